@@ -153,8 +153,13 @@ from agent_recall.memory.migration import VectorMigrationRequest
 from agent_recall.ralph.costs import format_usd, summarize_costs
 from agent_recall.ralph.iteration_store import IterationOutcome, IterationReportStore
 from agent_recall.storage import create_storage_backend
-from agent_recall.storage.base import Storage, UnsupportedStorageCapabilityError
+from agent_recall.storage.base import (
+    SharedBackendUnavailableError,
+    Storage,
+    UnsupportedStorageCapabilityError,
+)
 from agent_recall.storage.files import FileStorage, KnowledgeTier
+from agent_recall.storage.http_server import serve_shared_backend
 from agent_recall.storage.metadata import attribution_fields as resolve_attribution_fields
 from agent_recall.storage.migrations.migrate_to_embeddings import (
     get_migration_preview,
@@ -1104,6 +1109,12 @@ def context(
         min=1,
         help="Override rerank candidate pool size (default from config)",
     ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Show whether the assembled context came from the cache",
+    ),
 ):
     """Output current context (guardrails, style, recent, relevant)."""
     if ctx.invoked_subcommand is not None:
@@ -1148,11 +1159,17 @@ def context(
         raise typer.Exit(exc.exit_code) from None
 
     if normalized_format == "md":
-        render_context_result_markdown(result, console=console)
+        render_context_result_markdown(result, console=console, verbose=verbose)
         return
 
     if normalized_format == "json":
-        print_json({"status": "ok", "data": context_result_json_payload(result), "exit_code": 0})
+        print_json(
+            {
+                "status": "ok",
+                "data": context_result_json_payload(result, verbose=verbose),
+                "exit_code": 0,
+            }
+        )
         return
 
 
@@ -1276,7 +1293,11 @@ def refresh_context(
 
 
 @app.command()
-def compact(force: bool = typer.Option(False, "--force", "-f", help="Force compaction")):
+def compact(
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Force a full compaction, ignoring the incremental cursors"
+    ),
+):
     """Run compaction to update knowledge tiers from logs."""
     storage = get_storage()
     files = get_files()
@@ -1528,11 +1549,14 @@ def sync(
             if message_text == "-1":
                 message_text = "?"
             batch_size = event.get("messages_per_batch")
+            token_budget = event.get("prompt_token_budget")
             batch_text = (
                 f", batch size {str(_as_int(batch_size, -1))}"
                 if batch_size is not None and _as_int(batch_size, -1) > 0
                 else ""
             )
+            if token_budget is not None and _as_int(token_budget, -1) > 0:
+                batch_text = f", batch budget ~{_as_int(token_budget)} tokens"
             console.print(
                 f"[dim]{source_name}:{source_session_id} extraction started "
                 f"({message_text} messages{batch_text}).[/dim]"
@@ -1542,12 +1566,18 @@ def sync(
         if event_name == "extraction_batch_size_adjusted":
             source_name = str(event.get("source", "?"))
             source_session_id = str(event.get("session_id", "?"))
-            old_size = _as_int(event.get("old_messages_per_batch"), 0)
-            new_size = _as_int(event.get("new_messages_per_batch"), 0)
+            if "old_prompt_token_budget" in event:
+                old_size = _as_int(event.get("old_prompt_token_budget"), 0)
+                new_size = _as_int(event.get("new_prompt_token_budget"), 0)
+                size_label = "batch token budget"
+            else:
+                old_size = _as_int(event.get("old_messages_per_batch"), 0)
+                new_size = _as_int(event.get("new_messages_per_batch"), 0)
+                size_label = "batch size"
             attempt = _as_int(event.get("attempt"), 0)
             max_attempts = _as_int(event.get("max_attempts"), 0)
             console.print(
-                f"[warning]{source_name}:{source_session_id} rate limited; reducing batch size "
+                f"[warning]{source_name}:{source_session_id} rate limited; reducing {size_label} "
                 f"from {old_size} to {new_size} (attempt {attempt}/{max_attempts}).[/warning]"
             )
             return
@@ -1651,6 +1681,8 @@ def sync(
         )
     lines.append(f"Learnings extracted: {results['learnings_extracted']}")
     lines.append(f"LLM extraction requests: {results.get('llm_requests', 0)}")
+    if int(results.get("llm_calls_skipped", 0)) > 0:
+        lines.append(f"LLM calls skipped (low signal): {results['llm_calls_skipped']}")
     if request.session_ids and int(results["sessions_processed"]) == 0:
         already_processed = int(results.get("sessions_already_processed", 0))
         if already_processed == int(results["sessions_discovered"]) and already_processed > 0:
@@ -4111,6 +4143,7 @@ def ingest(
             duration_ms=(time.perf_counter() - started) * 1000.0,
             metadata={"source_session_id": source_session_id, "error": str(exc)},
         )
+        telemetry.flush()
         raise
 
     telemetry.record_event(
@@ -4121,6 +4154,7 @@ def ingest(
         duration_ms=(time.perf_counter() - started) * 1000.0,
         metadata={"source_session_id": source_session_id, "entries_ingested": int(count)},
     )
+    telemetry.flush()
     console.print(f"[success]✓ Ingested {count} transcript entries[/success]")
 
 
@@ -4133,6 +4167,7 @@ rule_confidence_app = typer.Typer(help="Manage rule confidence decay and pruning
 memory_pack_app = typer.Typer(help="Import/export versioned memory packs")
 attribution_app = typer.Typer(help="Inspect attribution metadata by agent/provider")
 memory_app = typer.Typer(help="Manage pluggable memory backends")
+storage_app = typer.Typer(help="Run and inspect the shared storage backend")
 external_compaction_app = typer.Typer(
     help="Run external conversation compaction and optional MCP server tools"
 )
@@ -4284,6 +4319,71 @@ def metrics_report(
     console.print(run_table)
 
 
+@metrics_app.command("events")
+def metrics_events(
+    run_id: str | None = typer.Option(None, "--run-id", help="Only events from this run"),
+    stage: str | None = typer.Option(None, "--stage", help="ingest, extract, compact, apply"),
+    action: str | None = typer.Option(None, "--action", help="start, complete, error"),
+    since_days: float | None = typer.Option(
+        None,
+        "--since-days",
+        min=0.0,
+        help="Only events from the last N days",
+    ),
+    limit: int = typer.Option(50, "--limit", "-n", min=1, help="Maximum events to show"),
+    format: str = typer.Option("table", "--format", help="Output format: table or json"),
+):
+    """Query recorded telemetry events by run, stage/action, and time range."""
+    _get_theme_manager()
+    files = get_files()
+    telemetry = PipelineTelemetry.from_config(agent_dir=files.agent_dir, config=files.read_config())
+    since = datetime.now(UTC) - timedelta(days=since_days) if since_days is not None else None
+    try:
+        events = telemetry.query_events(
+            run_id=run_id,
+            stage=stage,
+            action=action,
+            since=since,
+            limit=limit,
+        )
+    except ValueError as exc:
+        console.print(f"[error]Invalid filter: {exc}[/error]")
+        raise typer.Exit(1) from None
+
+    output_format = _resolve_output_format(format)
+    if output_format == "json":
+        print_json(
+            {
+                "status": "ok",
+                "data": {"events": [event.model_dump(mode="json") for event in events]},
+                "exit_code": 0,
+            }
+        )
+        return
+
+    if not events:
+        console.print("[dim]No telemetry events match the given filters.[/dim]")
+        return
+
+    event_table = Table(title="Pipeline Events", box=box.SIMPLE)
+    event_table.add_column("Created", overflow="fold")
+    event_table.add_column("Run ID", overflow="fold")
+    event_table.add_column("Stage")
+    event_table.add_column("Action")
+    event_table.add_column("Success")
+    event_table.add_column("Duration (ms)", justify="right")
+    for event in events:
+        event_table.add_row(
+            event.created_at.isoformat(),
+            event.run_id,
+            event.stage.value,
+            event.action.value,
+            "-" if event.success is None else str(event.success).lower(),
+            "-" if event.duration_ms is None else f"{float(event.duration_ms):.1f}",
+        )
+    console.print(event_table)
+
+
 @external_compaction_app.command("list")
 def external_compaction_list(
     limit: int = typer.Option(20, "--limit", "-n", min=1, help="Maximum conversations"),
@@ -6164,6 +6264,8 @@ def memory_migrate_vectors(
             f"Rows normalized: {payload['rows_normalized']}\n"
             f"Rows migrated: {payload['rows_migrated']}\n"
             f"Rows written: {payload['rows_written']}\n"
+            f"Rows unchanged: {payload.get('rows_unchanged', 0)}\n"
+            f"Rows deleted: {payload.get('rows_deleted', 0)}\n"
             f"Redacted rows: {payload['redacted_rows']}\n"
             f"Provider/backend: {payload['embedding_provider']}/{payload['vector_backend']}\n"
             f"Estimated tokens: {payload['estimated_tokens']}\n"
@@ -6208,6 +6310,185 @@ def memory_prune_vectors(
     )
 
 
+@storage_app.command("serve")
+def storage_serve(
+    db_path: Path = typer.Option(
+        DB_PATH,
+        "--db",
+        help="SQLite database backing the shared storage server",
+    ),
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8765, "--port", min=0, max=65535, help="Port to listen on"),
+    api_key_env: str = typer.Option(
+        "AGENT_RECALL_SHARED_API_KEY",
+        "--api-key-env",
+        help="Environment variable holding the bearer token clients must send",
+    ),
+    max_limit: int = typer.Option(
+        2000,
+        "--max-limit",
+        min=1,
+        help="Upper bound applied to list endpoint limits",
+    ),
+    max_body_bytes: int = typer.Option(
+        32 * 1024 * 1024,
+        "--max-body-bytes",
+        min=1,
+        help="Reject request bodies larger than this with 413",
+    ),
+    access_log: bool = typer.Option(
+        False,
+        "--access-log/--no-access-log",
+        help="Log every request to stderr",
+    ),
+):
+    """Serve the shared storage HTTP API for `storage.shared.base_url` clients."""
+    _get_theme_manager()
+    bearer_token = os.environ.get(api_key_env) or None
+    auth_note = f"bearer token from {api_key_env}" if bearer_token else "no authentication"
+    console.print(
+        f"[info]Serving shared storage for {db_path} on http://{host}:{port} "
+        f"({auth_note}). Press Ctrl+C to stop.[/info]"
+    )
+    try:
+        serve_shared_backend(
+            db_path,
+            host=host,
+            port=port,
+            access_log=access_log,
+            bearer_token=bearer_token,
+            max_limit=max_limit,
+            max_body_bytes=max_body_bytes,
+        )
+    except OSError as exc:
+        console.print(f"[error]storage serve failed: {exc}[/error]")
+        raise typer.Exit(1) from None
+    except KeyboardInterrupt:
+        console.print("[dim]Shared storage server stopped.[/dim]")
+
+
+@storage_app.command("status")
+def storage_status(
+    flush: bool = typer.Option(
+        False,
+        "--flush",
+        help="Replicate queued writes to the shared backend before reporting",
+    ),
+    format: str = typer.Option("table", "--format", "-f", help="Output format: table or json"),
+):
+    """Show the shared-storage write-behind queue depth and replication lag."""
+    _get_theme_manager()
+    output_format = format.strip().lower()
+    if output_format not in {"table", "json"}:
+        console.print("[error]Invalid format. Use 'table' or 'json'.[/error]")
+        raise typer.Exit(1)
+
+    storage = get_storage()
+    get_status = getattr(storage, "get_outbox_status", None)
+    flush_outbox = getattr(storage, "flush_outbox", None)
+    if flush and callable(flush_outbox):
+        flush_outbox()
+    status = get_status() if callable(get_status) else None
+
+    if status is None:
+        if output_format == "json":
+            typer.echo(json.dumps({"write_behind": False}, indent=2))
+        else:
+            console.print("[dim]Write-behind queue is not active for this storage backend.[/dim]")
+        return
+
+    payload = {
+        "write_behind": True,
+        "pending": status.pending,
+        "failed": status.failed,
+        "lag_seconds": round(status.lag_seconds, 3),
+        "oldest_enqueued_at": (
+            status.oldest_enqueued_at.isoformat() if status.oldest_enqueued_at else None
+        ),
+        "last_flushed_at": status.last_flushed_at.isoformat() if status.last_flushed_at else None,
+        "last_error": status.last_error,
+    }
+    if output_format == "json":
+        typer.echo(json.dumps(payload, indent=2))
+        return
+
+    table = Table(title="Write-Behind Queue", box=box.SIMPLE)
+    table.add_column("Metric")
+    table.add_column("Value")
+    table.add_row("Pending writes", str(status.pending))
+    table.add_row("Failed writes", str(status.failed))
+    table.add_row("Replication lag", f"{status.lag_seconds:.1f}s")
+    table.add_row("Last error", status.last_error or "-")
+    console.print(table)
+    if status.failed:
+        console.print(
+            "[warning]Failed writes were rejected by the shared backend and will not be "
+            "retried.[/warning]"
+        )
+
+
+@storage_app.command("pull")
+def storage_pull(
+    since: int | None = typer.Option(
+        None,
+        "--since",
+        min=0,
+        help="Change sequence to pull after (default: where the last pull stopped; 0 for all)",
+    ),
+    page_size: int = typer.Option(
+        500,
+        "--page-size",
+        min=1,
+        help="Entries and chunks requested per change-feed page",
+    ),
+    format: str = typer.Option("table", "--format", "-f", help="Output format: table or json"),
+):
+    """Copy shared entries and chunks changed since the last pull into the local database."""
+    _get_theme_manager()
+    output_format = format.strip().lower()
+    if output_format not in {"table", "json"}:
+        console.print("[error]Invalid format. Use 'table' or 'json'.[/error]")
+        raise typer.Exit(1)
+
+    storage = get_storage()
+    pull = getattr(storage, "pull_changes", None)
+    if not callable(pull):
+        console.print("[error]storage pull requires `storage.backend: shared`.[/error]")
+        raise typer.Exit(1)
+    try:
+        result = pull(since=since, page_size=page_size)
+    except (
+        SharedBackendUnavailableError,
+        UnsupportedStorageCapabilityError,
+        httpx.HTTPError,
+        ValueError,
+    ) as exc:
+        console.print(f"[error]storage pull failed: {exc}[/error]")
+        raise typer.Exit(1) from None
+
+    payload = {
+        "since": result.since,
+        "cursor": result.cursor,
+        "entries": result.entries,
+        "chunks": result.chunks,
+        "pages": result.pages,
+        "reset": result.reset,
+    }
+    if output_format == "json":
+        typer.echo(json.dumps(payload, indent=2))
+        return
+
+    if result.reset:
+        console.print(
+            "[warning]Shared change sequence is behind the saved cursor; pulled from the "
+            "beginning.[/warning]"
+        )
+    console.print(
+        f"[success]✓ Pulled {result.entries} entries and {result.chunks} chunks "
+        f"(changes {result.since} -> {result.cursor}).[/success]"
+    )
+
+
 external_compaction_app.add_typer(external_compaction_queue_app, name="queue")
 tiers_app.add_typer(tiers_write_app, name="write")
 
@@ -6222,6 +6503,7 @@ app.add_typer(topic_threads_app, name="topic-threads")
 app.add_typer(rule_confidence_app, name="rule-confidence")
 app.add_typer(memory_pack_app, name="memory-pack")
 app.add_typer(memory_app, name="memory")
+app.add_typer(storage_app, name="storage")
 app.add_typer(tiers_app, name="tiers")
 app.add_typer(config_app, name="config")
 app.add_typer(curation_app, name="curation")
@@ -39,6 +39,7 @@ class ContextResult:
     for_pr: bool
     context: str
     scope_payload: dict[str, Any] | None
+    cache_status: str | None = None
 
 
 @dataclass(frozen=True)
@@ -189,26 +190,31 @@ def execute_context_request(
             scope_payload=scope.to_dict(),
         )
 
-    output = assemble_standard_context(
-        storage=storage,
-        files=files,
+    context_asm = ContextAssembler(
+        storage,
+        files,
         retriever=retriever,
         retrieval_top_k=effective_top_k,
-        task=request.task,
     )
+    output = context_asm.assemble(task=request.task)
     return ContextResult(
         task=request.task,
         for_pr=False,
         context=output,
         scope_payload=None,
+        cache_status=context_asm.last_cache_status,
     )
 
 
-def render_context_result_markdown(result: ContextResult, *, console: Console) -> None:
+def render_context_result_markdown(
+    result: ContextResult, *, console: Console, verbose: bool = False
+) -> None:
     console.print(result.context)
+    if verbose and result.cache_status is not None:
+        console.print(f"[dim]Context cache: {result.cache_status}[/dim]")
 
 
-def context_result_json_payload(result: ContextResult) -> dict[str, Any]:
+def context_result_json_payload(result: ContextResult, *, verbose: bool = False) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "task": result.task,
         "for_pr": result.for_pr,
@@ -216,4 +222,6 @@ def context_result_json_payload(result: ContextResult) -> dict[str, Any]:
     }
     if result.scope_payload is not None:
         payload["scope"] = result.scope_payload
+    if verbose:
+        payload["cache_status"] = result.cache_status
     return payload
@@ -101,6 +101,8 @@ def render_sync_summary(
         )
     lines.append(f"Learnings extracted: {results['learnings_extracted']}")
     lines.append(f"LLM extraction requests: {results.get('llm_requests', 0)}")
+    if int(results.get("llm_calls_skipped", 0)) > 0:
+        lines.append(f"LLM calls skipped (low signal): {results['llm_calls_skipped']}")
     if request.session_ids and int(results["sessions_processed"]) == 0:
         already_processed = int(results.get("sessions_already_processed", 0))
         if already_processed == int(results["sessions_discovered"]) and already_processed > 0:
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import re
 from collections import Counter
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any
 
 from agent_recall.core.embeddings import generate_embedding
-from agent_recall.core.semantic_embedder import embed_single, get_embedding_dimension
+from agent_recall.core.semantic_embedder import embed_batch, get_embedding_dimension
 from agent_recall.core.tier_format import is_ralph_entry_start, parse_tier_content
 from agent_recall.core.tier_notes import normalize_tier_content, normalize_tier_line
 from agent_recall.llm.base import LLMProvider, Message
-from agent_recall.storage.base import Storage
-from agent_recall.storage.files import FileStorage, KnowledgeTier
+from agent_recall.storage.base import (
+    SharedBackendUnavailableError,
+    Storage,
+    UnsupportedStorageCapabilityError,
+)
+from agent_recall.storage.files import FileStorage, KnowledgeTier, atomic_write_text
 from agent_recall.storage.metadata import AttributionMetadata, EntryMetadata
 from agent_recall.storage.models import (
     Chunk,
@@ -97,11 +105,30 @@ Rules:
 - No markdown fences and no prose.
 """
 
+COMPACTION_STATE_FILENAME = "compaction_state.json"
+CHANGE_FEED_PAGE_SIZE = 500
+SYNTHESIS_BATCH_SIZE = 100
+
 _JSON_FENCE_RE = re.compile(r"```(?:json)?|```", flags=re.IGNORECASE)
 _BULLET_RE = re.compile(r"^\s*-\s*\[(?P<kind>[A-Z_]+)\]\s*(?P<text>.+?)\s*$")
 _RECENT_RE = re.compile(r"^\s*\*\*(?P<date>\d{4}-\d{2}-\d{2})\*\*:\s*(?P<summary>.+)\s*$")
 
 
+def _load_compaction_state(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def _save_compaction_state(path: Path, state: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(state, indent=2, sort_keys=True))
+
+
 class CompactionEngine:
     def __init__(self, storage: Storage, files: FileStorage, llm: LLMProvider):
         self.storage = storage
@@ -109,7 +136,14 @@ class CompactionEngine:
         self.llm = llm
 
     async def compact(self, force: bool = False) -> dict[str, bool | int]:
-        """Run compaction and return summary details."""
+        """Run compaction and return summary details.
+
+        Compaction is incremental: only entries the store recorded after each label's
+        change cursor in ``compaction_state.json`` are sent to the LLM alongside the
+        current tier content, at most ``SYNTHESIS_BATCH_SIZE`` per request, and tiers
+        with nothing new are skipped entirely. ``force`` ignores the cursors and
+        re-synthesizes from every entry.
+        """
         results: dict[str, bool | int] = {
             "guardrails_updated": False,
             "style_updated": False,
@@ -130,6 +164,10 @@ class CompactionEngine:
         pattern_threshold = int(compaction_cfg.get("promote_pattern_after_occurrences", 3))
         effective_pattern_threshold = 1 if force else max(1, pattern_threshold)
         recent_token_budget = int(compaction_cfg.get("max_recent_tokens", 1500))
+        try:
+            llm_concurrency = max(1, int(compaction_cfg.get("llm_concurrency", 3)))
+        except (TypeError, ValueError):
+            llm_concurrency = 3
         semantic_index_enabled = bool(retrieval_cfg.get("semantic_index_enabled", False))
         embedding_dimensions = int(retrieval_cfg.get("embedding_dimensions", 64))
         if embedding_dimensions < 8:
@@ -145,117 +183,327 @@ class CompactionEngine:
         non_style_index_thresholds = self._resolve_non_style_index_thresholds(compaction_cfg)
 
         curation_status = self._resolve_curation_status(compaction_cfg)
-        guardrail_entries = self.storage.get_entries_by_label(
-            guardrail_labels,
-            curation_status=curation_status,
-        )
-        style_entries = self.storage.get_entries_by_label(
-            style_labels,
+        state = self._load_state()
+        cursors = {} if force else self._read_cursors(state, curation_status)
+        label_groups = [guardrail_labels, style_labels, non_style_index_labels]
+        feed = self._entries_since_cursors(
+            [label for labels in label_groups for label in labels],
             curation_status=curation_status,
+            cursors=cursors,
         )
+        if feed is None:
+            # Without a change feed, fall back to the latest entries of each group.
+            new_entries = self._latest_entries(label_groups, curation_status=curation_status)
+            advanced: dict[str, int] = {}
+        else:
+            new_entries, advanced = feed
+
+        guardrail_entries = [entry for entry in new_entries if entry.label in guardrail_labels]
+        new_style_entries = [entry for entry in new_entries if entry.label in style_labels]
+        new_non_style_entries = [
+            entry for entry in new_entries if entry.label in non_style_index_labels
+        ]
         non_style_index_entries = self._filter_non_style_index_entries(
-            self.storage.get_entries_by_label(
-                non_style_index_labels,
-                curation_status=curation_status,
-            ),
+            new_non_style_entries,
             non_style_index_thresholds,
         )
-        promoted_style_entries = self._promoted_style_entries(
-            style_entries,
-            effective_pattern_threshold,
-        )
-
-        if guardrail_entries:
-            current = self.files.read_tier(KnowledgeTier.GUARDRAILS)
-            entries_text = self._format_entries_for_prompt(guardrail_entries)
-            results["llm_requests"] = int(results["llm_requests"]) + 1
-            response = await self.llm.generate(
-                [
-                    Message(
-                        role="user",
-                        content=GUARDRAILS_PROMPT.format(
-                            current_guardrails=current or "(empty)",
-                            entries=entries_text,
-                        ),
-                    )
-                ]
-            )
-            results["llm_responses"] = int(results["llm_responses"]) + 1
-            synthesized = self._extract_guardrail_lines(response.content)
-            if synthesized:
-                changed = self._merge_and_write_tier(
-                    tier=KnowledgeTier.GUARDRAILS,
-                    current=current,
-                    new_lines=synthesized,
-                    matcher=_BULLET_RE,
+        promoted_style_entries: list[LogEntry] = []
+        if new_style_entries:
+            # Pattern promotion counts occurrences across all style entries, but only
+            # patterns touched by new entries need to go back through the LLM.
+            style_entries = (
+                new_style_entries
+                if not cursors
+                else self.storage.get_entries_by_label(
+                    style_labels,
+                    curation_status=curation_status,
                 )
-                if changed:
-                    results["guardrails_updated"] = True
-
-        if promoted_style_entries:
-            current = self.files.read_tier(KnowledgeTier.STYLE)
-            entries_text = self._format_entries_for_prompt(promoted_style_entries)
-            results["llm_requests"] = int(results["llm_requests"]) + 1
-            response = await self.llm.generate(
-                [
-                    Message(
-                        role="user",
-                        content=STYLE_PROMPT.format(
-                            current_style=current or "(empty)",
-                            entries=entries_text,
-                        ),
-                    )
-                ]
             )
-            results["llm_responses"] = int(results["llm_responses"]) + 1
-            synthesized = self._extract_style_lines(response.content)
-            if synthesized:
-                changed = self._merge_and_write_tier(
-                    tier=KnowledgeTier.STYLE,
-                    current=current,
-                    new_lines=synthesized,
-                    matcher=_BULLET_RE,
+            new_style_keys = {self._normalize_content(entry.content) for entry in new_style_entries}
+            promoted_style_entries = [
+                entry
+                for entry in self._promoted_style_entries(
+                    style_entries,
+                    effective_pattern_threshold,
                 )
-                if changed:
-                    results["style_updated"] = True
+                if self._normalize_content(entry.content) in new_style_keys
+            ]
 
         recent_evidence = self._recent_evidence_lines()
+        recent_fingerprint = self._fingerprint_lines(recent_evidence)
+        if not force and recent_fingerprint == state.get("recent_evidence_hash"):
+            recent_evidence = []
+        semaphore = asyncio.Semaphore(llm_concurrency)
+        syntheses: dict[str, Awaitable[bool]] = {}
+        if guardrail_entries:
+            syntheses["guardrails_updated"] = self._synthesize_in_batches(
+                self._synthesize_guardrails,
+                guardrail_entries,
+                semaphore=semaphore,
+                results=results,
+            )
+        if promoted_style_entries:
+            syntheses["style_updated"] = self._synthesize_in_batches(
+                self._synthesize_style,
+                promoted_style_entries,
+                semaphore=semaphore,
+                results=results,
+            )
         if recent_evidence:
-            current_recent = self.files.read_tier(KnowledgeTier.RECENT)
-            results["llm_requests"] = int(results["llm_requests"]) + 1
-            response = await self.llm.generate(
-                [
-                    Message(
-                        role="user",
-                        content=RECENT_PROMPT.format(
-                            current_recent=current_recent or "(empty)",
-                            sessions="\n".join(recent_evidence),
-                        ),
-                    )
-                ]
+            syntheses["recent_updated"] = self._synthesize_recent(
+                recent_evidence,
+                recent_token_budget=recent_token_budget,
+                semaphore=semaphore,
+                results=results,
             )
-            results["llm_responses"] = int(results["llm_responses"]) + 1
-            recent_lines = self._extract_recent_lines(response.content)
-            if recent_lines:
-                recent_lines = self._trim_recent_lines(recent_lines, recent_token_budget)
-                changed = self._write_recent_lines(current_recent, recent_lines)
-                if changed:
-                    results["recent_updated"] = True
-
-        indexed_entry_ids: set[str] = set()
-        for entry in [*guardrail_entries, *promoted_style_entries, *non_style_index_entries]:
-            entry_id = str(entry.id)
-            if entry_id in indexed_entry_ids:
-                continue
-            indexed_entry_ids.add(entry_id)
-            if self.storage.has_chunk(entry.content, entry.label):
+
+        # Tiers are independent, so run them together and surface the first failure
+        # only after every synthesis has finished writing its own tier.
+        outcomes = await asyncio.gather(*syntheses.values(), return_exceptions=True)
+        for key, outcome in zip(syntheses, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                raise outcome
+            if outcome:
+                results[key] = True
+
+        self._advance_cursors(state, curation_status, advanced)
+        if recent_fingerprint:
+            state["recent_evidence_hash"] = recent_fingerprint
+        self._save_state(state)
+
+        results["chunks_indexed"] = self._index_entries(
+            [*guardrail_entries, *promoted_style_entries, *non_style_index_entries],
+            semantic_index_enabled=semantic_index_enabled,
+            embedding_dimensions=embedding_dimensions,
+        )
+
+        return results
+
+    @property
+    def state_path(self) -> Path:
+        return self.files.agent_dir / COMPACTION_STATE_FILENAME
+
+    def _load_state(self) -> dict[str, Any]:
+        return _load_compaction_state(self.state_path)
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        _save_compaction_state(self.state_path, state)
+
+    @staticmethod
+    def _read_cursors(
+        state: dict[str, Any],
+        curation_status: CurationStatus,
+    ) -> dict[str, int]:
+        by_status = state.get("change_cursors")
+        raw = by_status.get(curation_status.value) if isinstance(by_status, dict) else None
+        if not isinstance(raw, dict):
+            return {}
+        cursors: dict[str, int] = {}
+        for label, value in raw.items():
+            try:
+                cursors[str(label)] = int(value)
+            except (TypeError, ValueError):
                 continue
-            embedding = (
-                self._generate_chunk_embedding(entry.content, dimensions=embedding_dimensions)
-                if semantic_index_enabled
-                else None
-            )
-            chunk = Chunk(
+        return cursors
+
+    @staticmethod
+    def _advance_cursors(
+        state: dict[str, Any],
+        curation_status: CurationStatus,
+        advanced: dict[str, int],
+    ) -> None:
+        # Timestamp watermarks from older releases are superseded by the cursors.
+        state.pop("watermarks", None)
+        if not advanced:
+            return
+        by_status = state.get("change_cursors")
+        if not isinstance(by_status, dict):
+            by_status = {}
+            state["change_cursors"] = by_status
+        current = by_status.get(curation_status.value)
+        if not isinstance(current, dict):
+            current = {}
+            by_status[curation_status.value] = current
+        current.update(advanced)
+
+    def _entries_since_cursors(
+        self,
+        labels: list[SemanticLabel],
+        *,
+        curation_status: CurationStatus,
+        cursors: dict[str, int],
+    ) -> tuple[list[LogEntry], dict[str, int]] | None:
+        """Read entries written after each label's change cursor, page by page.
+
+        Cursors are change-sequence numbers assigned by the store, so entries that reach
+        it late (pulled from the shared backend, flushed from an outbox, or approved
+        after a compaction) are read regardless of their own timestamps. Returns the
+        entries and each label's new cursor, or ``None`` when the store has no change
+        feed to read.
+        """
+        starts: dict[int, set[SemanticLabel]] = {}
+        for label in labels:
+            starts.setdefault(cursors.get(label.value, 0), set()).add(label)
+        entries: list[LogEntry] = []
+        advanced: dict[str, int] = {}
+        try:
+            for since, wanted in sorted(starts.items()):
+                while True:
+                    page = self.storage.list_changes(since=since, limit=CHANGE_FEED_PAGE_SIZE)
+                    entries.extend(
+                        entry
+                        for entry in page.entries
+                        if entry.label in wanted and entry.curation_status == curation_status
+                    )
+                    since = page.next_since
+                    if not page.has_more:
+                        break
+                advanced.update(dict.fromkeys((label.value for label in wanted), since))
+        except (UnsupportedStorageCapabilityError, SharedBackendUnavailableError):
+            return None
+        return entries, advanced
+
+    def _latest_entries(
+        self,
+        label_groups: list[list[SemanticLabel]],
+        *,
+        curation_status: CurationStatus,
+    ) -> list[LogEntry]:
+        return [
+            entry
+            for labels in label_groups
+            if labels
+            for entry in self.storage.get_entries_by_label(labels, curation_status=curation_status)
+        ]
+
+    @staticmethod
+    async def _synthesize_in_batches(
+        synthesize: Callable[..., Awaitable[bool]],
+        entries: list[LogEntry],
+        **kwargs: Any,
+    ) -> bool:
+        """Run one tier's synthesis over ``entries`` a bounded batch at a time."""
+        updated = False
+        for start in range(0, len(entries), SYNTHESIS_BATCH_SIZE):
+            batch = entries[start : start + SYNTHESIS_BATCH_SIZE]
+            updated = await synthesize(batch, **kwargs) or updated
+        return updated
+
+    @staticmethod
+    def _fingerprint_lines(lines: list[str]) -> str:
+        if not lines:
+            return ""
+        return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+    async def _generate_limited(
+        self,
+        prompt: str,
+        *,
+        semaphore: asyncio.Semaphore,
+        results: dict[str, bool | int],
+    ) -> str:
+        async with semaphore:
+            results["llm_requests"] = int(results["llm_requests"]) + 1
+            response = await self.llm.generate([Message(role="user", content=prompt)])
+            results["llm_responses"] = int(results["llm_responses"]) + 1
+        return response.content
+
+    async def _synthesize_guardrails(
+        self,
+        entries: list[LogEntry],
+        *,
+        semaphore: asyncio.Semaphore,
+        results: dict[str, bool | int],
+    ) -> bool:
+        current = self.files.read_tier(KnowledgeTier.GUARDRAILS)
+        content = await self._generate_limited(
+            GUARDRAILS_PROMPT.format(
+                current_guardrails=current or "(empty)",
+                entries=self._format_entries_for_prompt(entries),
+            ),
+            semaphore=semaphore,
+            results=results,
+        )
+        synthesized = self._extract_guardrail_lines(content)
+        if not synthesized:
+            return False
+        return self._merge_and_write_tier(
+            tier=KnowledgeTier.GUARDRAILS,
+            current=current,
+            new_lines=synthesized,
+            matcher=_BULLET_RE,
+        )
+
+    async def _synthesize_style(
+        self,
+        entries: list[LogEntry],
+        *,
+        semaphore: asyncio.Semaphore,
+        results: dict[str, bool | int],
+    ) -> bool:
+        current = self.files.read_tier(KnowledgeTier.STYLE)
+        content = await self._generate_limited(
+            STYLE_PROMPT.format(
+                current_style=current or "(empty)",
+                entries=self._format_entries_for_prompt(entries),
+            ),
+            semaphore=semaphore,
+            results=results,
+        )
+        synthesized = self._extract_style_lines(content)
+        if not synthesized:
+            return False
+        return self._merge_and_write_tier(
+            tier=KnowledgeTier.STYLE,
+            current=current,
+            new_lines=synthesized,
+            matcher=_BULLET_RE,
+        )
+
+    async def _synthesize_recent(
+        self,
+        evidence: list[str],
+        *,
+        recent_token_budget: int,
+        semaphore: asyncio.Semaphore,
+        results: dict[str, bool | int],
+    ) -> bool:
+        current_recent = self.files.read_tier(KnowledgeTier.RECENT)
+        content = await self._generate_limited(
+            RECENT_PROMPT.format(
+                current_recent=current_recent or "(empty)",
+                sessions="\n".join(evidence),
+            ),
+            semaphore=semaphore,
+            results=results,
+        )
+        recent_lines = self._extract_recent_lines(content)
+        if not recent_lines:
+            return False
+        recent_lines = self._trim_recent_lines(recent_lines, recent_token_budget)
+        return self._write_recent_lines(current_recent, recent_lines)
+
+    def _index_entries(
+        self,
+        entries: list[LogEntry],
+        *,
+        semantic_index_enabled: bool,
+        embedding_dimensions: int,
+    ) -> int:
+        """Index entries as chunks with one lookup, one embedding batch and one bulk insert."""
+        candidates: dict[tuple[str, SemanticLabel], LogEntry] = {}
+        for entry in entries:
+            candidates.setdefault((entry.content, entry.label), entry)
+        if not candidates:
+            return 0
+
+        existing = self.storage.find_existing_chunks(list(candidates))
+        misses = [entry for key, entry in candidates.items() if key not in existing]
+        if not misses:
+            return 0
+
+        chunks = [
+            Chunk(
                 source=ChunkSource.LOG_ENTRY,
                 source_ids=[entry.id],
                 content=entry.content,
@@ -263,21 +511,27 @@ class CompactionEngine:
                 tags=list(dict.fromkeys([*entry.tags, *self._attribution_tags(entry)])),
                 embedding=None,
             )
-            self.storage.store_chunk(chunk)
-            if embedding is not None:
-                self.storage.index_chunk_embedding(chunk.id, embedding)
-            results["chunks_indexed"] = int(results["chunks_indexed"]) + 1
-
-        return results
+            for entry in misses
+        ]
+        self.storage.store_chunks(chunks)
+        if semantic_index_enabled:
+            embeddings = self._generate_chunk_embeddings(
+                [chunk.content for chunk in chunks],
+                dimensions=embedding_dimensions,
+            )
+            self.storage.index_chunk_embeddings(
+                {chunk.id: embedding for chunk, embedding in zip(chunks, embeddings, strict=True)}
+            )
+        return len(chunks)
 
     @staticmethod
-    def _generate_chunk_embedding(text: str, dimensions: int) -> list[float]:
+    def _generate_chunk_embeddings(texts: list[str], dimensions: int) -> list[list[float]]:
         if dimensions == get_embedding_dimension():
             try:
-                return embed_single(text).tolist()
+                return [row.tolist() for row in embed_batch(texts)]
             except Exception:  # noqa: BLE001
                 pass
-        return generate_embedding(text, dimensions=dimensions)
+        return [generate_embedding(text, dimensions=dimensions) for text in texts]
 
     @staticmethod
     def _format_entries_for_prompt(entries: list[LogEntry]) -> str:
@@ -1,8 +1,47 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import re
+from datetime import UTC, datetime
+from typing import Any
+
 from agent_recall.core.retrieve import Retriever
 from agent_recall.storage.base import Storage
-from agent_recall.storage.files import FileStorage, KnowledgeTier
+from agent_recall.storage.files import (
+    FileStorage,
+    KnowledgeTier,
+    atomic_write_text,
+    read_cached_file,
+)
+
+CONTEXT_CACHE_FILENAME = "context_cache.json"
+CONTEXT_CACHE_MAX_ENTRIES = 32
+
+# Ralph prefixes every iteration's task with its number; the prefix is a label, not part
+# of what the agent is working on, so it must not defeat the cache.
+_RALPH_ITERATION_PREFIX = re.compile(r"^\[Ralph Iteration \d+\]\s*")
+
+_RETRIEVER_CONFIG_ATTRS = (
+    "backend",
+    "fusion_k",
+    "rerank_enabled",
+    "rerank_candidate_k",
+    "fts_weight",
+    "semantic_weight",
+    "feedback_weight",
+)
+
+
+def normalize_context_task(task: str) -> str:
+    """Return the cache identity of ``task``: whitespace-collapsed, without iteration prefix."""
+    return " ".join(_RALPH_ITERATION_PREFIX.sub("", task.strip()).split())
+
+
+def _parse_context_cache(text: str) -> dict[str, Any]:
+    payload = json.loads(text) if text.strip() else {}
+    entries = payload.get("entries") if isinstance(payload, dict) else None
+    return entries if isinstance(entries, dict) else {}
 
 
 class ContextAssembler:
@@ -12,24 +51,99 @@ class ContextAssembler:
         files: FileStorage,
         retriever: Retriever | None = None,
         retrieval_top_k: int = 5,
+        use_cache: bool = True,
     ):
         self.storage = storage
         self.files = files
         self.retriever = retriever
         self.retrieval_top_k = max(1, retrieval_top_k)
+        self.use_cache = use_cache
+        self.cache_path = files.agent_dir / CONTEXT_CACHE_FILENAME
+        # "hit", "miss", or "bypass" for the most recent assemble() call.
+        self.last_cache_status: str | None = None
 
-    def assemble(self, task: str | None = None, include_retrieval: bool = True) -> str:
-        """Assemble full context for an agent."""
+    def _read_rules(self) -> str:
+        rules_path = self.files.agent_dir / "RULES.md"
+        try:
+            rules = read_cached_file(rules_path, str)
+        except OSError:
+            rules = None
+        return rules or ""
+
+    def _retrieval_config(self) -> dict[str, Any]:
+        retriever = self.retriever
+        config: dict[str, Any] = {
+            "retriever": type(retriever).__name__ if retriever is not None else None,
+            "top_k": self.retrieval_top_k,
+        }
+        for attr in _RETRIEVER_CONFIG_ATTRS:
+            value = getattr(retriever, attr, None)
+            if isinstance(value, (str, int, float, bool)):
+                config[attr] = value
+        return config
+
+    def cache_key(
+        self,
+        task: str | None,
+        *,
+        include_retrieval: bool = True,
+        sections: list[str] | None = None,
+    ) -> str | None:
+        """Return the freshness key for ``task`` against current memory, or ``None``.
+
+        The key covers the normalized task, the RULES.md and tier contents (read through
+        the mtime-validated file cache), the chunk-store generation, and the retrieval
+        configuration. The generation also moves when retrieval feedback is recorded,
+        since hybrid search ranks by it. ``None`` means the result cannot be cached safely.
+        """
+        if not task or not include_retrieval:
+            return None
+        generation = self.storage.get_chunk_generation()
+        if generation is None:
+            return None
+        if sections is None:
+            sections = self._static_sections()
+        material = {
+            "task": normalize_context_task(task),
+            "sections": hashlib.sha256("\0".join(sections).encode("utf-8")).hexdigest(),
+            "chunk_generation": generation,
+            "retrieval": self._retrieval_config(),
+        }
+        encoded = json.dumps(material, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def is_fresh(self, task: str | None, include_retrieval: bool = True) -> bool:
+        """Return whether a cached context for ``task`` is still valid."""
+        key = self.cache_key(task, include_retrieval=include_retrieval)
+        return key is not None and key in self._load_cache()
+
+    def _load_cache(self) -> dict[str, Any]:
+        try:
+            return read_cached_file(self.cache_path, _parse_context_cache) or {}
+        except (OSError, ValueError):
+            return {}
+
+    def _store_cache(self, key: str, relevant: list[str]) -> None:
+        entries = dict(self._load_cache())
+        entries.pop(key, None)
+        entries[key] = {"relevant": relevant, "stored_at": datetime.now(UTC).isoformat()}
+        while len(entries) > CONTEXT_CACHE_MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        try:
+            atomic_write_text(
+                self.cache_path,
+                json.dumps({"entries": entries}, indent=2),
+                parse=_parse_context_cache,
+            )
+        except OSError:
+            return
+
+    def _static_sections(self) -> list[str]:
         parts: list[str] = []
 
-        rules_path = self.files.agent_dir / "RULES.md"
-        if rules_path.exists():
-            try:
-                rules = rules_path.read_text(encoding="utf-8")
-            except OSError:
-                rules = ""
-            if rules.strip():
-                parts.append(f"## Rules\n\n{rules.strip()}")
+        rules = self._read_rules()
+        if rules.strip():
+            parts.append(f"## Rules\n\n{rules.strip()}")
 
         guardrails = self.files.read_tier(KnowledgeTier.GUARDRAILS)
         if guardrails.strip():
@@ -43,19 +157,50 @@ class ContextAssembler:
         if recent.strip():
             parts.append(f"## Recent Sessions\n\n{recent.strip()}")
 
+        return parts
+
+    def _retrieve(self, task: str) -> list[str]:
+        retriever = self.retriever or Retriever(self.storage)
+        if hasattr(retriever, "search_hybrid"):
+            chunks = retriever.search_hybrid(
+                query=task,
+                top_k=self.retrieval_top_k,
+                fts_weight=0.4,
+                semantic_weight=0.6,
+            )
+        else:
+            chunks = retriever.search(task, top_k=self.retrieval_top_k, backend="hybrid")
+        return [chunk.content for chunk in chunks]
+
+    def assemble(self, task: str | None = None, include_retrieval: bool = True) -> str:
+        """Assemble full context for an agent.
+
+        Retrieval results are reused from ``context_cache.json`` while the task, memory
+        files, chunk store, and retrieval settings are unchanged.
+        """
+        parts = self._static_sections()
+
         if task and include_retrieval:
-            retriever = self.retriever or Retriever(self.storage)
-            if hasattr(retriever, "search_hybrid"):
-                chunks = retriever.search_hybrid(
-                    query=task,
-                    top_k=self.retrieval_top_k,
-                    fts_weight=0.4,
-                    semantic_weight=0.6,
-                )
+            key = (
+                self.cache_key(task, include_retrieval=include_retrieval, sections=parts)
+                if self.use_cache
+                else None
+            )
+            cached = self._load_cache().get(key) if key is not None else None
+            if isinstance(cached, dict) and isinstance(cached.get("relevant"), list):
+                relevant = [str(item) for item in cached["relevant"]]
+                self.last_cache_status = "hit"
             else:
-                chunks = retriever.search(task, top_k=self.retrieval_top_k, backend="hybrid")
-            if chunks:
-                relevant = "\n".join(f"- {chunk.content}" for chunk in chunks)
-                parts.append(f'## Relevant to "{task}"\n\n{relevant}')
+                relevant = self._retrieve(task)
+                if key is not None:
+                    self._store_cache(key, relevant)
+                    self.last_cache_status = "miss"
+                else:
+                    self.last_cache_status = "bypass"
+            if relevant:
+                lines = "\n".join(f"- {content}" for content in relevant)
+                parts.append(f'## Relevant to "{task}"\n\n{lines}')
+        else:
+            self.last_cache_status = "bypass"
 
         return "\n\n---\n\n".join(parts) if parts else "No context available yet."
@@ -111,6 +111,30 @@ Previous output:
 
 JSON object:"""
 
+TRANSCRIPT_SEPARATOR = "\n\n---\n\n"
+MIN_TRANSCRIPT_TOKEN_BUDGET = 500
+
+BatchStrategy = Literal["messages", "token_budget"]
+SignalFilterAction = Literal["drop", "merge"]
+
+_NOISE_LINE_RE = re.compile(
+    r"""^(?:
+        [\w.@~+-]*[/\\][\w.@~+/\\-]*              # bare file paths / directory listings
+        | [-dlrwxst@+.]{10}\s.*                     # `ls -l` rows
+        | total\s+\d+                               # `ls -l` header
+        | (?=.{0,80}$).*?\b\d{1,3}(?:\.\d+)?%.*     # short progress lines
+        | [\s|/\\.=#>*\u2800-\u28ff-]+              # spinners and progress bars
+    )$""",
+    re.VERBOSE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch sizing."""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
 
 class ExtractionLearningPayload(BaseModel):
     """Strict response contract for one extracted learning."""
@@ -169,10 +193,20 @@ class TranscriptExtractor:
         llm: LLMProvider,
         messages_per_batch: int = 50,
         extracted_entry_curation_status: CurationStatus = CurationStatus.APPROVED,
+        batch_strategy: BatchStrategy = "messages",
+        prompt_token_budget: int = 6_000,
+        signal_filter_enabled: bool = False,
+        signal_filter_min_score: int = 4,
+        signal_filter_action: SignalFilterAction = "merge",
     ):
         self.llm = llm
         self.messages_per_batch = max(1, int(messages_per_batch))
         self.extracted_entry_curation_status = extracted_entry_curation_status
+        self.batch_strategy: BatchStrategy = batch_strategy
+        self.prompt_token_budget = max(1, int(prompt_token_budget))
+        self.signal_filter_enabled = signal_filter_enabled
+        self.signal_filter_min_score = max(1, int(signal_filter_min_score))
+        self.signal_filter_action: SignalFilterAction = signal_filter_action
 
     def _format_transcript(self, session: RawSession, max_chars: int = 8_000) -> str:
         segments: list[str] = []
@@ -450,6 +484,58 @@ class TranscriptExtractor:
             messages[start : start + chunk_size] for start in range(0, len(messages), chunk_size)
         ]
 
+    def _prompt_overhead_tokens(self, session: RawSession) -> int:
+        prompt = self._render_prompt(
+            EXTRACTION_USER_PROMPT,
+            session=session,
+            duration="unknown",
+            segment="batch 000/000",
+            transcript="",
+        )
+        return estimate_tokens(EXTRACTION_SYSTEM_PROMPT) + estimate_tokens(prompt)
+
+    def _transcript_token_budget(self, session: RawSession) -> int:
+        available = self.prompt_token_budget - self._prompt_overhead_tokens(session)
+        return max(MIN_TRANSCRIPT_TOKEN_BUDGET, available)
+
+    def _pack_messages_by_token_budget(
+        self,
+        messages: list[RawMessage],
+        token_budget: int,
+    ) -> list[list[RawMessage]]:
+        """Greedily fill batches with formatted messages up to ``token_budget`` tokens."""
+        separator_tokens = estimate_tokens(TRANSCRIPT_SEPARATOR)
+        batches: list[list[RawMessage]] = []
+        current: list[RawMessage] = []
+        current_tokens = 0
+
+        for message in messages:
+            formatted = self._format_message(message)
+            cost = estimate_tokens(formatted)
+            if cost and current_tokens:
+                cost += separator_tokens
+            if cost and current_tokens and current_tokens + cost > token_budget:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+                cost -= separator_tokens
+            current.append(message)
+            current_tokens += cost
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _plan_batches(self, session: RawSession) -> tuple[list[list[RawMessage]], int]:
+        """Split a session into extraction batches and return the transcript char budget."""
+        if self.batch_strategy == "token_budget":
+            token_budget = self._transcript_token_budget(session)
+            return (
+                self._pack_messages_by_token_budget(session.messages, token_budget),
+                token_budget * 4,
+            )
+        return self._chunk_messages(session.messages, self.messages_per_batch), 8_000
+
     @staticmethod
     def _build_duration(session: RawSession) -> str:
         duration = "unknown"
@@ -597,7 +683,7 @@ class TranscriptExtractor:
         if not segments:
             return ""
 
-        separator = "\n\n---\n\n"
+        separator = TRANSCRIPT_SEPARATOR
         transcript = separator.join(segments)
         if len(transcript) <= max_chars:
             return transcript
@@ -614,10 +700,21 @@ class TranscriptExtractor:
 
         return self._clip_text(transcript, max_chars=max_chars)
 
-    def _message_signal_score(self, message: RawMessage) -> int:
+    @staticmethod
+    def _looks_like_noise(content: str) -> bool:
+        lines = [line.strip() for line in content.splitlines() if line.strip()]
+        if len(lines) < 3:
+            return False
+        noisy = sum(1 for line in lines if _NOISE_LINE_RE.match(line))
+        return noisy / len(lines) >= 0.8
+
+    def _message_signal_score(self, message: RawMessage, *, drop_noise: bool = False) -> int:
         content = self._normalize_message_content(message.content, max_chars=2_000)
         if not content:
             return 0
+        has_failed_tool = any(not tool_call.success for tool_call in message.tool_calls)
+        if drop_noise and not has_failed_tool and self._looks_like_noise(content):
+            return 0
 
         lowered = content.lower()
         score = 1 if message.role == "assistant" else 0
@@ -630,6 +727,85 @@ class TranscriptExtractor:
             score += 1
         return score
 
+    def _batch_signal_score(self, messages: list[RawMessage]) -> int:
+        """Score a batch, counting repeated messages (e.g. re-emitted tool output) once."""
+        seen: set[str] = set()
+        score = 0
+        for message in messages:
+            key = self._normalize_whitespace(message.content).lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            score += self._message_signal_score(message, drop_noise=True)
+        return score
+
+    def _batch_chars(self, messages: list[RawMessage]) -> int:
+        formatted = [text for text in map(self._format_message, messages) if text]
+        return sum(map(len, formatted)) + len(TRANSCRIPT_SEPARATOR) * max(0, len(formatted) - 1)
+
+    def _filter_low_signal_batches(
+        self,
+        batches: list[list[RawMessage]],
+        *,
+        max_chars: int,
+    ) -> tuple[list[list[RawMessage]], dict[str, int]]:
+        """Drop or merge batches whose signal score is below the configured threshold.
+
+        In ``merge`` mode consecutive low-signal batches that still carry some signal
+        are pooled. The pool is sent once it reaches the threshold, before it would
+        outgrow the ``max_chars`` transcript budget, or ahead of the next kept batch so
+        segments stay in session order. A pool left over at the end is sent too, so
+        merged learnings are never dropped. Batches scoring zero are always dropped.
+        """
+        threshold = self.signal_filter_min_score
+        separator_chars = len(TRANSCRIPT_SEPARATOR)
+        kept: list[list[RawMessage]] = []
+        pending: list[RawMessage] = []
+        pending_score = 0
+        pending_chars = 0
+        low_signal = 0
+        merged = 0
+
+        for batch in batches:
+            score = self._batch_signal_score(batch)
+            if score >= threshold:
+                if pending:
+                    kept.append(pending)
+                    pending = []
+                    pending_score = 0
+                    pending_chars = 0
+                kept.append(batch)
+                continue
+            low_signal += 1
+            if self.signal_filter_action != "merge" or score == 0:
+                continue
+            batch_chars = self._batch_chars(batch)
+            if pending and pending_chars + separator_chars + batch_chars > max_chars:
+                kept.append(pending)
+                pending = []
+                pending_score = 0
+                pending_chars = 0
+            pending_chars += batch_chars + (separator_chars if pending else 0)
+            pending.extend(batch)
+            pending_score += score
+            merged += 1
+            if pending_score >= threshold:
+                kept.append(pending)
+                pending = []
+                pending_score = 0
+                pending_chars = 0
+
+        if pending:
+            kept.append(pending)
+
+        return kept, {
+            "batches_total": len(batches),
+            "batches_sent": len(kept),
+            "batches_low_signal": low_signal,
+            "batches_merged": merged,
+            "llm_calls_skipped": len(batches) - len(kept),
+        }
+
     def _select_recovery_messages(
         self,
         session: RawSession,
@@ -791,9 +967,25 @@ class TranscriptExtractor:
         if len(session.messages) < 2:
             return []
 
-        batches = self._chunk_messages(session.messages, self.messages_per_batch)
+        batches, transcript_max_chars = self._plan_batches(session)
         if not batches:
             return []
+        if self.signal_filter_enabled:
+            batches, filter_stats = self._filter_low_signal_batches(
+                batches, max_chars=transcript_max_chars
+            )
+            self._emit_progress(
+                progress_callback,
+                {
+                    "event": "extraction_signal_filter",
+                    "source": session.source,
+                    "session_id": session.session_id,
+                    "messages_total": len(session.messages),
+                    **filter_stats,
+                },
+            )
+            if not batches:
+                return []
 
         total_messages = len(session.messages)
         duration = self._build_duration(session)
@@ -804,7 +996,7 @@ class TranscriptExtractor:
             messages_processed += len(batch_messages)
             batch_session = session.model_copy(update={"messages": batch_messages})
 
-            transcript = self._format_transcript(batch_session)
+            transcript = self._format_transcript(batch_session, max_chars=transcript_max_chars)
             if len(transcript) < 200:
                 continue
 
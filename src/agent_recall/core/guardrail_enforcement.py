@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import json
 import re
+from collections import deque
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from hashlib import sha256
 from pathlib import Path
 from typing import Any, Literal
 
+from agent_recall.storage.files import atomic_write_text, read_cached_file
+
 GuardrailSeverity = Literal["warn", "block"]
 _RULE_LINE_RE = re.compile(r"^\s*-\s*(?:\[(?P<tag>[A-Z_]+)\])?\s*(?P<body>.+)\s*$")
 _BACKTICK_RE = re.compile(r"`([^`]+)`")
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
 
 
 @dataclass(frozen=True)
@@ -86,6 +91,11 @@ class GuardrailSuppression:
 
 
 def parse_guardrail_rules(guardrails_text: str) -> list[GuardrailRule]:
+    return list(_parse_guardrail_rules_cached(guardrails_text))
+
+
+@lru_cache(maxsize=8)
+def _parse_guardrail_rules_cached(guardrails_text: str) -> tuple[GuardrailRule, ...]:
     rules: list[GuardrailRule] = []
     seen_ids: set[str] = set()
 
@@ -117,7 +127,96 @@ def parse_guardrail_rules(guardrails_text: str) -> list[GuardrailRule]:
                 )
             )
 
-    return rules
+    return tuple(rules)
+
+
+class GuardrailMatcher:
+    """All rule patterns compiled for a single pass over the evaluated text.
+
+    Literal rules (the common case: backtick or plain-text guardrails) are loaded into an
+    Aho-Corasick automaton over case-folded text, so one scan finds every literal that
+    occurs. Each hit, and every regex rule, is then confirmed with the rule's own
+    precompiled pattern, which keeps results identical to per-rule ``re.search``.
+    """
+
+    def __init__(self, patterns: tuple[str, ...]) -> None:
+        self._compiled: dict[int, re.Pattern[str]] = {}
+        self._regex_indexes: list[int] = []
+        self._literal_indexes: list[int] = []
+        literals: list[tuple[str, int]] = []
+        for index, pattern in enumerate(patterns):
+            try:
+                self._compiled[index] = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                continue
+            literal = _ESCAPE_RE.sub(r"\1", pattern)
+            if literal and re.escape(literal) == pattern:
+                literals.append((literal.casefold(), index))
+                self._literal_indexes.append(index)
+            else:
+                self._regex_indexes.append(index)
+        self._build_automaton(literals)
+
+    def _build_automaton(self, literals: list[tuple[str, int]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for literal, index in literals:
+            state = 0
+            for char in literal:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    goto.append({})
+                    outputs.append([])
+                    next_state = len(goto) - 1
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state].append(index)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                candidate = goto[fallback].get(char, 0)
+                fail[next_state] = candidate if candidate != next_state else 0
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def _literal_candidates(self, text: str) -> set[int]:
+        if not text.isascii():
+            # Case folding of non-ASCII text is not always 1:1 with re.IGNORECASE.
+            return set(self._literal_indexes)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        found: set[int] = set()
+        for char in text.casefold():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def match(self, text: str) -> dict[int, str]:
+        """Return ``{rule index: matched text}`` for every pattern found in ``text``."""
+        matches: dict[int, str] = {}
+        for index in (*self._literal_candidates(text), *self._regex_indexes):
+            match = self._compiled[index].search(text)
+            if match:
+                matches[index] = match.group(0)
+        return matches
+
+
+@lru_cache(maxsize=8)
+def _guardrail_matcher(patterns: tuple[str, ...]) -> GuardrailMatcher:
+    return GuardrailMatcher(patterns)
 
 
 def evaluate_guardrail_text(
@@ -130,14 +229,13 @@ def evaluate_guardrail_text(
     if not text.strip():
         return violations
 
-    for rule in rules:
-        if suppression_store and suppression_store.is_suppressed(rule.rule_id):
-            continue
-        try:
-            match = re.search(rule.pattern, text, re.IGNORECASE)
-        except re.error:
-            continue
-        if not match:
+    matches = _guardrail_matcher(tuple(rule.pattern for rule in rules)).match(text)
+    if not matches:
+        return violations
+    suppressed = suppression_store.suppressed_rule_ids() if suppression_store else frozenset()
+    for index in sorted(matches):
+        rule = rules[index]
+        if rule.rule_id in suppressed:
             continue
         violations.append(
             GuardrailViolation(
@@ -145,7 +243,7 @@ def evaluate_guardrail_text(
                 severity=rule.severity,
                 pattern=rule.pattern,
                 description=rule.description,
-                matched_text=match.group(0),
+                matched_text=matches[index],
             )
         )
 
@@ -166,38 +264,52 @@ def is_guardrail_enforcement_enabled(config: dict[str, Any] | None) -> bool:
     return False
 
 
+def _parse_suppressions(text: str) -> dict[str, tuple[GuardrailSuppression, ...]]:
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    items = payload.get("suppressions") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return {}
+    by_rule: dict[str, list[GuardrailSuppression]] = {}
+    for item in items:
+        suppression = GuardrailSuppression.from_dict(item)
+        if suppression is None:
+            continue
+        by_rule.setdefault(suppression.rule_id, []).append(suppression)
+    return {rule_id: tuple(items) for rule_id, items in by_rule.items()}
+
+
 class GuardrailSuppressionStore:
+    """Suppression overrides, loaded once and re-read only when the file changes."""
+
     def __init__(self, path: Path) -> None:
         self.path = path
 
-    def list_suppressions(self) -> list[GuardrailSuppression]:
-        if not self.path.exists():
-            return []
+    def _by_rule(self) -> dict[str, tuple[GuardrailSuppression, ...]]:
         try:
-            payload = json.loads(self.path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            return []
-        items = payload.get("suppressions") if isinstance(payload, dict) else None
-        if not isinstance(items, list):
-            return []
-        suppressions: list[GuardrailSuppression] = []
-        for item in items:
-            suppression = GuardrailSuppression.from_dict(item)
-            if suppression is None:
-                continue
-            suppressions.append(suppression)
-        return suppressions
+            by_rule = read_cached_file(self.path, _parse_suppressions)
+        except OSError:
+            return {}
+        return by_rule or {}
+
+    def list_suppressions(self) -> list[GuardrailSuppression]:
+        return [item for items in self._by_rule().values() for item in items]
+
+    def suppressed_rule_ids(self, *, now: datetime | None = None) -> frozenset[str]:
+        """Return the ids of every rule with an active suppression."""
+        return frozenset(
+            rule_id
+            for rule_id, items in self._by_rule().items()
+            if any(item.is_active(now=now) for item in items)
+        )
 
     def is_suppressed(self, rule_id: str, *, now: datetime | None = None) -> bool:
         target = str(rule_id).strip()
         if not target:
             return False
-        for suppression in self.list_suppressions():
-            if suppression.rule_id != target:
-                continue
-            if suppression.is_active(now=now):
-                return True
-        return False
+        return any(item.is_active(now=now) for item in self._by_rule().get(target, ()))
 
     def add(
         self,
@@ -227,9 +339,10 @@ class GuardrailSuppressionStore:
         by_rule[normalized_rule_id] = suppression
         updated = [item.to_dict() for item in by_rule.values()]
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(
+        atomic_write_text(
+            self.path,
             json.dumps({"suppressions": updated}, indent=2),
-            encoding="utf-8",
+            parse=_parse_suppressions,
         )
         return suppression
 
@@ -0,0 +1,265 @@
+"""MinHash signatures and an LSH banding index for near-duplicate tier lines.
+
+Lines are tokenized with :func:`tier_notes.semantic_token_set`. LSH narrows each lookup
+to a handful of candidate lines, and only those candidates go through the exact token
+Jaccard check, so a lookup no longer scans every line already in the tier.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from agent_recall.core.tier_notes import (
+    jaccard_similarity,
+    normalize_tier_content,
+    semantic_token_set,
+)
+
+NEAR_DUPLICATE_THRESHOLD = 0.85
+TIER_LINE_INDEX_FILENAME = "tier_line_index.json"
+
+# 16 bands of 4 rows: a pair at Jaccard 0.85 becomes a candidate with probability
+# 1 - (1 - 0.85**4) ** 16 > 0.99999, so the exact check sees effectively every true match.
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+_ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_INDEX_VERSION = 1
+
+_permutation_rng = random.Random(0x5EED1D5)
+_PERMUTATIONS = tuple(
+    (_permutation_rng.randrange(1, _MERSENNE_PRIME), _permutation_rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash_signature(tokens: Iterable[str]) -> tuple[int, ...]:
+    """Return a stable (process-independent) MinHash signature for a token set."""
+    hashes = [_token_hash(token) for token in set(tokens)]
+    if not hashes:
+        return ()
+    return tuple(
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def line_key(line: str) -> str:
+    """Whitespace- and case-insensitive identity for a tier line."""
+    return hashlib.sha256(normalize_tier_content(line).encode()).hexdigest()[:16]
+
+
+class MinHashLSHIndex:
+    """Banded LSH buckets over MinHash signatures, keyed by caller-supplied ids."""
+
+    def __init__(self) -> None:
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._signatures
+
+    @staticmethod
+    def _bands(signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+        return [
+            (band, signature[band * _ROWS_PER_BAND : (band + 1) * _ROWS_PER_BAND])
+            for band in range(LSH_BANDS)
+        ]
+
+    def add(self, key: str, signature: tuple[int, ...]) -> None:
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        if not signature:
+            return
+        for bucket in self._bands(signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        signature = self._signatures.pop(key, None)
+        if not signature:
+            return
+        for bucket in self._bands(signature):
+            members = self._buckets.get(bucket)
+            if members is None:
+                continue
+            members.discard(key)
+            if not members:
+                del self._buckets[bucket]
+
+    def signature(self, key: str) -> tuple[int, ...] | None:
+        return self._signatures.get(key)
+
+    def candidates(self, signature: tuple[int, ...]) -> set[str]:
+        if not signature:
+            return set()
+        found: set[str] = set()
+        for bucket in self._bands(signature):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+
+class NearDuplicateLineIndex:
+    """Tier lines indexed for near-duplicate lookups.
+
+    ``find_near_duplicate`` returns an existing line whose token Jaccard similarity with
+    the query is at least ``threshold``; it matches a full pairwise scan while only
+    checking LSH candidates. ``dirty`` is set when the index holds signatures the
+    persisted cache does not, so callers can skip saving an unchanged index.
+    """
+
+    def __init__(self, *, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._lsh = MinHashLSHIndex()
+        self._lines: dict[str, str] = {}
+        self._tokens: dict[str, set[str]] = {}
+        self._counts: dict[str, int] = {}
+        self.signatures_computed = 0
+        self.dirty = False
+
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Iterable[str],
+        *,
+        cached_signatures: dict[str, list[int]] | None = None,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    ) -> NearDuplicateLineIndex:
+        index = cls(threshold=threshold)
+        cache = cached_signatures or {}
+        for line in lines:
+            if not line.strip():
+                continue
+            cached = cache.get(line_key(line))
+            index.add(line, signature=tuple(cached) if cached is not None else None)
+        index.dirty = index.signatures_computed > 0
+        return index
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def contains(self, line: str) -> bool:
+        return line_key(line) in self._lines
+
+    def add(self, line: str, *, signature: tuple[int, ...] | None = None) -> None:
+        key = line_key(line)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        if key in self._lines:
+            return
+        tokens = semantic_token_set(line)
+        if signature is None:
+            signature = minhash_signature(tokens)
+            self.signatures_computed += 1
+        self._lines[key] = line
+        self._tokens[key] = tokens
+        self._lsh.add(key, signature)
+        self.dirty = True
+
+    def remove(self, line: str) -> None:
+        key = line_key(line)
+        remaining = self._counts.get(key, 0) - 1
+        if remaining > 0:
+            self._counts[key] = remaining
+            return
+        self._counts.pop(key, None)
+        if self._lines.pop(key, None) is None:
+            return
+        self._tokens.pop(key, None)
+        self._lsh.remove(key)
+        self.dirty = True
+
+    def find_near_duplicate(self, line: str) -> str | None:
+        tokens = semantic_token_set(line)
+        if not tokens:
+            return None
+        for key in self._lsh.candidates(minhash_signature(tokens)):
+            if jaccard_similarity(tokens, self._tokens[key]) >= self.threshold:
+                return self._lines[key]
+        return None
+
+    def export_signatures(self) -> dict[str, list[int]]:
+        exported: dict[str, list[int]] = {}
+        for key in self._lines:
+            signature = self._lsh.signature(key)
+            if signature:
+                exported[key] = list(signature)
+        return exported
+
+
+def load_tier_line_index(
+    path: Path,
+    scope: str,
+    lines: Iterable[str],
+    *,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> NearDuplicateLineIndex:
+    """Build the index for ``lines``, reusing signatures persisted at ``path`` for ``scope``.
+
+    The persisted file is only a signature cache: lines no longer present are ignored
+    and new lines are hashed on demand, so a stale or missing file is always safe.
+    """
+    return NearDuplicateLineIndex.from_lines(
+        lines,
+        cached_signatures=_read_scope_signatures(path, scope),
+        threshold=threshold,
+    )
+
+
+def save_tier_line_index(path: Path, scope: str, index: NearDuplicateLineIndex) -> None:
+    payload = _read_index_file(path)
+    scopes = payload.setdefault("scopes", {})
+    scopes[scope] = index.export_signatures()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload, separators=(",", ":"), sort_keys=True))
+    os.replace(temp_path, path)
+    index.dirty = False
+
+
+def _read_index_file(path: Path) -> dict[str, Any]:
+    fresh: dict[str, Any] = {
+        "version": _INDEX_VERSION,
+        "num_permutations": NUM_PERMUTATIONS,
+        "bands": LSH_BANDS,
+        "scopes": {},
+    }
+    if not path.exists():
+        return fresh
+    try:
+        loaded = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return fresh
+    if (
+        not isinstance(loaded, dict)
+        or loaded.get("version") != _INDEX_VERSION
+        or loaded.get("num_permutations") != NUM_PERMUTATIONS
+        or loaded.get("bands") != LSH_BANDS
+        or not isinstance(loaded.get("scopes"), dict)
+    ):
+        return fresh
+    return loaded
+
+
+def _read_scope_signatures(path: Path, scope: str) -> dict[str, list[int]]:
+    raw = _read_index_file(path)["scopes"].get(scope)
+    if not isinstance(raw, dict):
+        return {}
+    return {
+        str(key): value
+        for key, value in raw.items()
+        if isinstance(value, list) and len(value) == NUM_PERMUTATIONS
+    }
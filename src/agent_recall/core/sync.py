@@ -9,6 +9,8 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Literal
 
+from pydantic import ValidationError
+
 from agent_recall.core.compact import CompactionEngine
 from agent_recall.core.embedding_indexer import EmbeddingIndexer
 from agent_recall.core.extract import TranscriptExtractor
@@ -19,16 +21,19 @@ from agent_recall.ingest import SessionIngester, get_default_ingesters
 from agent_recall.ingest.base import RawSession
 from agent_recall.ingest.sources import normalize_source_name
 from agent_recall.llm.base import LLMProvider, LLMRateLimitError
+from agent_recall.llm.rate_limit import rate_limit_stats
 from agent_recall.memory.migration import VectorMigrationRequest
 from agent_recall.memory.provisioning import VectorMemoryService
 from agent_recall.storage.base import Storage
 from agent_recall.storage.files import TIER_FILES, FileStorage, KnowledgeTier
 from agent_recall.storage.models import (
     CurationStatus,
+    ExtractionConfig,
     PipelineEventAction,
     PipelineStage,
     SessionCheckpoint,
 )
+from agent_recall.storage.remote import AsyncRemoteStorage, RemoteStorage
 
 
 @dataclass(frozen=True)
@@ -73,6 +78,7 @@ class SessionExtractStage:
     batch_events: list[dict[str, Any]]
     error: str | None
     duration_ms: float
+    llm_calls_skipped: int = 0
 
 
 @dataclass(frozen=True)
@@ -118,14 +124,26 @@ class AutoSync:
         extracted_entry_curation_status = (
             CurationStatus.PENDING if curation_mode else CurationStatus.APPROVED
         )
+        extraction_cfg = self._resolve_extraction_config(config)
         self.extractor = (
             TranscriptExtractor(
                 llm,
+                messages_per_batch=extraction_cfg.messages_per_batch,
                 extracted_entry_curation_status=extracted_entry_curation_status,
+                batch_strategy=extraction_cfg.batch_strategy,
+                prompt_token_budget=extraction_cfg.per_model_prompt_token_budget.get(
+                    llm.model_name,
+                    extraction_cfg.prompt_token_budget,
+                ),
+                signal_filter_enabled=extraction_cfg.signal_filter_enabled,
+                signal_filter_min_score=extraction_cfg.signal_filter_min_score,
+                signal_filter_action=extraction_cfg.signal_filter_action,
             )
             if llm
             else None
         )
+        # Shared HTTP storage is awaited from ``sync`` so remote calls never block the loop.
+        self._async_storage = storage.as_async() if isinstance(storage, RemoteStorage) else None
         self.ingesters = ingesters or get_default_ingesters(project_path)
         self.progress_callback = progress_callback
         self.extract_timeout_seconds = 45
@@ -133,6 +151,7 @@ class AutoSync:
         self.extract_retry_backoff_seconds = 2.0
         self.extract_retry_max_backoff_seconds = 45.0
         self.extract_rate_limit_min_messages_per_batch = 20
+        self.extract_rate_limit_min_prompt_token_budget = 1500
         self.zero_learning_warning_min_messages = 50
 
     async def sync(
@@ -144,6 +163,31 @@ class AutoSync:
         reset_checkpoints: bool = False,
         reset_full: bool = False,
         telemetry_run_id: str | None = None,
+    ) -> dict[str, Any]:
+        try:
+            return await self._sync(
+                since=since,
+                sources=sources,
+                session_ids=session_ids,
+                max_sessions=max_sessions,
+                reset_checkpoints=reset_checkpoints,
+                reset_full=reset_full,
+                telemetry_run_id=telemetry_run_id,
+            )
+        finally:
+            if self._async_storage is not None:
+                await self._async_storage.aclose()
+
+    async def _sync(
+        self,
+        *,
+        since: datetime | None,
+        sources: list[str] | None,
+        session_ids: list[str] | None,
+        max_sessions: int | None,
+        reset_checkpoints: bool,
+        reset_full: bool,
+        telemetry_run_id: str | None,
     ) -> dict[str, Any]:
         if self.extractor is None:
             msg = "LLM provider is required for sync"
@@ -176,7 +220,7 @@ class AutoSync:
 
         for candidate in filter_stage.candidates:
             source_results = results["by_source"][candidate.source_name]
-            filter_result = self._run_session_filter_stage(
+            filter_result = await self._run_session_filter_stage_async(
                 candidate,
                 reset_checkpoints=reset_checkpoints,
             )
@@ -196,7 +240,7 @@ class AutoSync:
                 if raw_session is None or content_hash is None:
                     msg = "Empty-session stage requires parsed session and content hash."
                     raise RuntimeError(msg)
-                self._persist_empty_session(
+                await self._persist_empty_session_async(
                     candidate.session_id,
                     raw_session=raw_session,
                     content_hash=content_hash,
@@ -245,7 +289,7 @@ class AutoSync:
                 continue
 
             try:
-                persist_stage = self._run_persist_stage(
+                persist_stage = await self._run_persist_stage_async(
                     candidate,
                     raw_session=raw_session,
                     content_hash=content_hash,
@@ -282,6 +326,7 @@ class AutoSync:
                 extract_stage=extract_stage,
             )
 
+        telemetry.flush()
         return results
 
     @staticmethod
@@ -295,6 +340,7 @@ class AutoSync:
             "empty_sessions": 0,
             "learnings_extracted": 0,
             "llm_requests": 0,
+            "llm_calls_skipped": 0,
             "by_source": {},
             "session_diagnostics": [],
             "errors": [],
@@ -375,9 +421,41 @@ class AutoSync:
         *,
         reset_checkpoints: bool,
     ) -> SessionFilterStage:
-        checkpoint = self.storage.get_session_checkpoint(candidate.session_id)
-        is_fully_processed = self.storage.is_session_processed(candidate.session_id)
+        return self._filter_session(
+            candidate,
+            checkpoint=self.storage.get_session_checkpoint(candidate.session_id),
+            is_fully_processed=self.storage.is_session_processed(candidate.session_id),
+            reset_checkpoints=reset_checkpoints,
+        )
 
+    async def _run_session_filter_stage_async(
+        self,
+        candidate: _SessionCandidate,
+        *,
+        reset_checkpoints: bool,
+    ) -> SessionFilterStage:
+        async_storage = self._async_storage
+        if async_storage is None:
+            return self._run_session_filter_stage(candidate, reset_checkpoints=reset_checkpoints)
+        checkpoint, is_fully_processed = await asyncio.gather(
+            async_storage.get_session_checkpoint(candidate.session_id),
+            async_storage.is_session_processed(candidate.session_id),
+        )
+        return self._filter_session(
+            candidate,
+            checkpoint=checkpoint,
+            is_fully_processed=is_fully_processed,
+            reset_checkpoints=reset_checkpoints,
+        )
+
+    def _filter_session(
+        self,
+        candidate: _SessionCandidate,
+        *,
+        checkpoint: SessionCheckpoint | None,
+        is_fully_processed: bool,
+        reset_checkpoints: bool,
+    ) -> SessionFilterStage:
         if is_fully_processed and checkpoint is None and not reset_checkpoints:
             return SessionFilterStage(
                 status="skip_already_processed",
@@ -459,6 +537,45 @@ class AutoSync:
         if not is_fully_processed:
             self.storage.mark_session_processed(session_id)
 
+    async def _persist_empty_session_async(
+        self,
+        session_id: str,
+        *,
+        raw_session: RawSession,
+        content_hash: str,
+        is_fully_processed: bool,
+    ) -> None:
+        async_storage = self._async_storage
+        if async_storage is None:
+            self._persist_empty_session(
+                session_id,
+                raw_session=raw_session,
+                content_hash=content_hash,
+                is_fully_processed=is_fully_processed,
+            )
+            return
+        await self._save_progress_async(
+            async_storage,
+            session_id,
+            checkpoint=self._build_checkpoint(session_id, raw_session, content_hash),
+            mark_processed=not is_fully_processed,
+        )
+
+    @staticmethod
+    async def _save_progress_async(
+        async_storage: AsyncRemoteStorage,
+        session_id: str,
+        *,
+        checkpoint: SessionCheckpoint | None,
+        mark_processed: bool,
+    ) -> None:
+        # Same order as the synchronous path: a session is never marked processed
+        # without the checkpoint that records how far it was read.
+        if checkpoint is not None:
+            await async_storage.save_session_checkpoint(checkpoint)
+        if mark_processed:
+            await async_storage.mark_session_processed(session_id)
+
     async def _run_extract_stage(
         self,
         candidate: _SessionCandidate,
@@ -473,11 +590,14 @@ class AutoSync:
             raise RuntimeError(msg)
 
         batch_events: list[dict[str, Any]] = []
+        filter_events: list[dict[str, Any]] = []
         entries: list[Any] = []
         extraction_error: str | None = None
         extraction_started = time.perf_counter()
+        rate_limit_before = rate_limit_stats(self.llm)
         message_count = len(raw_session.messages)
         initial_messages_per_batch = extractor.messages_per_batch
+        initial_prompt_token_budget = extractor.prompt_token_budget
         current_attempt = 0
         self._emit_progress(
             {
@@ -485,7 +605,7 @@ class AutoSync:
                 "source": candidate.source_name,
                 "session_id": candidate.session_id,
                 "messages_total": message_count,
-                "messages_per_batch": initial_messages_per_batch,
+                **self._extract_batch_size_payload(extractor),
             }
         )
 
@@ -500,6 +620,8 @@ class AutoSync:
                 "extraction_recovery_complete",
             }:
                 batch_events.append(event_payload)
+            elif event_payload.get("event") == "extraction_signal_filter":
+                filter_events.append(event_payload)
             self._emit_progress(event_payload)
 
         try:
@@ -507,6 +629,7 @@ class AutoSync:
                 current_attempt = attempt
                 try:
                     batch_events.clear()
+                    filter_events.clear()
                     entries = await asyncio.wait_for(
                         extractor.extract(
                             raw_session,
@@ -537,7 +660,7 @@ class AutoSync:
                                 "next_attempt": attempt + 1,
                                 "max_attempts": self.extract_retry_attempts,
                                 "delay_seconds": delay,
-                                "messages_per_batch": extractor.messages_per_batch,
+                                **self._extract_batch_size_payload(extractor),
                             }
                         )
                         await asyncio.sleep(delay)
@@ -545,6 +668,11 @@ class AutoSync:
                     adjusted = self._maybe_reduce_extract_batch_size(extractor)
                     if adjusted is not None:
                         old_size, new_size = adjusted
+                        size_key = (
+                            "prompt_token_budget"
+                            if extractor.batch_strategy == "token_budget"
+                            else "messages_per_batch"
+                        )
                         self._emit_progress(
                             {
                                 "event": "extraction_batch_size_adjusted",
@@ -552,8 +680,8 @@ class AutoSync:
                                 "session_id": candidate.session_id,
                                 "attempt": attempt,
                                 "max_attempts": self.extract_retry_attempts,
-                                "old_messages_per_batch": old_size,
-                                "new_messages_per_batch": new_size,
+                                f"old_{size_key}": old_size,
+                                f"new_{size_key}": new_size,
                             }
                         )
 
@@ -584,7 +712,7 @@ class AutoSync:
                                 "max_attempts": self.extract_retry_attempts,
                                 "delay_seconds": delay,
                                 "retry_after_seconds": retry_after,
-                                "messages_per_batch": extractor.messages_per_batch,
+                                **self._extract_batch_size_payload(extractor),
                             }
                         )
                         await asyncio.sleep(delay)
@@ -596,8 +724,10 @@ class AutoSync:
                     break
         finally:
             extractor.messages_per_batch = initial_messages_per_batch
+            extractor.prompt_token_budget = initial_prompt_token_budget
 
         extraction_duration_ms = (time.perf_counter() - extraction_started) * 1000.0
+        rate_limit_metadata = self._rate_limit_metadata(rate_limit_before)
         if extraction_error:
             telemetry.record_event(
                 run_id=run_id,
@@ -609,6 +739,7 @@ class AutoSync:
                     "source": candidate.source_name,
                     "session_id": candidate.session_id,
                     "error": extraction_error,
+                    **rate_limit_metadata,
                 },
             )
             return SessionExtractStage(
@@ -619,6 +750,7 @@ class AutoSync:
                 duration_ms=extraction_duration_ms,
             )
 
+        llm_calls_skipped = sum(int(event.get("llm_calls_skipped", 0)) for event in filter_events)
         telemetry.record_event(
             run_id=run_id,
             stage=PipelineStage.EXTRACT,
@@ -630,6 +762,8 @@ class AutoSync:
                 "session_id": candidate.session_id,
                 "entries_extracted": len(entries),
                 "llm_batches": len(batch_events),
+                "llm_calls_skipped": llm_calls_skipped,
+                **rate_limit_metadata,
             },
         )
         return SessionExtractStage(
@@ -638,6 +772,7 @@ class AutoSync:
             batch_events=batch_events,
             error=None,
             duration_ms=extraction_duration_ms,
+            llm_calls_skipped=llm_calls_skipped,
         )
 
     def _run_persist_stage(
@@ -650,8 +785,8 @@ class AutoSync:
         entries: list[Any],
     ) -> SessionPersistStage:
         started = time.perf_counter()
-        for entry in entries:
-            self.storage.append_entry(entry)
+        if entries:
+            self.storage.append_entries(list(entries))
         self._update_checkpoint(candidate.session_id, raw_session, content_hash)
         if not is_fully_processed:
             self.storage.mark_session_processed(candidate.session_id)
@@ -660,6 +795,39 @@ class AutoSync:
             duration_ms=(time.perf_counter() - started) * 1000.0,
         )
 
+    async def _run_persist_stage_async(
+        self,
+        candidate: _SessionCandidate,
+        *,
+        raw_session: RawSession,
+        content_hash: str,
+        is_fully_processed: bool,
+        entries: list[Any],
+    ) -> SessionPersistStage:
+        async_storage = self._async_storage
+        if async_storage is None:
+            return self._run_persist_stage(
+                candidate,
+                raw_session=raw_session,
+                content_hash=content_hash,
+                is_fully_processed=is_fully_processed,
+                entries=entries,
+            )
+        started = time.perf_counter()
+        # Entries land before the checkpoint moves, so a failed write is retried next sync.
+        if entries:
+            await async_storage.append_entries(list(entries))
+        await self._save_progress_async(
+            async_storage,
+            candidate.session_id,
+            checkpoint=self._build_checkpoint(candidate.session_id, raw_session, content_hash),
+            mark_processed=not is_fully_processed,
+        )
+        return SessionPersistStage(
+            entries_written=len(entries),
+            duration_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
     @staticmethod
     def _report_skip_already_processed(
         *,
@@ -780,6 +948,7 @@ class AutoSync:
             results["sessions_incremental"] += 1
         results["learnings_extracted"] += len(extract_stage.entries)
         results["llm_requests"] += len(extract_stage.batch_events)
+        results["llm_calls_skipped"] += extract_stage.llm_calls_skipped
 
         message_count = int(filter_stage.message_count or 0)
         diagnostic: dict[str, Any] = {
@@ -793,6 +962,8 @@ class AutoSync:
         }
         if extract_stage.batch_events:
             diagnostic["llm_batches"] = len(extract_stage.batch_events)
+        if extract_stage.llm_calls_skipped:
+            diagnostic["llm_calls_skipped"] = extract_stage.llm_calls_skipped
         if message_count >= self.zero_learning_warning_min_messages and not extract_stage.entries:
             warning = (
                 f"{candidate.source_name}:{candidate.session_id} has "
@@ -927,6 +1098,7 @@ class AutoSync:
                     msg = "LLM provider is required for compaction"
                     raise RuntimeError(msg)
                 self._configure_semantic_embedder()
+                rate_limit_before = rate_limit_stats(self.llm)
                 compact_engine = CompactionEngine(self.storage, self.files, self.llm)
                 try:
                     sync_results["compaction"] = await compact_engine.compact(force=force_compact)
@@ -953,9 +1125,11 @@ class AutoSync:
                         ),
                         "style_updated": bool(sync_results["compaction"].get("style_updated")),
                         "recent_updated": bool(sync_results["compaction"].get("recent_updated")),
+                        **self._rate_limit_metadata(rate_limit_before),
                     },
                 )
 
+        phase_telemetry.flush()
         return sync_results
 
     def index_chunk_embeddings(
@@ -1419,6 +1593,20 @@ class AutoSync:
         except Exception:  # noqa: BLE001
             return
 
+    def _rate_limit_metadata(self, before: dict[str, Any] | None) -> dict[str, Any]:
+        after = rate_limit_stats(self.llm)
+        if before is None or after is None:
+            return {}
+        return {
+            "rate_limit_waits": int(after["waits_total"]) - int(before["waits_total"]),
+            "rate_limit_wait_ms": round(
+                float(after["wait_ms_total"]) - float(before["wait_ms_total"]),
+                2,
+            ),
+            "rate_limit_retry_after": int(after["retry_after_total"])
+            - int(before["retry_after_total"]),
+        }
+
     def _compute_extract_retry_delay_seconds(
         self,
         *,
@@ -1434,20 +1622,43 @@ class AutoSync:
             delay = min(delay, max_backoff)
         return delay
 
+    @staticmethod
+    def _extract_batch_size_payload(extractor: TranscriptExtractor) -> dict[str, Any]:
+        if extractor.batch_strategy == "token_budget":
+            return {"prompt_token_budget": extractor.prompt_token_budget}
+        return {"messages_per_batch": extractor.messages_per_batch}
+
     def _maybe_reduce_extract_batch_size(
         self,
         extractor: TranscriptExtractor,
     ) -> tuple[int, int] | None:
-        current_size = max(1, int(extractor.messages_per_batch))
-        min_size = max(1, int(self.extract_rate_limit_min_messages_per_batch))
+        if extractor.batch_strategy == "token_budget":
+            current_size = max(1, int(extractor.prompt_token_budget))
+            min_size = max(1, int(self.extract_rate_limit_min_prompt_token_budget))
+        else:
+            current_size = max(1, int(extractor.messages_per_batch))
+            min_size = max(1, int(self.extract_rate_limit_min_messages_per_batch))
         if current_size <= min_size:
             return None
         next_size = max(min_size, current_size // 2)
         if next_size >= current_size:
             return None
-        extractor.messages_per_batch = next_size
+        if extractor.batch_strategy == "token_budget":
+            extractor.prompt_token_budget = next_size
+        else:
+            extractor.messages_per_batch = next_size
         return current_size, next_size
 
+    @staticmethod
+    def _resolve_extraction_config(config: Any) -> ExtractionConfig:
+        extraction_cfg = config.get("extraction") if isinstance(config, dict) else None
+        if not isinstance(extraction_cfg, dict):
+            return ExtractionConfig()
+        try:
+            return ExtractionConfig.model_validate(extraction_cfg)
+        except ValidationError:
+            return ExtractionConfig()
+
     def _compute_session_hash(self, raw_session: RawSession) -> str:
         """Compute a hash of session content for change detection."""
         content_parts = []
@@ -1497,17 +1708,23 @@ class AutoSync:
         content_hash: str,
     ) -> None:
         """Update checkpoint after processing a session."""
+        checkpoint = self._build_checkpoint(session_id, raw_session, content_hash)
+        if checkpoint is not None:
+            self.storage.save_session_checkpoint(checkpoint)
+
+    @staticmethod
+    def _build_checkpoint(
+        session_id: str,
+        raw_session: RawSession,
+        content_hash: str,
+    ) -> SessionCheckpoint | None:
         if not raw_session.messages:
-            return
+            return None
 
         last_message = raw_session.messages[-1]
-        last_index = len(raw_session.messages) - 1
-        last_timestamp = last_message.timestamp
-
-        checkpoint = SessionCheckpoint(
+        return SessionCheckpoint(
             source_session_id=session_id,
-            last_message_index=last_index,
-            last_message_timestamp=last_timestamp,
+            last_message_index=len(raw_session.messages) - 1,
+            last_message_timestamp=last_message.timestamp,
             content_hash=content_hash,
         )
-        self.storage.save_session_checkpoint(checkpoint)
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import atexit
+import fcntl
 import json
+import os
+import threading
+import time
 from collections import defaultdict
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
+from agent_recall.core.telemetry_store import TELEMETRY_DB_FILENAME, TelemetryEventStore
 from agent_recall.storage.models import PipelineEvent, PipelineEventAction, PipelineStage
 
 _DEFAULT_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 5000)
+_DEFAULT_FLUSH_MAX_EVENTS = 100
+_DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+_DEFAULT_JSONL_MAX_BYTES = 5 * 1024 * 1024
+_DEFAULT_JSONL_BACKUPS = 3
+_DEFAULT_RETENTION_DAYS = 30.0
+_DEFAULT_MAX_EVENTS = 100_000
 
 
 def _to_stage(value: PipelineStage | str) -> PipelineStage:
@@ -31,25 +43,251 @@ def _bucket_key(duration_ms: float, *, buckets: tuple[int, ...] = _DEFAULT_BUCKE
     return f"> {buckets[-1]}ms"
 
 
+def _metadata_int(metadata: dict[str, Any], key: str) -> int:
+    try:
+        return max(0, int(metadata.get(key, 0) or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _TelemetryBuffer:
+    """Process-wide pending events for one metrics directory.
+
+    Events are appended to the JSONL log and folded into the snapshot in batches.
+    Each flush holds an exclusive ``flock`` on a sidecar lock file, appends the whole
+    batch with one write, and replaces the snapshot atomically, so concurrent
+    processes neither lose counts nor observe a half-written snapshot.
+    """
+
+    def __init__(self, metrics_dir: Path) -> None:
+        self.metrics_dir = metrics_dir
+        self.events_path = metrics_dir / "pipeline-events.jsonl"
+        self.snapshot_path = metrics_dir / "pipeline-metrics.json"
+        self.lock_path = metrics_dir / ".pipeline-metrics.lock"
+        self.store = TelemetryEventStore(metrics_dir / TELEMETRY_DB_FILENAME)
+        self.flush_max_events = _DEFAULT_FLUSH_MAX_EVENTS
+        self.flush_interval_seconds = _DEFAULT_FLUSH_INTERVAL_SECONDS
+        self.jsonl_max_bytes = _DEFAULT_JSONL_MAX_BYTES
+        self.jsonl_backups = _DEFAULT_JSONL_BACKUPS
+        self._migrated = False
+        self._lock = threading.Lock()
+        self._pending: list[PipelineEvent] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, event: PipelineEvent) -> None:
+        with self._lock:
+            self._pending.append(event)
+            due = len(self._pending) >= self.flush_max_events or (
+                time.monotonic() - self._last_flush >= self.flush_interval_seconds
+            )
+        if due:
+            self.flush()
+
+    def jsonl_segments(self) -> list[Path]:
+        """Rotated JSONL segments, oldest first, followed by the live file."""
+        rotated = [
+            self.events_path.with_name(f"{self.events_path.name}.{index}")
+            for index in range(self.jsonl_backups, 0, -1)
+        ]
+        return [*rotated, self.events_path]
+
+    def store_ready(self) -> bool:
+        """Ensure legacy JSONL history is imported; ``False`` when nothing was recorded."""
+        if not self.metrics_dir.exists():
+            return False
+        if not self._migrated:
+            self.store.migrate_jsonl(self.jsonl_segments())
+            self._migrated = True
+        return True
+
+    def _rotate_jsonl(self) -> None:
+        try:
+            size = self.events_path.stat().st_size
+        except OSError:
+            return
+        if size < self.jsonl_max_bytes:
+            return
+        if self.jsonl_backups <= 0:
+            self.events_path.unlink(missing_ok=True)
+            return
+        segments = self.jsonl_segments()
+        segments[0].unlink(missing_ok=True)
+        for older, newer in zip(segments, segments[1:], strict=False):
+            if newer.exists():
+                os.replace(newer, older)
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if not pending:
+                return
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.lock_path), os.O_CREAT | os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if not self._migrated:
+                    self.store.migrate_jsonl(self.jsonl_segments())
+                    self._migrated = True
+                self.store.append(pending)
+                self._rotate_jsonl()
+                with self.events_path.open("a", encoding="utf-8") as fp:
+                    fp.write("".join(event.model_dump_json() + "\n" for event in pending))
+                snapshot = _read_snapshot_file(self.snapshot_path)
+                for event in pending:
+                    _apply_event(snapshot, event)
+                snapshot["schema_version"] = 1
+                snapshot["updated_at"] = datetime.now(UTC).isoformat()
+                temp_path = self.snapshot_path.with_name(
+                    f".{self.snapshot_path.name}.{os.getpid()}.tmp"
+                )
+                temp_path.write_text(
+                    json.dumps(snapshot, indent=2, sort_keys=True), encoding="utf-8"
+                )
+                os.replace(temp_path, self.snapshot_path)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+_BUFFERS: dict[Path, _TelemetryBuffer] = {}
+_BUFFERS_LOCK = threading.Lock()
+
+
+def _get_buffer(metrics_dir: Path) -> _TelemetryBuffer:
+    key = metrics_dir.resolve()
+    with _BUFFERS_LOCK:
+        buffer = _BUFFERS.get(key)
+        if buffer is None:
+            buffer = _TelemetryBuffer(metrics_dir)
+            _BUFFERS[key] = buffer
+        return buffer
+
+
+def flush_all_telemetry() -> None:
+    """Flush every buffered telemetry sink in this process."""
+    with _BUFFERS_LOCK:
+        buffers = list(_BUFFERS.values())
+    for buffer in buffers:
+        try:
+            buffer.flush()
+        except OSError:
+            continue
+
+
+atexit.register(flush_all_telemetry)
+
+
+def _empty_snapshot() -> dict[str, Any]:
+    return {
+        "schema_version": 1,
+        "updated_at": None,
+        "counters": {"events_total": 0, "by_stage": {}},
+        "duration_histograms_ms": {},
+    }
+
+
+def _read_snapshot_file(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return _empty_snapshot()
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return _empty_snapshot()
+    if not isinstance(loaded, dict):
+        return _empty_snapshot()
+    return loaded
+
+
+def _apply_event(snapshot: dict[str, Any], event: PipelineEvent) -> None:
+    counters = snapshot.setdefault("counters", {})
+    counters["events_total"] = int(counters.get("events_total", 0)) + 1
+    skipped = _metadata_int(event.metadata, "llm_calls_skipped")
+    if skipped:
+        counters["llm_calls_skipped"] = int(counters.get("llm_calls_skipped", 0)) + skipped
+
+    by_stage = counters.setdefault("by_stage", {})
+    stage_key = event.stage.value
+    stage_stats = by_stage.setdefault(
+        stage_key,
+        {"start": 0, "complete": 0, "error": 0, "success": 0, "failure": 0},
+    )
+    action_key = event.action.value
+    if action_key in stage_stats:
+        stage_stats[action_key] = int(stage_stats[action_key]) + 1
+    if event.success is True:
+        stage_stats["success"] = int(stage_stats.get("success", 0)) + 1
+    elif event.success is False:
+        stage_stats["failure"] = int(stage_stats.get("failure", 0)) + 1
+
+    if isinstance(event.duration_ms, int | float) and event.duration_ms >= 0:
+        hist_root = snapshot.setdefault("duration_histograms_ms", {})
+        stage_hist = hist_root.setdefault(stage_key, {})
+        bucket = _bucket_key(float(event.duration_ms))
+        stage_hist[bucket] = int(stage_hist.get(bucket, 0)) + 1
+
+
 class PipelineTelemetry:
     """Small local telemetry sink for pipeline lifecycle events."""
 
-    def __init__(self, agent_dir: Path, *, enabled: bool = True) -> None:
+    def __init__(
+        self,
+        agent_dir: Path,
+        *,
+        enabled: bool = True,
+        flush_max_events: int = _DEFAULT_FLUSH_MAX_EVENTS,
+        flush_interval_seconds: float = _DEFAULT_FLUSH_INTERVAL_SECONDS,
+        retention_days: float | None = _DEFAULT_RETENTION_DAYS,
+        max_events: int | None = _DEFAULT_MAX_EVENTS,
+        jsonl_max_bytes: int = _DEFAULT_JSONL_MAX_BYTES,
+        jsonl_backups: int = _DEFAULT_JSONL_BACKUPS,
+    ) -> None:
         self.enabled = enabled
         self.agent_dir = agent_dir
         self.metrics_dir = agent_dir / "metrics"
         self.events_path = self.metrics_dir / "pipeline-events.jsonl"
         self.snapshot_path = self.metrics_dir / "pipeline-metrics.json"
+        self.db_path = self.metrics_dir / TELEMETRY_DB_FILENAME
+        self._buffer = _get_buffer(self.metrics_dir)
+        if enabled:
+            self._buffer.flush_max_events = max(1, int(flush_max_events))
+            self._buffer.flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+            self._buffer.jsonl_max_bytes = max(1, int(jsonl_max_bytes))
+            self._buffer.jsonl_backups = max(0, int(jsonl_backups))
+            self._buffer.store.retention_days = retention_days
+            self._buffer.store.max_events = max_events
 
     @classmethod
     def from_config(
         cls, *, agent_dir: Path, config: dict[str, Any] | None = None
     ) -> PipelineTelemetry:
         telemetry_cfg = (config or {}).get("telemetry")
-        enabled = True
-        if isinstance(telemetry_cfg, dict):
-            enabled = bool(telemetry_cfg.get("enabled", True))
-        return cls(agent_dir=agent_dir, enabled=enabled)
+        if not isinstance(telemetry_cfg, dict):
+            return cls(agent_dir=agent_dir)
+        options: dict[str, Any] = {}
+        for key, cast in (
+            ("flush_max_events", int),
+            ("flush_interval_seconds", float),
+            ("jsonl_max_bytes", int),
+            ("jsonl_backups", int),
+            ("retention_days", float),
+            ("max_events", int),
+        ):
+            if key not in telemetry_cfg:
+                continue
+            raw = telemetry_cfg[key]
+            if raw is None and key in {"retention_days", "max_events"}:
+                options[key] = None
+                continue
+            try:
+                options[key] = cast(raw)
+            except (TypeError, ValueError):
+                continue
+        return cls(
+            agent_dir=agent_dir,
+            enabled=bool(telemetry_cfg.get("enabled", True)),
+            **options,
+        )
 
     @staticmethod
     def create_run_id(prefix: str) -> str:
@@ -77,39 +315,49 @@ class PipelineTelemetry:
         if not self.enabled:
             return event
 
-        self.metrics_dir.mkdir(parents=True, exist_ok=True)
-        with self.events_path.open("a", encoding="utf-8") as fp:
-            fp.write(event.model_dump_json() + "\n")
-        self._update_snapshot(event)
+        self._buffer.add(event)
         return event
 
+    def flush(self) -> None:
+        """Write buffered events and the updated snapshot to disk."""
+        self._buffer.flush()
+
+    def query_events(
+        self,
+        *,
+        run_id: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        stage: PipelineStage | str | None = None,
+        action: PipelineEventAction | str | None = None,
+        limit: int | None = None,
+    ) -> list[PipelineEvent]:
+        """Look up recorded events by run id, time range, and stage/action."""
+        self.flush()
+        if not self._buffer.store_ready():
+            return []
+        return self._buffer.store.query(
+            run_id=run_id,
+            since=since,
+            until=until,
+            stage=_to_stage(stage).value if stage is not None else None,
+            action=_to_action(action).value if action is not None else None,
+            limit=limit,
+        )
+
     def read_snapshot(self) -> dict[str, Any]:
-        if not self.snapshot_path.exists():
-            return self._empty_snapshot()
-        try:
-            loaded = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            return self._empty_snapshot()
-        if not isinstance(loaded, dict):
-            return self._empty_snapshot()
-        return loaded
+        self.flush()
+        return _read_snapshot_file(self.snapshot_path)
 
     def list_recent_runs(self, *, limit: int = 5) -> list[dict[str, Any]]:
-        if not self.events_path.exists():
+        self.flush()
+        if not self._buffer.store_ready():
             return []
+        store = self._buffer.store
+        events = store.events_for_runs(store.recent_run_ids(limit=max(1, int(limit))))
 
         runs: dict[str, dict[str, Any]] = {}
-        try:
-            lines = self.events_path.read_text(encoding="utf-8").splitlines()
-        except OSError:
-            return []
-
-        for raw_line in lines:
-            try:
-                event = PipelineEvent.model_validate_json(raw_line)
-            except Exception:  # noqa: BLE001
-                continue
-
+        for event in events:
             run = runs.setdefault(
                 event.run_id,
                 {
@@ -117,6 +365,7 @@ class PipelineTelemetry:
                     "started_at": event.created_at,
                     "last_event_at": event.created_at,
                     "events_total": 0,
+                    "llm_calls_skipped": 0,
                     "by_stage": defaultdict(
                         lambda: {
                             "start": 0,
@@ -131,6 +380,7 @@ class PipelineTelemetry:
                 },
             )
             run["events_total"] += 1
+            run["llm_calls_skipped"] += _metadata_int(event.metadata, "llm_calls_skipped")
             if event.created_at < run["started_at"]:
                 run["started_at"] = event.created_at
             if event.created_at > run["last_event_at"]:
@@ -185,47 +435,8 @@ class PipelineTelemetry:
                     "last_event_at": last_event_at.isoformat(),
                     "duration_ms": round(duration_ms, 2),
                     "events_total": run["events_total"],
+                    "llm_calls_skipped": run["llm_calls_skipped"],
                     "by_stage": by_stage,
                 }
             )
         return rendered
-
-    def _update_snapshot(self, event: PipelineEvent) -> None:
-        snapshot = self.read_snapshot()
-        counters = snapshot.setdefault("counters", {})
-        counters["events_total"] = int(counters.get("events_total", 0)) + 1
-
-        by_stage = counters.setdefault("by_stage", {})
-        stage_key = event.stage.value
-        stage_stats = by_stage.setdefault(
-            stage_key,
-            {"start": 0, "complete": 0, "error": 0, "success": 0, "failure": 0},
-        )
-        action_key = event.action.value
-        if action_key in stage_stats:
-            stage_stats[action_key] = int(stage_stats[action_key]) + 1
-        if event.success is True:
-            stage_stats["success"] = int(stage_stats.get("success", 0)) + 1
-        elif event.success is False:
-            stage_stats["failure"] = int(stage_stats.get("failure", 0)) + 1
-
-        if isinstance(event.duration_ms, int | float) and event.duration_ms >= 0:
-            hist_root = snapshot.setdefault("duration_histograms_ms", {})
-            stage_hist = hist_root.setdefault(stage_key, {})
-            bucket = _bucket_key(float(event.duration_ms))
-            stage_hist[bucket] = int(stage_hist.get(bucket, 0)) + 1
-
-        snapshot["schema_version"] = 1
-        snapshot["updated_at"] = datetime.now(UTC).isoformat()
-        self.snapshot_path.write_text(
-            json.dumps(snapshot, indent=2, sort_keys=True), encoding="utf-8"
-        )
-
-    @staticmethod
-    def _empty_snapshot() -> dict[str, Any]:
-        return {
-            "schema_version": 1,
-            "updated_at": None,
-            "counters": {"events_total": 0, "by_stage": {}},
-            "duration_histograms_ms": {},
-        }
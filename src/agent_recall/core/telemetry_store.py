@@ -0,0 +1,279 @@
+"""Indexed SQLite store for pipeline telemetry events.
+
+``pipeline-events.jsonl`` is convenient to tail, but answering "what happened in the
+last few runs" from it means parsing the whole file. This store keeps the same events
+in ``metrics/pipeline-events.db`` with indexes on run id, timestamp, and stage/action,
+plus a per-run summary table so "latest runs" never scans the event log, and prunes
+rows past the configured retention.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from agent_recall.storage.models import PipelineEvent
+
+TELEMETRY_DB_FILENAME = "pipeline-events.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    run_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    action TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    success INTEGER,
+    duration_ms REAL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_pipeline_events_run ON pipeline_events(run_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_pipeline_events_created ON pipeline_events(created_ts);
+CREATE INDEX IF NOT EXISTS idx_pipeline_events_stage_action
+    ON pipeline_events(stage, action, created_ts);
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id TEXT PRIMARY KEY,
+    last_ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_last ON pipeline_runs(last_ts);
+CREATE TABLE IF NOT EXISTS telemetry_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_JSONL_MIGRATED_KEY = "jsonl_migrated_at"
+
+
+def _timestamp(value: datetime) -> float:
+    normalized = value.replace(tzinfo=UTC) if value.tzinfo is None else value
+    return normalized.timestamp()
+
+
+def _event_row(event: PipelineEvent) -> tuple[Any, ...]:
+    return (
+        str(event.id),
+        event.run_id,
+        event.stage.value,
+        event.action.value,
+        event.created_at.isoformat(),
+        _timestamp(event.created_at),
+        None if event.success is None else int(event.success),
+        event.duration_ms,
+        json.dumps(event.metadata, sort_keys=True, default=str),
+    )
+
+
+def _row_event(row: sqlite3.Row) -> PipelineEvent:
+    success = row["success"]
+    return PipelineEvent.model_validate(
+        {
+            "id": row["id"],
+            "run_id": row["run_id"],
+            "stage": row["stage"],
+            "action": row["action"],
+            "created_at": row["created_at"],
+            "success": None if success is None else bool(success),
+            "duration_ms": row["duration_ms"],
+            "metadata": json.loads(row["metadata"] or "{}"),
+        }
+    )
+
+
+class TelemetryEventStore:
+    """SQLite-backed event log with run/time/type lookups and retention."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        retention_days: float | None = 30.0,
+        max_events: int | None = 100_000,
+    ) -> None:
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.max_events = max_events
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._lock:
+            if self._conn is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def append(self, events: Iterable[PipelineEvent]) -> int:
+        rows = [_event_row(event) for event in events]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO pipeline_events (
+                    id, run_id, stage, action, created_at, created_ts,
+                    success, duration_ms, metadata
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            inserted = conn.total_changes - before
+            conn.executemany(
+                """
+                INSERT INTO pipeline_runs (run_id, last_ts) VALUES (?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET last_ts = MAX(last_ts, excluded.last_ts)
+                """,
+                [(row[1], row[5]) for row in rows],
+            )
+            self._prune(conn)
+            return inserted
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        before = conn.total_changes
+        if self.retention_days is not None and self.retention_days > 0:
+            cutoff = datetime.now(UTC) - timedelta(days=float(self.retention_days))
+            conn.execute(
+                "DELETE FROM pipeline_events WHERE created_ts < ?",
+                (cutoff.timestamp(),),
+            )
+        if self.max_events is not None and self.max_events > 0:
+            conn.execute(
+                """
+                DELETE FROM pipeline_events
+                WHERE seq <= (SELECT MAX(seq) FROM pipeline_events) - ?
+                """,
+                (int(self.max_events),),
+            )
+        if conn.total_changes == before:
+            return
+        conn.execute(
+            """
+            DELETE FROM pipeline_runs
+            WHERE NOT EXISTS (
+                SELECT 1 FROM pipeline_events WHERE pipeline_events.run_id = pipeline_runs.run_id
+            )
+            """
+        )
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM pipeline_events").fetchone()
+        return int(row[0])
+
+    def query(
+        self,
+        *,
+        run_id: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        stage: str | None = None,
+        action: str | None = None,
+        limit: int | None = None,
+    ) -> list[PipelineEvent]:
+        """Return events matching every given filter, oldest first."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if since is not None:
+            clauses.append("created_ts >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("created_ts <= ?")
+            params.append(_timestamp(until))
+        if stage is not None:
+            clauses.append("stage = ?")
+            params.append(stage)
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM pipeline_events {where} ORDER BY created_ts DESC, seq DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(max(1, int(limit)))
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [_row_event(row) for row in reversed(rows)]
+
+    def recent_run_ids(self, *, limit: int) -> list[str]:
+        """Return run ids ordered by their latest event, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT run_id FROM pipeline_runs ORDER BY last_ts DESC LIMIT ?",
+                (max(1, int(limit)),),
+            ).fetchall()
+        return [str(row["run_id"]) for row in rows]
+
+    def events_for_runs(self, run_ids: list[str]) -> list[PipelineEvent]:
+        if not run_ids:
+            return []
+        placeholders = ", ".join("?" for _ in run_ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT * FROM pipeline_events
+                WHERE run_id IN ({placeholders})
+                ORDER BY created_ts, seq
+                """,
+                run_ids,
+            ).fetchall()
+        return [_row_event(row) for row in rows]
+
+    def migrate_jsonl(self, jsonl_paths: Iterable[Path]) -> int:
+        """Import legacy JSONL event logs once; later calls are no-ops."""
+        with self._connect() as conn:
+            already = conn.execute(
+                "SELECT value FROM telemetry_meta WHERE key = ?",
+                (_JSONL_MIGRATED_KEY,),
+            ).fetchone()
+        if already is not None:
+            return 0
+
+        events: list[PipelineEvent] = []
+        for path in jsonl_paths:
+            if not path.exists():
+                continue
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                continue
+            for raw_line in lines:
+                try:
+                    events.append(PipelineEvent.model_validate_json(raw_line))
+                except Exception:  # noqa: BLE001
+                    continue
+
+        inserted = self.append(events)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO telemetry_meta (key, value) VALUES (?, ?)",
+                (_JSONL_MIGRATED_KEY, datetime.now(UTC).isoformat()),
+            )
+        return inserted
@@ -12,12 +12,19 @@ from __future__ import annotations
 
 import hashlib
 import re
+from collections import Counter
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import StrEnum
 from pathlib import Path
 from typing import Any
 
+from agent_recall.core.near_duplicates import (
+    TIER_LINE_INDEX_FILENAME,
+    NearDuplicateLineIndex,
+    load_tier_line_index,
+    save_tier_line_index,
+)
 from agent_recall.core.tier_notes import normalize_tier_content
 from agent_recall.storage.files import FileStorage, KnowledgeTier
 
@@ -154,6 +161,8 @@ class TierWriter:
     ):
         self.files = files
         self.policy = policy or WritePolicy()
+        # Per-scope line index and the tier text it was built from.
+        self._line_indexes: dict[str, tuple[str, NearDuplicateLineIndex]] = {}
 
     def write_guardrails_entry(
         self,
@@ -375,7 +384,7 @@ class TierWriter:
         current = self._ensure_header(tier, current)
 
         # Check for duplicates if enabled
-        if self.policy.deduplicate and self._is_duplicate(current, content):
+        if self.policy.deduplicate and self._is_duplicate(current, content, tier):
             return False
 
         # Apply write mode
@@ -398,17 +407,61 @@ class TierWriter:
             )
 
         self.files.write_tier(tier, updated)
+        if self.policy.deduplicate:
+            self._record_written_lines(tier, current, updated)
         return True
 
-    def _is_duplicate(self, current: str, new_content: str) -> bool:
+    @staticmethod
+    def _line_index_scope(tier: KnowledgeTier | None) -> str:
+        return f"tier_writer:{tier.value if tier is not None else 'untiered'}"
+
+    def _line_index(self, tier: KnowledgeTier | None, current: str) -> NearDuplicateLineIndex:
+        """Return the line index for ``current``, reusing it while the tier text is unchanged."""
+        scope = self._line_index_scope(tier)
+        cached = self._line_indexes.get(scope)
+        if cached is not None and cached[0] == current:
+            return cached[1]
+        index = load_tier_line_index(
+            self.files.agent_dir / TIER_LINE_INDEX_FILENAME, scope, current.split("\n")
+        )
+        self._line_indexes[scope] = (current, index)
+        return index
+
+    def _record_written_lines(self, tier: KnowledgeTier, current: str, updated: str) -> None:
+        """Apply the lines a successful write added or trimmed, then persist if changed."""
+        index = self._line_index(tier, current)
+        before = Counter(line for line in current.split("\n") if line.strip())
+        after = Counter(line for line in updated.split("\n") if line.strip())
+        for line, count in (before - after).items():
+            for _ in range(count):
+                index.remove(line)
+        for line, count in (after - before).items():
+            for _ in range(count):
+                index.add(line)
+        scope = self._line_index_scope(tier)
+        self._line_indexes[scope] = (updated, index)
+        if index.dirty:
+            save_tier_line_index(self.files.agent_dir / TIER_LINE_INDEX_FILENAME, scope, index)
+
+    def _is_duplicate(
+        self,
+        current: str,
+        new_content: str,
+        tier: KnowledgeTier | None = None,
+    ) -> bool:
         """Check if content is a duplicate of existing content.
 
         Duplicates are detected by:
         1. Exact hash match of the entire entry
-        2. Same iteration number and item ID (for Ralph loop entries)
+        2. Near-duplicate match for single-line entries (same index as external compaction)
+        3. Same iteration number and item ID (for Ralph loop entries)
         """
-        # Check for exact hash match
-        new_hash = _compute_content_hash(new_content)
+        line_index = self._line_index(tier, current)
+        if line_index.contains(new_content):
+            return True
+        stripped = new_content.strip()
+        if "\n" not in stripped and line_index.find_near_duplicate(stripped) is not None:
+            return True
 
         # Extract iteration number and item ID from new content
         new_iteration = None
@@ -422,14 +475,12 @@ class TierWriter:
                     new_item_id = match.group(2)
                 break
 
-        # Parse existing entries
-        for line in current.split("\n"):
-            # Check hash match
-            if _compute_content_hash(line) == new_hash:
-                return True
+        if not (new_iteration and new_item_id):
+            return False
 
-            # Check iteration/item_id match for Ralph loop entries
-            if new_iteration and new_item_id and line.startswith("## "):
+        # Check iteration/item_id match for Ralph loop entries
+        for line in current.split("\n"):
+            if line.startswith("## "):
                 match = re.search(r"Iteration\s+(\d+)\s+\(([^)]+)\)", line)
                 if match:
                     existing_iteration = match.group(1)
@@ -16,6 +16,11 @@ from agent_recall.core.guardrail_enforcement import (
     is_guardrail_enforcement_enabled,
     parse_guardrail_rules,
 )
+from agent_recall.core.near_duplicates import (
+    TIER_LINE_INDEX_FILENAME,
+    load_tier_line_index,
+    save_tier_line_index,
+)
 from agent_recall.core.telemetry import PipelineTelemetry
 from agent_recall.core.tier_writer import TIER_HEADERS
 from agent_recall.external_compaction.models import (
@@ -53,14 +58,6 @@ def _polarity(text: str) -> str:
     return tier_notes.polarity(text)
 
 
-def _token_set(text: str) -> set[str]:
-    return tier_notes.semantic_token_set(text)
-
-
-def _jaccard_similarity(left: set[str], right: set[str]) -> float:
-    return tier_notes.jaccard_similarity(left, right)
-
-
 def _is_candidate_line(line: str) -> bool:
     normalized = line.strip()
     return bool(normalized) and (normalized.startswith("- [") or normalized.startswith("**"))
@@ -108,6 +105,7 @@ class ExternalCompactionService:
         self.agent_dir = agent_dir
         self.repo_root = repo_root.resolve()
         self.state_path = state_path or (agent_dir / "external_compaction_state.json")
+        self.line_index_path = self.state_path.parent / TIER_LINE_INDEX_FILENAME
         config = self.files.read_config()
         self.write_guard = write_guard or ExternalWriteScopeGuard.from_config(
             repo_root=self.repo_root,
@@ -384,6 +382,8 @@ class ExternalCompactionService:
                 metadata={"write_target": target, "dry_run": dry_run, "error": str(exc)},
             )
             raise
+        finally:
+            telemetry.flush()
 
     def cleanup_state(self) -> dict[str, int]:
         """Remove stale/invalid external compaction state entries."""
@@ -664,9 +664,11 @@ class ExternalCompactionService:
             for line in existing_lines
             if line.strip() and _is_candidate_line(line)
         }
-        token_sets = [
-            _token_set(line) for line in existing_lines if line.strip() and _is_candidate_line(line)
-        ]
+        line_index = load_tier_line_index(
+            self.line_index_path,
+            f"external_compaction:{tier.value}",
+            (line for line in existing_lines if line.strip() and _is_candidate_line(line)),
+        )
         topic_polarity: dict[str, tuple[str, str]] = {}
         for line in existing_lines:
             if not line.strip() or not _is_candidate_line(line):
@@ -688,8 +690,7 @@ class ExternalCompactionService:
             semantic = _semantic_key(line)
             if semantic and semantic in semantic_seen:
                 continue
-            candidate_tokens = _token_set(line)
-            if any(_jaccard_similarity(candidate_tokens, tokens) >= 0.85 for tokens in token_sets):
+            if line_index.find_near_duplicate(line) is not None:
                 continue
 
             topic = _topic_key(line)
@@ -715,16 +716,19 @@ class ExternalCompactionService:
                     if existing_line in working_lines:
                         working_lines.remove(existing_line)
                     semantic_seen.discard(_semantic_key(existing_line))
-                    existing_tokens = _token_set(existing_line)
-                    token_sets = [tokens for tokens in token_sets if tokens != existing_tokens]
+                    line_index.remove(existing_line)
 
             semantic_seen.add(semantic)
-            token_sets.append(candidate_tokens)
+            line_index.add(line)
             if topic:
                 topic_polarity[topic] = (polarity, line)
             additions.append(line)
             applied_notes.append(note)
 
+        if line_index.dirty:
+            save_tier_line_index(
+                self.line_index_path, f"external_compaction:{tier.value}", line_index
+            )
         if not additions:
             return _MergeOutcome(
                 merged=existing,
@@ -16,6 +16,12 @@ from agent_recall.llm.base import (
     LLMResponse,
     Message,
 )
+from agent_recall.llm.rate_limit import (
+    RateLimitedProvider,
+    RateLimitSettings,
+    get_rate_limiter,
+    rate_limit_stats,
+)
 
 if TYPE_CHECKING:
     from agent_recall.storage.models import LLMConfig
@@ -28,6 +34,8 @@ __all__ = [
     "LLMConfigError",
     "LLMConnectionError",
     "LLMRateLimitError",
+    "RateLimitedProvider",
+    "rate_limit_stats",
     "create_llm_provider",
     "get_available_providers",
     "ensure_provider_dependency",
@@ -166,6 +174,26 @@ def create_llm_provider(config: LLMConfig) -> LLMProvider:
     if not ok:
         raise LLMConfigError(message or f"Provider dependency check failed for '{provider}'.")
 
+    client = _create_provider_client(config, provider)
+    settings = _resolve_rate_limit_settings(config, provider)
+    if settings is None:
+        return client
+    return RateLimitedProvider(client, get_rate_limiter(provider, settings))
+
+
+def _resolve_rate_limit_settings(config: LLMConfig, provider: str) -> RateLimitSettings | None:
+    for name, limits in config.rate_limits.items():
+        if _normalize_provider_name(name) != provider:
+            continue
+        settings = RateLimitSettings(
+            requests_per_minute=limits.requests_per_minute,
+            tokens_per_minute=limits.tokens_per_minute,
+        )
+        return settings if settings.enabled else None
+    return None
+
+
+def _create_provider_client(config: LLMConfig, provider: str) -> LLMProvider:
     if provider == "anthropic":
         from agent_recall.llm.anthropic import AnthropicProvider
 
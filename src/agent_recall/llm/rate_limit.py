@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from agent_recall.llm.base import LLMProvider, LLMRateLimitError, LLMResponse, Message
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    """Requests-per-minute and tokens-per-minute budget for one provider."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.requests_per_minute) or bool(self.tokens_per_minute)
+
+
+class TokenBucket:
+    """Reservation-based token bucket.
+
+    Callers reserve capacity up front and receive the delay they must wait before
+    the reservation is honoured. The level may go negative, which queues later
+    callers behind earlier ones instead of letting them race for the same refill.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = max(1.0, float(capacity))
+        self.refill_per_second = max(1e-9, float(refill_per_second))
+        self._clock = clock
+        self._level = self.capacity
+        self._updated_at = clock()
+
+    @classmethod
+    def per_minute(
+        cls,
+        limit: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> TokenBucket:
+        return cls(capacity=limit, refill_per_second=float(limit) / 60.0, clock=clock)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._level = min(self.capacity, self._level + elapsed * self.refill_per_second)
+        self._updated_at = now
+
+    def reserve(self, amount: float, *, now: float | None = None) -> float:
+        """Reserve ``amount`` units and return seconds to wait before using them."""
+        current = self._clock() if now is None else now
+        self._refill(current)
+        self._level -= min(self.capacity, max(0.0, float(amount)))
+        if self._level >= 0:
+            return 0.0
+        return -self._level / self.refill_per_second
+
+    def adjust(self, delta: float, *, now: float | None = None) -> None:
+        """Credit (positive) or debit (negative) the bucket after the fact."""
+        current = self._clock() if now is None else now
+        self._refill(current)
+        self._level = min(self.capacity, self._level + float(delta))
+
+
+class ProviderRateLimiter:
+    """Process-wide RPM/TPM limiter shared by every client of one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        settings: RateLimitSettings,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.settings = settings
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = (
+            TokenBucket.per_minute(settings.requests_per_minute, clock=clock)
+            if settings.requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket.per_minute(settings.tokens_per_minute, clock=clock)
+            if settings.tokens_per_minute
+            else None
+        )
+        self._blocked_until = 0.0
+        self._acquired_total = 0
+        self._waits_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._retry_after_total = 0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request plus ``tokens`` and return the required delay."""
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._blocked_until - now)
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now=now))
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(tokens, now=now))
+            self._acquired_total += 1
+            if delay > 0:
+                self._waits_total += 1
+                self._wait_seconds_total += delay
+                self._wait_seconds_max = max(self._wait_seconds_max, delay)
+            return delay
+
+    async def acquire(self, tokens: int) -> float:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def settle(self, *, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Reconcile a reservation with the usage the provider actually reported."""
+        if self._tokens is None or actual_tokens is None:
+            return
+        with self._lock:
+            self._tokens.adjust(float(estimated_tokens - actual_tokens))
+
+    def record_retry_after(self, seconds: float | None) -> None:
+        """Pause every caller until the provider's ``Retry-After`` has elapsed."""
+        with self._lock:
+            self._retry_after_total += 1
+            if seconds is None or seconds <= 0:
+                return
+            self._blocked_until = max(self._blocked_until, self._clock() + float(seconds))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "requests_per_minute": self.settings.requests_per_minute,
+                "tokens_per_minute": self.settings.tokens_per_minute,
+                "acquired_total": self._acquired_total,
+                "waits_total": self._waits_total,
+                "wait_ms_total": round(self._wait_seconds_total * 1000.0, 2),
+                "wait_ms_max": round(self._wait_seconds_max * 1000.0, 2),
+                "retry_after_total": self._retry_after_total,
+            }
+
+
+_LIMITERS: dict[str, ProviderRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(name: str, settings: RateLimitSettings) -> ProviderRateLimiter:
+    """Return the process-wide limiter for ``name``, rebuilding it if settings changed."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None or limiter.settings != settings:
+            limiter = ProviderRateLimiter(name, settings)
+            _LIMITERS[name] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+def estimate_request_tokens(messages: list[Message], max_tokens: int) -> int:
+    """Cheap upper-bound estimate of prompt plus completion tokens for one call."""
+    prompt_chars = sum(len(message.content) for message in messages)
+    return max(1, (prompt_chars + 3) // 4) + max(0, int(max_tokens))
+
+
+def _response_tokens(response: LLMResponse) -> int | None:
+    usage = response.usage
+    if not usage:
+        return None
+    total = int(usage.get("prompt_tokens", 0)) + int(usage.get("completion_tokens", 0))
+    return total if total > 0 else None
+
+
+class RateLimitedProvider(LLMProvider):
+    """Provider wrapper that passes every call through a shared rate limiter."""
+
+    def __init__(self, inner: LLMProvider, limiter: ProviderRateLimiter) -> None:
+        self.inner = inner
+        self.rate_limiter = limiter
+
+    @property
+    def provider_name(self) -> str:
+        return self.inner.provider_name
+
+    @property
+    def model_name(self) -> str:
+        return self.inner.model_name
+
+    async def generate(
+        self,
+        messages: list[Message],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        estimated = estimate_request_tokens(messages, max_tokens)
+        await self.rate_limiter.acquire(estimated)
+        try:
+            response = await self.inner.generate(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except LLMRateLimitError as exc:
+            self.rate_limiter.record_retry_after(exc.retry_after_seconds)
+            raise
+        self.rate_limiter.settle(
+            estimated_tokens=estimated,
+            actual_tokens=_response_tokens(response),
+        )
+        return response
+
+    async def generate_stream(
+        self,
+        messages: list[Message],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        await self.rate_limiter.acquire(estimate_request_tokens(messages, max_tokens))
+        try:
+            async for chunk in self.inner.generate_stream(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ):
+                yield chunk
+        except LLMRateLimitError as exc:
+            self.rate_limiter.record_retry_after(exc.retry_after_seconds)
+            raise
+
+    def validate(self) -> tuple[bool, str]:
+        return self.inner.validate()
+
+
+def rate_limit_stats(provider: LLMProvider | None) -> dict[str, Any] | None:
+    """Return limiter stats for a provider, or ``None`` when it is not rate limited."""
+    if isinstance(provider, RateLimitedProvider):
+        return provider.rate_limiter.stats()
+    return None
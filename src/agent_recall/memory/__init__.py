@@ -19,6 +19,7 @@ from agent_recall.memory.embedding_provider import (
     EmbeddingProvider,
     ExternalEmbeddingProvider,
     LocalEmbeddingProvider,
+    PartialEmbeddingError,
 )
 from agent_recall.memory.local_model import LocalEmbeddingModelManager
 from agent_recall.memory.policy import MemoryPolicy, NormalizedRows, normalize_memory_rows
@@ -59,6 +60,7 @@ __all__ = [
     "MarkdownMemoryStore",
     "MemoryStore",
     "NormalizedRows",
+    "PartialEmbeddingError",
     "TurboPufferVectorStore",
     "VectorMemoryService",
     "VectorMemorySetupRequest",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from collections import OrderedDict
 from datetime import UTC, datetime
 from pathlib import Path
@@ -10,6 +11,7 @@ from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_valida
 
 from agent_recall.core.config import load_config
 from agent_recall.core.semantic_embedder import configure_from_memory_config
+from agent_recall.memory.embedding_provider import EmbeddingProvider, ExternalEmbeddingProvider
 from agent_recall.memory.migration import (
     build_embedding_provider_from_memory_config,
     collect_learning_rows,
@@ -21,7 +23,7 @@ from agent_recall.memory.vector_store import (
     resolve_local_vector_db_path,
 )
 from agent_recall.storage.base import Storage
-from agent_recall.storage.files import FileStorage
+from agent_recall.storage.files import FileStamp, FileStorage, file_stamp
 
 AGENT_MEMORY_BUNDLE_FILENAME = "agent-memory.json"
 MEMORY_REQUEST_ENVELOPE_KEY = "agent_recall_memory_request"
@@ -250,24 +252,101 @@ def render_agent_memory_prompt(bundle: dict[str, Any]) -> str:
 
 
 class AgentMemoryIndex:
+    """Reusable memory search over the configured vector backend.
+
+    Config is reloaded only when ``config.yaml`` or a file it extends changes on
+    disk. The embedding provider and vector store built from it stay warm between
+    searches until then, or until ``close()``.
+    """
+
     def __init__(self, *, storage: Storage, files: FileStorage) -> None:
         self.storage = storage
         self.files = files
+        self._lock = threading.RLock()
+        self._config_paths: list[Path] = [files.agent_dir / "config.yaml"]
+        self._config_stamp: tuple[FileStamp | None, ...] | None = None
+        self._runtime: dict[str, Any] | None = None
+        self._provider: EmbeddingProvider | None = None
+        self._store: LocalVectorStore | TurboPufferVectorStore | None = None
+
+    def _current_stamp(self) -> tuple[FileStamp | None, ...]:
+        return tuple(file_stamp(path) for path in self._config_paths)
+
+    def _load_runtime(self) -> dict[str, Any]:
+        with self._lock:
+            if self._runtime is not None and self._current_stamp() == self._config_stamp:
+                return self._runtime
+            self.close()
+            config = load_config(self.files.agent_dir)
+            agent_dir = self.files.agent_dir
+            self._config_paths = [agent_dir / "config.yaml"]
+            for extend_path in config.extends:
+                path = Path(extend_path).expanduser()
+                self._config_paths.append(path if path.is_absolute() else agent_dir / path)
+            self._config_stamp = self._current_stamp()
+            memory_cfg = config.memory.model_dump(mode="python")
+            self._runtime = {
+                "enabled": bool(memory_cfg.get("vector_enabled", False)),
+                "backend": str(memory_cfg.get("vector_backend", "local")).strip().lower(),
+                "embedding_provider": (
+                    str(memory_cfg.get("embedding_provider", "local")).strip().lower()
+                ),
+                "embedding_dimensions": int(config.retrieval.embedding_dimensions),
+                "tenant_id": config.storage.shared.tenant_id,
+                "project_id": config.storage.shared.project_id,
+                "memory_cfg": memory_cfg,
+            }
+            return self._runtime
 
     def status(self) -> dict[str, Any]:
-        config = load_config(self.files.agent_dir)
-        memory_cfg = config.memory.model_dump(mode="python")
-        return {
-            "enabled": bool(memory_cfg.get("vector_enabled", False)),
-            "backend": str(memory_cfg.get("vector_backend", "local")).strip().lower(),
-            "embedding_provider": (
-                str(memory_cfg.get("embedding_provider", "local")).strip().lower()
-            ),
-            "embedding_dimensions": int(config.retrieval.embedding_dimensions),
-            "tenant_id": config.storage.shared.tenant_id,
-            "project_id": config.storage.shared.project_id,
-            "memory_cfg": memory_cfg,
-        }
+        return dict(self._load_runtime())
+
+    def close(self) -> None:
+        """Release the warm provider and vector store; the next search rebuilds them."""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+            if isinstance(self._provider, ExternalEmbeddingProvider):
+                self._provider.close()
+            self._store = None
+            self._provider = None
+
+    def _embedding_provider(self, runtime: dict[str, Any]) -> EmbeddingProvider:
+        if self._provider is None:
+            memory_cfg = runtime["memory_cfg"]
+            if (
+                str(runtime["embedding_provider"]) == "local"
+                and int(runtime["embedding_dimensions"]) == 384
+            ):
+                configure_from_memory_config(memory_cfg)
+            _provider_name, self._provider = build_embedding_provider_from_memory_config(
+                memory_cfg,
+                embedding_dimensions=int(runtime["embedding_dimensions"]),
+            )
+        return self._provider
+
+    def _vector_store(self, runtime: dict[str, Any]) -> LocalVectorStore | TurboPufferVectorStore:
+        if self._store is None:
+            if str(runtime["backend"]) == "turbopuffer":
+                turbopuffer_cfg = runtime["memory_cfg"].get("turbopuffer")
+                config = turbopuffer_cfg if isinstance(turbopuffer_cfg, dict) else {}
+                self._store = TurboPufferVectorStore(
+                    base_url=str(config.get("base_url") or "").strip(),
+                    api_key_env=str(config.get("api_key_env", "TURBOPUFFER_API_KEY")),
+                    tenant_id=str(runtime["tenant_id"]),
+                    project_id=str(runtime["project_id"]),
+                    timeout_seconds=float(config.get("timeout_seconds", 10.0)),
+                    retry_attempts=int(config.get("retry_attempts", 2)),
+                    upsert_batch_size=int(config.get("upsert_batch_size", 500)),
+                    upsert_concurrency=int(config.get("upsert_concurrency", 4)),
+                )
+            else:
+                self._store = LocalVectorStore(
+                    resolve_local_vector_db_path(self.files.agent_dir),
+                    tenant_id=str(runtime["tenant_id"]),
+                    project_id=str(runtime["project_id"]),
+                )
+        return self._store
 
     def recent_memories(self, *, limit: int = 3) -> list[MemoryCard]:
         return [
@@ -276,48 +355,35 @@ class AgentMemoryIndex:
         ]
 
     def search(self, query: str, *, top_k: int = 5) -> list[MemoryCard]:
-        runtime = self.status()
-        if not runtime["enabled"]:
-            return []
+        return self.search_many([query], top_k=top_k)[0]
 
-        memory_cfg = runtime["memory_cfg"]
-        if (
-            str(runtime["embedding_provider"]) == "local"
-            and int(runtime["embedding_dimensions"]) == 384
-        ):
-            configure_from_memory_config(memory_cfg)
-        _provider_name, provider = build_embedding_provider_from_memory_config(
-            memory_cfg,
-            embedding_dimensions=int(runtime["embedding_dimensions"]),
-        )
-        query_embedding = provider.embed_texts([query]).vectors[0]
-        backend = str(runtime["backend"])
-        if backend == "turbopuffer":
-            turbopuffer_cfg = memory_cfg.get("turbopuffer")
-            config = turbopuffer_cfg if isinstance(turbopuffer_cfg, dict) else {}
-            store = TurboPufferVectorStore(
-                base_url=str(config.get("base_url") or "").strip(),
-                api_key_env=str(config.get("api_key_env", "TURBOPUFFER_API_KEY")),
-                tenant_id=str(runtime["tenant_id"]),
-                project_id=str(runtime["project_id"]),
-                timeout_seconds=float(config.get("timeout_seconds", 10.0)),
-                retry_attempts=int(config.get("retry_attempts", 2)),
-            )
+    def search_many(self, queries: list[str], *, top_k: int = 5) -> list[list[MemoryCard]]:
+        """Search several queries, embedding them in one provider call."""
+        if not queries:
+            return []
+        with self._lock:
+            runtime = self._load_runtime()
+            if not runtime["enabled"]:
+                return [[] for _ in queries]
+            provider = self._embedding_provider(runtime)
+            store = self._vector_store(runtime)
+            embeddings = provider.embed_texts(list(queries)).vectors
+            if isinstance(store, TurboPufferVectorStore):
+                return [
+                    [
+                        _memory_card_from_remote_match(match)
+                        for match in store.query(embedding=embedding, top_k=top_k)
+                    ]
+                    for embedding in embeddings
+                ]
             return [
-                _memory_card_from_remote_match(match)
-                for match in store.query(embedding=query_embedding, top_k=top_k)
+                [
+                    _memory_card_from_vector_record(record, score=score)
+                    for record, score in store.query(embedding=embedding, top_k=top_k)
+                ]
+                for embedding in embeddings
             ]
 
-        store = LocalVectorStore(
-            resolve_local_vector_db_path(self.files.agent_dir),
-            tenant_id=str(runtime["tenant_id"]),
-            project_id=str(runtime["project_id"]),
-        )
-        return [
-            _memory_card_from_vector_record(record, score=score)
-            for record, score in store.query(embedding=query_embedding, top_k=top_k)
-        ]
-
 
 def build_agent_memory_bundle(
     *,
@@ -328,8 +394,9 @@ def build_agent_memory_bundle(
     repo_path: Path,
     refreshed_at: datetime,
     top_k: int = 5,
+    index: AgentMemoryIndex | None = None,
 ) -> dict[str, Any]:
-    index = AgentMemoryIndex(storage=storage, files=files)
+    index = index or AgentMemoryIndex(storage=storage, files=files)
     status = index.status()
     recent = [card.model_dump(mode="json") for card in index.recent_memories(limit=3)]
     long_term: list[dict[str, Any]] = []
@@ -399,11 +466,12 @@ class AgentMemoryBroker:
         storage: Storage,
         files: FileStorage,
         bundle: dict[str, Any],
+        index: AgentMemoryIndex | None = None,
     ) -> None:
         self.storage = storage
         self.files = files
         self.bundle = bundle
-        self.index = AgentMemoryIndex(storage=storage, files=files)
+        self.index = index or AgentMemoryIndex(storage=storage, files=files)
         self.known_cards: dict[str, MemoryCard] = {}
         self.working_set: OrderedDict[str, MemoryCard] = OrderedDict()
         for group_name in ("long_term_memory", "working_set"):
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import random
+import re
+import threading
 from collections import OrderedDict
+from collections.abc import Coroutine
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Protocol, TypeVar
 
 import httpx
 
@@ -13,6 +18,13 @@ from agent_recall.core.semantic_embedder import (
     embed_single,
     get_embedding_dimension,
 )
+from agent_recall.llm.rate_limit import ProviderRateLimiter, RateLimitSettings, get_rate_limiter
+
+_T = TypeVar("_T")
+
+# Statuses worth retrying; other client errors fail the batch at once.
+_EMBEDDING_RETRY_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+_EMBEDDING_MAX_BACKOFF_SECONDS = 8.0
 
 
 @dataclass(frozen=True)
@@ -24,6 +36,27 @@ class EmbeddingResponse:
     estimated_cost_usd: float
 
 
+class PartialEmbeddingError(RuntimeError):
+    """An embedding call failed after some of its requests had already succeeded.
+
+    ``vectors`` maps input positions to the embeddings that came back. Their tokens
+    and cost are reported here and were already charged to the provider's budget.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        vectors: dict[int, list[float]],
+        estimated_tokens: int,
+        estimated_cost_usd: float,
+    ) -> None:
+        super().__init__(message)
+        self.vectors = vectors
+        self.estimated_tokens = estimated_tokens
+        self.estimated_cost_usd = estimated_cost_usd
+
+
 class EmbeddingProvider(Protocol):
     def embed_texts(self, texts: list[str]) -> EmbeddingResponse:
         """Embed text list and return vectors + usage metadata."""
@@ -99,7 +132,14 @@ class LocalEmbeddingProvider:
 
 
 class ExternalEmbeddingProvider:
-    """External API embedding provider with timeout and cost guardrails."""
+    """External API embedding provider with timeout and cost guardrails.
+
+    Texts are packed into requests of at most ``max_batch_inputs`` inputs and
+    ``max_batch_tokens`` estimated tokens. Up to ``max_concurrency`` requests run at
+    once on one pooled ``httpx.AsyncClient``, behind the process-wide rate limiter for
+    this endpoint. Each request retries on its own, so a transient failure resends one
+    batch rather than the whole call.
+    """
 
     def __init__(
         self,
@@ -110,6 +150,11 @@ class ExternalEmbeddingProvider:
         timeout_seconds: float = 10.0,
         max_cost_usd: float = 1.0,
         cost_per_1k_tokens_usd: float = 0.0005,
+        max_batch_inputs: int = 256,
+        max_batch_tokens: int = 100_000,
+        max_concurrency: int = 4,
+        retry_attempts: int = 3,
+        rate_limit: RateLimitSettings | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key_env = api_key_env
@@ -117,11 +162,28 @@ class ExternalEmbeddingProvider:
         self.timeout_seconds = max(1.0, float(timeout_seconds))
         self.max_cost_usd = max(0.0, float(max_cost_usd))
         self.cost_per_1k_tokens_usd = max(0.0, float(cost_per_1k_tokens_usd))
+        self.max_batch_inputs = max(1, int(max_batch_inputs))
+        self.max_batch_tokens = max(1, int(max_batch_tokens))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.retry_attempts = max(1, int(retry_attempts))
+        self.rate_limiter: ProviderRateLimiter | None = (
+            get_rate_limiter(f"embeddings:{self.base_url}", rate_limit)
+            if rate_limit is not None and rate_limit.enabled
+            else None
+        )
         self.spent_usd = 0.0
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._runner: tuple[asyncio.AbstractEventLoop, threading.Thread] | None = None
+        self._runner_lock = threading.Lock()
 
     def embed_texts(self, texts: list[str]) -> EmbeddingResponse:
-        token_estimate = sum(_estimate_tokens(text) for text in texts)
-        projected_cost = (token_estimate / 1000.0) * self.cost_per_1k_tokens_usd
+        return self._run(self.aembed_texts(texts))
+
+    async def aembed_texts(self, texts: list[str]) -> EmbeddingResponse:
+        token_counts = [_estimate_tokens(text) for text in texts]
+        token_estimate = sum(token_counts)
+        projected_cost = self._cost(token_estimate)
         if self.spent_usd + projected_cost > self.max_cost_usd:
             raise RuntimeError(
                 "Embedding request blocked by cost guardrail. "
@@ -132,26 +194,243 @@ class ExternalEmbeddingProvider:
         api_key = os.getenv(self.api_key_env, "").strip()
         if not api_key:
             raise RuntimeError(f"Missing embedding API key in env var {self.api_key_env}")
-        payload = {"model": self.model, "input": texts}
         headers = {"Authorization": f"Bearer {api_key}"}
 
-        with httpx.Client(timeout=self.timeout_seconds) as client:
-            response = client.post(f"{self.base_url}/embeddings", json=payload, headers=headers)
-            response.raise_for_status()
-        data = response.json()
-        vectors = _parse_embedding_vectors(data)
-        self.spent_usd += projected_cost
+        client = await self._http()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = _pack_batches(token_counts, self.max_batch_inputs, self.max_batch_tokens)
+        try:
+            # A batch that fails for good cancels the rest instead of spending more.
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(
+                        self._embed_batch(
+                            client,
+                            semaphore,
+                            headers,
+                            [texts[index] for index in batch],
+                            sum(token_counts[index] for index in batch),
+                        )
+                    )
+                    for batch in batches
+                ]
+        except ExceptionGroup as errors:
+            # Requests that finished before the failure were paid for; keep them.
+            completed: dict[int, list[float]] = {}
+            completed_tokens = 0
+            for batch, task in zip(batches, tasks, strict=True):
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                batch_vectors, batch_tokens = task.result()
+                completed.update(zip(batch, batch_vectors, strict=True))
+                completed_tokens += batch_tokens
+            completed_cost = self._cost(completed_tokens)
+            self.spent_usd += completed_cost
+            error = errors.exceptions[0]
+            raise PartialEmbeddingError(
+                str(error),
+                vectors=completed,
+                estimated_tokens=completed_tokens,
+                estimated_cost_usd=completed_cost,
+            ) from error
+        vectors: list[list[float]] = []
+        used_tokens = 0
+        for task in tasks:
+            batch_vectors, batch_tokens = task.result()
+            vectors.extend(batch_vectors)
+            used_tokens += batch_tokens
+        cost = self._cost(used_tokens)
+        self.spent_usd += cost
         return EmbeddingResponse(
             vectors=vectors,
             provider="external",
             model=self.model,
-            estimated_tokens=token_estimate,
-            estimated_cost_usd=projected_cost,
+            estimated_tokens=used_tokens,
+            estimated_cost_usd=cost,
         )
 
+    def close(self) -> None:
+        """Close the pooled client and stop the loop that serves ``embed_texts``."""
+        with self._runner_lock:
+            runner, self._runner = self._runner, None
+        if runner is None:
+            return
+        loop, thread = runner
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def aclose(self) -> None:
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+    def _cost(self, tokens: int) -> float:
+        return (tokens / 1000.0) * self.cost_per_1k_tokens_usd
+
+    def _run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        # Synchronous callers share one background loop, so the pooled client and its
+        # connections outlive a single call and work even inside a running event loop.
+        with self._runner_lock:
+            if self._runner is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="agent-recall-embeddings", daemon=True
+                )
+                thread.start()
+                self._runner = (loop, thread)
+            loop = self._runner[0]
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def _http(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None and self._client_loop is not None:
+                await self._close_stale_client(self._client, self._client_loop)
+            # Pooled connections belong to the loop that opened them. Building the
+            # client loads an SSL context, which takes tens of milliseconds.
+            self._client = await asyncio.to_thread(
+                httpx.AsyncClient,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    @staticmethod
+    async def _close_stale_client(
+        client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        if loop.is_running():
+            # Close it on its own loop. Don't wait: that loop may be blocked in
+            # ``embed_texts`` waiting for this call.
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except RuntimeError:
+            # Its loop is closed: the client is marked closed and has dropped its pool.
+            pass
+
+    async def _embed_batch(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        headers: dict[str, str],
+        texts: list[str],
+        estimated_tokens: int,
+    ) -> tuple[list[list[float]], int]:
+        payload = {"model": self.model, "input": texts}
+        last_error: Exception | None = None
+        async with semaphore:
+            for attempt in range(1, self.retry_attempts + 1):
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(estimated_tokens)
+                try:
+                    response = await client.post(
+                        f"{self.base_url}/embeddings", json=payload, headers=headers
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as exc:
+                    last_error = exc
+                    retry_after = _retry_after_seconds(exc)
+                    if self.rate_limiter is not None and retry_after is not None:
+                        self.rate_limiter.record_retry_after(retry_after)
+                    if attempt < self.retry_attempts and _is_retryable(exc):
+                        delay = min(0.25 * 2 ** (attempt - 1), _EMBEDDING_MAX_BACKOFF_SECONDS)
+                        delay *= random.uniform(0.5, 1.0)
+                        await asyncio.sleep(max(retry_after or 0.0, delay))
+                        continue
+                    break
+                data = response.json()
+                vectors = _parse_embedding_vectors(data)
+                if len(vectors) != len(texts):
+                    raise RuntimeError(
+                        f"Embedding provider returned {len(vectors)} vectors for "
+                        f"{len(texts)} inputs."
+                    )
+                used_tokens = _reported_tokens(data)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.settle(
+                        estimated_tokens=estimated_tokens, actual_tokens=used_tokens
+                    )
+                return vectors, used_tokens if used_tokens is not None else estimated_tokens
+        raise RuntimeError(f"Embedding request failed: {last_error}") from last_error
+
+
+# Approximates a BPE pre-tokenizer: ASCII words, digit groups, single non-ASCII
+# characters, punctuation runs and whitespace runs.
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|[^\x00-\x7f]|[^\w\s]+|\s+")
+
 
 def _estimate_tokens(text: str) -> int:
-    return max(1, int(len(text.strip()) / 4))
+    """Estimate BPE tokens for ``text``, erring high so batches stay under limits.
+
+    Common words are one token and long words split every few characters. Digits
+    group in threes, punctuation pairs up, and each non-ASCII character counts as
+    one token.
+    """
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text.strip()):
+        if piece.isspace():
+            tokens += 1 if len(piece) > 1 else 0
+        elif piece.isascii() and piece.isalpha():
+            tokens += 1 + (len(piece) - 1) // 5
+        elif piece.isascii() and not piece.isdigit():
+            tokens += (len(piece) + 1) // 2
+        else:
+            tokens += 1
+    return max(1, tokens)
+
+
+def _pack_batches(token_counts: list[int], max_inputs: int, max_tokens: int) -> list[list[int]]:
+    """Group input indexes into consecutive batches that respect both limits.
+
+    An input larger than ``max_tokens`` on its own still gets a batch of one, so the
+    provider can reject or truncate it.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for index, tokens in enumerate(token_counts):
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _is_retryable(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _EMBEDDING_RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+def _retry_after_seconds(exc: httpx.HTTPError) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    try:
+        seconds = float(exc.response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def _reported_tokens(payload: object) -> int | None:
+    if not isinstance(payload, dict):
+        return None
+    usage = payload.get("usage")
+    if not isinstance(usage, dict):
+        return None
+    tokens = usage.get("total_tokens", usage.get("prompt_tokens"))
+    return int(tokens) if isinstance(tokens, int | float) and tokens > 0 else None
 
 
 def _parse_embedding_vectors(payload: object) -> list[list[float]]:
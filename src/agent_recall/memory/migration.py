@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from agent_recall.llm.rate_limit import RateLimitSettings
 from agent_recall.memory.embedding_provider import (
     EmbeddingProvider,
     ExternalEmbeddingProvider,
     LocalEmbeddingProvider,
+    PartialEmbeddingError,
 )
 from agent_recall.memory.policy import MemoryPolicy, normalize_memory_rows
 from agent_recall.memory.vector_store import LocalVectorStore, TurboPufferVectorStore, VectorRecord
@@ -46,6 +50,19 @@ def learning_row_from_entry(entry: LogEntry) -> dict[str, Any]:
     }
 
 
+def vector_content_hash(row: dict[str, Any], *, embedding_fingerprint: str) -> str:
+    """Hash everything a vector record is built from, including the embedding model."""
+    payload = {
+        "text": str(row.get("text", "")),
+        "label": str(row.get("label", "unknown")),
+        "tags": [str(tag) for tag in row.get("tags", [])],
+        "metadata": row.get("metadata"),
+        "embedding": embedding_fingerprint,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
 def collect_learning_rows(storage: Storage) -> list[dict[str, Any]]:
     limit = max(100, int(storage.count_log_entries() or 0))
     entries = storage.list_entries_by_curation_status(CurationStatus.APPROVED, limit=limit)
@@ -78,6 +95,14 @@ def build_embedding_provider_from_memory_config(
             ),
             timeout_seconds=float(memory_cfg.get("external_embedding_timeout_seconds", 10.0)),
             max_cost_usd=float(cost_cfg.get("max_external_embedding_usd", 1.0)),
+            max_batch_inputs=int(memory_cfg.get("external_embedding_max_batch_inputs", 256)),
+            max_batch_tokens=int(memory_cfg.get("external_embedding_max_batch_tokens", 100_000)),
+            max_concurrency=int(memory_cfg.get("external_embedding_concurrency", 4)),
+            retry_attempts=int(memory_cfg.get("external_embedding_retry_attempts", 3)),
+            rate_limit=RateLimitSettings(
+                requests_per_minute=memory_cfg.get("external_embedding_requests_per_minute"),
+                tokens_per_minute=memory_cfg.get("external_embedding_tokens_per_minute"),
+            ),
         )
         return embedding_provider_name, provider
 
@@ -169,8 +194,14 @@ class VectorMigrationService:
         self.project_id = project_id
         self.embedding_dimensions = int(embedding_dimensions)
         self.vector_db_path = vector_db_path
+        self._local_store: LocalVectorStore | None = None
 
     def migrate(self, request: VectorMigrationRequest) -> dict[str, Any]:
+        """Embed and write rows whose content hash changed; drop rows that are gone.
+
+        The local backend stores a content hash per record, so an unchanged sync
+        embeds nothing. Backends without stored hashes re-embed every row.
+        """
         rows = self.collect_rows()
         normalized = normalize_memory_rows(
             rows,
@@ -178,22 +209,56 @@ class VectorMigrationService:
             limit_override=request.max_records,
         )
         embedding_provider_name, provider = self.build_embedding_provider()
-        vectors, estimated_tokens, estimated_cost_usd = self.embed_rows(
-            normalized.rows,
-            provider=provider,
-            batch_size_override=request.batch_size,
-        )
         vector_backend = self.resolve_backend()
+        fingerprint = self.embedding_fingerprint(embedding_provider_name)
+        for row in normalized.rows:
+            row["content_hash"] = vector_content_hash(row, embedding_fingerprint=fingerprint)
+        existing = self.existing_content_hashes(vector_backend)
+        pending = [
+            row
+            for row in normalized.rows
+            if existing.get(str(row.get("id", ""))) != row["content_hash"]
+        ]
+        current_ids = {str(row.get("id", "")) for row in rows}
+        stale_ids = sorted(record_id for record_id in existing if record_id not in current_ids)
+        try:
+            vectors, estimated_tokens, estimated_cost_usd = self.embed_rows(
+                pending,
+                provider=provider,
+                batch_size_override=request.batch_size,
+            )
+        except PartialEmbeddingError as exc:
+            # Store what was already paid for. The other rows keep their old content
+            # hash, so the next run embeds only those.
+            self.persist_vectors(
+                [
+                    self.vector_record(pending[index], embedding)
+                    for index, embedding in sorted(exc.vectors.items())
+                ],
+                backend=vector_backend,
+                dry_run=request.dry_run,
+            )
+            raise
+        finally:
+            if isinstance(provider, ExternalEmbeddingProvider):
+                provider.close()
         rows_written = self.persist_vectors(
             vectors,
             backend=vector_backend,
             dry_run=request.dry_run,
         )
+        rows_deleted = self.delete_vectors(
+            stale_ids,
+            backend=vector_backend,
+            dry_run=request.dry_run,
+        )
         return {
             "rows_discovered": normalized.rows_discovered,
             "rows_normalized": normalized.rows_normalized,
             "rows_migrated": len(vectors),
             "rows_written": rows_written,
+            "rows_unchanged": len(normalized.rows) - len(pending),
+            "rows_deleted": rows_deleted,
             "redacted_rows": normalized.redacted_rows,
             "rows_capped": normalized.rows_capped,
             "rows_deduplicated": normalized.rows_deduplicated,
@@ -210,6 +275,31 @@ class VectorMigrationService:
     def resolve_backend(self) -> str:
         return str(self.memory_cfg.get("vector_backend", "local")).strip().lower()
 
+    def embedding_fingerprint(self, embedding_provider_name: str) -> str:
+        if embedding_provider_name == "external":
+            model = self.memory_cfg.get("external_embedding_model", "text-embedding-3-small")
+        else:
+            model = (
+                self.memory_cfg.get("local_model_path")
+                or self.memory_cfg.get("local_model_name")
+                or "all-MiniLM-L6-v2"
+            )
+        return f"{embedding_provider_name}:{model}:{self.embedding_dimensions}"
+
+    def existing_content_hashes(self, backend: str) -> dict[str, str | None]:
+        if backend != "local" or not self.vector_db_path.exists():
+            return {}
+        return self.local_vector_store().content_hashes()
+
+    def local_vector_store(self) -> LocalVectorStore:
+        if self._local_store is None:
+            self._local_store = LocalVectorStore(
+                self.vector_db_path,
+                tenant_id=self.tenant_id,
+                project_id=self.project_id,
+            )
+        return self._local_store
+
     def build_embedding_provider(self) -> tuple[str, EmbeddingProvider]:
         return build_embedding_provider_from_memory_config(
             self.memory_cfg,
@@ -229,34 +319,48 @@ class VectorMigrationService:
         batch_size_override: int | None = None,
     ) -> tuple[list[VectorRecord], int, float]:
         batch_size = self.resolve_migration_batch_size(batch_size_override)
+        if isinstance(provider, ExternalEmbeddingProvider) and batch_size_override is None:
+            # The external provider packs requests and sends them concurrently itself.
+            batch_size = max(1, len(rows))
         vectors: list[VectorRecord] = []
         total_tokens = 0
         total_cost = 0.0
         for start in range(0, len(rows), batch_size):
             batch = rows[start : start + batch_size]
             texts = [str(item.get("text", "")) for item in batch]
-            response = provider.embed_texts(texts)
+            try:
+                response = provider.embed_texts(texts)
+            except PartialEmbeddingError as exc:
+                # Report positions in ``rows``, including the batches that already finished.
+                completed = {offset: record.embedding for offset, record in enumerate(vectors)}
+                completed.update({start + index: vector for index, vector in exc.vectors.items()})
+                raise PartialEmbeddingError(
+                    str(exc),
+                    vectors=completed,
+                    estimated_tokens=total_tokens + exc.estimated_tokens,
+                    estimated_cost_usd=total_cost + exc.estimated_cost_usd,
+                ) from exc
             total_tokens += response.estimated_tokens
             total_cost += response.estimated_cost_usd
             for row, embedding in zip(batch, response.vectors, strict=False):
-                metadata = row.get("metadata")
-                vectors.append(
-                    VectorRecord(
-                        id=str(row.get("id", "")),
-                        tenant_id=self.tenant_id,
-                        project_id=self.project_id,
-                        text=str(row.get("text", "")),
-                        label=str(row.get("label", "unknown")),
-                        tags=[str(tag) for tag in row.get("tags", []) if str(tag).strip()],
-                        embedding=embedding,
-                        metadata=metadata
-                        if isinstance(metadata, dict)
-                        else {"source": "migration"},
-                        updated_at=datetime.now(UTC).isoformat(),
-                    )
-                )
+                vectors.append(self.vector_record(row, embedding))
         return vectors, total_tokens, total_cost
 
+    def vector_record(self, row: dict[str, Any], embedding: list[float]) -> VectorRecord:
+        metadata = row.get("metadata")
+        return VectorRecord(
+            id=str(row.get("id", "")),
+            tenant_id=self.tenant_id,
+            project_id=self.project_id,
+            text=str(row.get("text", "")),
+            label=str(row.get("label", "unknown")),
+            tags=[str(tag) for tag in row.get("tags", []) if str(tag).strip()],
+            embedding=embedding,
+            metadata=metadata if isinstance(metadata, dict) else {"source": "migration"},
+            updated_at=datetime.now(UTC).isoformat(),
+            content_hash=row.get("content_hash"),
+        )
+
     def persist_vectors(
         self,
         vectors: list[VectorRecord],
@@ -282,11 +386,13 @@ class VectorMigrationService:
                 project_id=self.project_id,
                 timeout_seconds=float(turbo_cfg.get("timeout_seconds", 10.0)),
                 retry_attempts=int(turbo_cfg.get("retry_attempts", 2)),
+                upsert_batch_size=int(turbo_cfg.get("upsert_batch_size", 500)),
+                upsert_concurrency=int(turbo_cfg.get("upsert_concurrency", 4)),
             )
             return vector_store.upsert_records(vectors)
-        vector_store = LocalVectorStore(
-            self.vector_db_path,
-            tenant_id=self.tenant_id,
-            project_id=self.project_id,
-        )
-        return vector_store.upsert_records(vectors)
+        return self.local_vector_store().upsert_records(vectors)
+
+    def delete_vectors(self, ids: list[str], *, backend: str, dry_run: bool) -> int:
+        if dry_run or not ids or backend != "local":
+            return 0
+        return self.local_vector_store().delete_records(ids)
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import json
 import os
+import random
+import re
 import sqlite3
+import threading
 import time
+from array import array
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -24,6 +30,7 @@ class VectorRecord(BaseModel):
     embedding: list[float]
     metadata: dict[str, Any] = Field(default_factory=dict)
     updated_at: str
+    content_hash: str | None = None
 
 
 DEFAULT_LOCAL_VECTOR_DB_FILENAME = "semantic-memory.db"
@@ -44,8 +51,20 @@ def resolve_local_vector_db_path(agent_dir: Path) -> Path:
     return preferred
 
 
+_VEC0_MAX_K = 4096
+
+
 class LocalVectorStore:
-    """Local vector store backed by SQLite plus sqlite-vec functions."""
+    """Local vector store backed by SQLite plus sqlite-vec functions.
+
+    Records live in ``memory_vector_records``. A ``vec0`` virtual table keyed by the
+    record rowid, partitioned by tenant and project, serves KNN queries for
+    embeddings of the indexed dimension; other queries fall back to a full scan.
+    One connection with sqlite-vec loaded is opened on first use and kept until
+    ``close()``.
+    """
+
+    _index_table = "memory_vector_index"
 
     _schema = """
     CREATE TABLE IF NOT EXISTS memory_vector_records (
@@ -57,7 +76,8 @@ class LocalVectorStore:
         tags TEXT NOT NULL,
         embedding BLOB NOT NULL,
         metadata TEXT NOT NULL,
-        updated_at TEXT NOT NULL
+        updated_at TEXT NOT NULL,
+        content_hash TEXT
     );
     CREATE INDEX IF NOT EXISTS idx_memory_vector_scope
     ON memory_vector_records(tenant_id, project_id, updated_at DESC);
@@ -67,21 +87,39 @@ class LocalVectorStore:
         self.db_path = db_path
         self.tenant_id = tenant_id
         self.project_id = project_id
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         with self._connect() as conn:
             conn.executescript(self._schema)
+            self._migrate_content_hash_column(conn)
             self._migrate_legacy_embeddings(conn)
+            self._migrate_vector_index(conn)
 
     @contextmanager
-    def _connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        self._load_sqlite_vec(conn)
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                try:
+                    self._load_sqlite_vec(conn)
+                except RuntimeError:
+                    conn.close()
+                    raise
+                self._conn = conn
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     @staticmethod
     def _load_sqlite_vec(conn: sqlite3.Connection) -> None:
@@ -96,6 +134,12 @@ class LocalVectorStore:
             except Exception:
                 pass
 
+    @staticmethod
+    def _migrate_content_hash_column(conn: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(memory_vector_records)")}
+        if "content_hash" not in columns:
+            conn.execute("ALTER TABLE memory_vector_records ADD COLUMN content_hash TEXT")
+
     def _migrate_legacy_embeddings(self, conn: sqlite3.Connection) -> None:
         rows = conn.execute(
             """
@@ -126,29 +170,117 @@ class LocalVectorStore:
                 (self._serialize_embedding(vector), str(row["id"])),
             )
 
+    def _migrate_vector_index(self, conn: sqlite3.Connection) -> None:
+        if self._index_dimensions(conn) is not None:
+            return
+        row = conn.execute(
+            """
+            SELECT length(embedding) / 4 AS dimensions
+            FROM memory_vector_records
+            WHERE typeof(embedding) = 'blob' AND length(embedding) > 0
+            GROUP BY dimensions
+            ORDER BY COUNT(*) DESC
+            LIMIT 1
+            """
+        ).fetchone()
+        if row is not None:
+            self._build_vector_index(conn, int(row["dimensions"]))
+
+    def _index_dimensions(self, conn: sqlite3.Connection) -> int | None:
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self._index_table,),
+        ).fetchone()
+        match = re.search(r"float\[(\d+)\]", str(row["sql"])) if row else None
+        return int(match.group(1)) if match else None
+
+    def _build_vector_index(self, conn: sqlite3.Connection, dimensions: int) -> None:
+        """(Re)create the KNN index for ``dimensions`` and fill it from stored records."""
+        conn.execute(f"DROP TABLE IF EXISTS {self._index_table}")
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE {self._index_table} USING vec0(
+                embedding float[{int(dimensions)}] distance_metric=cosine,
+                tenant_id text partition key,
+                project_id text partition key,
+                label text
+            )
+            """
+        )
+        conn.execute(
+            f"""
+            INSERT INTO {self._index_table} (rowid, embedding, tenant_id, project_id, label)
+            SELECT rowid, embedding, tenant_id, project_id, label
+            FROM memory_vector_records
+            WHERE typeof(embedding) = 'blob' AND length(embedding) = ?
+            """,
+            (int(dimensions) * 4,),
+        )
+
+    def _index_records(
+        self,
+        conn: sqlite3.Connection,
+        records: list[VectorRecord],
+        replaced_rowids: list[int],
+    ) -> None:
+        dimensions = self._index_dimensions(conn)
+        latest_dimensions = len(records[-1].embedding)
+        if latest_dimensions and dimensions != latest_dimensions:
+            # A new embedding model changes the dimension of everything written from now on.
+            self._build_vector_index(conn, latest_dimensions)
+            return
+        if dimensions is None:
+            return
+        conn.executemany(
+            f"DELETE FROM {self._index_table} WHERE rowid = ?",
+            [(rowid,) for rowid in replaced_rowids],
+        )
+        conn.execute(
+            f"""
+            INSERT INTO {self._index_table} (rowid, embedding, tenant_id, project_id, label)
+            SELECT rowid, embedding, tenant_id, project_id, label
+            FROM memory_vector_records
+            WHERE id IN (SELECT value FROM json_each(?)) AND length(embedding) = ?
+            """,
+            (json.dumps([record.id for record in records]), dimensions * 4),
+        )
+
     @staticmethod
     def _serialize_embedding(embedding: list[float]) -> bytes:
-        return sqlite_vec.serialize_float32([float(value) for value in embedding])
+        # Same packed float32 layout as sqlite_vec.serialize_float32, without the unpacking.
+        return array("f", embedding).tobytes()
 
     def upsert_records(self, records: list[VectorRecord]) -> int:
-        written = 0
+        if not records:
+            return 0
         with self._connect() as conn:
-            for record in records:
-                conn.execute(
+            replaced_rowids = [
+                int(row[0])
+                for row in conn.execute(
                     """
-                    INSERT INTO memory_vector_records (
-                        id, tenant_id, project_id, text, label,
-                        tags, embedding, metadata, updated_at
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                        text = excluded.text,
-                        label = excluded.label,
-                        tags = excluded.tags,
-                        embedding = excluded.embedding,
-                        metadata = excluded.metadata,
-                        updated_at = excluded.updated_at
+                    SELECT rowid FROM memory_vector_records
+                    WHERE id IN (SELECT value FROM json_each(?))
                     """,
+                    (json.dumps([record.id for record in records]),),
+                )
+            ]
+            conn.executemany(
+                """
+                INSERT INTO memory_vector_records (
+                    id, tenant_id, project_id, text, label,
+                    tags, embedding, metadata, updated_at, content_hash
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    text = excluded.text,
+                    label = excluded.label,
+                    tags = excluded.tags,
+                    embedding = excluded.embedding,
+                    metadata = excluded.metadata,
+                    updated_at = excluded.updated_at,
+                    content_hash = excluded.content_hash
+                """,
+                [
                     (
                         record.id,
                         record.tenant_id,
@@ -159,10 +291,13 @@ class LocalVectorStore:
                         self._serialize_embedding(record.embedding),
                         json.dumps(record.metadata, separators=(",", ":")),
                         record.updated_at,
-                    ),
-                )
-                written += 1
-        return written
+                        record.content_hash,
+                    )
+                    for record in records
+                ],
+            )
+            self._index_records(conn, records, replaced_rowids)
+        return len(records)
 
     def list_records(self, *, limit: int = 500) -> list[VectorRecord]:
         with self._connect() as conn:
@@ -175,12 +310,10 @@ class LocalVectorStore:
                     text,
                     label,
                     tags,
-                    CASE
-                        WHEN typeof(embedding) = 'blob' THEN vec_to_json(embedding)
-                        ELSE embedding
-                    END AS embedding_json,
+                    embedding,
                     metadata,
-                    updated_at
+                    updated_at,
+                    content_hash
                 FROM memory_vector_records
                 WHERE tenant_id = ? AND project_id = ?
                 ORDER BY updated_at DESC, id ASC
@@ -204,33 +337,80 @@ class LocalVectorStore:
             return 0
         return int(row["count"] or 0)
 
-    def query(self, *, embedding: list[float], top_k: int = 10) -> list[tuple[VectorRecord, float]]:
+    def query(
+        self,
+        *,
+        embedding: list[float],
+        top_k: int = 10,
+        label: str | None = None,
+    ) -> list[tuple[VectorRecord, float]]:
+        limit = max(1, int(top_k))
+        serialized = self._serialize_embedding(embedding)
+        label_filter = "" if label is None else "AND label = ?"
+        label_params = () if label is None else (label,)
         with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT
-                    id,
-                    tenant_id,
-                    project_id,
-                    text,
-                    label,
-                    tags,
-                    vec_to_json(embedding) AS embedding_json,
-                    metadata,
-                    updated_at,
-                    vec_distance_cosine(embedding, ?) AS distance
-                FROM memory_vector_records
-                WHERE tenant_id = ? AND project_id = ?
-                ORDER BY distance ASC, id ASC
-                LIMIT ?
-                """,
-                (
-                    self._serialize_embedding(embedding),
-                    self.tenant_id,
-                    self.project_id,
-                    max(1, int(top_k)),
-                ),
-            ).fetchall()
+            if self._index_dimensions(conn) == len(embedding):
+                rows = conn.execute(
+                    f"""
+                    SELECT
+                        r.id,
+                        r.tenant_id,
+                        r.project_id,
+                        r.text,
+                        r.label,
+                        r.tags,
+                        r.embedding,
+                        r.metadata,
+                        r.updated_at,
+                        r.content_hash,
+                        knn.distance
+                    FROM (
+                        SELECT rowid, distance
+                        FROM {self._index_table}
+                        WHERE embedding MATCH ? AND k = ?
+                        AND tenant_id = ? AND project_id = ? {label_filter}
+                    ) AS knn
+                    JOIN memory_vector_records AS r ON r.rowid = knn.rowid
+                    ORDER BY knn.distance ASC, r.id ASC
+                    """,
+                    (
+                        serialized,
+                        min(limit, _VEC0_MAX_K),
+                        self.tenant_id,
+                        self.project_id,
+                        *label_params,
+                    ),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"""
+                    SELECT
+                        id,
+                        tenant_id,
+                        project_id,
+                        text,
+                        label,
+                        tags,
+                        embedding,
+                        metadata,
+                        updated_at,
+                        content_hash,
+                        vec_distance_cosine(embedding, ?) AS distance
+                    FROM memory_vector_records
+                    WHERE tenant_id = ? AND project_id = ? AND length(embedding) = ?
+                    {label_filter}
+                    ORDER BY distance ASC, id ASC
+                    LIMIT ?
+                    """,
+                    (
+                        serialized,
+                        self.tenant_id,
+                        self.project_id,
+                        len(serialized),
+                        *label_params,
+                        limit,
+                    ),
+                ).fetchall()
         scored: list[tuple[VectorRecord, float]] = []
         for row in rows:
             record = self._row_to_record(row)
@@ -238,25 +418,74 @@ class LocalVectorStore:
             scored.append((record, max(0.0, 1.0 - distance)))
         return scored
 
+    def content_hashes(self) -> dict[str, str | None]:
+        """Map each record id in scope to its stored content hash."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, content_hash
+                FROM memory_vector_records
+                WHERE tenant_id = ? AND project_id = ?
+                """,
+                (self.tenant_id, self.project_id),
+            ).fetchall()
+        return {str(row["id"]): row["content_hash"] for row in rows}
+
+    def delete_records(self, ids: list[str]) -> int:
+        if not ids:
+            return 0
+        params = (json.dumps(ids), self.tenant_id, self.project_id)
+        scope = """
+            id IN (SELECT value FROM json_each(?)) AND tenant_id = ? AND project_id = ?
+        """
+        with self._connect() as conn:
+            if self._index_dimensions(conn) is not None:
+                conn.execute(
+                    f"""
+                    DELETE FROM {self._index_table}
+                    WHERE rowid IN (SELECT rowid FROM memory_vector_records WHERE {scope})
+                    """,
+                    params,
+                )
+            cursor = conn.execute(f"DELETE FROM memory_vector_records WHERE {scope}", params)
+            return int(cursor.rowcount or 0)
+
     def prune_older_than(self, *, retention_days: int) -> int:
         cutoff = datetime.now(UTC) - timedelta(days=max(0, int(retention_days)))
+        params = (self.tenant_id, self.project_id, cutoff.isoformat())
         with self._connect() as conn:
+            if self._index_dimensions(conn) is not None:
+                conn.execute(
+                    f"""
+                    DELETE FROM {self._index_table}
+                    WHERE rowid IN (
+                        SELECT rowid FROM memory_vector_records
+                        WHERE tenant_id = ? AND project_id = ? AND updated_at < ?
+                    )
+                    """,
+                    params,
+                )
             cursor = conn.execute(
                 """
                 DELETE FROM memory_vector_records
                 WHERE tenant_id = ? AND project_id = ? AND updated_at < ?
                 """,
-                (self.tenant_id, self.project_id, cutoff.isoformat()),
+                params,
             )
             return int(cursor.rowcount or 0)
 
     @staticmethod
-    def _row_to_record(row: sqlite3.Row) -> VectorRecord:
+    def _deserialize_embedding(raw: Any) -> list[float]:
+        if isinstance(raw, bytes):
+            # sqlite-vec stores float32 vectors as packed native floats.
+            return array("f", raw).tolist()
+        parsed = json.loads(str(raw)) if raw else []
+        return parsed if isinstance(parsed, list) else []
+
+    @classmethod
+    def _row_to_record(cls, row: sqlite3.Row) -> VectorRecord:
         tags = json.loads(str(row["tags"])) if row["tags"] else []
-        embedding_raw = (
-            row["embedding_json"] if "embedding_json" in row.keys() else row["embedding"]
-        )
-        embedding = json.loads(str(embedding_raw)) if embedding_raw else []
+        embedding = cls._deserialize_embedding(row["embedding"])
         metadata = json.loads(str(row["metadata"])) if row["metadata"] else {}
         return VectorRecord(
             id=str(row["id"]),
@@ -265,14 +494,30 @@ class LocalVectorStore:
             text=str(row["text"]),
             label=str(row["label"]),
             tags=tags if isinstance(tags, list) else [],
-            embedding=embedding if isinstance(embedding, list) else [],
+            embedding=embedding,
             metadata=metadata if isinstance(metadata, dict) else {},
             updated_at=str(row["updated_at"]),
+            content_hash=row["content_hash"],
         )
 
 
+# Statuses worth retrying; other client errors fail the batch at once.
+_TURBOPUFFER_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+_TURBOPUFFER_MAX_BACKOFF_SECONDS = 5.0
+
+
 class TurboPufferVectorStore:
-    """TurboPuffer adapter with auth, tenancy mapping, and retry policy."""
+    """TurboPuffer adapter with auth, tenancy mapping, and retry policy.
+
+    Requests share one keep-alive ``httpx.Client`` until ``close()``. Upserts are
+    split into ``upsert_batch_size`` chunks sent by up to ``upsert_concurrency``
+    worker threads. Each chunk retries on its own with jittered exponential
+    backoff, so one chunk waiting to retry does not hold up the others.
+
+    The backoff sleeps on the thread that made the request: ``query()``, and
+    upserts with ``upsert_concurrency=1``, block their caller while they wait.
+    Call them through ``asyncio.to_thread`` from an event loop.
+    """
 
     def __init__(
         self,
@@ -283,6 +528,8 @@ class TurboPufferVectorStore:
         project_id: str,
         timeout_seconds: float = 10.0,
         retry_attempts: int = 2,
+        upsert_batch_size: int = 500,
+        upsert_concurrency: int = 4,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key_env = api_key_env
@@ -290,6 +537,10 @@ class TurboPufferVectorStore:
         self.project_id = project_id
         self.timeout_seconds = max(1.0, float(timeout_seconds))
         self.retry_attempts = max(1, int(retry_attempts))
+        self.upsert_batch_size = max(1, int(upsert_batch_size))
+        self.upsert_concurrency = max(1, int(upsert_concurrency))
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
 
     def _headers(self) -> dict[str, str]:
         token = os.getenv(self.api_key_env, "").strip()
@@ -300,12 +551,44 @@ class TurboPufferVectorStore:
     def _namespace(self) -> str:
         return f"{self.tenant_id}:{self.project_id}"
 
+    def _http(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout_seconds)
+            return self._client
+
+    def close(self) -> None:
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
     def upsert_records(self, records: list[VectorRecord]) -> int:
-        payload = {
-            "namespace": self._namespace(),
-            "records": [record.model_dump() for record in records],
-        }
-        self._request("POST", "/vectors/upsert", payload)
+        if not records:
+            return 0
+        size = self.upsert_batch_size
+        payloads = [
+            {
+                "namespace": self._namespace(),
+                "records": [record.model_dump() for record in records[start : start + size]],
+            }
+            for start in range(0, len(records), size)
+        ]
+        workers = min(self.upsert_concurrency, len(payloads))
+        if workers == 1:
+            for payload in payloads:
+                self._request("POST", "/vectors/upsert", payload)
+            return len(records)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="agent-recall-turbopuffer"
+        ) as pool:
+            futures = [
+                pool.submit(self._request, "POST", "/vectors/upsert", payload)
+                for payload in payloads
+            ]
+            # Upserts are idempotent, so a failed chunk can be resent on the next sync.
+            for future in futures:
+                future.result()
         return len(records)
 
     def query(self, *, embedding: list[float], top_k: int = 10) -> list[dict[str, Any]]:
@@ -320,23 +603,30 @@ class TurboPufferVectorStore:
             return [item for item in data["matches"] if isinstance(item, dict)]
         return []
 
+    @staticmethod
+    def _is_retryable(exc: Exception) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in _TURBOPUFFER_RETRY_STATUSES
+        return isinstance(exc, httpx.HTTPError)
+
     def _request(self, method: str, path: str, payload: dict[str, Any]) -> httpx.Response:
+        headers = self._headers()
         last_error: Exception | None = None
         for attempt in range(1, self.retry_attempts + 1):
             try:
-                with httpx.Client(timeout=self.timeout_seconds) as client:
-                    response = client.request(
-                        method,
-                        f"{self.base_url}{path}",
-                        headers=self._headers(),
-                        json=payload,
-                    )
+                response = self._http().request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=headers,
+                    json=payload,
+                )
                 response.raise_for_status()
                 return response
-            except (httpx.HTTPError, RuntimeError) as exc:
+            except httpx.HTTPError as exc:
                 last_error = exc
-                if attempt < self.retry_attempts:
-                    time.sleep(0.2 * attempt)
+                if attempt < self.retry_attempts and self._is_retryable(exc):
+                    delay = min(0.2 * 2 ** (attempt - 1), _TURBOPUFFER_MAX_BACKOFF_SECONDS)
+                    time.sleep(delay * random.uniform(0.5, 1.0))
                     continue
                 break
         raise RuntimeError(f"TurboPuffer request failed: {last_error}") from last_error
@@ -5,7 +5,11 @@ from pathlib import Path
 
 from agent_recall.core.adapters import write_adapter_payloads
 from agent_recall.core.context import ContextAssembler
-from agent_recall.memory.agent_memory import build_agent_memory_bundle, write_agent_memory_bundle
+from agent_recall.memory.agent_memory import (
+    AgentMemoryIndex,
+    build_agent_memory_bundle,
+    write_agent_memory_bundle,
+)
 from agent_recall.storage.base import Storage
 from agent_recall.storage.files import FileStorage
 
@@ -13,11 +17,19 @@ from agent_recall.storage.files import FileStorage
 class ContextRefreshHook:
     """Hook for refreshing context and adapter payloads between iterations."""
 
-    def __init__(self, agent_dir: Path, storage: Storage, files: FileStorage):
+    def __init__(
+        self,
+        agent_dir: Path,
+        storage: Storage,
+        files: FileStorage,
+        *,
+        memory_index: AgentMemoryIndex | None = None,
+    ):
         self.agent_dir = agent_dir
         self.storage = storage
         self.files = files
         self.assembler = ContextAssembler(storage, files)
+        self.memory_index = memory_index or AgentMemoryIndex(storage=storage, files=files)
 
     def refresh(
         self,
@@ -48,6 +60,7 @@ class ContextRefreshHook:
             active_session_id=active_session_id,
             repo_path=self.agent_dir.parent,
             refreshed_at=refreshed_at,
+            index=self.memory_index,
         )
         agent_memory_path = write_agent_memory_bundle(self.agent_dir, agent_memory)
         written = write_adapter_payloads(
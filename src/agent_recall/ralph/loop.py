@@ -19,6 +19,7 @@ from agent_recall.core.guardrail_enforcement import (
 )
 from agent_recall.memory.agent_memory import (
     AgentMemoryBroker,
+    AgentMemoryIndex,
     load_agent_memory_bundle,
     render_agent_memory_prompt,
 )
@@ -95,6 +96,8 @@ class RalphLoop:
         self.storage = storage
         self.files = files
         self.state = RalphStateManager(agent_dir)
+        # Shared by every iteration so memory searches reuse a warm provider and store.
+        self.memory_index = AgentMemoryIndex(storage=storage, files=files)
 
     def enable(self) -> RalphState:
         state = self.state.load()
@@ -237,7 +240,12 @@ class RalphLoop:
         if agent_memory_bundle_path is not None and agent_memory_bundle_path.exists():
             bundle = load_agent_memory_bundle(agent_memory_bundle_path)
             if bundle:
-                broker = AgentMemoryBroker(storage=self.storage, files=self.files, bundle=bundle)
+                broker = AgentMemoryBroker(
+                    storage=self.storage,
+                    files=self.files,
+                    bundle=bundle,
+                    index=self.memory_index,
+                )
                 prompt_segments.extend(
                     [
                         "",
@@ -442,6 +450,29 @@ class RalphLoop:
         progress_callback: Callable[[dict[str, Any]], None] | None = None,
         coding_cli: str | None = None,
         cli_model: str | None = None,
+    ) -> dict[str, int]:
+        try:
+            return await self._run_loop(
+                max_iterations=max_iterations,
+                item_id=item_id,
+                selected_prd_ids=selected_prd_ids,
+                progress_callback=progress_callback,
+                coding_cli=coding_cli,
+                cli_model=cli_model,
+            )
+        finally:
+            # The warm provider and vector store hold connection pools and threads.
+            self.memory_index.close()
+
+    async def _run_loop(
+        self,
+        *,
+        max_iterations: int | None,
+        item_id: str | None,
+        selected_prd_ids: list[str] | None,
+        progress_callback: Callable[[dict[str, Any]], None] | None,
+        coding_cli: str | None,
+        cli_model: str | None,
     ) -> dict[str, int]:
         prd_path = self._resolve_prd_path(self.agent_dir)
         if not prd_path.exists():
@@ -577,7 +608,12 @@ class RalphLoop:
             elif coding_cli:
                 agent_memory_bundle_path: Path | None = None
                 try:
-                    hook = ContextRefreshHook(self.agent_dir, self.storage, self.files)
+                    hook = ContextRefreshHook(
+                        self.agent_dir,
+                        self.storage,
+                        self.files,
+                        memory_index=self.memory_index,
+                    )
                     summary = hook.refresh_for_prd_item(item, iteration=index)
                     bundle_path_value = summary.get("agent_memory_path")
                     if isinstance(bundle_path_value, str) and bundle_path_value.strip():
@@ -8,6 +8,7 @@ from uuid import UUID
 
 from agent_recall.storage.models import (
     BackgroundSyncStatus,
+    ChangeBatch,
     Chunk,
     CurationStatus,
     LogEntry,
@@ -53,6 +54,7 @@ class StorageCapabilities:
     retrieval_feedback: bool = False
     topic_threads: bool = False
     rule_confidence: bool = False
+    change_feed: bool = False
 
     def merge(self, other: StorageCapabilities | None) -> StorageCapabilities:
         if other is None:
@@ -70,6 +72,7 @@ class StorageCapabilities:
             retrieval_feedback=(self.retrieval_feedback or other.retrieval_feedback),
             topic_threads=(self.topic_threads or other.topic_threads),
             rule_confidence=(self.rule_confidence or other.rule_confidence),
+            change_feed=(self.change_feed or other.change_feed),
         )
 
 
@@ -133,6 +136,11 @@ class Storage(ABC):
         """Append a new log entry to a session."""
         ...
 
+    def append_entries(self, entries: list[LogEntry]) -> None:
+        """Append several log entries, ideally in one bulk write."""
+        for entry in entries:
+            self.append_entry(entry)
+
     @abstractmethod
     def get_entries(self, session_id: UUID) -> list[LogEntry]:
         """Retrieve all log entries for a given session."""
@@ -199,11 +207,52 @@ class Storage(ABC):
         """Check if a chunk with the same content and label already exists."""
         ...
 
+    def find_existing_chunks(
+        self,
+        candidates: list[tuple[str, SemanticLabel]],
+    ) -> set[tuple[str, SemanticLabel]]:
+        """Return the ``(content, label)`` candidates that already exist as chunks.
+
+        Backends should override this with a single set-based lookup; the default
+        falls back to one ``has_chunk`` call per candidate.
+        """
+        return {
+            (content, label)
+            for content, label in dict.fromkeys(candidates)
+            if self.has_chunk(content, label)
+        }
+
+    def store_chunks(self, chunks: list[Chunk]) -> None:
+        """Store several chunks, ideally in one bulk write."""
+        for chunk in chunks:
+            self.store_chunk(chunk)
+
+    def index_chunk_embeddings(self, embeddings: dict[UUID, list[float]]) -> None:
+        """Index vector embeddings for several existing chunks, ideally in one bulk write."""
+        for chunk_id, embedding in embeddings.items():
+            self.index_chunk_embedding(chunk_id, embedding)
+
     @abstractmethod
     def count_chunks(self) -> int:
         """Return the total number of chunks in the database."""
         ...
 
+    def get_chunk_generation(self) -> int | None:
+        """Return a counter that changes whenever chunks are written.
+
+        Backends that cannot report one return ``None``, which callers must treat as
+        "always changed".
+        """
+        return None
+
+    def list_changes(self, since: int = 0, limit: int = 500) -> ChangeBatch:
+        """Return log entries and chunks written after change sequence ``since``.
+
+        Rows come back in change-sequence order; pass ``next_since`` back in to read
+        the following page.
+        """
+        raise UnsupportedStorageCapabilityError("change_feed")
+
     @abstractmethod
     def search_chunks_fts(self, query: str, top_k: int = 5) -> list[Chunk]:
         """Perform a full-text search over chunks."""
@@ -248,6 +297,11 @@ class Storage(ABC):
         """Mark a source session as processed to prevent duplicate ingestion."""
         ...
 
+    def mark_sessions_processed(self, source_session_ids: list[str]) -> None:
+        """Mark several source sessions as processed, ideally in one bulk write."""
+        for source_session_id in source_session_ids:
+            self.mark_session_processed(source_session_id)
+
     @abstractmethod
     def clear_processed_sessions(
         self,
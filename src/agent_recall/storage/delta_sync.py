@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from agent_recall.storage.base import Storage
+from agent_recall.storage.sqlite import SQLiteStorage
+
+PULL_CURSOR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_pull_cursor (
+    tenant_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    change_seq INTEGER NOT NULL,
+    pulled_at TEXT NOT NULL,
+    PRIMARY KEY (tenant_id, project_id, source)
+);
+"""
+
+
+@dataclass(frozen=True)
+class PullResult:
+    since: int
+    cursor: int
+    entries: int
+    chunks: int
+    pages: int
+    reset: bool = False
+
+
+class PullCursorStore:
+    """Last change sequence pulled from one shared source, kept in the local database."""
+
+    def __init__(self, db_path: Path, *, tenant_id: str, project_id: str, source: str) -> None:
+        self.db_path = db_path
+        self._key = (tenant_id, project_id, source)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(PULL_CURSOR_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT change_seq FROM shared_pull_cursor
+                   WHERE tenant_id = ? AND project_id = ? AND source = ?""",
+                self._key,
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def save(self, change_seq: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO shared_pull_cursor
+                   (tenant_id, project_id, source, change_seq, pulled_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(tenant_id, project_id, source) DO UPDATE SET
+                       change_seq = excluded.change_seq,
+                       pulled_at = excluded.pulled_at""",
+                (*self._key, int(change_seq), datetime.now(UTC).isoformat()),
+            )
+
+
+def pull_changes(
+    source: Storage,
+    target: SQLiteStorage,
+    *,
+    since: int,
+    page_size: int = 500,
+    cursor: PullCursorStore | None = None,
+) -> PullResult:
+    """Copy entries and chunks changed after ``since`` from ``source`` into ``target``.
+
+    Each page is applied and the cursor saved before the next is requested, so an
+    interrupted pull resumes where it stopped. A source whose sequence is behind
+    ``since`` has been rebuilt; the pull then starts over from the beginning.
+    """
+    position = max(0, int(since))
+    reset = False
+    entries = chunks = pages = 0
+    while True:
+        batch = source.list_changes(since=position, limit=page_size)
+        if batch.latest_seq < position and not reset:
+            position, reset = 0, True
+            continue
+        target.apply_changes(batch)
+        pages += 1
+        entries += len(batch.entries)
+        chunks += len(batch.chunks)
+        position = batch.next_since
+        if cursor is not None:
+            cursor.save(position)
+        if not batch.has_more:
+            break
+    return PullResult(
+        since=max(0, int(since)),
+        cursor=position,
+        entries=entries,
+        chunks=chunks,
+        pages=pages,
+        reset=reset,
+    )
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import copy
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from enum import StrEnum
 from pathlib import Path
 from typing import Any
@@ -22,6 +28,124 @@ TIER_FILES = {
 }
 
 
+# Filesystems stamp mtimes with coarse ticks, so a file rewritten within the same tick
+# can keep its (mtime, size). Entries whose mtime is this close to when they were
+# cached are re-read and compared before the cached value is trusted.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+FileStamp = tuple[int, int, int]
+"""``(mtime_ns, size, inode)`` of a file; it changes when the file is rewritten or replaced."""
+
+
+def file_stamp(path: Path) -> FileStamp | None:
+    """Return the ``(mtime_ns, size, inode)`` stamp of ``path``, or ``None`` if it is missing."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+@dataclass
+class _CachedFile:
+    stamp: FileStamp
+    text: str
+    parsed: Any
+    verified_at_ns: int
+
+
+_FILE_CACHE: dict[Path, _CachedFile] = {}
+_FILE_CACHE_LOCK = threading.Lock()
+
+
+def clear_file_cache() -> None:
+    """Drop every cached file read in this process."""
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE.clear()
+
+
+def read_cached_file(path: Path, parse: Callable[[str], Any]) -> Any | None:
+    """Return ``parse(text)`` for ``path``, reusing the cached value while it is unchanged.
+
+    Returns ``None`` when the file does not exist.
+    """
+    key = path.absolute()
+    stamp = file_stamp(path)
+    if stamp is None:
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE.pop(key, None)
+        return None
+
+    now_ns = time.time_ns()
+    with _FILE_CACHE_LOCK:
+        cached = _FILE_CACHE.get(key)
+    if cached is not None and cached.stamp == stamp:
+        if cached.verified_at_ns - stamp[0] >= _RACY_WINDOW_NS:
+            return cached.parsed
+        text = path.read_text(encoding="utf-8")
+        if text == cached.text:
+            cached.verified_at_ns = now_ns
+            return cached.parsed
+    else:
+        text = path.read_text(encoding="utf-8")
+
+    parsed = parse(text)
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[key] = _CachedFile(
+            stamp=stamp,
+            text=text,
+            parsed=parsed,
+            verified_at_ns=now_ns,
+        )
+    return parsed
+
+
+def atomic_write_text(
+    path: Path,
+    content: str,
+    *,
+    parse: Callable[[str], Any] = str,
+) -> None:
+    """Write ``content`` via a temporary file and rename so readers never see partial text.
+
+    The cache entry for ``path`` is refreshed with ``parse(content)``.
+    """
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temp_path.write_text(content, encoding="utf-8")
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    key = path.absolute()
+    try:
+        parsed = parse(content)
+    except Exception:  # noqa: BLE001
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE.pop(key, None)
+        return
+    stamp = file_stamp(path)
+    with _FILE_CACHE_LOCK:
+        if stamp is None:
+            _FILE_CACHE.pop(key, None)
+            return
+        _FILE_CACHE[key] = _CachedFile(
+            stamp=stamp,
+            text=content,
+            parsed=parsed,
+            verified_at_ns=time.time_ns(),
+        )
+
+
+def _parse_config(text: str) -> dict[str, Any]:
+    config = yaml.safe_load(text) or {}
+    if isinstance(config, dict):
+        validate_no_legacy_config_keys(config)
+        return config
+    return {}
+
+
 class FileStorage:
     def __init__(self, agent_dir: Path, shared_tiers_dir: Path | None = None):
         self.agent_dir = agent_dir
@@ -37,31 +161,27 @@ class FileStorage:
 
     def read_tier(self, tier: KnowledgeTier) -> str:
         shared_path = self._shared_tier_path(tier)
-        if shared_path is not None and shared_path.exists():
-            return shared_path.read_text()
-        local_path = self._local_tier_path(tier)
-        if local_path.exists():
-            return local_path.read_text()
-        return ""
+        if shared_path is not None:
+            shared = read_cached_file(shared_path, str)
+            if shared is not None:
+                return shared
+        local = read_cached_file(self._local_tier_path(tier), str)
+        return local if local is not None else ""
 
     def write_tier(self, tier: KnowledgeTier, content: str) -> None:
         local_path = self._local_tier_path(tier)
-        local_path.write_text(content)
+        atomic_write_text(local_path, content)
         shared_path = self._shared_tier_path(tier)
         if shared_path is not None and shared_path != local_path:
             shared_path.parent.mkdir(parents=True, exist_ok=True)
-            shared_path.write_text(content)
+            atomic_write_text(shared_path, content)
 
     def read_config(self) -> dict[str, Any]:
-        path = self.agent_dir / "config.yaml"
-        if path.exists():
-            config = yaml.safe_load(path.read_text()) or {}
-            if isinstance(config, dict):
-                validate_no_legacy_config_keys(config)
-                return config
-            return {}
-        return {}
+        config = read_cached_file(self.agent_dir / "config.yaml", _parse_config)
+        # Callers routinely mutate the returned dict before write_config().
+        return copy.deepcopy(config) if config else {}
 
     def write_config(self, config: dict[str, Any]) -> None:
         path = self.agent_dir / "config.yaml"
-        path.write_text(yaml.dump(config, default_flow_style=False, sort_keys=False))
+        text = yaml.dump(config, default_flow_style=False, sort_keys=False)
+        atomic_write_text(path, text, parse=_parse_config)
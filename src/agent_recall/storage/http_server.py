@@ -1,13 +1,564 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from socketserver import ThreadingMixIn
+from typing import IO, Any, TypeVar, cast
 from urllib.parse import parse_qs
+from uuid import UUID, uuid4
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer, make_server
 
+from pydantic import BaseModel, ValidationError
+
+from agent_recall.storage.base import UnsupportedStorageCapabilityError
+from agent_recall.storage.models import (
+    AuditEvent,
+    BackgroundSyncStatus,
+    Chunk,
+    CurationStatus,
+    LogEntry,
+    SemanticLabel,
+    Session,
+    SessionCheckpoint,
+    SessionStatus,
+)
 from agent_recall.storage.sqlite import SQLiteStorage
 
-_JSON_HEADERS = [("Content-Type", "application/json; charset=utf-8")]
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_FILENAME = "audit-events.jsonl"
+
+_JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+# Compressing tiny bodies costs more than it saves on the wire.
+_GZIP_MIN_BYTES = 1024
+# Chunk reads are validated against the chunk-generation counter, so a matching
+# If-None-Match is answered before the query runs.
+_CHUNK_READ_PATHS = frozenset({"/chunks", "/chunks/count", "/chunks/search", "/chunks/embeddings"})
+_MAX_BODY_BYTES = 32 * 1024 * 1024
+# Rejected requests drain bodies up to this size to keep the connection; larger ones close it.
+_DRAIN_LIMIT_BYTES = 64 * 1024
+# Per-connection state the keep-alive handler shares with the app through the environ.
+_CONNECTION_STATE_KEY = "agent_recall.connection"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: str, error: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+def _bad_request(message: str) -> _HTTPError:
+    return _HTTPError("400 Bad Request", "invalid_request", message)
+
+
+def _not_found(message: str) -> _HTTPError:
+    return _HTTPError("404 Not Found", "not_found", message)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_json(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for token in accept_encoding.split(","):
+        coding, _, params = token.strip().partition(";")
+        if coding.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+@dataclass
+class _Request:
+    method: str
+    path_params: dict[str, str]
+    query: dict[str, list[str]]
+    body: bytes
+    storage: SQLiteStorage
+    tenant_id: str
+    project_id: str
+
+    def arg(self, name: str) -> str | None:
+        values = self.query.get(name)
+        if not values:
+            return None
+        value = values[0].strip()
+        return value or None
+
+    def required_arg(self, name: str) -> str:
+        value = self.arg(name)
+        if value is None:
+            raise _bad_request(f"Query parameter '{name}' is required.")
+        return value
+
+    def int_arg(
+        self, name: str, default: int, *, minimum: int = 1, maximum: int | None = None
+    ) -> int:
+        raw = self.arg(name)
+        if raw is None:
+            value = default
+        else:
+            try:
+                value = int(raw)
+            except ValueError:
+                raise _bad_request(f"Query parameter '{name}' must be an integer.") from None
+        value = max(minimum, value)
+        return min(value, maximum) if maximum is not None else value
+
+    def uuid_param(self, name: str) -> UUID:
+        try:
+            return UUID(self.path_params[name])
+        except ValueError:
+            raise _bad_request(f"Path parameter '{name}' must be a UUID.") from None
+
+    def json(self) -> dict[str, Any]:
+        try:
+            payload = json.loads(self.body or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise _bad_request("Request body must be valid JSON.") from None
+        if not isinstance(payload, dict):
+            raise _bad_request("Request body must be a JSON object.")
+        return payload
+
+    def items(self, field: str, *, max_items: int) -> list[Any]:
+        items = self.json().get(field)
+        if not isinstance(items, list):
+            raise _bad_request(f"Field '{field}' must be a list.")
+        if len(items) > max_items:
+            raise _bad_request(f"Field '{field}' accepts at most {max_items} items per request.")
+        return items
+
+    def models(self, field: str, model_type: type[ModelT], *, max_items: int) -> list[ModelT]:
+        try:
+            return [
+                model_type.model_validate(item) for item in self.items(field, max_items=max_items)
+            ]
+        except ValidationError as exc:
+            raise _bad_request(f"Invalid {model_type.__name__} payload: {exc}") from None
+
+    def model(self, model_type: type[ModelT]) -> ModelT:
+        try:
+            return model_type.model_validate_json(self.body or b"{}")
+        except ValidationError as exc:
+            raise _bad_request(f"Invalid {model_type.__name__} payload: {exc}") from None
+
+
+_Response = tuple[str, Any]
+_Handler = Callable[[_Request], _Response]
+
+_OK: _Response = ("200 OK", {"status": "ok"})
+
+
+def _enable_wal(db_path: Path) -> None:
+    """Switch the served database to WAL; the mode persists in the database file."""
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+
+
+class _ScopedStorageCache:
+    """One ``SQLiteStorage`` per tenant/project so schema setup runs once per scope."""
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._storages: dict[tuple[str, str], SQLiteStorage] = {}
+
+    def get(self, tenant_id: str, project_id: str) -> SQLiteStorage:
+        key = (tenant_id, project_id)
+        storage = self._storages.get(key)
+        if storage is not None:
+            return storage
+        with self._lock:
+            storage = self._storages.get(key)
+            if storage is None:
+                storage = SQLiteStorage(
+                    self._db_path,
+                    tenant_id=tenant_id,
+                    project_id=project_id,
+                    strict_namespace_validation=False,
+                )
+                self._storages[key] = storage
+        return storage
+
+
+def _dump_all(items: Iterable[BaseModel]) -> list[dict[str, Any]]:
+    return [item.model_dump(mode="json") for item in items]
+
+
+def _build_routes(
+    *,
+    max_limit: int,
+    audit_log_path: Path,
+) -> list[tuple[str, re.Pattern[str], _Handler]]:
+    audit_lock = threading.Lock()
+
+    # Sessions
+
+    def create_session(req: _Request) -> _Response:
+        session = req.model(Session)
+        req.storage.create_session(session)
+        return "201 Created", session.model_dump(mode="json")
+
+    def get_active_session(req: _Request) -> _Response:
+        session = req.storage.get_active_session()
+        if session is None:
+            raise _not_found("No active session in current scope.")
+        return "200 OK", session.model_dump(mode="json")
+
+    def list_sessions(req: _Request) -> _Response:
+        raw_status = req.arg("status")
+        try:
+            status = SessionStatus(raw_status) if raw_status else None
+        except ValueError:
+            raise _bad_request(f"Unknown session status '{raw_status}'.") from None
+        limit = req.int_arg("limit", 50, maximum=max_limit)
+        return "200 OK", _dump_all(req.storage.list_sessions(limit=limit, status=status))
+
+    def get_session(req: _Request) -> _Response:
+        session = req.storage.get_session(req.uuid_param("session_id"))
+        if session is None:
+            raise _not_found("Session not found in current scope.")
+        return "200 OK", session.model_dump(mode="json")
+
+    def update_session(req: _Request) -> _Response:
+        session = req.model(Session)
+        if session.id != req.uuid_param("session_id"):
+            raise _bad_request("Session id in body does not match the request path.")
+        req.storage.update_session(session)
+        return "200 OK", session.model_dump(mode="json")
+
+    def get_session_entries(req: _Request) -> _Response:
+        return "200 OK", _dump_all(req.storage.get_entries(req.uuid_param("session_id")))
+
+    # Log entries
+
+    def append_entry(req: _Request) -> _Response:
+        entry = req.model(LogEntry)
+        req.storage.append_entry(entry)
+        return "201 Created", entry.model_dump(mode="json")
+
+    def append_entries(req: _Request) -> _Response:
+        entries = req.models("entries", LogEntry, max_items=max_limit)
+        # Retried pages must not conflict with rows an earlier attempt already wrote.
+        req.storage.append_entries(entries, skip_existing=True)
+        return "201 Created", {"count": len(entries)}
+
+    def list_entries(req: _Request) -> _Response:
+        limit = req.int_arg("limit", 100, maximum=max_limit)
+        try:
+            status = CurationStatus(req.arg("curation_status") or CurationStatus.APPROVED.value)
+            labels = [SemanticLabel(value) for value in req.query.get("labels", []) if value]
+        except ValueError as exc:
+            raise _bad_request(str(exc)) from None
+        if labels:
+            entries = req.storage.get_entries_by_label(
+                labels,
+                limit=limit,
+                curation_status=status,
+            )
+        else:
+            entries = req.storage.list_entries_by_curation_status(status, limit=limit)
+        return "200 OK", _dump_all(entries)
+
+    def count_entries(req: _Request) -> _Response:
+        return "200 OK", {"count": req.storage.count_log_entries()}
+
+    def entries_by_source_session(req: _Request) -> _Response:
+        source_session_id = req.required_arg("source_session_id")
+        limit = req.int_arg("limit", 200, maximum=max_limit)
+        entries = req.storage.get_entries_by_source_session(source_session_id, limit=limit)
+        if not entries:
+            raise _not_found("No entries found for source_session_id in current scope.")
+        return "200 OK", _dump_all(entries)
+
+    def update_entry(req: _Request) -> _Response:
+        raw_status = req.json().get("curation_status")
+        try:
+            status = CurationStatus(raw_status)
+        except ValueError:
+            raise _bad_request(f"Unknown curation status '{raw_status}'.") from None
+        entry = req.storage.update_entry_curation_status(req.uuid_param("entry_id"), status)
+        if entry is None:
+            raise _not_found("Entry not found in current scope.")
+        return "200 OK", entry.model_dump(mode="json")
+
+    # Chunks
+
+    def store_chunk(req: _Request) -> _Response:
+        chunk = req.model(Chunk)
+        req.storage.store_chunk(chunk)
+        return "201 Created", {"id": str(chunk.id)}
+
+    def store_chunks(req: _Request) -> _Response:
+        chunks = req.models("chunks", Chunk, max_items=max_limit)
+        req.storage.store_chunks(chunks, skip_existing=True)
+        return "201 Created", {"count": len(chunks)}
+
+    def list_chunks(req: _Request) -> _Response:
+        return "200 OK", _dump_all(req.storage.list_chunks())
+
+    def chunk_exists(req: _Request) -> _Response:
+        payload = req.json()
+        content = payload.get("content")
+        if not isinstance(content, str):
+            raise _bad_request("Field 'content' must be a string.")
+        try:
+            label = SemanticLabel(payload.get("label"))
+        except ValueError:
+            raise _bad_request(f"Unknown label '{payload.get('label')}'.") from None
+        return "200 OK", {"exists": req.storage.has_chunk(content, label)}
+
+    def find_existing_chunks(req: _Request) -> _Response:
+        candidates: list[tuple[str, SemanticLabel]] = []
+        for item in req.items("candidates", max_items=max_limit):
+            content = item.get("content") if isinstance(item, dict) else None
+            if not isinstance(content, str):
+                raise _bad_request("Each candidate needs a string 'content'.")
+            try:
+                candidates.append((content, SemanticLabel(item.get("label"))))
+            except ValueError:
+                raise _bad_request(f"Unknown label '{item.get('label')}'.") from None
+        existing = req.storage.find_existing_chunks(candidates)
+        return "200 OK", {
+            "existing": [
+                {"content": content, "label": label.value}
+                for content, label in candidates
+                if (content, label) in existing
+            ]
+        }
+
+    def count_chunks(req: _Request) -> _Response:
+        return "200 OK", {"count": req.storage.count_chunks()}
+
+    def search_chunks(req: _Request) -> _Response:
+        query = req.required_arg("q")
+        top_k = req.int_arg("top_k", 5, maximum=max_limit)
+        return "200 OK", _dump_all(req.storage.search_chunks_fts(query, top_k=top_k))
+
+    def list_chunk_embeddings(req: _Request) -> _Response:
+        return "200 OK", _dump_all(req.storage.list_chunks_with_embeddings())
+
+    def index_chunk_embedding(req: _Request) -> _Response:
+        embedding = req.json().get("embedding")
+        if not isinstance(embedding, list) or not all(
+            isinstance(value, (int, float)) for value in embedding
+        ):
+            raise _bad_request("Field 'embedding' must be a list of numbers.")
+        req.storage.index_chunk_embedding(
+            req.uuid_param("chunk_id"), [float(value) for value in embedding]
+        )
+        return _OK
+
+    def index_chunk_embeddings(req: _Request) -> _Response:
+        payload = req.json().get("embeddings")
+        if not isinstance(payload, dict):
+            raise _bad_request("Field 'embeddings' must map chunk ids to vectors.")
+        if len(payload) > max_limit:
+            raise _bad_request(f"Field 'embeddings' accepts at most {max_limit} items.")
+        embeddings: dict[UUID, list[float]] = {}
+        for raw_id, vector in payload.items():
+            if not isinstance(vector, list) or not all(
+                isinstance(value, (int, float)) for value in vector
+            ):
+                raise _bad_request("Embeddings must be lists of numbers.")
+            try:
+                embeddings[UUID(str(raw_id))] = [float(value) for value in vector]
+            except ValueError:
+                raise _bad_request(f"Invalid chunk id '{raw_id}'.") from None
+        req.storage.index_chunk_embeddings(embeddings)
+        return "200 OK", {"count": len(embeddings)}
+
+    # Processed sessions and checkpoints
+
+    def check_processed(req: _Request) -> _Response:
+        source_session_id = req.required_arg("source_session_id")
+        return "200 OK", {"processed": req.storage.is_session_processed(source_session_id)}
+
+    def mark_processed(req: _Request) -> _Response:
+        source_session_id = req.json().get("source_session_id")
+        if not isinstance(source_session_id, str) or not source_session_id.strip():
+            raise _bad_request("Field 'source_session_id' is required.")
+        req.storage.mark_session_processed(source_session_id)
+        return _OK
+
+    def mark_processed_batch(req: _Request) -> _Response:
+        source_session_ids = req.items("source_session_ids", max_items=max_limit)
+        if not all(isinstance(item, str) and item.strip() for item in source_session_ids):
+            raise _bad_request("Field 'source_session_ids' must contain non-empty strings.")
+        req.storage.mark_sessions_processed(source_session_ids)
+        return "200 OK", {"count": len(source_session_ids)}
+
+    def clear_processed(req: _Request) -> _Response:
+        count = req.storage.clear_processed_sessions(
+            source=req.arg("source"),
+            source_session_id=req.arg("source_session_id"),
+        )
+        return "200 OK", {"count": count}
+
+    def get_checkpoint(req: _Request) -> _Response:
+        checkpoint = req.storage.get_session_checkpoint(req.required_arg("source_session_id"))
+        if checkpoint is None:
+            raise _not_found("Checkpoint not found in current scope.")
+        return "200 OK", checkpoint.model_dump(mode="json")
+
+    def save_checkpoint(req: _Request) -> _Response:
+        req.storage.save_session_checkpoint(req.model(SessionCheckpoint))
+        return _OK
+
+    def clear_checkpoints(req: _Request) -> _Response:
+        count = req.storage.clear_session_checkpoints(
+            source=req.arg("source"),
+            source_session_id=req.arg("source_session_id"),
+        )
+        return "200 OK", {"count": count}
+
+    # Change feed
+
+    def list_changes(req: _Request) -> _Response:
+        since = req.int_arg("since", 0, minimum=0)
+        limit = req.int_arg("limit", 500, maximum=max_limit)
+        batch = req.storage.list_changes(since=since, limit=limit)
+        return "200 OK", batch.model_dump(mode="json")
+
+    # Stats and background sync
+
+    def get_stats(req: _Request) -> _Response:
+        return "200 OK", req.storage.get_stats()
+
+    def get_last_processed(req: _Request) -> _Response:
+        last = req.storage.get_last_processed_at()
+        return "200 OK", {"last_processed_at": last.isoformat() if last else None}
+
+    def recent_sources(req: _Request) -> _Response:
+        limit = req.int_arg("limit", 20, maximum=max_limit)
+        return "200 OK", req.storage.list_recent_source_sessions(limit=limit)
+
+    def get_background_status(req: _Request) -> _Response:
+        return "200 OK", req.storage.get_background_sync_status().model_dump(mode="json")
+
+    def save_background_status(req: _Request) -> _Response:
+        req.storage.save_background_sync_status(req.model(BackgroundSyncStatus))
+        return _OK
+
+    def start_background_sync(req: _Request) -> _Response:
+        pid = req.json().get("pid")
+        if not isinstance(pid, int) or isinstance(pid, bool):
+            raise _bad_request("Field 'pid' must be an integer.")
+        return "200 OK", req.storage.start_background_sync(pid).model_dump(mode="json")
+
+    def complete_background_sync(req: _Request) -> _Response:
+        payload = req.json()
+        try:
+            status = req.storage.complete_background_sync(
+                int(payload.get("sessions_processed", 0)),
+                int(payload.get("learnings_extracted", 0)),
+                payload.get("error_message"),
+            )
+        except (TypeError, ValueError):
+            raise _bad_request("Sync counters must be integers.") from None
+        return "200 OK", status.model_dump(mode="json")
+
+    # Audit and health
+
+    def write_audit_events(req: _Request, events: list[AuditEvent]) -> None:
+        # The request scope is authoritative; clients cannot log into another namespace.
+        scope = {"tenant_id": req.tenant_id, "project_id": req.project_id}
+        lines = "".join(event.model_copy(update=scope).model_dump_json() + "\n" for event in events)
+        with audit_lock, audit_log_path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+    def record_audit_event(req: _Request) -> _Response:
+        event = req.model(AuditEvent)
+        write_audit_events(req, [event])
+        return "201 Created", {"id": str(event.id)}
+
+    def record_audit_events(req: _Request) -> _Response:
+        events = req.models("events", AuditEvent, max_items=max_limit)
+        write_audit_events(req, events)
+        return "201 Created", {"count": len(events)}
+
+    def health(req: _Request) -> _Response:
+        return _OK
+
+    raw_routes: list[tuple[str, str, _Handler]] = [
+        ("GET", "/health", health),
+        ("POST", "/sessions", create_session),
+        ("GET", "/sessions", list_sessions),
+        ("GET", "/sessions/active", get_active_session),
+        ("GET", "/sessions/{session_id}", get_session),
+        ("PUT", "/sessions/{session_id}", update_session),
+        ("GET", "/sessions/{session_id}/entries", get_session_entries),
+        ("POST", "/entries", append_entry),
+        ("POST", "/entries/batch", append_entries),
+        ("GET", "/entries", list_entries),
+        ("GET", "/entries/count", count_entries),
+        ("GET", "/entries/by-source-session", entries_by_source_session),
+        ("PUT", "/entries/{entry_id}", update_entry),
+        ("POST", "/chunks", store_chunk),
+        ("POST", "/chunks/batch", store_chunks),
+        ("GET", "/chunks", list_chunks),
+        ("POST", "/chunks/exists", chunk_exists),
+        ("POST", "/chunks/exists/batch", find_existing_chunks),
+        ("GET", "/chunks/count", count_chunks),
+        ("GET", "/chunks/search", search_chunks),
+        ("GET", "/chunks/embeddings", list_chunk_embeddings),
+        ("POST", "/chunks/embeddings/batch", index_chunk_embeddings),
+        ("POST", "/chunks/{chunk_id}/embedding", index_chunk_embedding),
+        ("GET", "/processed_sessions/check", check_processed),
+        ("PUT", "/processed_sessions", mark_processed),
+        ("PUT", "/processed_sessions/batch", mark_processed_batch),
+        ("DELETE", "/processed_sessions", clear_processed),
+        ("GET", "/checkpoints", get_checkpoint),
+        ("PUT", "/checkpoints", save_checkpoint),
+        ("DELETE", "/checkpoints", clear_checkpoints),
+        ("GET", "/changes", list_changes),
+        ("GET", "/stats", get_stats),
+        ("GET", "/stats/last_processed", get_last_processed),
+        ("GET", "/recent-sources", recent_sources),
+        ("GET", "/background-sync/status", get_background_status),
+        ("PUT", "/background-sync/status", save_background_status),
+        ("POST", "/background-sync/start", start_background_sync),
+        ("POST", "/background-sync/complete", complete_background_sync),
+        ("POST", "/audit/events", record_audit_event),
+        ("POST", "/audit/events/batch", record_audit_events),
+    ]
+    routes: list[tuple[str, re.Pattern[str], _Handler]] = []
+    for method, template, handler in raw_routes:
+        pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", template)
+        routes.append((method, re.compile(f"^{pattern}$"), handler))
+    return routes
 
 
 def create_shared_backend_wsgi_app(
@@ -17,28 +568,77 @@ def create_shared_backend_wsgi_app(
     default_project_id: str = "default",
     bearer_token: str | None = None,
     max_limit: int = 2000,
+    gzip_min_bytes: int = _GZIP_MIN_BYTES,
+    max_body_bytes: int = _MAX_BODY_BYTES,
 ):
-    """Build a minimal WSGI app for shared-backend HTTP storage endpoints.
+    """Build a WSGI app serving the shared-backend HTTP storage API used by ``RemoteStorage``.
+
+    Every ``_HTTPClient`` endpoint is routed to a ``SQLiteStorage`` scoped by the
+    ``X-Tenant-ID``/``X-Project-ID`` headers. Storages are cached per scope, responses
+    are compact JSON, and bodies of at least ``gzip_min_bytes`` are gzip-encoded when
+    the client sends ``Accept-Encoding: gzip``. ``GET`` responses carry an ``ETag``
+    (the chunk generation for chunk reads, a body digest otherwise) and a matching
+    ``If-None-Match`` is answered with ``304 Not Modified``.
 
-    This server currently exposes:
-    - GET /entries/by-source-session?source_session_id=<id>&limit=<n>
+    The bearer token is checked before routing or reading the body, and bodies over
+    ``max_body_bytes`` are rejected with ``413``. The database is switched to WAL so
+    concurrent request threads can read while another writes.
     """
 
     resolved_db_path = Path(db_path).expanduser()
     resolved_db_path.parent.mkdir(parents=True, exist_ok=True)
+    _enable_wal(resolved_db_path)
     safe_max_limit = max(1, int(max_limit))
+    safe_max_body_bytes = max(1, int(max_body_bytes))
+    storages = _ScopedStorageCache(resolved_db_path)
+    routes = _build_routes(
+        max_limit=safe_max_limit,
+        audit_log_path=resolved_db_path.parent / AUDIT_LOG_FILENAME,
+    )
+
+    # Generation ETags embed this id so a rebuilt database never revalidates old caches.
+    instance_id = uuid4().hex[:12]
 
     def _json_response(
+        environ: dict[str, Any],
         start_response,
         status: str,
-        payload: dict[str, Any] | list[dict[str, Any]],
+        payload: Any,
+        etag: str | None = None,
     ) -> list[bytes]:
-        body = json.dumps(payload, indent=2).encode("utf-8")
-        headers = list(_JSON_HEADERS)
+        body = _encode_json(payload)
+        if etag is None and status.startswith("200") and environ.get("REQUEST_METHOD") == "GET":
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if etag is not None and etag == _header(environ, "If-None-Match"):
+            return _not_modified(start_response, etag)
+        headers = [("Content-Type", _JSON_CONTENT_TYPE), ("Vary", "Accept-Encoding")]
+        if etag is not None:
+            headers.append(("ETag", etag))
+        if len(body) >= gzip_min_bytes and _accepts_gzip(_header(environ, "Accept-Encoding")):
+            body = gzip.compress(body, compresslevel=5)
+            headers.append(("Content-Encoding", "gzip"))
         headers.append(("Content-Length", str(len(body))))
         start_response(status, headers)
         return [body]
 
+    def _not_modified(start_response, etag: str) -> list[bytes]:
+        start_response("304 Not Modified", [("ETag", etag), ("Content-Length", "0")])
+        return []
+
+    def _chunk_etag(request: _Request) -> str | None:
+        generation = request.storage.get_chunk_generation()
+        if generation is None:
+            return None
+        return f'"chunks-{instance_id}-{generation}"'
+
+    def _error_response(environ: dict[str, Any], start_response, error: _HTTPError) -> list[bytes]:
+        return _json_response(
+            environ,
+            start_response,
+            error.status,
+            {"error": error.error, "message": error.message},
+        )
+
     def _header(environ: dict[str, Any], name: str) -> str:
         key = f"HTTP_{name.upper().replace('-', '_')}"
         return str(environ.get(key, "")).strip()
@@ -54,72 +654,202 @@ def create_shared_backend_wsgi_app(
         authorization = _header(environ, "Authorization")
         return authorization == f"Bearer {bearer_token}"
 
+    def _content_length(environ: dict[str, Any]) -> int:
+        try:
+            return max(0, int(environ.get("CONTENT_LENGTH") or 0))
+        except ValueError:
+            return 0
+
+    def _discard_body(environ: dict[str, Any], length: int) -> None:
+        """Drain a small unread body, or have the handler close the connection."""
+        if length <= _DRAIN_LIMIT_BYTES:
+            environ["wsgi.input"].read(length)
+            return
+        state = environ.get(_CONNECTION_STATE_KEY)
+        if isinstance(state, dict):
+            state["close"] = True
+
+    def _match(method: str, path: str) -> tuple[_Handler, dict[str, str]] | None:
+        path_matched = False
+        for route_method, pattern, handler in routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return handler, match.groupdict()
+            path_matched = True
+        if path_matched:
+            raise _HTTPError("405 Method Not Allowed", "method_not_allowed", "Method not allowed.")
+        return None
+
     def app(environ: dict[str, Any], start_response):
         method = str(environ.get("REQUEST_METHOD", "")).strip().upper()
-        path = str(environ.get("PATH_INFO", "")).strip()
+        path = str(environ.get("PATH_INFO", "")).strip().rstrip("/") or "/"
 
-        if method == "GET" and path == "/entries/by-source-session":
+        length = _content_length(environ)
+        try:
+            # Reject before routing or buffering, so unauthenticated callers learn nothing
+            # about the routes and cannot make the server hold large bodies.
             if not _is_authorized(environ):
-                return _json_response(
-                    start_response,
-                    "401 Unauthorized",
-                    {
-                        "error": "unauthorized",
-                        "message": "Missing or invalid bearer token.",
-                    },
-                )
-
-            query = parse_qs(str(environ.get("QUERY_STRING", "")), keep_blank_values=True)
-            source_session_id = str(query.get("source_session_id", [""])[0]).strip()
-            if not source_session_id:
-                return _json_response(
-                    start_response,
-                    "400 Bad Request",
-                    {
-                        "error": "invalid_request",
-                        "message": "Query parameter 'source_session_id' is required.",
-                    },
+                _discard_body(environ, length)
+                raise _HTTPError(
+                    "401 Unauthorized", "unauthorized", "Missing or invalid bearer token."
                 )
-
-            raw_limit = str(query.get("limit", ["200"])[0]).strip()
-            try:
-                limit = int(raw_limit)
-            except ValueError:
-                return _json_response(
-                    start_response,
-                    "400 Bad Request",
-                    {
-                        "error": "invalid_request",
-                        "message": "Query parameter 'limit' must be an integer.",
-                    },
+            if length > safe_max_body_bytes:
+                _discard_body(environ, length)
+                raise _HTTPError(
+                    "413 Content Too Large",
+                    "body_too_large",
+                    f"Request body exceeds {safe_max_body_bytes} bytes.",
                 )
-            limit = max(1, min(limit, safe_max_limit))
-
+            # Read the whole body so a kept-alive connection starts the next request cleanly.
+            body = environ["wsgi.input"].read(length) if length else b""
+            matched = _match(method, path)
+            if matched is None:
+                raise _not_found("Endpoint not found.")
+            handler, path_params = matched
             tenant_id, project_id = _resolve_scope(environ)
-            scoped_storage = SQLiteStorage(
-                resolved_db_path,
+            request = _Request(
+                method=method,
+                path_params=path_params,
+                query=parse_qs(str(environ.get("QUERY_STRING", "")), keep_blank_values=True),
+                body=body,
+                storage=storages.get(tenant_id, project_id),
                 tenant_id=tenant_id,
                 project_id=project_id,
-                strict_namespace_validation=False,
             )
-            entries = scoped_storage.get_entries_by_source_session(source_session_id, limit=limit)
-            if not entries:
-                return _json_response(
-                    start_response,
-                    "404 Not Found",
-                    {
-                        "error": "not_found",
-                        "message": "No entries found for source_session_id in current scope.",
-                    },
-                )
+            etag = _chunk_etag(request) if method == "GET" and path in _CHUNK_READ_PATHS else None
+            if etag is not None and etag == _header(environ, "If-None-Match"):
+                return _not_modified(start_response, etag)
+            status, payload = handler(request)
+        except _HTTPError as exc:
+            return _error_response(environ, start_response, exc)
+        except sqlite3.IntegrityError:
+            return _error_response(
+                environ,
+                start_response,
+                _HTTPError("409 Conflict", "conflict", "Resource already exists."),
+            )
+        except UnsupportedStorageCapabilityError as exc:
+            return _error_response(
+                environ,
+                start_response,
+                _HTTPError("501 Not Implemented", "unsupported", str(exc)),
+            )
+        except Exception:  # noqa: BLE001
+            logger.exception("Shared backend request failed: %s %s", method, path)
+            return _error_response(
+                environ,
+                start_response,
+                _HTTPError("500 Internal Server Error", "internal_error", "Storage error."),
+            )
+        return _json_response(environ, start_response, status, payload, etag)
 
-            payload = [entry.model_dump(mode="json") for entry in entries]
-            return _json_response(start_response, "200 OK", payload)
+    return app
 
-        return _json_response(
-            start_response,
-            "404 Not Found",
-            {"error": "not_found", "message": "Endpoint not found."},
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class _KeepAliveWSGIRequestHandler(WSGIRequestHandler):
+    """Serve HTTP/1.1 requests on one connection until the client closes it or idles out."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; Nagle would hold the body back.
+    disable_nagle_algorithm = True
+    # Idle keep-alive connections each hold a server thread; reclaim them.
+    timeout = 30
+
+    def handle(self) -> None:
+        self.close_connection = False
+        while not self.close_connection:
+            try:
+                self._handle_one()
+            except (TimeoutError, ConnectionError):
+                self.close_connection = True
+
+    def _handle_one(self) -> None:
+        self.raw_requestline = self.rfile.readline(65537)
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ""
+            self.request_version = ""
+            self.command = ""
+            self.send_error(414)
+            self.close_connection = True
+            return
+        if not self.parse_request():
+            return
+        environ = self.get_environ()
+        connection_state: dict[str, bool] = {"close": False}
+        environ[_CONNECTION_STATE_KEY] = connection_state
+        handler = ServerHandler(
+            cast(IO[bytes], self.rfile),
+            cast(IO[bytes], self.wfile),
+            self.get_stderr(),
+            environ,
+            multithread=True,
         )
+        # Back-pointer ServerHandler.close() uses to log the request.
+        cast(Any, handler).request_handler = self
+        handler.http_version = self.request_version.removeprefix("HTTP/") or "1.0"
+        app = cast(WSGIServer, self.server).get_app()
+        if app is None:
+            raise RuntimeError("WSGI server has no application configured.")
+        handler.run(app)
+        self.wfile.flush()
+        if connection_state["close"]:
+            # The app left an oversized body unread; it cannot start the next request.
+            self.close_connection = True
 
-    return app
+
+class _QuietWSGIRequestHandler(_KeepAliveWSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+def make_shared_backend_server(
+    db_path: Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    access_log: bool = False,
+    **app_options: Any,
+) -> WSGIServer:
+    """Create a thread-per-request HTTP server for the shared backend (``port=0`` picks one)."""
+    app = create_shared_backend_wsgi_app(db_path, **app_options)
+    handler_class = _KeepAliveWSGIRequestHandler if access_log else _QuietWSGIRequestHandler
+    return make_server(
+        host,
+        port,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=handler_class,
+    )
+
+
+def serve_shared_backend(
+    db_path: Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    access_log: bool = False,
+    **app_options: Any,
+) -> None:
+    """Serve the shared backend until interrupted."""
+    server = make_shared_backend_server(
+        db_path,
+        host=host,
+        port=port,
+        access_log=access_log,
+        **app_options,
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
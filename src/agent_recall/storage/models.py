@@ -170,6 +170,24 @@ class AuditEvent(BaseModel):
     created_at: datetime = Field(default_factory=utcnow)
 
 
+class ChangeBatch(BaseModel):
+    """One page of the change feed: entries and chunks written after ``since``."""
+
+    since: int = 0
+    next_since: int = 0
+    latest_seq: int = 0
+    has_more: bool = False
+    entries: list[LogEntry] = Field(default_factory=list)
+    chunks: list[Chunk] = Field(default_factory=list)
+
+
+class LLMRateLimitConfig(BaseModel):
+    """Client-side request and token budget for one LLM provider."""
+
+    requests_per_minute: int | None = Field(default=None, gt=0)
+    tokens_per_minute: int | None = Field(default=None, gt=0)
+
+
 class LLMConfig(BaseModel):
     """LLM provider configuration."""
 
@@ -197,6 +215,10 @@ class LLMConfig(BaseModel):
     )
     max_tokens: int = Field(default=4096, gt=0, description="Maximum tokens to generate")
     timeout: float = Field(default=120.0, gt=0, description="Request timeout in seconds")
+    rate_limits: dict[str, LLMRateLimitConfig] = Field(
+        default_factory=dict,
+        description="Per-provider client-side rate limits shared by all calls in the process",
+    )
 
 
 class CompactionConfig(BaseModel):
@@ -212,6 +234,11 @@ class CompactionConfig(BaseModel):
     max_recent_tokens: int = 1500
     max_tier_tokens: int = 10000
     max_sessions_before_compact: int = 5
+    llm_concurrency: int = Field(
+        default=3,
+        ge=1,
+        description="Maximum tier-synthesis LLM requests in flight at once (1 = sequential)",
+    )
     promote_pattern_after_occurrences: int = 3
     index_decision_entries: bool = True
     index_decision_min_confidence: float = Field(default=0.7, ge=0.0, le=1.0)
@@ -222,6 +249,28 @@ class CompactionConfig(BaseModel):
     archive_sessions_older_than_days: int = 30
 
 
+class ExtractionConfig(BaseModel):
+    """Transcript extraction batching settings."""
+
+    batch_strategy: Literal["messages", "token_budget"] = Field(
+        default="messages",
+        description="'messages' chunks by a fixed message count; "
+        "'token_budget' packs messages up to an estimated prompt-token budget",
+    )
+    messages_per_batch: int = Field(default=50, ge=1)
+    prompt_token_budget: int = Field(default=6000, ge=1000)
+    per_model_prompt_token_budget: dict[str, int] = Field(
+        default_factory=dict,
+        description="Optional per-model prompt-token budgets (tokens)",
+    )
+    signal_filter_enabled: bool = Field(
+        default=False,
+        description="Skip or merge low-signal batches before calling the LLM",
+    )
+    signal_filter_min_score: int = Field(default=4, ge=1)
+    signal_filter_action: Literal["drop", "merge"] = "merge"
+
+
 class RetrievalConfig(BaseModel):
     """Retrieval configuration."""
 
@@ -273,6 +322,8 @@ class MemoryTurboPufferConfig(BaseModel):
     api_key_env: str = "TURBOPUFFER_API_KEY"
     timeout_seconds: float = Field(default=10.0, gt=0.0)
     retry_attempts: int = Field(default=2, ge=1, le=10)
+    upsert_batch_size: int = Field(default=500, ge=1)
+    upsert_concurrency: int = Field(default=4, ge=1, le=32)
 
 
 class MemoryConfig(BaseModel):
@@ -295,6 +346,12 @@ class MemoryConfig(BaseModel):
     external_embedding_api_key_env: str = "OPENAI_API_KEY"
     external_embedding_model: str = "text-embedding-3-small"
     external_embedding_timeout_seconds: float = Field(default=10.0, gt=0.0)
+    external_embedding_max_batch_inputs: int = Field(default=256, ge=1, le=2048)
+    external_embedding_max_batch_tokens: int = Field(default=100_000, ge=1)
+    external_embedding_concurrency: int = Field(default=4, ge=1, le=32)
+    external_embedding_retry_attempts: int = Field(default=3, ge=1, le=10)
+    external_embedding_requests_per_minute: int | None = Field(default=None, gt=0)
+    external_embedding_tokens_per_minute: int | None = Field(default=None, gt=0)
     cost: MemoryCostConfig = Field(default_factory=MemoryCostConfig)
     privacy: MemoryPrivacyConfig = Field(default_factory=MemoryPrivacyConfig)
     turbopuffer: MemoryTurboPufferConfig = Field(default_factory=MemoryTurboPufferConfig)
@@ -341,6 +398,55 @@ class SharedStorageConfig(BaseModel):
         description="Actor name recorded in shared backend audit events",
     )
     timeout_seconds: float = Field(default=10.0, gt=0.0, description="HTTP timeout in seconds")
+    batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=2000,
+        description="Maximum items sent per bulk request to the HTTP shared backend",
+    )
+    audit_batch_size: int = Field(
+        default=50,
+        ge=1,
+        description="Pending audit events that trigger a batched audit post",
+    )
+    audit_flush_interval_seconds: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Maximum age of pending audit events before the next write posts them",
+    )
+    max_connections: int = Field(
+        default=10,
+        ge=1,
+        description="Connection pool size for async requests to the HTTP shared backend",
+    )
+    http2: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 for async shared-backend requests (requires h2)",
+    )
+    write_behind_enabled: bool = Field(
+        default=True,
+        description=(
+            "Queue sync writes in the local database and replicate them to the shared "
+            "backend in the background"
+        ),
+    )
+    outbox_flush_interval_seconds: float = Field(
+        default=1.0,
+        gt=0.0,
+        description="Seconds between background flushes of the write-behind queue",
+    )
+    read_cache_enabled: bool = Field(
+        default=True,
+        description=(
+            "Mirror shared chunks and cache read responses in a local SQLite file, "
+            "revalidated against the HTTP shared backend with ETags"
+        ),
+    )
+    read_cache_max_age_seconds: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="Serve the local chunk mirror without revalidating for this many seconds",
+    )
     retry_attempts: int = Field(
         default=2,
         ge=0,
@@ -384,6 +490,12 @@ class TelemetryConfig(BaseModel):
     """Telemetry configuration for local pipeline observability."""
 
     enabled: bool = True
+    flush_max_events: int = Field(default=100, ge=1)
+    flush_interval_seconds: float = Field(default=5.0, ge=0.0)
+    retention_days: float | None = Field(default=30.0, gt=0.0)
+    max_events: int | None = Field(default=100_000, ge=1)
+    jsonl_max_bytes: int = Field(default=5 * 1024 * 1024, ge=1)
+    jsonl_backups: int = Field(default=3, ge=0)
 
 
 class RalphNotificationEvent(StrEnum):
@@ -525,6 +637,7 @@ class AgentRecallConfig(BaseModel):
     extends: list[str] = Field(default_factory=list)
     llm: LLMConfig = Field(default_factory=LLMConfig)
     compaction: CompactionConfig = Field(default_factory=CompactionConfig)
+    extraction: ExtractionConfig = Field(default_factory=ExtractionConfig)
     retrieval: RetrievalConfig = Field(default_factory=RetrievalConfig)
     memory: MemoryConfig = Field(default_factory=MemoryConfig)
     embeddings: EmbeddingSettings = Field(default_factory=EmbeddingSettings)
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from agent_recall.storage.base import (
+    PermissionDeniedError,
+    SharedBackendUnavailableError,
+    Storage,
+)
+from agent_recall.storage.models import LogEntry, SessionCheckpoint
+
+OP_APPEND_ENTRIES = "append_entries"
+OP_MARK_PROCESSED = "mark_sessions_processed"
+OP_SAVE_CHECKPOINT = "save_session_checkpoint"
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tenant_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    enqueued_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_shared_outbox_pending
+    ON shared_outbox(tenant_id, project_id, state, id);
+CREATE INDEX IF NOT EXISTS idx_shared_outbox_key
+    ON shared_outbox(tenant_id, project_id, operation, item_key);
+"""
+
+# Responses that will not succeed on retry; the item is parked as failed instead of
+# blocking everything queued behind it.
+_PERMANENT_HTTP_STATUSES = frozenset({400, 404, 405, 410, 413, 422})
+_MAX_BACKOFF_SECONDS = 60.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(frozen=True)
+class OutboxItem:
+    id: int
+    operation: str
+    item_key: str
+    payload: Any
+
+
+@dataclass(frozen=True)
+class OutboxStatus:
+    pending: int
+    failed: int
+    oldest_enqueued_at: datetime | None
+    last_flushed_at: datetime | None
+    last_error: str | None
+
+    @property
+    def lag_seconds(self) -> float:
+        if self.oldest_enqueued_at is None:
+            return 0.0
+        return max(0.0, (_utcnow() - self.oldest_enqueued_at).total_seconds())
+
+
+class SharedWriteOutbox:
+    """Durable queue of shared-storage writes, kept in the local SQLite database."""
+
+    def __init__(self, db_path: Path, *, tenant_id: str, project_id: str) -> None:
+        self.db_path = db_path
+        self._scope = (tenant_id, project_id)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(OUTBOX_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def enqueue(self, operation: str, items: list[tuple[str, Any]]) -> None:
+        """Append ``(item_key, payload)`` pairs for ``operation`` in one transaction."""
+        if not items:
+            return
+        enqueued_at = _utcnow().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                """INSERT INTO shared_outbox
+                   (tenant_id, project_id, operation, item_key, payload, enqueued_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [
+                    (*self._scope, operation, key, json.dumps(payload), enqueued_at)
+                    for key, payload in items
+                ],
+            )
+
+    def pending(self, limit: int) -> list[OutboxItem]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT id, operation, item_key, payload FROM shared_outbox
+                   WHERE tenant_id = ? AND project_id = ? AND state = 'pending'
+                   ORDER BY id LIMIT ?""",
+                (*self._scope, limit),
+            ).fetchall()
+        return [
+            OutboxItem(id=row[0], operation=row[1], item_key=row[2], payload=json.loads(row[3]))
+            for row in rows
+        ]
+
+    def count_pending(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT COUNT(*) FROM shared_outbox
+                   WHERE tenant_id = ? AND project_id = ? AND state = 'pending'""",
+                self._scope,
+            ).fetchone()
+        return int(row[0])
+
+    def has_pending(self, operation: str, item_key: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT 1 FROM shared_outbox
+                   WHERE tenant_id = ? AND project_id = ? AND state = 'pending'
+                   AND operation = ? AND item_key = ?
+                   LIMIT 1""",
+                (*self._scope, operation, item_key),
+            ).fetchone()
+        return row is not None
+
+    def latest_payload(self, operation: str, item_key: str) -> Any | None:
+        """Return the newest pending payload for ``item_key``, or ``None``."""
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT payload FROM shared_outbox
+                   WHERE tenant_id = ? AND project_id = ? AND state = 'pending'
+                   AND operation = ? AND item_key = ?
+                   ORDER BY id DESC LIMIT 1""",
+                (*self._scope, operation, item_key),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def acknowledge(self, ids: list[int]) -> None:
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM shared_outbox WHERE id = ?", [(i,) for i in ids])
+
+    def record_error(self, ids: list[int], error: str, *, permanent: bool = False) -> None:
+        state = "failed" if permanent else "pending"
+        with self._connect() as conn:
+            conn.executemany(
+                """UPDATE shared_outbox
+                   SET attempts = attempts + 1, last_error = ?, state = ?
+                   WHERE id = ?""",
+                [(error, state, i) for i in ids],
+            )
+
+    def discard(self, operation: str, item_key: str | None = None) -> int:
+        """Drop pending items for ``operation`` (optionally one key); returns the count."""
+        query = """DELETE FROM shared_outbox
+                   WHERE tenant_id = ? AND project_id = ? AND state = 'pending'
+                   AND operation = ?"""
+        params: tuple[Any, ...] = (*self._scope, operation)
+        if item_key is not None:
+            query += " AND item_key = ?"
+            params += (item_key,)
+        with self._connect() as conn:
+            return conn.execute(query, params).rowcount
+
+    def status(self, last_flushed_at: datetime | None = None) -> OutboxStatus:
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT
+                       SUM(CASE WHEN state = 'pending' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN state = 'failed' THEN 1 ELSE 0 END),
+                       MIN(CASE WHEN state = 'pending' THEN enqueued_at END)
+                   FROM shared_outbox WHERE tenant_id = ? AND project_id = ?""",
+                self._scope,
+            ).fetchone()
+            error_row = conn.execute(
+                """SELECT last_error FROM shared_outbox
+                   WHERE tenant_id = ? AND project_id = ? AND last_error IS NOT NULL
+                   ORDER BY id DESC LIMIT 1""",
+                self._scope,
+            ).fetchone()
+        return OutboxStatus(
+            pending=int(row[0] or 0),
+            failed=int(row[1] or 0),
+            oldest_enqueued_at=datetime.fromisoformat(row[2]) if row[2] else None,
+            last_flushed_at=last_flushed_at,
+            last_error=str(error_row[0]) if error_row else None,
+        )
+
+
+def _is_conflict(exc: Exception) -> bool:
+    if isinstance(exc, sqlite3.IntegrityError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 409
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if isinstance(exc, (PermissionDeniedError, ValueError)):
+        return True
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and exc.response.status_code in _PERMANENT_HTTP_STATUSES
+    )
+
+
+_REPLAY_ERRORS: tuple[type[Exception], ...] = (
+    httpx.HTTPError,
+    sqlite3.Error,
+    OSError,
+    SharedBackendUnavailableError,
+    PermissionDeniedError,
+    ValueError,
+)
+
+
+class OutboxReplicator:
+    """Flush a ``SharedWriteOutbox`` to the shared backend from a daemon thread.
+
+    Consecutive items of one operation are replayed as a single batch call. Replays
+    are idempotent: entries the server already has (409 / unique-constraint errors)
+    are skipped one by one, and processed marks and checkpoints are upserts.
+    """
+
+    def __init__(
+        self,
+        outbox: SharedWriteOutbox,
+        target: Storage,
+        *,
+        batch_size: int,
+        flush_interval_seconds: float,
+    ) -> None:
+        self.outbox = outbox
+        self.target = target
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.last_flushed_at: datetime | None = None
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._failures = 0
+        self._failed_at: float | None = None
+
+    def status(self) -> OutboxStatus:
+        return self.outbox.status(self.last_flushed_at)
+
+    def _backoff_seconds(self) -> float:
+        return min(self.flush_interval_seconds * (2**self._failures), _MAX_BACKOFF_SECONDS)
+
+    def in_backoff(self) -> bool:
+        """``True`` while the last flush failed and its retry delay has not elapsed."""
+        failed_at = self._failed_at
+        return failed_at is not None and time.monotonic() - failed_at < self._backoff_seconds()
+
+    def notify(self, *, urgent: bool = False) -> None:
+        """Start the background thread if needed; ``urgent`` flushes without waiting."""
+        with self._thread_lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="agent-recall-outbox", daemon=True
+                )
+                self._thread.start()
+        if urgent:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self._backoff_seconds())
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background thread and make one last flush attempt."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is None:
+            return
+        try:
+            self.flush()
+        except (sqlite3.Error, OSError):
+            # Runs at interpreter exit; whatever is left stays queued for the next run.
+            return
+
+    def flush(self) -> bool:
+        """Replay pending items in order; ``True`` when the queue was drained."""
+        with self._flush_lock:
+            while True:
+                items = self.outbox.pending(self.batch_size)
+                if not items:
+                    self._failures = 0
+                    self._failed_at = None
+                    return True
+                for group in self._group(items):
+                    try:
+                        self._apply(group[0].operation, group)
+                    except _REPLAY_ERRORS as exc:
+                        permanent = _is_permanent(exc)
+                        self.outbox.record_error(
+                            [item.id for item in group],
+                            f"{type(exc).__name__}: {exc}",
+                            permanent=permanent,
+                        )
+                        if permanent:
+                            continue
+                        self._failures += 1
+                        self._failed_at = time.monotonic()
+                        return False
+                    self.outbox.acknowledge([item.id for item in group])
+                    self.last_flushed_at = _utcnow()
+
+    @staticmethod
+    def _group(items: list[OutboxItem]) -> list[list[OutboxItem]]:
+        groups: list[list[OutboxItem]] = []
+        for item in items:
+            if groups and groups[-1][0].operation == item.operation:
+                groups[-1].append(item)
+            else:
+                groups.append([item])
+        return groups
+
+    def _apply(self, operation: str, items: list[OutboxItem]) -> None:
+        if operation == OP_APPEND_ENTRIES:
+            entries = [LogEntry.model_validate(item.payload) for item in items]
+            try:
+                self.target.append_entries(entries)
+            except _REPLAY_ERRORS as exc:
+                if not _is_conflict(exc):
+                    raise
+                # Part of the batch already landed on an earlier attempt.
+                for entry in entries:
+                    try:
+                        self.target.append_entry(entry)
+                    except _REPLAY_ERRORS as entry_exc:
+                        if not _is_conflict(entry_exc):
+                            raise
+        elif operation == OP_MARK_PROCESSED:
+            self.target.mark_sessions_processed([item.item_key for item in items])
+        elif operation == OP_SAVE_CHECKPOINT:
+            latest: dict[str, OutboxItem] = {item.item_key: item for item in items}
+            for item in latest.values():
+                self.target.save_session_checkpoint(SessionCheckpoint.model_validate(item.payload))
+        else:
+            raise ValueError(f"Unknown outbox operation '{operation}'")
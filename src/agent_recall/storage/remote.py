@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import json
 import os
 import sqlite3
+import threading
 import time
+import weakref
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any
-from urllib.parse import unquote, urlparse
+from urllib.parse import unquote, urlencode, urlparse
 from uuid import UUID
 
 import httpx
@@ -19,10 +26,12 @@ from agent_recall.storage.base import (
     UnsupportedStorageCapabilityError,
     validate_shared_namespace,
 )
+from agent_recall.storage.delta_sync import PullCursorStore, PullResult, pull_changes
 from agent_recall.storage.models import (
     AuditAction,
     AuditEvent,
     BackgroundSyncStatus,
+    ChangeBatch,
     Chunk,
     CurationStatus,
     LogEntry,
@@ -33,6 +42,14 @@ from agent_recall.storage.models import (
     SessionStatus,
     SharedStorageConfig,
 )
+from agent_recall.storage.outbox import (
+    OP_APPEND_ENTRIES,
+    OP_MARK_PROCESSED,
+    OP_SAVE_CHECKPOINT,
+    OutboxReplicator,
+    OutboxStatus,
+    SharedWriteOutbox,
+)
 from agent_recall.storage.sqlite import SQLiteStorage
 
 
@@ -77,12 +94,145 @@ def _capabilities_for(storage: Storage | None) -> StorageCapabilities:
     return StorageCapabilities()
 
 
+class _AuditBuffer:
+    """Coalesce audit events into periodic ``POST /audit/events/batch`` requests."""
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        *,
+        max_events: int,
+        flush_interval_seconds: float,
+    ) -> None:
+        self._client = client
+        self._max_events = max(1, max_events)
+        self._flush_interval_seconds = max(0.0, flush_interval_seconds)
+        self._lock = threading.Lock()
+        self._pending: list[AuditEvent] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, events: list[AuditEvent]) -> None:
+        with self._lock:
+            self._pending.extend(events)
+            due = (
+                len(self._pending) >= self._max_events
+                or time.monotonic() - self._last_flush >= self._flush_interval_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            events, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not events:
+            return
+        try:
+            response = self._client.post(
+                "/audit/events/batch",
+                json={"events": [event.model_dump(mode="json") for event in events]},
+            )
+            if response.status_code in _MISSING_ENDPOINT_STATUSES:
+                # Older servers only accept one event per request.
+                for event in events:
+                    self._client.post(
+                        "/audit/events", content=event.model_dump_json()
+                    ).raise_for_status()
+                return
+            response.raise_for_status()
+        except (httpx.HTTPError, RuntimeError):
+            # Audit delivery is best effort, and the client may already be closed at exit.
+            return
+
+
+_MISSING_ENDPOINT_STATUSES = frozenset({404, 405})
+
+# Failures worth retrying and then answering from the local fallback database.
+_TRANSIENT_ERRORS: tuple[type[Exception], ...] = (
+    httpx.TransportError,
+    httpx.TimeoutException,
+    sqlite3.OperationalError,
+    OSError,
+    SharedBackendUnavailableError,
+    UnsupportedStorageCapabilityError,
+)
+
+SHARED_READ_CACHE_FILENAME = "shared_cache.db"
+_CHUNK_MIRROR_KEY = "chunks:mirror"
+
+_READ_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_read_cache (
+    tenant_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    request_key TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (tenant_id, project_id, request_key)
+);
+"""
+
+
+class _ReadThroughCache:
+    """Local SQLite copy of shared-backend reads, revalidated with ``If-None-Match``.
+
+    Chunks are mirrored into a ``SQLiteStorage`` so retrieval runs locally and is
+    revalidated at most once per ``max_age_seconds``; other reads keep the last
+    response body and its ``ETag``.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        tenant_id: str,
+        project_id: str,
+        max_age_seconds: float,
+    ) -> None:
+        self.mirror = SQLiteStorage(db_path, tenant_id=tenant_id, project_id=project_id)
+        self.lock = threading.Lock()
+        self.max_age_seconds = max_age_seconds
+        # Cleared when the server sends no ETag, since the mirror could never be validated.
+        self.mirror_supported = True
+        self.mirror_validated_at: float | None = None
+        self._db_path = db_path
+        self._scope = (tenant_id, project_id)
+        with self._connect() as conn:
+            conn.executescript(_READ_CACHE_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self._db_path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def lookup(self, request_key: str) -> tuple[str, bytes] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT etag, body FROM http_read_cache
+                   WHERE tenant_id = ? AND project_id = ? AND request_key = ?""",
+                (*self._scope, request_key),
+            ).fetchone()
+        return (str(row[0]), bytes(row[1])) if row else None
+
+    def store(self, request_key: str, etag: str, body: bytes) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO http_read_cache
+                   (tenant_id, project_id, request_key, etag, body)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (*self._scope, request_key, etag, body),
+            )
+
+
 class _HTTPClient(Storage):
     """Internal client for the remote HTTP storage backend."""
 
     _CAPABILITIES = StorageCapabilities()
 
-    def __init__(self, config: SharedStorageConfig) -> None:
+    def __init__(self, config: SharedStorageConfig, cache_path: Path | None = None) -> None:
         if not config.base_url:
             raise ValueError("Shared storage backend requires `storage.shared.base_url`.")
 
@@ -107,6 +257,23 @@ class _HTTPClient(Storage):
         self._allow_promote = config.allow_promote
         self._actor = config.audit_actor
         self._audit_enabled = config.audit_enabled
+        self._batch_size = config.batch_size
+        self._audit = _AuditBuffer(
+            self._client,
+            max_events=config.audit_batch_size,
+            flush_interval_seconds=config.audit_flush_interval_seconds,
+        )
+        weakref.finalize(self, self._audit.flush)
+        self._read_cache = (
+            _ReadThroughCache(
+                cache_path,
+                tenant_id=config.tenant_id,
+                project_id=config.project_id,
+                max_age_seconds=config.read_cache_max_age_seconds,
+            )
+            if cache_path is not None
+            else None
+        )
 
     @property
     def capabilities(self) -> StorageCapabilities:
@@ -122,17 +289,14 @@ class _HTTPClient(Storage):
         if not self._allow_promote:
             raise PermissionDeniedError("Shared backend promotion actions are disabled.")
 
-    def _audit_event(
+    def _build_audit_event(
         self,
         action: AuditAction,
         resource_type: str,
         resource_id: str | None = None,
         metadata: dict[str, Any] | None = None,
-    ) -> None:
-        if not self._audit_enabled:
-            return
-
-        event = AuditEvent(
+    ) -> AuditEvent:
+        return AuditEvent(
             tenant_id=self._client.headers.get("X-Tenant-ID", "default"),
             project_id=self._client.headers.get("X-Project-ID", "default"),
             actor=self._actor,
@@ -141,11 +305,99 @@ class _HTTPClient(Storage):
             resource_id=resource_id,
             metadata=metadata or {},
         )
-        try:
-            response = self._client.post("/audit/events", content=event.model_dump_json())
-            response.raise_for_status()
-        except httpx.HTTPError:
+
+    def _audit_event(
+        self,
+        action: AuditAction,
+        resource_type: str,
+        resource_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        if not self._audit_enabled:
             return
+        self._audit.add([self._build_audit_event(action, resource_type, resource_id, metadata)])
+
+    def _audit_events(self, events: Callable[[], list[AuditEvent]]) -> None:
+        if self._audit_enabled:
+            self._audit.add(events())
+
+    def flush_audit_events(self) -> None:
+        """Post any buffered audit events now."""
+        self._audit.flush()
+
+    def close(self) -> None:
+        self._audit.flush()
+        self._client.close()
+
+    def _send_batches(
+        self,
+        method: str,
+        path: str,
+        items: list[Any],
+        build_payload: Callable[[list[Any]], dict[str, Any]],
+    ) -> bool:
+        """Send ``items`` in ``batch_size`` pages; ``False`` if the server lacks ``path``."""
+        for start in range(0, len(items), self._batch_size):
+            response = self._client.request(
+                method,
+                path,
+                json=build_payload(items[start : start + self._batch_size]),
+            )
+            if start == 0 and response.status_code in _MISSING_ENDPOINT_STATUSES:
+                return False
+            response.raise_for_status()
+        return True
+
+    def _get_json(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """GET ``path``, reusing the cached body when the server answers ``304``."""
+        cache = self._read_cache
+        if cache is None:
+            response = self._client.get(path, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        request_key = f"{path}?{urlencode(params or {}, doseq=True)}"
+        cached = cache.lookup(request_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self._client.get(path, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return json.loads(cached[1])
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        if etag:
+            cache.store(request_key, etag, response.content)
+        return response.json()
+
+    def _chunk_mirror(self) -> SQLiteStorage | None:
+        """Return the local chunk mirror after revalidating it, or ``None`` if unavailable."""
+        cache = self._read_cache
+        if cache is None or not cache.mirror_supported:
+            return None
+        with cache.lock:
+            validated_at = cache.mirror_validated_at
+            if validated_at is not None and time.monotonic() - validated_at < cache.max_age_seconds:
+                return cache.mirror
+            cached = cache.lookup(_CHUNK_MIRROR_KEY)
+            headers = {"If-None-Match": cached[0]} if cached else None
+            response = self._client.get("/chunks", headers=headers)
+            if response.status_code != 304 or cached is None:
+                response.raise_for_status()
+                etag = response.headers.get("ETag")
+                if not etag:
+                    cache.mirror_supported = False
+                    return None
+                cache.mirror.replace_chunks([Chunk.model_validate(c) for c in response.json()])
+                cache.store(_CHUNK_MIRROR_KEY, etag, b"")
+            cache.mirror_validated_at = time.monotonic()
+            return cache.mirror
+
+    def _invalidate_chunk_mirror(self) -> None:
+        if self._read_cache is not None:
+            self._read_cache.mirror_validated_at = None
+
+    def get_chunk_generation(self) -> int | None:
+        mirror = self._chunk_mirror()
+        return mirror.get_chunk_generation() if mirror is not None else None
 
     def create_session(self, session: Session) -> None:
         self._require_role("admin", "writer")
@@ -202,6 +454,31 @@ class _HTTPClient(Storage):
             metadata={"label": entry.label.value},
         )
 
+    def append_entries(self, entries: list[LogEntry]) -> None:
+        self._require_role("admin", "writer")
+        if not entries:
+            return
+        sent = self._send_batches(
+            "POST",
+            "/entries/batch",
+            [entry.model_dump(mode="json") for entry in entries],
+            lambda page: {"entries": page},
+        )
+        if not sent:
+            for entry in entries:
+                self._client.post("/entries", content=entry.model_dump_json()).raise_for_status()
+        self._audit_events(
+            lambda: [
+                self._build_audit_event(
+                    AuditAction.CREATE,
+                    "log_entry",
+                    resource_id=str(entry.id),
+                    metadata={"label": entry.label.value},
+                )
+                for entry in entries
+            ]
+        )
+
     def get_entries(self, session_id: UUID) -> list[LogEntry]:
         response = self._client.get(f"/sessions/{session_id}/entries")
         response.raise_for_status()
@@ -242,9 +519,7 @@ class _HTTPClient(Storage):
             "curation_status": curation_status.value,
         }
         # httpx handles list params by repeating keys: labels=...&labels=...
-        response = self._client.get("/entries", params=params)
-        response.raise_for_status()
-        return [LogEntry.model_validate(e) for e in response.json()]
+        return [LogEntry.model_validate(e) for e in self._get_json("/entries", params)]
 
     def list_entries_by_curation_status(
         self,
@@ -290,6 +565,7 @@ class _HTTPClient(Storage):
         self._require_promote()
         response = self._client.post("/chunks", content=chunk.model_dump_json())
         response.raise_for_status()
+        self._invalidate_chunk_mirror()
         self._audit_event(
             AuditAction.CREATE,
             "chunk",
@@ -297,6 +573,58 @@ class _HTTPClient(Storage):
             metadata={"label": chunk.label.value, "source": chunk.source.value},
         )
 
+    def store_chunks(self, chunks: list[Chunk]) -> None:
+        self._require_role("admin", "writer")
+        self._require_promote()
+        if not chunks:
+            return
+        sent = self._send_batches(
+            "POST",
+            "/chunks/batch",
+            [chunk.model_dump(mode="json") for chunk in chunks],
+            lambda page: {"chunks": page},
+        )
+        if not sent:
+            for chunk in chunks:
+                self._client.post("/chunks", content=chunk.model_dump_json()).raise_for_status()
+        self._invalidate_chunk_mirror()
+        self._audit_events(
+            lambda: [
+                self._build_audit_event(
+                    AuditAction.CREATE,
+                    "chunk",
+                    resource_id=str(chunk.id),
+                    metadata={"label": chunk.label.value, "source": chunk.source.value},
+                )
+                for chunk in chunks
+            ]
+        )
+
+    def find_existing_chunks(
+        self,
+        candidates: list[tuple[str, SemanticLabel]],
+    ) -> set[tuple[str, SemanticLabel]]:
+        unique = list(dict.fromkeys(candidates))
+        existing: set[tuple[str, SemanticLabel]] = set()
+        for start in range(0, len(unique), self._batch_size):
+            page = unique[start : start + self._batch_size]
+            response = self._client.post(
+                "/chunks/exists/batch",
+                json={
+                    "candidates": [
+                        {"content": content, "label": label.value} for content, label in page
+                    ]
+                },
+            )
+            if start == 0 and response.status_code in _MISSING_ENDPOINT_STATUSES:
+                return super().find_existing_chunks(unique)
+            response.raise_for_status()
+            existing.update(
+                (str(item["content"]), SemanticLabel(item["label"]))
+                for item in response.json().get("existing", [])
+            )
+        return existing
+
     def has_chunk(self, content: str, label: SemanticLabel) -> bool:
         response = self._client.post(
             "/chunks/exists",
@@ -306,21 +634,33 @@ class _HTTPClient(Storage):
         return response.json()["exists"]
 
     def count_chunks(self) -> int:
+        mirror = self._chunk_mirror()
+        if mirror is not None:
+            return mirror.count_chunks()
         response = self._client.get("/chunks/count")
         response.raise_for_status()
         return response.json()["count"]
 
     def search_chunks_fts(self, query: str, top_k: int = 5) -> list[Chunk]:
+        mirror = self._chunk_mirror()
+        if mirror is not None:
+            return mirror.search_chunks_fts(query, top_k=top_k)
         response = self._client.get("/chunks/search", params={"q": query, "top_k": top_k})
         response.raise_for_status()
         return [Chunk.model_validate(c) for c in response.json()]
 
     def list_chunks_with_embeddings(self) -> list[Chunk]:
+        mirror = self._chunk_mirror()
+        if mirror is not None:
+            return mirror.list_chunks_with_embeddings()
         response = self._client.get("/chunks/embeddings")
         response.raise_for_status()
         return [Chunk.model_validate(c) for c in response.json()]
 
     def list_chunks(self) -> list[Chunk]:
+        mirror = self._chunk_mirror()
+        if mirror is not None:
+            return mirror.list_chunks()
         response = self._client.get("/chunks")
         response.raise_for_status()
         return [Chunk.model_validate(c) for c in response.json()]
@@ -338,6 +678,22 @@ class _HTTPClient(Storage):
             json={"embedding": embedding},
         )
         response.raise_for_status()
+        self._invalidate_chunk_mirror()
+
+    def index_chunk_embeddings(self, embeddings: dict[UUID, list[float]]) -> None:
+        self._require_role("admin", "writer")
+        self._require_promote()
+        if not embeddings:
+            return
+        sent = self._send_batches(
+            "POST",
+            "/chunks/embeddings/batch",
+            list(embeddings.items()),
+            lambda page: {"embeddings": {str(chunk_id): vector for chunk_id, vector in page}},
+        )
+        if not sent:
+            super().index_chunk_embeddings(embeddings)
+        self._invalidate_chunk_mirror()
 
     def is_session_processed(self, source_session_id: str) -> bool:
         # We might want base64 or similar if session IDs contain slashes
@@ -361,6 +717,33 @@ class _HTTPClient(Storage):
             resource_id=source_session_id,
         )
 
+    def mark_sessions_processed(self, source_session_ids: list[str]) -> None:
+        self._require_role("admin", "writer")
+        unique = list(dict.fromkeys(source_session_ids))
+        if not unique:
+            return
+        sent = self._send_batches(
+            "PUT",
+            "/processed_sessions/batch",
+            unique,
+            lambda page: {"source_session_ids": page},
+        )
+        if not sent:
+            for source_session_id in unique:
+                self._client.put(
+                    "/processed_sessions", json={"source_session_id": source_session_id}
+                ).raise_for_status()
+        self._audit_events(
+            lambda: [
+                self._build_audit_event(
+                    AuditAction.CREATE,
+                    "processed_session",
+                    resource_id=source_session_id,
+                )
+                for source_session_id in unique
+            ]
+        )
+
     def clear_processed_sessions(
         self,
         source: str | None = None,
@@ -420,10 +803,15 @@ class _HTTPClient(Storage):
         )
         return response.json()["count"]
 
-    def get_stats(self) -> dict[str, int]:
-        response = self._client.get("/stats")
+    def list_changes(self, since: int = 0, limit: int = 500) -> ChangeBatch:
+        response = self._client.get("/changes", params={"since": since, "limit": limit})
+        if response.status_code in _MISSING_ENDPOINT_STATUSES:
+            raise UnsupportedStorageCapabilityError("change_feed")
         response.raise_for_status()
-        return response.json()
+        return ChangeBatch.model_validate(response.json())
+
+    def get_stats(self) -> dict[str, int]:
+        return self._get_json("/stats")
 
     def get_last_processed_at(self) -> datetime | None:
         response = self._client.get("/stats/last_processed")
@@ -436,7 +824,12 @@ class _HTTPClient(Storage):
     def list_recent_source_sessions(self, limit: int = 20) -> list[dict[str, Any]]:
         response = self._client.get("/recent-sources", params={"limit": limit})
         response.raise_for_status()
-        return response.json()
+        sessions = response.json()
+        for session in sessions:
+            last_timestamp = session.get("last_timestamp")
+            if isinstance(last_timestamp, str):
+                session["last_timestamp"] = datetime.fromisoformat(last_timestamp)
+        return sessions
 
     def get_background_sync_status(self) -> BackgroundSyncStatus:
         response = self._client.get("/background-sync/status")
@@ -572,6 +965,189 @@ class _HTTPClient(Storage):
         raise UnsupportedStorageCapabilityError("rule_confidence")
 
 
+async def _close_async_client_from(
+    client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop
+) -> None:
+    """Close ``client``, whose pooled connections were opened on another event ``loop``."""
+    if loop.is_running():
+        # Transports can only be closed on the loop that owns them. Don't wait for it:
+        # that loop may itself be blocked waiting on the caller.
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    try:
+        await client.aclose()
+    except RuntimeError:
+        # The owning loop is already closed; the client is marked closed and drops its
+        # pool, and the dead connections are released with it.
+        pass
+
+
+class _AsyncHTTPClient:
+    """Awaitable counterpart of ``_HTTPClient`` for the calls the sync pipeline makes.
+
+    Requests share one pooled ``httpx.AsyncClient`` per event loop. Role checks, batch
+    size and the audit buffer come from the synchronous client.
+    """
+
+    def __init__(self, sync_client: _HTTPClient, config: SharedStorageConfig) -> None:
+        if config.http2 and importlib.util.find_spec("h2") is None:
+            raise ValueError(
+                "`storage.shared.http2` requires the h2 package. "
+                "Install with: pip install 'agent-recall[http2]'"
+            )
+        self._sync = sync_client
+        self._config = config
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def _http(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None and self._loop is not None:
+                await _close_async_client_from(self._client, self._loop)
+            # Pooled connections belong to the loop that opened them. Building the
+            # client loads an SSL context, which takes tens of milliseconds.
+            self._client = await asyncio.to_thread(
+                httpx.AsyncClient,
+                base_url=str(self._config.base_url),
+                headers=dict(self._sync._client.headers),
+                timeout=self._config.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self._config.max_connections,
+                    max_keepalive_connections=self._config.max_connections,
+                ),
+                http2=self._config.http2,
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+    async def _audit_events(self, events: Callable[[], list[AuditEvent]]) -> None:
+        # Adding may post a full batch with the synchronous client, so keep it off the loop.
+        await asyncio.to_thread(self._sync._audit_events, events)
+
+    async def _send_batches(
+        self,
+        method: str,
+        path: str,
+        items: list[Any],
+        build_payload: Callable[[list[Any]], dict[str, Any]],
+    ) -> bool:
+        """Send ``items`` in ``batch_size`` pages, concurrently after the first page."""
+        client = await self._http()
+        size = self._sync._batch_size
+        pages = [items[start : start + size] for start in range(0, len(items), size)]
+        first = await client.request(method, path, json=build_payload(pages[0]))
+        if first.status_code in _MISSING_ENDPOINT_STATUSES:
+            return False
+        first.raise_for_status()
+        responses = await asyncio.gather(
+            *(client.request(method, path, json=build_payload(page)) for page in pages[1:])
+        )
+        for response in responses:
+            response.raise_for_status()
+        return True
+
+    async def append_entries(self, entries: list[LogEntry]) -> None:
+        self._sync._require_role("admin", "writer")
+        if not entries:
+            return
+        sent = await self._send_batches(
+            "POST",
+            "/entries/batch",
+            [entry.model_dump(mode="json") for entry in entries],
+            lambda page: {"entries": page},
+        )
+        if not sent:
+            client = await self._http()
+            responses = await asyncio.gather(
+                *(client.post("/entries", content=entry.model_dump_json()) for entry in entries)
+            )
+            for response in responses:
+                response.raise_for_status()
+        await self._audit_events(
+            lambda: [
+                self._sync._build_audit_event(
+                    AuditAction.CREATE,
+                    "log_entry",
+                    resource_id=str(entry.id),
+                    metadata={"label": entry.label.value},
+                )
+                for entry in entries
+            ]
+        )
+
+    async def is_session_processed(self, source_session_id: str) -> bool:
+        client = await self._http()
+        response = await client.get(
+            "/processed_sessions/check", params={"source_session_id": source_session_id}
+        )
+        response.raise_for_status()
+        return response.json()["processed"]
+
+    async def mark_session_processed(self, source_session_id: str) -> None:
+        await self.mark_sessions_processed([source_session_id])
+
+    async def mark_sessions_processed(self, source_session_ids: list[str]) -> None:
+        self._sync._require_role("admin", "writer")
+        unique = list(dict.fromkeys(source_session_ids))
+        if not unique:
+            return
+        sent = await self._send_batches(
+            "PUT",
+            "/processed_sessions/batch",
+            unique,
+            lambda page: {"source_session_ids": page},
+        )
+        if not sent:
+            client = await self._http()
+            responses = await asyncio.gather(
+                *(
+                    client.put("/processed_sessions", json={"source_session_id": session_id})
+                    for session_id in unique
+                )
+            )
+            for response in responses:
+                response.raise_for_status()
+        await self._audit_events(
+            lambda: [
+                self._sync._build_audit_event(
+                    AuditAction.CREATE,
+                    "processed_session",
+                    resource_id=source_session_id,
+                )
+                for source_session_id in unique
+            ]
+        )
+
+    async def get_session_checkpoint(self, source_session_id: str) -> SessionCheckpoint | None:
+        client = await self._http()
+        response = await client.get("/checkpoints", params={"source_session_id": source_session_id})
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return SessionCheckpoint.model_validate(response.json())
+
+    async def save_session_checkpoint(self, checkpoint: SessionCheckpoint) -> None:
+        self._sync._require_role("admin", "writer")
+        client = await self._http()
+        response = await client.put("/checkpoints", content=checkpoint.model_dump_json())
+        response.raise_for_status()
+        await self._audit_events(
+            lambda: [
+                self._sync._build_audit_event(
+                    AuditAction.UPDATE,
+                    "checkpoint",
+                    resource_id=checkpoint.source_session_id,
+                )
+            ]
+        )
+
+
 class RemoteStorage(Storage):
     """
     Storage implementation for shared single-tenant backends.
@@ -602,8 +1178,34 @@ class RemoteStorage(Storage):
                 strict_namespace_validation=True,
             )
         else:
-            # HTTP backend - client handles namespace via headers
-            self._delegate = _HTTPClient(config)
+            # HTTP backend - client handles namespace via headers; reads go through a
+            # local cache next to the fallback database when one is configured.
+            cache_path = (
+                local_db_path.parent / SHARED_READ_CACHE_FILENAME
+                if local_db_path is not None and config.read_cache_enabled
+                else None
+            )
+            self._delegate = _HTTPClient(config, cache_path=cache_path)
+
+        # Sync-path writes (entry batches, processed marks, checkpoints) land in the local
+        # database and are queued there for background replication, so sync never waits
+        # on the network and the local fallback already sees them while the server is
+        # down. Readers cannot write, so they keep the direct path and its errors.
+        self._async_view: AsyncRemoteStorage | None = None
+        self._outbox: OutboxReplicator | None = None
+        if local_db_path is not None and config.write_behind_enabled and config.role != "reader":
+            self._outbox = OutboxReplicator(
+                SharedWriteOutbox(
+                    local_db_path, tenant_id=config.tenant_id, project_id=config.project_id
+                ),
+                self._delegate,
+                batch_size=config.batch_size,
+                flush_interval_seconds=config.outbox_flush_interval_seconds,
+            )
+            weakref.finalize(self, self._outbox.close)
+            if self._outbox.outbox.count_pending():
+                # Resume replicating writes left behind by an earlier process.
+                self._outbox.notify()
 
     @property
     def capabilities(self) -> StorageCapabilities:
@@ -611,6 +1213,55 @@ class RemoteStorage(Storage):
         local_caps = _capabilities_for(self._local)
         return delegate_caps.merge(local_caps)
 
+    def as_async(self) -> AsyncRemoteStorage:
+        """Return the awaitable view of this storage, created on first use."""
+        if self._async_view is None:
+            self._async_view = AsyncRemoteStorage(self)
+        return self._async_view
+
+    def flush_outbox(self) -> bool:
+        """Replicate queued writes now; ``True`` when nothing is left pending."""
+        return self._outbox.flush() if self._outbox is not None else True
+
+    def get_outbox_status(self) -> OutboxStatus | None:
+        """Return write-behind queue depth and lag, or ``None`` when it is disabled."""
+        return self._outbox.status() if self._outbox is not None else None
+
+    def _write_behind(
+        self,
+        outbox: OutboxReplicator,
+        operation: str,
+        items: list[tuple[str, Any]],
+        write_local: Callable[[SQLiteStorage], None],
+    ) -> None:
+        """Apply a write to the local database and queue it for replication."""
+        if isinstance(self._local, SQLiteStorage):
+            write_local(self._local)
+        outbox.outbox.enqueue(operation, items)
+        outbox.notify(urgent=len(items) >= outbox.batch_size)
+
+    def _settle_outbox(self) -> None:
+        # Reads that may cover queued writes try to replicate them first. After a failed
+        # flush the background thread owns retries; the read goes straight to the server
+        # or the local fallback, which already holds every queued write.
+        if self._outbox is None or self._outbox.in_backoff():
+            return
+        if self._outbox.outbox.count_pending():
+            self._outbox.flush()
+
+    def flush_audit_events(self) -> None:
+        """Post audit events the HTTP client has buffered; a no-op for other backends."""
+        flush = getattr(self._delegate, "flush_audit_events", None)
+        if callable(flush):
+            flush()
+
+    def get_chunk_generation(self) -> int | None:
+        # No retries or local fallback: a wrong generation would validate stale caches.
+        try:
+            return self._delegate.get_chunk_generation()
+        except (httpx.HTTPError, sqlite3.Error, OSError):
+            return None
+
     def _require_capability(self, capability: str) -> None:
         supported = bool(getattr(self.capabilities, capability, False))
         if not supported:
@@ -624,14 +1275,7 @@ class RemoteStorage(Storage):
             try:
                 method = getattr(self._delegate, method_name)
                 return method(*args, **kwargs)
-            except (
-                httpx.TransportError,
-                httpx.TimeoutException,
-                sqlite3.OperationalError,
-                OSError,
-                SharedBackendUnavailableError,
-                UnsupportedStorageCapabilityError,
-            ) as e:
+            except _TRANSIENT_ERRORS as e:
                 last_error = e
                 if i < attempts - 1:
                     time.sleep(0.5 * (2**i))
@@ -674,7 +1318,18 @@ class RemoteStorage(Storage):
     def append_entry(self, entry: LogEntry) -> None:
         return self._execute("append_entry", entry)
 
+    def append_entries(self, entries: list[LogEntry]) -> None:
+        if self._outbox is None:
+            return self._execute("append_entries", entries)
+        self._write_behind(
+            self._outbox,
+            OP_APPEND_ENTRIES,
+            [(str(entry.id), entry.model_dump(mode="json")) for entry in entries],
+            lambda local: local.apply_changes(ChangeBatch(entries=entries)),
+        )
+
     def get_entries(self, session_id: UUID) -> list[LogEntry]:
+        self._settle_outbox()
         return self._execute("get_entries", session_id)
 
     def get_entries_by_source_session(
@@ -682,6 +1337,7 @@ class RemoteStorage(Storage):
         source_session_id: str,
         limit: int = 200,
     ) -> list[LogEntry]:
+        self._settle_outbox()
         return self._execute("get_entries_by_source_session", source_session_id, limit=limit)
 
     def get_entries_by_label(
@@ -690,6 +1346,7 @@ class RemoteStorage(Storage):
         limit: int = 100,
         curation_status: CurationStatus = CurationStatus.APPROVED,
     ) -> list[LogEntry]:
+        self._settle_outbox()
         return self._execute(
             "get_entries_by_label",
             labels=labels,
@@ -704,6 +1361,7 @@ class RemoteStorage(Storage):
     ) -> list[LogEntry]:
         if status is None:
             status = CurationStatus.APPROVED
+        self._settle_outbox()
         return self._execute("list_entries_by_curation_status", status=status, limit=limit)
 
     def update_entry_curation_status(
@@ -714,6 +1372,7 @@ class RemoteStorage(Storage):
         return self._execute("update_entry_curation_status", entry_id, status)
 
     def count_log_entries(self) -> int:
+        self._settle_outbox()
         return self._execute("count_log_entries")
 
     def store_chunk(self, chunk: Chunk) -> None:
@@ -722,6 +1381,15 @@ class RemoteStorage(Storage):
     def has_chunk(self, content: str, label: SemanticLabel) -> bool:
         return self._execute("has_chunk", content, label)
 
+    def find_existing_chunks(
+        self,
+        candidates: list[tuple[str, SemanticLabel]],
+    ) -> set[tuple[str, SemanticLabel]]:
+        return self._execute("find_existing_chunks", candidates)
+
+    def store_chunks(self, chunks: list[Chunk]) -> None:
+        return self._execute("store_chunks", chunks)
+
     def count_chunks(self) -> int:
         return self._execute("count_chunks")
 
@@ -742,43 +1410,137 @@ class RemoteStorage(Storage):
     def index_chunk_embedding(self, chunk_id: UUID, embedding: list[float]) -> None:
         return self._execute("index_chunk_embedding", chunk_id, embedding)
 
+    def index_chunk_embeddings(self, embeddings: dict[UUID, list[float]]) -> None:
+        return self._execute("index_chunk_embeddings", embeddings)
+
+    def _queued_processed_mark(self, source_session_id: str) -> bool:
+        return self._outbox is not None and self._outbox.outbox.has_pending(
+            OP_MARK_PROCESSED, source_session_id
+        )
+
+    def _queued_checkpoint(self, source_session_id: str) -> SessionCheckpoint | None:
+        if self._outbox is None:
+            return None
+        queued = self._outbox.outbox.latest_payload(OP_SAVE_CHECKPOINT, source_session_id)
+        return SessionCheckpoint.model_validate(queued) if queued is not None else None
+
     def is_session_processed(self, source_session_id: str) -> bool:
+        if self._queued_processed_mark(source_session_id):
+            return True
         return self._execute("is_session_processed", source_session_id)
 
     def mark_session_processed(self, source_session_id: str) -> None:
-        return self._execute("mark_session_processed", source_session_id)
+        if self._outbox is None:
+            return self._execute("mark_session_processed", source_session_id)
+        self.mark_sessions_processed([source_session_id])
+
+    def mark_sessions_processed(self, source_session_ids: list[str]) -> None:
+        if self._outbox is None:
+            return self._execute("mark_sessions_processed", source_session_ids)
+        unique = list(dict.fromkeys(source_session_ids))
+        self._write_behind(
+            self._outbox,
+            OP_MARK_PROCESSED,
+            [(source_session_id, None) for source_session_id in unique],
+            lambda local: local.mark_sessions_processed(unique),
+        )
+
+    def _discard_queued(self, operation: str, source: str | None, key: str | None) -> None:
+        if self._outbox is None:
+            return
+        self._outbox.flush()
+        # A filter by source cannot be matched against queued keys, so those stay queued.
+        if source is None:
+            self._outbox.outbox.discard(operation, key)
+
+    def _clear_written_behind(
+        self, method_name: str, source: str | None, source_session_id: str | None
+    ) -> None:
+        # Write-behind also stored these rows locally; drop them there too.
+        if self._outbox is not None and isinstance(self._local, SQLiteStorage):
+            getattr(self._local, method_name)(source=source, source_session_id=source_session_id)
 
     def clear_processed_sessions(
         self,
         source: str | None = None,
         source_session_id: str | None = None,
     ) -> int:
-        return self._execute(
+        self._discard_queued(OP_MARK_PROCESSED, source, source_session_id)
+        removed = self._execute(
             "clear_processed_sessions", source=source, source_session_id=source_session_id
         )
+        self._clear_written_behind("clear_processed_sessions", source, source_session_id)
+        return removed
 
     def get_session_checkpoint(self, source_session_id: str) -> SessionCheckpoint | None:
+        queued = self._queued_checkpoint(source_session_id)
+        if queued is not None:
+            return queued
         return self._execute("get_session_checkpoint", source_session_id)
 
     def save_session_checkpoint(self, checkpoint: SessionCheckpoint) -> None:
-        return self._execute("save_session_checkpoint", checkpoint)
+        if self._outbox is None:
+            return self._execute("save_session_checkpoint", checkpoint)
+        self._write_behind(
+            self._outbox,
+            OP_SAVE_CHECKPOINT,
+            [(checkpoint.source_session_id, checkpoint.model_dump(mode="json"))],
+            lambda local: local.save_session_checkpoint(checkpoint.model_copy()),
+        )
 
     def clear_session_checkpoints(
         self,
         source: str | None = None,
         source_session_id: str | None = None,
     ) -> int:
-        return self._execute(
+        self._discard_queued(OP_SAVE_CHECKPOINT, source, source_session_id)
+        removed = self._execute(
             "clear_session_checkpoints", source=source, source_session_id=source_session_id
         )
+        self._clear_written_behind("clear_session_checkpoints", source, source_session_id)
+        return removed
+
+    def list_changes(self, since: int = 0, limit: int = 500) -> ChangeBatch:
+        # Never answered from the local fallback: the feed describes the shared store.
+        self._settle_outbox()
+        try:
+            return self._delegate.list_changes(since=since, limit=limit)
+        except (httpx.TransportError, sqlite3.OperationalError, OSError) as exc:
+            raise SharedBackendUnavailableError(
+                "Shared storage operation 'list_changes' failed"
+            ) from exc
+
+    def pull_changes(self, since: int | None = None, page_size: int = 500) -> PullResult:
+        """Mirror shared entries and chunks changed since the last pull into the local database.
+
+        ``since`` overrides the stored cursor; ``0`` pulls everything again.
+        """
+        if not isinstance(self._local, SQLiteStorage):
+            raise ValueError("Pulling shared changes requires a local database.")
+        cursor = PullCursorStore(
+            self._local.db_path,
+            tenant_id=self.config.tenant_id,
+            project_id=self.config.project_id,
+            source=str(self.config.base_url),
+        )
+        return pull_changes(
+            self,
+            self._local,
+            since=cursor.get() if since is None else since,
+            page_size=page_size,
+            cursor=cursor,
+        )
 
     def get_stats(self) -> dict[str, int]:
+        self._settle_outbox()
         return self._execute("get_stats")
 
     def get_last_processed_at(self) -> datetime | None:
+        self._settle_outbox()
         return self._execute("get_last_processed_at")
 
     def list_recent_source_sessions(self, limit: int = 20) -> list[dict[str, Any]]:
+        self._settle_outbox()
         return self._execute("list_recent_source_sessions", limit=limit)
 
     def get_background_sync_status(self) -> BackgroundSyncStatus:
@@ -990,3 +1752,86 @@ class RemoteStorage(Storage):
     def get_rule_confidence_summary(self) -> dict[str, Any]:
         self._require_capability("rule_confidence")
         return self._execute("get_rule_confidence_summary")
+
+
+class AsyncRemoteStorage:
+    """Awaitable view of a ``RemoteStorage`` for asyncio callers such as ``AutoSync``.
+
+    HTTP backends are called through ``_AsyncHTTPClient``. Filesystem backends, the
+    write-behind queue and the local fallback run in worker threads, so no call blocks
+    the event loop. Retries and fallback follow ``RemoteStorage._execute``.
+    """
+
+    def __init__(self, storage: RemoteStorage) -> None:
+        self.storage = storage
+        delegate = storage._delegate
+        self._http = (
+            _AsyncHTTPClient(delegate, storage.config)
+            if isinstance(delegate, _HTTPClient)
+            else None
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections; the next call opens a new pool."""
+        if self._http is not None:
+            await self._http.aclose()
+
+    async def _execute(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        attempts = max(1, self.storage.config.retry_attempts or 1)
+        last_error: Exception | None = None
+
+        for i in range(attempts):
+            try:
+                if self._http is not None:
+                    return await getattr(self._http, method_name)(*args, **kwargs)
+                method = getattr(self.storage._delegate, method_name)
+                return await asyncio.to_thread(method, *args, **kwargs)
+            except _TRANSIENT_ERRORS as e:
+                last_error = e
+                if i < attempts - 1:
+                    await asyncio.sleep(0.5 * (2**i))
+
+        if self.storage._local:
+            try:
+                method = getattr(self.storage._local, method_name)
+                return await asyncio.to_thread(method, *args, **kwargs)
+            except Exception:
+                # If local also fails, ignore local error and raise the shared one
+                pass
+
+        if isinstance(last_error, UnsupportedStorageCapabilityError):
+            raise last_error
+        raise SharedBackendUnavailableError(
+            f"Shared storage operation '{method_name}' failed after {attempts} attempts"
+        ) from last_error
+
+    async def append_entries(self, entries: list[LogEntry]) -> None:
+        if self.storage._outbox is not None:
+            return await asyncio.to_thread(self.storage.append_entries, entries)
+        return await self._execute("append_entries", entries)
+
+    async def is_session_processed(self, source_session_id: str) -> bool:
+        if await asyncio.to_thread(self.storage._queued_processed_mark, source_session_id):
+            return True
+        return await self._execute("is_session_processed", source_session_id)
+
+    async def mark_session_processed(self, source_session_id: str) -> None:
+        if self.storage._outbox is not None:
+            return await asyncio.to_thread(self.storage.mark_session_processed, source_session_id)
+        return await self._execute("mark_session_processed", source_session_id)
+
+    async def mark_sessions_processed(self, source_session_ids: list[str]) -> None:
+        if self.storage._outbox is not None:
+            return await asyncio.to_thread(self.storage.mark_sessions_processed, source_session_ids)
+        return await self._execute("mark_sessions_processed", source_session_ids)
+
+    async def get_session_checkpoint(self, source_session_id: str) -> SessionCheckpoint | None:
+        queued = await asyncio.to_thread(self.storage._queued_checkpoint, source_session_id)
+        if queued is not None:
+            return queued
+        return await self._execute("get_session_checkpoint", source_session_id)
+
+    async def save_session_checkpoint(self, checkpoint: SessionCheckpoint) -> None:
+        if self.storage._outbox is not None:
+            return await asyncio.to_thread(self.storage.save_session_checkpoint, checkpoint)
+        return await self._execute("save_session_checkpoint", checkpoint)
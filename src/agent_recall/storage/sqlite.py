@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
+from collections import Counter
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
@@ -11,6 +13,7 @@ from uuid import UUID
 from agent_recall.storage.base import Storage, StorageCapabilities, validate_shared_namespace
 from agent_recall.storage.models import (
     BackgroundSyncStatus,
+    ChangeBatch,
     Chunk,
     ChunkSource,
     CurationStatus,
@@ -62,6 +65,14 @@ CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
 END;
 """
 
+# Stay well below SQLite's bound-parameter limit for ``IN (...)`` lookups.
+_SQLITE_IN_BATCH_SIZE = 500
+
+
+def _chunk_content_hash(content: str, label: str) -> str:
+    return hashlib.sha256(f"{label}\x00{content}".encode()).hexdigest()
+
+
 SCHEMA = f"""
 CREATE TABLE IF NOT EXISTS sessions (
     id TEXT PRIMARY KEY,
@@ -88,7 +99,8 @@ CREATE TABLE IF NOT EXISTS log_entries (
     tags TEXT NOT NULL,
     confidence REAL DEFAULT 1.0,
     curation_status TEXT NOT NULL DEFAULT 'approved',
-    metadata TEXT NOT NULL
+    metadata TEXT NOT NULL,
+    change_seq INTEGER
 );
 
 CREATE TABLE IF NOT EXISTS chunks (
@@ -103,7 +115,9 @@ CREATE TABLE IF NOT EXISTS chunks (
     created_at TEXT NOT NULL,
     token_count INTEGER,
     embedding BLOB,
-    embedding_version INTEGER NOT NULL DEFAULT 0
+    embedding_version INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    change_seq INTEGER
 );
 
 CREATE TABLE IF NOT EXISTS embedding_indices (
@@ -118,6 +132,30 @@ CREATE TABLE IF NOT EXISTS embedding_indices (
 
 {CHUNKS_FTS_SCHEMA}
 
+CREATE TABLE IF NOT EXISTS chunk_generation (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO chunk_generation (id, generation) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS chunks_generation_ai AFTER INSERT ON chunks BEGIN
+    UPDATE chunk_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_generation_ad AFTER DELETE ON chunks BEGIN
+    UPDATE chunk_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_generation_au AFTER UPDATE ON chunks BEGIN
+    UPDATE chunk_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TABLE IF NOT EXISTS change_sequence (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    seq INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO change_sequence (id, seq) VALUES (1, 0);
+
 CREATE TABLE IF NOT EXISTS processed_sessions (
     source_session_id TEXT PRIMARY KEY,
     tenant_id TEXT NOT NULL DEFAULT 'default',
@@ -228,6 +266,21 @@ ON retrieval_feedback(tenant_id, project_id, query_hash, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_retrieval_feedback_scope_chunk
 ON retrieval_feedback(tenant_id, project_id, chunk_id, created_at DESC);
 
+CREATE TRIGGER IF NOT EXISTS retrieval_feedback_generation_ai
+AFTER INSERT ON retrieval_feedback BEGIN
+    UPDATE chunk_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS retrieval_feedback_generation_ad
+AFTER DELETE ON retrieval_feedback BEGIN
+    UPDATE chunk_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS retrieval_feedback_generation_au
+AFTER UPDATE ON retrieval_feedback BEGIN
+    UPDATE chunk_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
 CREATE TABLE IF NOT EXISTS topic_threads (
     thread_id TEXT PRIMARY KEY,
     tenant_id TEXT NOT NULL DEFAULT 'default',
@@ -324,6 +377,7 @@ class SQLiteStorage(Storage):
         retrieval_feedback=True,
         topic_threads=True,
         rule_confidence=True,
+        change_feed=True,
     )
 
     def __init__(
@@ -409,13 +463,69 @@ class SQLiteStorage(Storage):
                         "ALTER TABLE chunks ADD COLUMN embedding_version INTEGER NOT NULL DEFAULT 0"
                     )
                     columns.append("embedding_version")
+                if table == "chunks" and "content_hash" not in columns:
+                    conn.execute("ALTER TABLE chunks ADD COLUMN content_hash TEXT")
+                    columns.append("content_hash")
+                    self._backfill_chunk_content_hashes(conn)
                 if table == "log_entries" and "curation_status" not in columns:
                     conn.execute(
                         "ALTER TABLE log_entries "
                         "ADD COLUMN curation_status TEXT NOT NULL DEFAULT 'approved'"
                     )
                     columns.append("curation_status")
+                if table in {"log_entries", "chunks"} and "change_seq" not in columns:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN change_seq INTEGER")
+                    columns.append("change_seq")
+                    self._backfill_change_seqs(conn, table)
             self._ensure_scope_indexes(conn)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_content_hash "
+                "ON chunks(tenant_id, project_id, content_hash)"
+            )
+            for table in ("log_entries", "chunks"):
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_change_seq "
+                    f"ON {table}(tenant_id, project_id, change_seq)"
+                )
+
+    @staticmethod
+    def _backfill_chunk_content_hashes(conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            "SELECT id, content, label FROM chunks WHERE content_hash IS NULL"
+        ).fetchall()
+        # content_hash is not indexed by FTS, so skip the update trigger while backfilling.
+        conn.execute("DROP TRIGGER IF EXISTS chunks_au")
+        conn.executemany(
+            "UPDATE chunks SET content_hash = ? WHERE id = ?",
+            [(_chunk_content_hash(row["content"], row["label"]), row["id"]) for row in rows],
+        )
+        conn.executescript(CHUNKS_FTS_SCHEMA)
+
+    @classmethod
+    def _backfill_change_seqs(cls, conn: sqlite3.Connection, table: str) -> None:
+        rows = conn.execute(f"SELECT rowid FROM {table} ORDER BY rowid").fetchall()
+        if not rows:
+            return
+        first = cls._allocate_change_seqs(conn, len(rows))
+        if table == "chunks":
+            conn.execute("DROP TRIGGER IF EXISTS chunks_au")
+        conn.executemany(
+            f"UPDATE {table} SET change_seq = ? WHERE rowid = ?",
+            [(first + offset, row[0]) for offset, row in enumerate(rows)],
+        )
+        if table == "chunks":
+            conn.executescript(CHUNKS_FTS_SCHEMA)
+
+    @staticmethod
+    def _allocate_change_seqs(conn: sqlite3.Connection, count: int) -> int:
+        """Reserve ``count`` consecutive change sequence numbers; returns the first.
+
+        Must run inside the write transaction that stamps them, so sequence numbers
+        become visible to the change feed in commit order.
+        """
+        conn.execute("UPDATE change_sequence SET seq = seq + ? WHERE id = 1", (count,))
+        row = conn.execute("SELECT seq FROM change_sequence WHERE id = 1").fetchone()
+        return int(row[0]) - count + 1
 
     def _validate_namespace(self) -> None:
         """Validate namespace if strict mode is enabled."""
@@ -530,39 +640,86 @@ class SQLiteStorage(Storage):
             entry_count=row["entry_count"],
         )
 
+    def _entry_insert_params(self, entry: LogEntry) -> tuple[Any, ...]:
+        return (
+            str(entry.id),
+            self.tenant_id,
+            self.project_id,
+            str(entry.session_id) if entry.session_id else None,
+            entry.source.value,
+            entry.source_session_id,
+            entry.timestamp.isoformat(),
+            entry.content,
+            entry.label.value,
+            json.dumps(entry.tags),
+            entry.confidence,
+            entry.curation_status.value,
+            json.dumps(entry.metadata),
+        )
+
     def append_entry(self, entry: LogEntry) -> None:
+        self.append_entries([entry])
+
+    def append_entries(self, entries: list[LogEntry], *, skip_existing: bool = False) -> None:
+        """Insert ``entries`` in one transaction.
+
+        With ``skip_existing`` entries whose id is already stored are left untouched
+        instead of raising, so a retried batch upload is a no-op for the rows that
+        already landed.
+        """
+        if not entries:
+            return
         self._validate_namespace()
+        on_conflict = " ON CONFLICT(id) DO NOTHING" if skip_existing else ""
         with self._connect() as conn:
-            conn.execute(
+            first_seq = self._allocate_change_seqs(conn, len(entries))
+            conn.executemany(
                 """INSERT INTO log_entries
                    (
                         id, tenant_id, project_id, session_id, source, source_session_id, timestamp,
-                        content, label, tags, confidence, curation_status, metadata
+                        content, label, tags, confidence, curation_status, metadata, change_seq
                    )
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    str(entry.id),
-                    self.tenant_id,
-                    self.project_id,
-                    str(entry.session_id) if entry.session_id else None,
-                    entry.source.value,
-                    entry.source_session_id,
-                    entry.timestamp.isoformat(),
-                    entry.content,
-                    entry.label.value,
-                    json.dumps(entry.tags),
-                    entry.confidence,
-                    entry.curation_status.value,
-                    json.dumps(entry.metadata),
-                ),
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+                + on_conflict,
+                [
+                    (*self._entry_insert_params(entry), first_seq + offset)
+                    for offset, entry in enumerate(entries)
+                ],
             )
-            if entry.session_id:
-                conn.execute(
+            if skip_existing:
+                # Only rows stamped with this call's sequence range were inserted.
+                session_counts = Counter(
+                    {
+                        row[0]: int(row[1])
+                        for row in conn.execute(
+                            (
+                                "SELECT session_id, COUNT(*) FROM log_entries "
+                                "WHERE change_seq BETWEEN ? AND ? AND session_id IS NOT NULL "
+                                "AND tenant_id = ? AND project_id = ? GROUP BY session_id"
+                            ),
+                            (
+                                first_seq,
+                                first_seq + len(entries) - 1,
+                                self.tenant_id,
+                                self.project_id,
+                            ),
+                        )
+                    }
+                )
+            else:
+                session_counts = Counter(
+                    str(entry.session_id) for entry in entries if entry.session_id
+                )
+            if session_counts:
+                conn.executemany(
                     (
-                        "UPDATE sessions SET entry_count = entry_count + 1 "
+                        "UPDATE sessions SET entry_count = entry_count + ? "
                         "WHERE id = ? AND tenant_id = ? AND project_id = ?"
                     ),
-                    (str(entry.session_id), self.tenant_id, self.project_id),
+                    [
+                        (count, session_id, self.tenant_id, self.project_id)
+                        for session_id, count in session_counts.items()
+                    ],
                 )
 
     def get_entries(self, session_id: UUID) -> list[LogEntry]:
@@ -652,10 +809,16 @@ class SQLiteStorage(Storage):
                 return None
             conn.execute(
                 (
-                    "UPDATE log_entries SET curation_status = ? "
+                    "UPDATE log_entries SET curation_status = ?, change_seq = ? "
                     "WHERE id = ? AND tenant_id = ? AND project_id = ?"
                 ),
-                (status.value, str(entry_id), self.tenant_id, self.project_id),
+                (
+                    status.value,
+                    self._allocate_change_seqs(conn, 1),
+                    str(entry_id),
+                    self.tenant_id,
+                    self.project_id,
+                ),
             )
             refreshed = conn.execute(
                 "SELECT * FROM log_entries WHERE id = ? AND tenant_id = ? AND project_id = ?",
@@ -694,32 +857,47 @@ class SQLiteStorage(Storage):
             metadata=json.loads(row["metadata"]),
         )
 
+    def _chunk_insert_params(self, chunk: Chunk) -> tuple[Any, ...]:
+        return (
+            str(chunk.id),
+            self.tenant_id,
+            self.project_id,
+            chunk.source.value,
+            json.dumps([str(item) for item in chunk.source_ids]),
+            chunk.content,
+            chunk.label.value,
+            json.dumps(chunk.tags),
+            chunk.created_at.isoformat(),
+            chunk.token_count,
+            self._serialize_embedding(chunk.embedding),
+            chunk.embedding_version,
+            _chunk_content_hash(chunk.content, chunk.label.value),
+        )
+
     def store_chunk(self, chunk: Chunk) -> None:
+        self.store_chunks([chunk])
+
+    def store_chunks(self, chunks: list[Chunk], *, skip_existing: bool = False) -> None:
+        """Insert ``chunks``; ``skip_existing`` ignores ids that are already stored."""
+        if not chunks:
+            return
         self._validate_namespace()
+        params = [self._chunk_insert_params(chunk) for chunk in chunks]
+        on_conflict = " ON CONFLICT(id) DO NOTHING" if skip_existing else ""
         for attempt in range(2):
             try:
                 with self._connect() as conn:
-                    conn.execute(
+                    first_seq = self._allocate_change_seqs(conn, len(params))
+                    conn.executemany(
                         """INSERT INTO chunks
                            (
                                id, tenant_id, project_id, source, source_ids, content, label,
-                               tags, created_at, token_count, embedding, embedding_version
+                               tags, created_at, token_count, embedding, embedding_version,
+                               content_hash, change_seq
                            )
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            str(chunk.id),
-                            self.tenant_id,
-                            self.project_id,
-                            chunk.source.value,
-                            json.dumps([str(item) for item in chunk.source_ids]),
-                            chunk.content,
-                            chunk.label.value,
-                            json.dumps(chunk.tags),
-                            chunk.created_at.isoformat(),
-                            chunk.token_count,
-                            self._serialize_embedding(chunk.embedding),
-                            chunk.embedding_version,
-                        ),
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+                        + on_conflict,
+                        [(*row, first_seq + offset) for offset, row in enumerate(params)],
                     )
                 return
             except sqlite3.DatabaseError as exc:
@@ -728,21 +906,69 @@ class SQLiteStorage(Storage):
                     continue
                 raise
 
+    def replace_chunks(self, chunks: list[Chunk]) -> None:
+        """Replace every chunk in this scope with ``chunks`` in one transaction."""
+        self._validate_namespace()
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM chunks WHERE tenant_id = ? AND project_id = ?",
+                (self.tenant_id, self.project_id),
+            )
+            first_seq = self._allocate_change_seqs(conn, len(chunks))
+            conn.executemany(
+                """INSERT INTO chunks
+                   (
+                       id, tenant_id, project_id, source, source_ids, content, label,
+                       tags, created_at, token_count, embedding, embedding_version,
+                       content_hash, change_seq
+                   )
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (*self._chunk_insert_params(chunk), first_seq + offset)
+                    for offset, chunk in enumerate(chunks)
+                ],
+            )
+
     def index_chunk_embedding(self, chunk_id: UUID, embedding: list[float]) -> None:
         self.save_embedding(chunk_id=chunk_id, embedding=embedding, version=1)
 
+    def index_chunk_embeddings(self, embeddings: dict[UUID, list[float]]) -> None:
+        if not embeddings:
+            return
+        self._validate_namespace()
+        with self._connect() as conn:
+            first_seq = self._allocate_change_seqs(conn, len(embeddings))
+            conn.executemany(
+                (
+                    "UPDATE chunks "
+                    "SET embedding = ?, embedding_version = 1, change_seq = ? "
+                    "WHERE id = ? AND tenant_id = ? AND project_id = ?"
+                ),
+                [
+                    (
+                        self._serialize_embedding(embedding),
+                        first_seq + offset,
+                        str(chunk_id),
+                        self.tenant_id,
+                        self.project_id,
+                    )
+                    for offset, (chunk_id, embedding) in enumerate(embeddings.items())
+                ],
+            )
+
     def save_embedding(self, chunk_id: UUID, embedding: list[float], version: int = 1) -> None:
         self._validate_namespace()
         with self._connect() as conn:
             conn.execute(
                 (
                     "UPDATE chunks "
-                    "SET embedding = ?, embedding_version = ? "
+                    "SET embedding = ?, embedding_version = ?, change_seq = ? "
                     "WHERE id = ? AND tenant_id = ? AND project_id = ?"
                 ),
                 (
                     self._serialize_embedding(embedding),
                     int(version),
+                    self._allocate_change_seqs(conn, 1),
                     str(chunk_id),
                     self.tenant_id,
                     self.project_id,
@@ -866,17 +1092,41 @@ class SQLiteStorage(Storage):
             conn.executescript(rebuild_script)
 
     def has_chunk(self, content: str, label: SemanticLabel) -> bool:
+        return bool(self.find_existing_chunks([(content, label)]))
+
+    def find_existing_chunks(
+        self,
+        candidates: list[tuple[str, SemanticLabel]],
+    ) -> set[tuple[str, SemanticLabel]]:
+        by_hash = {
+            _chunk_content_hash(content, label.value): (content, label)
+            for content, label in candidates
+        }
+        if not by_hash:
+            return set()
+        hashes = list(by_hash)
+        existing: set[tuple[str, SemanticLabel]] = set()
         with self._connect() as conn:
-            row = conn.execute(
-                (
-                    "SELECT 1 FROM chunks "
-                    "WHERE content = ? AND label = ? "
-                    "AND tenant_id = ? AND project_id = ? "
-                    "LIMIT 1"
-                ),
-                (content, label.value, self.tenant_id, self.project_id),
-            ).fetchone()
-        return row is not None
+            for start in range(0, len(hashes), _SQLITE_IN_BATCH_SIZE):
+                batch = hashes[start : start + _SQLITE_IN_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    (
+                        "SELECT content_hash, content, label FROM chunks "
+                        "WHERE tenant_id = ? AND project_id = ? "
+                        f"AND content_hash IN ({placeholders})"
+                    ),
+                    [self.tenant_id, self.project_id, *batch],
+                ).fetchall()
+                for row in rows:
+                    candidate = by_hash.get(row["content_hash"])
+                    # Guard against hash collisions by comparing the stored values too.
+                    if candidate and (row["content"], row["label"]) == (
+                        candidate[0],
+                        candidate[1].value,
+                    ):
+                        existing.add(candidate)
+        return existing
 
     def count_chunks(self) -> int:
         with self._connect() as conn:
@@ -886,6 +1136,110 @@ class SQLiteStorage(Storage):
             ).fetchone()
         return int(row["n"]) if row else 0
 
+    def get_chunk_generation(self) -> int | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT generation FROM chunk_generation WHERE id = 1").fetchone()
+        return int(row["generation"]) if row else None
+
+    def list_changes(self, since: int = 0, limit: int = 500) -> ChangeBatch:
+        limit = max(1, int(limit))
+        scope = (self.tenant_id, self.project_id, int(since), limit + 1)
+        with self._connect() as conn:
+            # One read transaction, so both tables are read from the same snapshot.
+            conn.execute("BEGIN")
+            entry_rows = conn.execute(
+                (
+                    "SELECT * FROM log_entries "
+                    "WHERE tenant_id = ? AND project_id = ? AND change_seq > ? "
+                    "ORDER BY change_seq LIMIT ?"
+                ),
+                scope,
+            ).fetchall()
+            chunk_rows = conn.execute(
+                (
+                    "SELECT * FROM chunks "
+                    "WHERE tenant_id = ? AND project_id = ? AND change_seq > ? "
+                    "ORDER BY change_seq LIMIT ?"
+                ),
+                scope,
+            ).fetchall()
+            latest = conn.execute("SELECT seq FROM change_sequence WHERE id = 1").fetchone()
+
+        changes = sorted(
+            [(row["change_seq"], True, row) for row in entry_rows]
+            + [(row["change_seq"], False, row) for row in chunk_rows],
+            key=lambda change: change[0],
+        )
+        page = changes[:limit]
+        return ChangeBatch(
+            since=int(since),
+            next_since=page[-1][0] if page else int(since),
+            latest_seq=int(latest["seq"]) if latest else 0,
+            has_more=len(changes) > limit,
+            entries=[self._row_to_entry(row) for _, is_entry, row in page if is_entry],
+            chunks=[self._row_to_chunk(row) for _, is_entry, row in page if not is_entry],
+        )
+
+    def apply_changes(self, batch: ChangeBatch) -> None:
+        """Upsert a change-feed page from another store into this scope.
+
+        Rows keep their ids, so re-applying a page is a no-op. Entries that reference a
+        session this database does not have are stored without the session link.
+        """
+        if not batch.entries and not batch.chunks:
+            return
+        self._validate_namespace()
+        with self._connect() as conn:
+            first_seq = self._allocate_change_seqs(conn, len(batch.entries) + len(batch.chunks))
+            entry_params = [
+                (*self._entry_insert_params(entry), first_seq + offset)
+                for offset, entry in enumerate(batch.entries)
+            ]
+            conn.executemany(
+                """INSERT INTO log_entries
+                   (
+                        id, tenant_id, project_id, session_id, source, source_session_id, timestamp,
+                        content, label, tags, confidence, curation_status, metadata, change_seq
+                   )
+                   VALUES (
+                        ?, ?, ?, (SELECT id FROM sessions WHERE id = ?),
+                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                   )
+                   ON CONFLICT(id) DO UPDATE SET
+                        content = excluded.content,
+                        label = excluded.label,
+                        tags = excluded.tags,
+                        confidence = excluded.confidence,
+                        curation_status = excluded.curation_status,
+                        metadata = excluded.metadata,
+                        change_seq = excluded.change_seq""",
+                entry_params,
+            )
+            first_seq += len(entry_params)
+            conn.executemany(
+                """INSERT INTO chunks
+                   (
+                       id, tenant_id, project_id, source, source_ids, content, label,
+                       tags, created_at, token_count, embedding, embedding_version,
+                       content_hash, change_seq
+                   )
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       source_ids = excluded.source_ids,
+                       content = excluded.content,
+                       label = excluded.label,
+                       tags = excluded.tags,
+                       token_count = excluded.token_count,
+                       embedding = excluded.embedding,
+                       embedding_version = excluded.embedding_version,
+                       content_hash = excluded.content_hash,
+                       change_seq = excluded.change_seq""",
+                [
+                    (*self._chunk_insert_params(chunk), first_seq + offset)
+                    for offset, chunk in enumerate(batch.chunks)
+                ],
+            )
+
     @staticmethod
     def _serialize_embedding(embedding: list[float] | None) -> bytes | None:
         if embedding is None:
@@ -1057,14 +1411,23 @@ class SQLiteStorage(Storage):
         return row is not None
 
     def mark_session_processed(self, source_session_id: str) -> None:
+        self.mark_sessions_processed([source_session_id])
+
+    def mark_sessions_processed(self, source_session_ids: list[str]) -> None:
+        if not source_session_ids:
+            return
         self._validate_namespace()
+        processed_at = datetime.now(UTC).isoformat()
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 (
                     "INSERT OR REPLACE INTO processed_sessions "
                     "(source_session_id, tenant_id, project_id, processed_at) VALUES (?, ?, ?, ?)"
                 ),
-                (source_session_id, self.tenant_id, self.project_id, datetime.now(UTC).isoformat()),
+                [
+                    (source_session_id, self.tenant_id, self.project_id, processed_at)
+                    for source_session_id in dict.fromkeys(source_session_ids)
+                ],
             )
 
     def clear_processed_sessions(
@@ -0,0 +1,142 @@
+"""Benchmarks for the chunk-indexing step at the end of compaction.
+
+This module compares:
+- The legacy per-entry path (``has_chunk`` + ``embed_single`` + ``store_chunk`` per entry)
+- The set-based path used by ``CompactionEngine`` (one lookup, one ``embed_batch``,
+  one bulk insert)
+
+The embedder is a stand-in with a fixed per-call cost so the numbers reflect call and
+transaction overhead rather than model speed.
+
+Run with: pytest tests/benchmarks/benchmark_compaction.py -v
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pytest
+
+from agent_recall.core import compact as compact_module
+from agent_recall.core.compact import CompactionEngine
+from agent_recall.llm.base import LLMProvider
+from agent_recall.storage.files import FileStorage
+from agent_recall.storage.models import Chunk, ChunkSource, LogEntry, LogSource, SemanticLabel
+from agent_recall.storage.sqlite import SQLiteStorage
+
+ENTRY_COUNT = 5_000
+EMBEDDING_DIMENSIONS = 384
+# Rough fixed cost of one model forward pass, independent of batch size.
+SIMULATED_FORWARD_PASS_SECONDS = 0.0002
+
+
+def _fake_embed_single(text: str) -> np.ndarray:
+    time.sleep(SIMULATED_FORWARD_PASS_SECONDS)
+    return np.full(EMBEDDING_DIMENSIONS, len(text) % 7 / 7.0, dtype=np.float32)
+
+
+def _fake_embed_batch(texts: list[str]) -> list[np.ndarray]:
+    time.sleep(SIMULATED_FORWARD_PASS_SECONDS)
+    return [np.full(EMBEDDING_DIMENSIONS, len(t) % 7 / 7.0, dtype=np.float32) for t in texts]
+
+
+def _entries(count: int) -> list[LogEntry]:
+    return [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            content=f"Benchmark gotcha {index}: retry sqlite writes on busy timeout",
+            label=SemanticLabel.GOTCHA,
+            tags=[f"tag{index % 50}"],
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def compaction_env() -> Generator[tuple[SQLiteStorage, FileStorage], None, None]:
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        agent_dir = temp_dir / ".agent"
+        storage = SQLiteStorage(agent_dir / "state.db")
+        yield storage, FileStorage(agent_dir)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def _index_per_entry(storage: SQLiteStorage, entries: list[LogEntry]) -> int:
+    """The pre-batching indexing loop, kept here as the baseline."""
+    indexed = 0
+    for entry in entries:
+        if storage.has_chunk(entry.content, entry.label):
+            continue
+        embedding = _fake_embed_single(entry.content).tolist()
+        chunk = Chunk(
+            source=ChunkSource.LOG_ENTRY,
+            source_ids=[entry.id],
+            content=entry.content,
+            label=entry.label,
+            tags=list(entry.tags),
+        )
+        storage.store_chunk(chunk)
+        storage.index_chunk_embedding(chunk.id, embedding)
+        indexed += 1
+    return indexed
+
+
+def _index_batched(engine: CompactionEngine, entries: list[LogEntry]) -> int:
+    return engine._index_entries(
+        entries,
+        semantic_index_enabled=True,
+        embedding_dimensions=EMBEDDING_DIMENSIONS,
+    )
+
+
+def test_benchmark_compaction_indexing_per_entry(benchmark, compaction_env):
+    """Benchmark the legacy per-entry indexing loop for 5K entries."""
+    storage, _files = compaction_env
+    entries = _entries(ENTRY_COUNT)
+
+    indexed = benchmark.pedantic(_index_per_entry, args=(storage, entries), rounds=1)
+
+    assert indexed == ENTRY_COUNT
+
+
+def test_benchmark_compaction_indexing_batched(benchmark, compaction_env, monkeypatch):
+    """Benchmark the set-based indexing pipeline for 5K entries."""
+    storage, files = compaction_env
+    monkeypatch.setattr(compact_module, "embed_batch", _fake_embed_batch)
+    engine = CompactionEngine(storage=storage, files=files, llm=cast(LLMProvider, None))
+    entries = _entries(ENTRY_COUNT)
+
+    indexed = benchmark.pedantic(_index_batched, args=(engine, entries), rounds=1)
+
+    assert indexed == ENTRY_COUNT
+    assert _index_batched(engine, entries) == 0
+
+
+if __name__ == "__main__":
+    for label, runner in (("per-entry", "legacy"), ("batched", "batched")):
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            agent_dir = temp_dir / ".agent"
+            storage = SQLiteStorage(agent_dir / "state.db")
+            entries = _entries(ENTRY_COUNT)
+            started = time.perf_counter()
+            if runner == "legacy":
+                _index_per_entry(storage, entries)
+            else:
+                setattr(compact_module, "embed_batch", _fake_embed_batch)
+                engine = CompactionEngine(
+                    storage, FileStorage(agent_dir), llm=cast(LLMProvider, None)
+                )
+                _index_batched(engine, entries)
+            elapsed = time.perf_counter() - started
+            print(f"{label:>10}: {ENTRY_COUNT} entries in {elapsed:.2f}s")
+        finally:
+            shutil.rmtree(temp_dir)
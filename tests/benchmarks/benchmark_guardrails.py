@@ -0,0 +1,91 @@
+"""Benchmarks for guardrail rule evaluation at 500 rules.
+
+This module compares:
+- The legacy loop (one ``re.search`` per rule pattern per evaluation)
+- ``evaluate_guardrail_text`` backed by the compiled single-pass matcher
+
+Run with: pytest tests/benchmarks/benchmark_guardrails.py -v
+"""
+
+from __future__ import annotations
+
+import random
+import re
+
+from agent_recall.core.guardrail_enforcement import (
+    GuardrailRule,
+    evaluate_guardrail_text,
+    parse_guardrail_rules,
+)
+
+RULE_COUNT = 500
+_WORDS = [
+    "rm",
+    "-rf",
+    "sudo",
+    "git",
+    "push",
+    "--force",
+    "drop",
+    "table",
+    "curl",
+    "chmod",
+    "777",
+    "publish",
+    "docker",
+    "prune",
+    "kubectl",
+    "delete",
+    "terraform",
+    "destroy",
+    "mkfs",
+    "shutdown",
+]
+COMMAND = (
+    "python -m pytest -q tests/test_sync.py && git status && ls -la src/agent_recall/core "
+    "&& uv run ruff check src tests"
+)
+
+
+def _guardrails_markdown(count: int) -> str:
+    rng = random.Random(17)
+    lines = ["# Guardrails", ""]
+    for index in range(count):
+        phrase = " ".join(rng.sample(_WORDS, k=2))
+        if index % 10 == 0:
+            pattern = phrase.replace(" ", r"\s+")
+            lines.append(f"- [BLOCK] regex: {pattern}\\s+{index}")
+        else:
+            lines.append(f"- [WARN] Do not run `{phrase} {index}` without review.")
+    return "\n".join(lines)
+
+
+def _legacy_evaluate(text: str, rules: list[GuardrailRule]) -> int:
+    hits = 0
+    for rule in rules:
+        try:
+            match = re.search(rule.pattern, text, re.IGNORECASE)
+        except re.error:
+            continue
+        if match:
+            hits += 1
+    return hits
+
+
+def test_benchmark_guardrails_per_rule_search(benchmark):
+    """Benchmark the legacy per-rule ``re.search`` loop over 500 rules."""
+    rules = parse_guardrail_rules(_guardrails_markdown(RULE_COUNT))
+    assert len(rules) == RULE_COUNT
+
+    hits = benchmark(_legacy_evaluate, COMMAND, rules)
+
+    assert hits == 0
+
+
+def test_benchmark_guardrails_compiled_matcher(benchmark):
+    """Benchmark the compiled single-pass matcher over 500 rules."""
+    rules = parse_guardrail_rules(_guardrails_markdown(RULE_COUNT))
+
+    violations = benchmark(evaluate_guardrail_text, COMMAND, rules)
+
+    assert violations == []
@@ -0,0 +1,424 @@
+"""Benchmarks for persisting a sync batch through ``RemoteStorage``.
+
+This module compares writing 300 entries plus their processed-session marks:
+- Per-item remote writes (one request per entry, mark, and audit event, HTTP/1.0 server)
+- Batched remote writes (bulk endpoints, coalesced audit posts, keep-alive server)
+- Local ``SQLiteStorage`` as the baseline remote mode should approach
+
+Against a shared server that adds 50ms to every request, it compares the sync
+persist step written straight through with the write-behind outbox (queued in
+local SQLite, replicated in the background).
+
+It also compares 50 FTS searches over 1,000 shared chunks with and without the
+read-through cache (local chunk mirror revalidated by ``If-None-Match``).
+
+For the sync pipeline's per-session storage calls against the slow server, it
+compares blocking ``RemoteStorage`` calls made from a coroutine with the awaited
+``AsyncRemoteStorage`` path, reporting the longest event-loop stall in ``extra_info``.
+
+Finally it compares mirroring 5,000 shared entries and 1,000 chunks into the local
+database from scratch with an incremental ``pull_changes`` of 20 new entries.
+
+Run with: pytest tests/benchmarks/benchmark_remote_storage.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from agent_recall.storage.http_server import (
+    _QuietWSGIRequestHandler,
+    _ThreadingWSGIServer,
+    create_shared_backend_wsgi_app,
+)
+from agent_recall.storage.models import (
+    Chunk,
+    ChunkSource,
+    LogEntry,
+    LogSource,
+    SemanticLabel,
+    SessionCheckpoint,
+    SharedStorageConfig,
+)
+from agent_recall.storage.remote import RemoteStorage
+from agent_recall.storage.sqlite import SQLiteStorage
+
+ENTRY_COUNT = 300
+SESSION_COUNT = 30
+CHUNK_COUNT = 1000
+SLOW_SERVER_LATENCY_SECONDS = 0.05
+SEARCH_COUNT = 50
+MIRROR_ENTRY_COUNT = 5000
+NEW_ENTRY_COUNT = 20
+PIPELINE_SESSION_COUNT = 10
+_TOPICS = ["retry", "cache", "schema", "migration", "sync", "audit", "token", "index"]
+_run_ids = itertools.count()
+
+
+class _ClosingRequestHandler(WSGIRequestHandler):
+    """One request per connection, as the server behaved before keep-alive."""
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+def _batch(run_id: int) -> tuple[list[LogEntry], list[str]]:
+    session_ids = [f"bench-{run_id}-{index}" for index in range(SESSION_COUNT)]
+    entries = [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            source_session_id=session_ids[index % SESSION_COUNT],
+            content=f"learning {run_id}-{index}: batch remote writes",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(ENTRY_COUNT)
+    ]
+    return entries, session_ids
+
+
+def _persist_per_item(storage) -> None:  # noqa: ANN001
+    entries, session_ids = _batch(next(_run_ids))
+    for entry in entries:
+        storage.append_entry(entry)
+    for source_session_id in session_ids:
+        storage.mark_session_processed(source_session_id)
+    storage.flush_audit_events()
+
+
+def _persist_batched(storage) -> None:  # noqa: ANN001
+    entries, session_ids = _batch(next(_run_ids))
+    storage.append_entries(entries)
+    storage.mark_sessions_processed(session_ids)
+    flush = getattr(storage, "flush_audit_events", None)
+    if flush is not None:
+        flush()
+
+
+def _serve(
+    db_path: Path,
+    handler_class: type[WSGIRequestHandler],
+    *,
+    latency_seconds: float = 0.0,
+) -> tuple[Any, str]:
+    app = create_shared_backend_wsgi_app(db_path)
+    if latency_seconds:
+        inner = app
+
+        def app(environ, start_response):  # noqa: ANN001, ANN202
+            time.sleep(latency_seconds)
+            return inner(environ, start_response)
+
+    server = make_server(
+        "127.0.0.1",
+        0,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=handler_class,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def _remote(base_url: str, local_db_path: Path | None = None, **options: Any) -> RemoteStorage:
+    return RemoteStorage(
+        SharedStorageConfig(
+            base_url=base_url,
+            tenant_id="bench-tenant",
+            project_id="bench-project",
+            **options,
+        ),
+        local_db_path=local_db_path,
+    )
+
+
+def _benchmark_remote(
+    benchmark,
+    db_path: Path,
+    handler_class: type[WSGIRequestHandler],
+    persist: Callable[[RemoteStorage], None],
+    **config_options: Any,
+) -> None:
+    server, base_url = _serve(db_path, handler_class)
+    storage = _remote(base_url, **config_options)
+    try:
+        benchmark.pedantic(persist, args=(storage,), rounds=3)
+        assert storage.count_log_entries() == ENTRY_COUNT * 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_benchmark_remote_storage_per_item(benchmark, tmp_path: Path):
+    """Benchmark per-item remote writes with one audit post per event."""
+    _benchmark_remote(
+        benchmark,
+        tmp_path / "state.db",
+        _ClosingRequestHandler,
+        _persist_per_item,
+        audit_batch_size=1,
+    )
+
+
+def test_benchmark_remote_storage_batched(benchmark, tmp_path: Path):
+    """Benchmark bulk remote writes over a kept-alive connection."""
+    _benchmark_remote(
+        benchmark,
+        tmp_path / "state.db",
+        _QuietWSGIRequestHandler,
+        _persist_batched,
+    )
+
+
+def test_benchmark_local_storage_batched(benchmark, tmp_path: Path):
+    """Benchmark the same batch written straight to local SQLite."""
+    storage = SQLiteStorage(tmp_path / "state.db")
+    benchmark.pedantic(_persist_batched, args=(storage,), rounds=3)
+    assert storage.count_log_entries() == ENTRY_COUNT * 3
+
+
+def _persist_sync_step(storage: RemoteStorage) -> None:
+    entries, session_ids = _batch(next(_run_ids))
+    storage.append_entries(entries)
+    for source_session_id in session_ids:
+        storage.save_session_checkpoint(
+            SessionCheckpoint(source_session_id=source_session_id, last_message_index=10)
+        )
+        storage.mark_session_processed(source_session_id)
+
+
+def _benchmark_slow_server_persist(benchmark, tmp_path: Path, *, write_behind: bool) -> None:
+    server, base_url = _serve(
+        tmp_path / "server" / "state.db",
+        _QuietWSGIRequestHandler,
+        latency_seconds=SLOW_SERVER_LATENCY_SECONDS,
+    )
+    storage = _remote(
+        base_url,
+        local_db_path=tmp_path / "client" / "state.db",
+        write_behind_enabled=write_behind,
+        audit_enabled=False,
+    )
+    try:
+        benchmark.pedantic(_persist_sync_step, args=(storage,), rounds=3)
+        assert storage.flush_outbox() is True
+        assert storage.count_log_entries() == ENTRY_COUNT * 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_benchmark_slow_server_persist_direct(benchmark, tmp_path: Path):
+    """Benchmark the sync persist step writing through to a slow server."""
+    _benchmark_slow_server_persist(benchmark, tmp_path, write_behind=False)
+
+
+def test_benchmark_slow_server_persist_write_behind(benchmark, tmp_path: Path):
+    """Benchmark the sync persist step queued in the write-behind outbox."""
+    _benchmark_slow_server_persist(benchmark, tmp_path, write_behind=True)
+
+
+def _search_many(storage: RemoteStorage) -> int:
+    return sum(
+        len(storage.search_chunks_fts(_TOPICS[index % len(_TOPICS)], top_k=5))
+        for index in range(SEARCH_COUNT)
+    )
+
+
+def _benchmark_search(benchmark, tmp_path: Path, *, read_cache_enabled: bool) -> None:
+    server, base_url = _serve(tmp_path / "server" / "state.db", _QuietWSGIRequestHandler)
+    try:
+        _remote(base_url).store_chunks(
+            [
+                Chunk(
+                    source=ChunkSource.MANUAL,
+                    content=f"{_TOPICS[index % len(_TOPICS)]} note {index}: keep writes batched",
+                    label=SemanticLabel.PATTERN,
+                )
+                for index in range(CHUNK_COUNT)
+            ]
+        )
+        storage = _remote(
+            base_url,
+            local_db_path=tmp_path / "client" / "state.db",
+            read_cache_enabled=read_cache_enabled,
+        )
+        hits = benchmark.pedantic(_search_many, args=(storage,), rounds=3, warmup_rounds=1)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert hits == SEARCH_COUNT * 5
+
+
+def test_benchmark_remote_search_uncached(benchmark, tmp_path: Path):
+    """Benchmark FTS searches answered by the shared backend."""
+    _benchmark_search(benchmark, tmp_path, read_cache_enabled=False)
+
+
+def test_benchmark_remote_search_read_through_cache(benchmark, tmp_path: Path):
+    """Benchmark FTS searches against the revalidated local chunk mirror."""
+    _benchmark_search(benchmark, tmp_path, read_cache_enabled=True)
+
+
+def _benchmark_pull(benchmark, tmp_path: Path, *, incremental: bool) -> None:
+    server, base_url = _serve(tmp_path / "server" / "state.db", _QuietWSGIRequestHandler)
+    writer = _remote(base_url, audit_enabled=False)
+    storage = _remote(base_url, local_db_path=tmp_path / "client" / "state.db")
+    try:
+        writer.append_entries(
+            [
+                LogEntry(
+                    source=LogSource.EXTRACTED,
+                    source_session_id=f"bench-{index % SESSION_COUNT}",
+                    content=f"learning {index}: mirror only what changed",
+                    label=SemanticLabel.PATTERN,
+                )
+                for index in range(MIRROR_ENTRY_COUNT)
+            ]
+        )
+        writer.store_chunks(
+            [
+                Chunk(
+                    source=ChunkSource.MANUAL,
+                    content=f"{_TOPICS[index % len(_TOPICS)]} note {index}",
+                    label=SemanticLabel.PATTERN,
+                )
+                for index in range(CHUNK_COUNT)
+            ]
+        )
+        storage.pull_changes()
+
+        def setup() -> tuple[tuple[Any, ...], dict[str, Any]]:
+            if not incremental:
+                return (), {"since": 0}
+            run_id = next(_run_ids)
+            writer.append_entries(
+                [
+                    LogEntry(
+                        source=LogSource.EXTRACTED,
+                        source_session_id=f"bench-new-{run_id}",
+                        content=f"new learning {run_id}-{index}",
+                        label=SemanticLabel.PATTERN,
+                    )
+                    for index in range(NEW_ENTRY_COUNT)
+                ]
+            )
+            return (), {}
+
+        result = benchmark.pedantic(storage.pull_changes, setup=setup, rounds=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+    expected = NEW_ENTRY_COUNT if incremental else MIRROR_ENTRY_COUNT
+    assert result.entries == expected
+
+
+def test_benchmark_pull_full_mirror(benchmark, tmp_path: Path):
+    """Benchmark re-pulling every shared entry and chunk into the local database."""
+    _benchmark_pull(benchmark, tmp_path, incremental=False)
+
+
+def test_benchmark_pull_incremental(benchmark, tmp_path: Path):
+    """Benchmark pulling only the entries written since the last pull."""
+    _benchmark_pull(benchmark, tmp_path, incremental=True)
+
+
+def _session_step_batch(run_id: int) -> list[tuple[str, list[LogEntry], SessionCheckpoint]]:
+    steps = []
+    for session_index in range(PIPELINE_SESSION_COUNT):
+        source_session_id = f"pipeline-{run_id}-{session_index}"
+        entries = [
+            LogEntry(
+                source=LogSource.EXTRACTED,
+                source_session_id=source_session_id,
+                content=f"learning {run_id}-{session_index}-{index}",
+                label=SemanticLabel.PATTERN,
+            )
+            for index in range(SESSION_COUNT)
+        ]
+        checkpoint = SessionCheckpoint(source_session_id=source_session_id, last_message_index=9)
+        steps.append((source_session_id, entries, checkpoint))
+    return steps
+
+
+async def _measure_loop_stall(work) -> float:  # noqa: ANN001
+    """Run ``work`` next to a 1ms ticker and return the longest gap between ticks."""
+    longest = 0.0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal longest
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        await work()
+    finally:
+        done.set()
+        await tick
+    return longest
+
+
+def _benchmark_pipeline_storage(benchmark, tmp_path: Path, *, awaited: bool) -> None:
+    server, base_url = _serve(
+        tmp_path / "server" / "state.db",
+        _QuietWSGIRequestHandler,
+        latency_seconds=SLOW_SERVER_LATENCY_SECONDS,
+    )
+    storage = _remote(base_url, write_behind_enabled=False, audit_enabled=False)
+    stalls: list[float] = []
+
+    async def blocking_steps() -> None:
+        for source_session_id, entries, checkpoint in _session_step_batch(next(_run_ids)):
+            storage.get_session_checkpoint(source_session_id)
+            storage.is_session_processed(source_session_id)
+            storage.append_entries(entries)
+            storage.save_session_checkpoint(checkpoint)
+            storage.mark_session_processed(source_session_id)
+
+    async def awaited_steps() -> None:
+        async_storage = storage.as_async()
+        for source_session_id, entries, checkpoint in _session_step_batch(next(_run_ids)):
+            await asyncio.gather(
+                async_storage.get_session_checkpoint(source_session_id),
+                async_storage.is_session_processed(source_session_id),
+            )
+            await async_storage.append_entries(entries)
+            await async_storage.save_session_checkpoint(checkpoint)
+            await async_storage.mark_session_processed(source_session_id)
+        await async_storage.aclose()
+
+    def run() -> None:
+        work = awaited_steps if awaited else blocking_steps
+        stalls.append(asyncio.run(_measure_loop_stall(work)))
+
+    try:
+        benchmark.pedantic(run, rounds=3)
+        assert storage.count_log_entries() == PIPELINE_SESSION_COUNT * SESSION_COUNT * 3
+    finally:
+        server.shutdown()
+        server.server_close()
+    benchmark.extra_info["max_loop_stall_ms"] = max(stalls) * 1000
+
+
+def test_benchmark_pipeline_storage_blocking(benchmark, tmp_path: Path):
+    """Benchmark per-session sync storage calls made with the blocking client."""
+    _benchmark_pipeline_storage(benchmark, tmp_path, awaited=False)
+
+
+def test_benchmark_pipeline_storage_awaited(benchmark, tmp_path: Path):
+    """Benchmark the same calls awaited through ``AsyncRemoteStorage``."""
+    _benchmark_pipeline_storage(benchmark, tmp_path, awaited=True)
@@ -0,0 +1,155 @@
+"""Load-test benchmarks for the shared-backend HTTP server.
+
+This module compares, under concurrent clients on a local socket:
+- The legacy handler (new ``SQLiteStorage`` per request, pretty-printed JSON)
+- ``create_shared_backend_wsgi_app`` (cached per-scope storage, compact/gzip JSON)
+
+Each run reports requests per second and p99 latency in ``extra_info``.
+
+Run with: pytest tests/benchmarks/benchmark_shared_backend.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs
+from wsgiref.simple_server import make_server
+
+import httpx
+import pytest
+
+from agent_recall.storage.http_server import (
+    _QuietWSGIRequestHandler,
+    _ThreadingWSGIServer,
+    create_shared_backend_wsgi_app,
+)
+from agent_recall.storage.models import LogEntry, LogSource, SemanticLabel
+from agent_recall.storage.sqlite import SQLiteStorage
+
+CLIENT_THREADS = 8
+REQUESTS_PER_CLIENT = 50
+ENTRY_COUNT = 50
+SOURCE_SESSION_ID = "bench-source-session"
+
+
+def _legacy_app(db_path: Path):
+    """The pre-rewrite handler for ``GET /entries/by-source-session``."""
+
+    def app(environ, start_response):
+        query = parse_qs(str(environ.get("QUERY_STRING", "")))
+        storage = SQLiteStorage(db_path)
+        entries = storage.get_entries_by_source_session(
+            query["source_session_id"][0], limit=int(query.get("limit", ["200"])[0])
+        )
+        body = json.dumps([entry.model_dump(mode="json") for entry in entries], indent=2).encode()
+        start_response(
+            "200 OK",
+            [("Content-Type", "application/json"), ("Content-Length", str(len(body)))],
+        )
+        return [body]
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def seeded_db() -> Generator[Path, None, None]:
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        db_path = temp_dir / "state.db"
+        storage = SQLiteStorage(db_path)
+        base = datetime.now(UTC) - timedelta(hours=1)
+        for index in range(ENTRY_COUNT):
+            storage.append_entry(
+                LogEntry(
+                    source=LogSource.EXTRACTED,
+                    source_session_id=SOURCE_SESSION_ID,
+                    timestamp=base + timedelta(seconds=index),
+                    content=f"learning {index}: prefer batched writes over per-row commits",
+                    label=SemanticLabel.PATTERN,
+                )
+            )
+        yield db_path
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def _run_load(base_url: str) -> dict[str, float]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def client_loop() -> None:
+        local: list[float] = []
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            for _ in range(REQUESTS_PER_CLIENT):
+                started = time.perf_counter()
+                response = client.get(
+                    "/entries/by-source-session",
+                    params={"source_session_id": SOURCE_SESSION_ID, "limit": ENTRY_COUNT},
+                )
+                response.raise_for_status()
+                local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client_loop) for _ in range(CLIENT_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": float(len(latencies)),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": statistics.quantiles(latencies, n=100)[98] * 1000,
+    }
+
+
+def _serve(app) -> tuple[_ThreadingWSGIServer, str]:
+    server = make_server(
+        "127.0.0.1",
+        0,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=_QuietWSGIRequestHandler,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def _benchmark_app(benchmark, app) -> dict[str, float]:
+    server, base_url = _serve(app)
+    try:
+        stats = benchmark.pedantic(_run_load, args=(base_url,), rounds=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+    benchmark.extra_info.update(stats)
+    print(
+        f"\n{stats['requests_per_second']:.0f} req/s, "
+        f"p50 {stats['p50_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms"
+    )
+    return stats
+
+
+def test_benchmark_shared_backend_legacy_handler(benchmark, seeded_db):
+    """Load-test the legacy per-request storage handler."""
+    stats = _benchmark_app(benchmark, _legacy_app(seeded_db))
+    assert stats["requests"] == CLIENT_THREADS * REQUESTS_PER_CLIENT
+
+
+def test_benchmark_shared_backend_cached_storage(benchmark, seeded_db):
+    """Load-test the shared backend app with cached scoped storage."""
+    stats = _benchmark_app(benchmark, create_shared_backend_wsgi_app(seeded_db))
+    assert stats["requests"] == CLIENT_THREADS * REQUESTS_PER_CLIENT
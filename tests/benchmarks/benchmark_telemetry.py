@@ -0,0 +1,88 @@
+"""Benchmarks for telemetry run lookups.
+
+This module compares:
+- Parsing the whole ``pipeline-events.jsonl`` to find the latest runs (legacy path)
+- Indexed lookups against ``TelemetryEventStore``
+
+Run with: pytest tests/benchmarks/benchmark_telemetry.py -v
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from agent_recall.core.telemetry_store import TelemetryEventStore
+from agent_recall.storage.models import PipelineEvent, PipelineEventAction, PipelineStage
+
+EVENT_COUNT = 50_000
+EVENTS_PER_RUN = 25
+
+
+def _events(count: int) -> list[PipelineEvent]:
+    started = datetime.now(UTC) - timedelta(days=1)
+    stages = list(PipelineStage)
+    return [
+        PipelineEvent(
+            run_id=f"sync-{index // EVENTS_PER_RUN:05d}",
+            stage=stages[index % len(stages)],
+            action=PipelineEventAction.COMPLETE,
+            success=True,
+            duration_ms=float(index % 400),
+            created_at=started + timedelta(milliseconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(scope="module")
+def telemetry_env() -> Generator[tuple[Path, TelemetryEventStore], None, None]:
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        events = _events(EVENT_COUNT)
+        jsonl_path = temp_dir / "pipeline-events.jsonl"
+        jsonl_path.write_text(
+            "".join(event.model_dump_json() + "\n" for event in events),
+            encoding="utf-8",
+        )
+        store = TelemetryEventStore(temp_dir / "pipeline-events.db", retention_days=None)
+        store.append(events)
+        yield jsonl_path, store
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def _latest_runs_from_jsonl(path: Path, limit: int) -> list[str]:
+    last_seen: dict[str, datetime] = {}
+    for raw_line in path.read_text(encoding="utf-8").splitlines():
+        event = PipelineEvent.model_validate_json(raw_line)
+        last_seen[event.run_id] = max(
+            event.created_at, last_seen.get(event.run_id, event.created_at)
+        )
+    return sorted(last_seen, key=last_seen.__getitem__, reverse=True)[:limit]
+
+
+def test_benchmark_telemetry_recent_runs_jsonl_scan(benchmark, telemetry_env):
+    """Benchmark finding the latest 5 runs by parsing 50K JSONL events."""
+    jsonl_path, _store = telemetry_env
+    runs = benchmark.pedantic(_latest_runs_from_jsonl, args=(jsonl_path, 5), rounds=3)
+    assert len(runs) == 5
+
+
+def test_benchmark_telemetry_recent_runs_indexed(benchmark, telemetry_env):
+    """Benchmark finding the latest 5 runs through the indexed store."""
+    _jsonl_path, store = telemetry_env
+    runs = benchmark(store.recent_run_ids, limit=5)
+    assert runs[0] == f"sync-{(EVENT_COUNT - 1) // EVENTS_PER_RUN:05d}"
+
+
+def test_benchmark_telemetry_events_for_run_indexed(benchmark, telemetry_env):
+    """Benchmark loading one run's events by run id."""
+    _jsonl_path, store = telemetry_env
+    events = benchmark(store.query, run_id="sync-00042")
+    assert len(events) == EVENTS_PER_RUN
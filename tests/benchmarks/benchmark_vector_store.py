@@ -0,0 +1,479 @@
+"""Benchmarks for local vector memory queries.
+
+This module compares:
+- Opening a connection, loading sqlite-vec and JSON-decoding embeddings per query (legacy path)
+- Ordering the whole table by ``vec_distance_cosine`` on a kept-open connection
+- KNN queries against the ``vec0`` index of one long-lived ``LocalVectorStore``
+- Upserting records and index rows one statement at a time versus in batches
+- A full vector migration versus a re-run over unchanged learnings
+- Agent memory searches through a fresh ``AgentMemoryIndex`` per query versus one
+  long-lived index, and one ``search_many`` call
+- TurboPuffer upserts sent one batch at a time versus concurrent batches, and queries
+  on a new HTTP client per request versus one pooled client
+- External embeddings posted one batch at a time on a new client per call versus packed
+  batches sent concurrently on one pooled client
+
+Run with: pytest tests/benchmarks/benchmark_vector_store.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Generator, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+import pytest
+
+from agent_recall.memory.agent_memory import AgentMemoryIndex
+from agent_recall.memory.embedding_provider import ExternalEmbeddingProvider
+from agent_recall.memory.migration import VectorMigrationRequest, VectorMigrationService
+from agent_recall.memory.policy import MemoryPolicy
+from agent_recall.memory.vector_store import (
+    LocalVectorStore,
+    TurboPufferVectorStore,
+    VectorRecord,
+)
+from agent_recall.storage.base import Storage
+from agent_recall.storage.files import FileStorage
+from agent_recall.storage.models import LogEntry, LogSource, SemanticLabel
+from agent_recall.storage.sqlite import SQLiteStorage
+from tests.support.fake_embeddings import FakeEmbeddingServer
+from tests.support.fake_turbopuffer import FakeTurboPufferServer
+
+RECORD_COUNT = 5_000
+UPSERT_COUNT = 1_000
+LEARNING_COUNT = 1_000
+DIMENSIONS = 384
+QUERY_COUNT = 20
+TOP_K = 10
+TURBOPUFFER_RECORDS = 2_000
+TURBOPUFFER_LATENCY_SECONDS = 0.02
+EMBEDDING_TEXTS = 1_000
+EMBEDDING_BATCH = 100
+EMBEDDING_LATENCY_SECONDS = 0.03
+
+
+def _vector(rng: random.Random) -> list[float]:
+    return [rng.uniform(-1.0, 1.0) for _ in range(DIMENSIONS)]
+
+
+@pytest.fixture(scope="module")
+def vector_env() -> Generator[tuple[LocalVectorStore, list[list[float]]], None, None]:
+    temp_dir = Path(tempfile.mkdtemp())
+    rng = random.Random(7)
+    try:
+        store = LocalVectorStore(temp_dir / "semantic-memory.db", tenant_id="t", project_id="p")
+        now = datetime.now(UTC).isoformat()
+        store.upsert_records(
+            [
+                VectorRecord(
+                    id=f"v{index:05d}",
+                    tenant_id="t",
+                    project_id="p",
+                    text=f"learning {index}",
+                    label="pattern",
+                    embedding=_vector(rng),
+                    updated_at=now,
+                )
+                for index in range(RECORD_COUNT)
+            ]
+        )
+        yield store, [_vector(rng) for _ in range(QUERY_COUNT)]
+        store.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def _legacy_query(store: LocalVectorStore, embedding: list[float]) -> list[tuple[str, float]]:
+    conn = sqlite3.connect(store.db_path)
+    try:
+        LocalVectorStore._load_sqlite_vec(conn)
+        rows = conn.execute(
+            """
+            SELECT id, vec_to_json(embedding), vec_distance_cosine(embedding, ?) AS distance
+            FROM memory_vector_records
+            WHERE tenant_id = ? AND project_id = ?
+            ORDER BY distance ASC, id ASC
+            LIMIT ?
+            """,
+            (
+                LocalVectorStore._serialize_embedding(embedding),
+                store.tenant_id,
+                store.project_id,
+                TOP_K,
+            ),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(row[0], 1.0 - row[2]) for row in rows if json.loads(row[1])]
+
+
+def _scan_query(store: LocalVectorStore, embedding: list[float]) -> list[tuple[str, float]]:
+    with store._connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, vec_distance_cosine(embedding, ?) AS distance
+            FROM memory_vector_records
+            WHERE tenant_id = ? AND project_id = ?
+            ORDER BY distance ASC, id ASC
+            LIMIT ?
+            """,
+            (
+                LocalVectorStore._serialize_embedding(embedding),
+                store.tenant_id,
+                store.project_id,
+                TOP_K,
+            ),
+        ).fetchall()
+    return [(row[0], 1.0 - row[1]) for row in rows]
+
+
+def _upsert_row_by_row(store: LocalVectorStore, records: list[VectorRecord]) -> None:
+    with store._connect() as conn:
+        for record in records:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO memory_vector_records (
+                    id, tenant_id, project_id, text, label,
+                    tags, embedding, metadata, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, '[]', ?, '{}', ?)
+                """,
+                (
+                    record.id,
+                    record.tenant_id,
+                    record.project_id,
+                    record.text,
+                    record.label,
+                    LocalVectorStore._serialize_embedding(record.embedding),
+                    record.updated_at,
+                ),
+            )
+            conn.execute(
+                """
+                DELETE FROM memory_vector_index
+                WHERE rowid = (SELECT rowid FROM memory_vector_records WHERE id = ?)
+                """,
+                (record.id,),
+            )
+            conn.execute(
+                """
+                INSERT INTO memory_vector_index (rowid, embedding, tenant_id, project_id, label)
+                SELECT rowid, embedding, tenant_id, project_id, label
+                FROM memory_vector_records WHERE id = ?
+                """,
+                (record.id,),
+            )
+
+
+def _upsert_batch(tmp_path: Path) -> tuple[LocalVectorStore, list[VectorRecord]]:
+    rng = random.Random(11)
+    store = LocalVectorStore(tmp_path / "semantic-memory.db", tenant_id="t", project_id="p")
+    now = datetime.now(UTC).isoformat()
+    store.upsert_records(
+        [
+            VectorRecord(
+                id="seed",
+                tenant_id="t",
+                project_id="p",
+                text="seed",
+                label="pattern",
+                embedding=_vector(rng),
+                updated_at=now,
+            )
+        ]
+    )
+    records = [
+        VectorRecord(
+            id=f"u{index:05d}",
+            tenant_id="t",
+            project_id="p",
+            text=f"learning {index}",
+            label="pattern",
+            embedding=_vector(rng),
+            updated_at=now,
+        )
+        for index in range(UPSERT_COUNT)
+    ]
+    return store, records
+
+
+def test_benchmark_vector_query_connection_per_call(benchmark, vector_env):
+    """Benchmark 20 top-10 queries that reconnect and JSON-decode every result."""
+    store, queries = vector_env
+    results = benchmark.pedantic(
+        lambda: [_legacy_query(store, query) for query in queries], rounds=5
+    )
+    assert all(len(result) == TOP_K for result in results)
+
+
+def test_benchmark_vector_query_full_scan(benchmark, vector_env):
+    """Benchmark the same queries ordering every row on a kept-open connection."""
+    store, queries = vector_env
+    results = benchmark.pedantic(lambda: [_scan_query(store, query) for query in queries], rounds=5)
+    assert all(len(result) == TOP_K for result in results)
+
+
+def test_benchmark_vector_query_knn_index(benchmark, vector_env):
+    """Benchmark the same queries through the store's ``vec0`` KNN index."""
+    store, queries = vector_env
+    results = benchmark.pedantic(
+        lambda: [store.query(embedding=query, top_k=TOP_K) for query in queries], rounds=5
+    )
+    assert all(len(result) == TOP_K for result in results)
+
+
+def test_benchmark_vector_upsert_row_by_row(benchmark, tmp_path: Path):
+    """Benchmark upserting 1K records and their index rows one ``execute`` at a time."""
+    store, records = _upsert_batch(tmp_path)
+    benchmark.pedantic(_upsert_row_by_row, args=(store, records), rounds=3)
+    assert store.count_records() == UPSERT_COUNT + 1
+
+
+def test_benchmark_vector_upsert_batch(benchmark, tmp_path: Path):
+    """Benchmark upserting 1K records with ``executemany``, including the KNN index."""
+    store, records = _upsert_batch(tmp_path)
+    benchmark.pedantic(store.upsert_records, args=(records,), rounds=3)
+    assert store.count_records() == UPSERT_COUNT + 1
+
+
+def _migration_service(tmp_path: Path) -> VectorMigrationService:
+    storage = SQLiteStorage(tmp_path / "state.db")
+    storage.append_entries(
+        [
+            LogEntry(
+                source=LogSource.EXTRACTED,
+                source_session_id=f"session-{index // 10}",
+                content=f"learning {index} about the build and its test fixtures",
+                label=SemanticLabel.PATTERN,
+            )
+            for index in range(LEARNING_COUNT)
+        ]
+    )
+    memory_cfg = {"embedding_provider": "local", "cost": {"max_vector_records": LEARNING_COUNT}}
+    return VectorMigrationService(
+        storage=storage,
+        files=FileStorage(tmp_path),
+        memory_cfg=memory_cfg,
+        policy=MemoryPolicy.from_memory_config(memory_cfg),
+        tenant_id="t",
+        project_id="p",
+        embedding_dimensions=64,
+        vector_db_path=tmp_path / "semantic-memory.db",
+    )
+
+
+def test_benchmark_vector_migration_full(benchmark, tmp_path: Path):
+    """Benchmark embedding and writing 1K learnings into an empty vector store."""
+    service = _migration_service(tmp_path)
+
+    def run() -> dict:
+        service.local_vector_store().delete_records(list(service.existing_content_hashes("local")))
+        return service.migrate(VectorMigrationRequest())
+
+    payload = benchmark.pedantic(run, rounds=3)
+    assert payload["rows_written"] == LEARNING_COUNT
+
+
+def test_benchmark_vector_migration_unchanged(benchmark, tmp_path: Path):
+    """Benchmark re-running the migration when no learning changed."""
+    service = _migration_service(tmp_path)
+    service.migrate(VectorMigrationRequest())
+    payload = benchmark.pedantic(service.migrate, args=(VectorMigrationRequest(),), rounds=3)
+    assert (payload["rows_written"], payload["rows_unchanged"]) == (0, LEARNING_COUNT)
+
+
+@pytest.fixture
+def memory_index_env(tmp_path: Path) -> tuple[Storage, FileStorage, list[str]]:
+    service = _migration_service(tmp_path)
+    service.migrate(VectorMigrationRequest())
+    (tmp_path / "config.yaml").write_text(
+        "memory:\n"
+        "  vector_enabled: true\n"
+        "retrieval:\n"
+        "  embedding_dimensions: 64\n"
+        "storage:\n"
+        "  shared:\n"
+        "    tenant_id: t\n"
+        "    project_id: p\n"
+    )
+    queries = [f"how do we run test fixtures {index}" for index in range(QUERY_COUNT)]
+    return service.storage, service.files, queries
+
+
+def test_benchmark_agent_memory_search_fresh_index(benchmark, memory_index_env):
+    """Benchmark 20 searches that each build a new index, provider and store."""
+    storage, files, queries = memory_index_env
+
+    def run() -> list:
+        return [
+            AgentMemoryIndex(storage=storage, files=files).search(query, top_k=TOP_K)
+            for query in queries
+        ]
+
+    results = benchmark.pedantic(run, rounds=5)
+    assert all(len(cards) == TOP_K for cards in results)
+
+
+def test_benchmark_agent_memory_search_long_lived(benchmark, memory_index_env):
+    """Benchmark the same searches through one warm index."""
+    storage, files, queries = memory_index_env
+    index = AgentMemoryIndex(storage=storage, files=files)
+    results = benchmark.pedantic(
+        lambda: [index.search(query, top_k=TOP_K) for query in queries], rounds=5
+    )
+    assert all(len(cards) == TOP_K for cards in results)
+    index.close()
+
+
+def test_benchmark_agent_memory_search_many(benchmark, memory_index_env):
+    """Benchmark the same searches as one ``search_many`` call on a warm index."""
+    storage, files, queries = memory_index_env
+    index = AgentMemoryIndex(storage=storage, files=files)
+    results = benchmark.pedantic(lambda: index.search_many(queries, top_k=TOP_K), rounds=5)
+    assert all(len(cards) == TOP_K for cards in results)
+    index.close()
+
+
+@pytest.fixture
+def slow_turbopuffer(turbopuffer_server: FakeTurboPufferServer) -> FakeTurboPufferServer:
+    turbopuffer_server.latency_seconds = TURBOPUFFER_LATENCY_SECONDS
+    return turbopuffer_server
+
+
+def _turbopuffer_store(server: FakeTurboPufferServer, concurrency: int) -> TurboPufferVectorStore:
+    return TurboPufferVectorStore(
+        base_url=server.base_url,
+        api_key_env="TP_KEY",
+        tenant_id="t",
+        project_id="p",
+        upsert_batch_size=100,
+        upsert_concurrency=concurrency,
+    )
+
+
+def _turbopuffer_records() -> list[VectorRecord]:
+    rng = random.Random(13)
+    now = datetime.now(UTC).isoformat()
+    return [
+        VectorRecord(
+            id=f"tp{index:05d}",
+            tenant_id="t",
+            project_id="p",
+            text=f"learning {index}",
+            label="pattern",
+            embedding=[rng.uniform(-1.0, 1.0) for _ in range(64)],
+            updated_at=now,
+        )
+        for index in range(TURBOPUFFER_RECORDS)
+    ]
+
+
+def test_benchmark_turbopuffer_upsert_serial(benchmark, slow_turbopuffer):
+    """Benchmark upserting 2K records as 20 batches sent one after another."""
+    store = _turbopuffer_store(slow_turbopuffer, concurrency=1)
+    records = _turbopuffer_records()
+    benchmark.pedantic(store.upsert_records, args=(records,), rounds=3)
+    assert len(slow_turbopuffer.records) == TURBOPUFFER_RECORDS
+    store.close()
+
+
+def test_benchmark_turbopuffer_upsert_concurrent(benchmark, slow_turbopuffer):
+    """Benchmark the same 20 batches sent by four workers on one pooled client."""
+    store = _turbopuffer_store(slow_turbopuffer, concurrency=4)
+    records = _turbopuffer_records()
+    benchmark.pedantic(store.upsert_records, args=(records,), rounds=3)
+    assert len(slow_turbopuffer.records) == TURBOPUFFER_RECORDS
+    assert slow_turbopuffer.max_in_flight > 1
+    store.close()
+
+
+def _client_per_request_query(server: FakeTurboPufferServer) -> list[dict]:
+    with httpx.Client(timeout=10.0) as client:
+        response = client.post(
+            f"{server.base_url}/vectors/query",
+            headers={"Authorization": "Bearer token"},
+            json={"namespace": "t:p", "embedding": [0.1, 0.2], "top_k": TOP_K},
+        )
+        response.raise_for_status()
+        return response.json()["matches"]
+
+
+def test_benchmark_turbopuffer_query_client_per_request(benchmark, turbopuffer_server):
+    """Benchmark 20 queries that each build a new ``httpx.Client`` (legacy path)."""
+    results = benchmark.pedantic(
+        lambda: [_client_per_request_query(turbopuffer_server) for _ in range(QUERY_COUNT)],
+        rounds=5,
+    )
+    assert len(results) == QUERY_COUNT
+
+
+def test_benchmark_turbopuffer_query_pooled(benchmark, turbopuffer_server):
+    """Benchmark the same queries through one store's keep-alive client."""
+    store = _turbopuffer_store(turbopuffer_server, concurrency=1)
+    results = benchmark.pedantic(
+        lambda: [store.query(embedding=[0.1, 0.2], top_k=TOP_K) for _ in range(QUERY_COUNT)],
+        rounds=5,
+    )
+    assert len(results) == QUERY_COUNT
+    assert turbopuffer_server.connections == 1
+    store.close()
+
+
+@pytest.fixture
+def embedding_server(monkeypatch) -> Iterator[FakeEmbeddingServer]:
+    monkeypatch.setenv("EMB_KEY", "token")
+    server = FakeEmbeddingServer(latency_seconds=EMBEDDING_LATENCY_SECONDS).start()
+    yield server
+    server.stop()
+
+
+def _embedding_texts() -> list[str]:
+    return [
+        f"learning {index} about the build and its test fixtures"
+        for index in range(EMBEDDING_TEXTS)
+    ]
+
+
+def _serial_embeddings(server: FakeEmbeddingServer, texts: list[str]) -> list[list[float]]:
+    vectors: list[list[float]] = []
+    for start in range(0, len(texts), EMBEDDING_BATCH):
+        with httpx.Client(timeout=10.0) as client:
+            response = client.post(
+                f"{server.base_url}/embeddings",
+                json={"model": "emb", "input": texts[start : start + EMBEDDING_BATCH]},
+                headers={"Authorization": "Bearer token"},
+            )
+            response.raise_for_status()
+        vectors.extend(item["embedding"] for item in response.json()["data"])
+    return vectors
+
+
+def test_benchmark_external_embeddings_serial(benchmark, embedding_server):
+    """Benchmark 1K texts as ten 100-input requests, one client each (legacy path)."""
+    texts = _embedding_texts()
+    vectors = benchmark.pedantic(_serial_embeddings, args=(embedding_server, texts), rounds=3)
+    assert len(vectors) == EMBEDDING_TEXTS
+
+
+def test_benchmark_external_embeddings_concurrent(benchmark, embedding_server):
+    """Benchmark the same texts packed into 100-input requests sent four at a time."""
+    provider = ExternalEmbeddingProvider(
+        base_url=embedding_server.base_url,
+        api_key_env="EMB_KEY",
+        model="emb",
+        max_cost_usd=100.0,
+        max_batch_inputs=EMBEDDING_BATCH,
+        max_concurrency=4,
+    )
+    texts = _embedding_texts()
+    response = benchmark.pedantic(provider.embed_texts, args=(texts,), rounds=3)
+    assert len(response.vectors) == EMBEDDING_TEXTS
+    assert embedding_server.max_in_flight > 1
+    provider.close()
@@ -9,6 +9,7 @@ import pytest
 
 from agent_recall.storage.files import FileStorage
 from agent_recall.storage.sqlite import SQLiteStorage
+from tests.support.fake_turbopuffer import FakeTurboPufferServer
 
 
 @pytest.fixture(autouse=True)
@@ -44,3 +45,12 @@ def storage(temp_agent_dir: Path) -> SQLiteStorage:
 def files(temp_agent_dir: Path) -> FileStorage:
     """Create a FileStorage instance for testing."""
     return FileStorage(temp_agent_dir)
+
+
+@pytest.fixture
+def turbopuffer_server(monkeypatch) -> Iterator[FakeTurboPufferServer]:
+    """Run a local fake TurboPuffer API; its key is exported as ``TP_KEY``."""
+    monkeypatch.setenv("TP_KEY", "token")
+    server = FakeTurboPufferServer(token="token").start()
+    yield server
+    server.stop()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import shutil
+
+from agent_recall.storage.models import (
+    Chunk,
+    ChunkSource,
+    CurationStatus,
+    LogEntry,
+    LogSource,
+    SemanticLabel,
+    SharedStorageConfig,
+)
+from agent_recall.storage.remote import RemoteStorage
+from agent_recall.storage.sqlite import SQLiteStorage
+
+
+def _entries(count: int, prefix: str = "learning") -> list[LogEntry]:
+    return [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            source_session_id="source-1",
+            content=f"{prefix} {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(count)
+    ]
+
+
+def _chunks(count: int, prefix: str = "chunk") -> list[Chunk]:
+    return [
+        Chunk(source=ChunkSource.MANUAL, content=f"{prefix} {index}", label=SemanticLabel.GOTCHA)
+        for index in range(count)
+    ]
+
+
+def _file_backed(tmp_path) -> tuple[RemoteStorage, SQLiteStorage, SQLiteStorage]:
+    config = SharedStorageConfig(
+        base_url=f"sqlite://{tmp_path / 'shared'}",
+        tenant_id="test-tenant",
+        project_id="test-project",
+        write_behind_enabled=False,
+    )
+    storage = RemoteStorage(config, local_db_path=tmp_path / "local" / "state.db")
+    shared = SQLiteStorage(
+        tmp_path / "shared" / "state.db", tenant_id="test-tenant", project_id="test-project"
+    )
+    return storage, shared, SQLiteStorage(tmp_path / "local" / "state.db")
+
+
+def test_change_feed_pages_rows_in_write_order(tmp_path) -> None:
+    storage = SQLiteStorage(tmp_path / "state.db", tenant_id="team", project_id="app")
+    other_scope = SQLiteStorage(tmp_path / "state.db", tenant_id="team", project_id="other")
+    entries = _entries(3)
+    chunks = _chunks(2)
+    storage.append_entries(entries)
+    other_scope.append_entries(_entries(2, prefix="elsewhere"))
+    storage.store_chunks(chunks)
+    storage.update_entry_curation_status(entries[0].id, CurationStatus.REJECTED)
+
+    first = storage.list_changes(since=0, limit=4)
+    assert [e.id for e in first.entries] == [entries[1].id, entries[2].id]
+    assert [c.id for c in first.chunks] == [c.id for c in chunks]
+    assert first.has_more is True
+
+    second = storage.list_changes(since=first.next_since, limit=4)
+    assert [e.id for e in second.entries] == [entries[0].id]
+    assert second.entries[0].curation_status == CurationStatus.REJECTED
+    assert second.chunks == []
+    assert second.has_more is False
+    assert second.latest_seq == second.next_since
+
+    assert storage.list_changes(since=second.next_since).entries == []
+
+
+def test_change_seq_is_backfilled_for_existing_databases(tmp_path) -> None:
+    db_path = tmp_path / "state.db"
+    storage = SQLiteStorage(db_path)
+    entries = _entries(2)
+    storage.append_entries(entries)
+    storage.store_chunks(_chunks(1))
+    with storage._connect() as conn:
+        for table in ("log_entries", "chunks"):
+            conn.execute(f"DROP INDEX idx_{table}_change_seq")
+            conn.execute(f"ALTER TABLE {table} DROP COLUMN change_seq")
+
+    migrated = SQLiteStorage(db_path)
+    batch = migrated.list_changes()
+
+    assert [e.id for e in batch.entries] == [e.id for e in entries]
+    assert len(batch.chunks) == 1
+    assert [c.content for c in migrated.search_chunks_fts("chunk")] == ["chunk 0"]
+
+
+def test_pull_copies_only_changes_since_the_last_pull(tmp_path) -> None:
+    storage, shared, local = _file_backed(tmp_path)
+    shared.append_entries(_entries(3))
+    shared.store_chunks(_chunks(2))
+
+    first = storage.pull_changes(page_size=2)
+    assert (first.entries, first.chunks, first.pages) == (3, 2, 3)
+    assert local.count_log_entries() == 3
+    assert local.count_chunks() == 2
+
+    new_entry = _entries(1, prefix="fresh")[0]
+    shared.append_entry(new_entry)
+    second = storage.pull_changes()
+    assert (second.since, second.entries, second.chunks) == (first.cursor, 1, 0)
+    assert local.count_log_entries() == 4
+
+    # Re-pulling everything upserts by id instead of duplicating rows.
+    storage.pull_changes(since=0)
+    assert local.count_log_entries() == 4
+    assert local.count_chunks() == 2
+
+
+def test_pull_starts_over_when_the_shared_store_was_rebuilt(tmp_path) -> None:
+    storage, shared, local = _file_backed(tmp_path)
+    shared.append_entries(_entries(5))
+    assert storage.pull_changes().cursor == 5
+
+    shutil.rmtree(tmp_path / "shared")
+    storage, shared, local = _file_backed(tmp_path)
+    shared.append_entries(_entries(2, prefix="rebuilt"))
+
+    result = storage.pull_changes()
+    assert result.reset is True
+    assert (result.entries, result.cursor) == (2, 2)
+    assert local.count_log_entries() == 7
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import time
+
+import httpx
+import respx
+
+from agent_recall.storage.models import (
+    LogEntry,
+    LogSource,
+    SemanticLabel,
+    SessionCheckpoint,
+    SharedStorageConfig,
+)
+from agent_recall.storage.remote import RemoteStorage
+from agent_recall.storage.sqlite import SQLiteStorage
+
+
+def _entries(count: int) -> list[LogEntry]:
+    return [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            source_session_id="source-1",
+            content=f"queued learning {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(count)
+    ]
+
+
+def _file_backed(tmp_path, **options) -> tuple[RemoteStorage, SQLiteStorage]:
+    config = SharedStorageConfig(
+        base_url=f"sqlite://{tmp_path / 'shared'}",
+        tenant_id="test-tenant",
+        project_id="test-project",
+        outbox_flush_interval_seconds=60.0,
+        **options,
+    )
+    storage = RemoteStorage(config, local_db_path=tmp_path / "local" / "state.db")
+    shared = SQLiteStorage(
+        tmp_path / "shared" / "state.db",
+        tenant_id="test-tenant",
+        project_id="test-project",
+    )
+    return storage, shared
+
+
+def test_sync_writes_queue_locally_until_flushed(tmp_path) -> None:
+    storage, shared = _file_backed(tmp_path)
+    entries = _entries(3)
+
+    storage.append_entries(entries)
+    storage.mark_session_processed("source-1")
+    storage.save_session_checkpoint(
+        SessionCheckpoint(source_session_id="source-1", last_message_index=7)
+    )
+
+    assert shared.count_log_entries() == 0
+    assert storage.is_session_processed("source-1") is True
+    checkpoint = storage.get_session_checkpoint("source-1")
+    assert checkpoint is not None and checkpoint.last_message_index == 7
+    status = storage.get_outbox_status()
+    assert status is not None and status.pending == 5
+
+    assert storage.flush_outbox() is True
+
+    assert sorted(e.id for e in shared.get_entries_by_source_session("source-1")) == sorted(
+        e.id for e in entries
+    )
+    assert shared.is_session_processed("source-1") is True
+    checkpoint = shared.get_session_checkpoint("source-1")
+    assert checkpoint is not None and checkpoint.last_message_index == 7
+    status = storage.get_outbox_status()
+    assert status is not None and status.pending == 0
+
+
+def test_replay_skips_entries_the_backend_already_has(tmp_path) -> None:
+    storage, shared = _file_backed(tmp_path)
+    entries = _entries(4)
+    shared.append_entries(entries[:2])
+
+    storage.append_entries(entries)
+
+    assert storage.flush_outbox() is True
+    assert shared.count_log_entries() == 4
+
+
+def test_entry_reads_replicate_queued_writes_first(tmp_path) -> None:
+    storage, shared = _file_backed(tmp_path)
+    storage.append_entries(_entries(2))
+
+    assert storage.count_log_entries() == 2
+    assert shared.count_log_entries() == 2
+
+
+def test_unreachable_backend_keeps_writes_queued_without_blocking(tmp_path) -> None:
+    config = SharedStorageConfig(
+        base_url="http://test-server",
+        tenant_id="test-tenant",
+        project_id="test-project",
+        audit_enabled=False,
+        outbox_flush_interval_seconds=60.0,
+    )
+    storage = RemoteStorage(config, local_db_path=tmp_path / "state.db")
+
+    with respx.mock:
+        route = respx.post("http://test-server/entries/batch").mock(
+            side_effect=httpx.ConnectError("connection refused")
+        )
+        started = time.perf_counter()
+        storage.append_entries(_entries(2))
+        assert time.perf_counter() - started < 0.5
+        assert storage.flush_outbox() is False
+
+        status = storage.get_outbox_status()
+        assert status is not None and status.pending == 2
+        assert "ConnectError" in (status.last_error or "")
+
+        route.mock(return_value=httpx.Response(201))
+        assert storage.flush_outbox() is True
+    status = storage.get_outbox_status()
+    assert status is not None and status.pending == 0
+
+
+def test_offline_reads_fall_back_to_locally_written_queue(tmp_path) -> None:
+    config = SharedStorageConfig(
+        base_url="http://test-server",
+        tenant_id="test-tenant",
+        project_id="test-project",
+        audit_enabled=False,
+        retry_attempts=1,
+        outbox_flush_interval_seconds=60.0,
+    )
+    storage = RemoteStorage(config, local_db_path=tmp_path / "state.db")
+    entries = _entries(2)
+
+    with respx.mock:
+        refused = httpx.ConnectError("connection refused")
+        batch_route = respx.post("http://test-server/entries/batch").mock(side_effect=refused)
+        read_route = respx.get(url__startswith="http://test-server/entries").mock(
+            side_effect=refused
+        )
+        storage.append_entries(entries)
+        storage.mark_session_processed("source-1")
+        storage.save_session_checkpoint(
+            SessionCheckpoint(source_session_id="source-1", last_message_index=3)
+        )
+        assert storage.flush_outbox() is False
+        assert batch_route.call_count == 1
+
+        fetched = storage.get_entries_by_source_session("source-1")
+        assert sorted(entry.id for entry in fetched) == sorted(entry.id for entry in entries)
+        # The failed flush put replication in backoff; reads do not retry it inline.
+        assert batch_route.call_count == 1
+        assert read_route.call_count == 1
+
+        local = SQLiteStorage(tmp_path / "state.db")
+        assert local.is_session_processed("source-1") is True
+        checkpoint = local.get_session_checkpoint("source-1")
+        assert checkpoint is not None and checkpoint.last_message_index == 3
+        status = storage.get_outbox_status()
+        assert status is not None and status.pending == 4
+
+        batch_route.mock(return_value=httpx.Response(201))
+        respx.put("http://test-server/processed_sessions/batch").mock(
+            return_value=httpx.Response(200)
+        )
+        respx.put("http://test-server/checkpoints").mock(return_value=httpx.Response(200))
+        assert storage.flush_outbox() is True
+
+
+def test_rejected_writes_are_parked_as_failed(tmp_path) -> None:
+    config = SharedStorageConfig(
+        base_url="http://test-server",
+        tenant_id="test-tenant",
+        project_id="test-project",
+        audit_enabled=False,
+        outbox_flush_interval_seconds=60.0,
+    )
+    storage = RemoteStorage(config, local_db_path=tmp_path / "state.db")
+
+    with respx.mock:
+        respx.post("http://test-server/entries/batch").mock(return_value=httpx.Response(400))
+        respx.put("http://test-server/processed_sessions/batch").mock(
+            return_value=httpx.Response(200)
+        )
+        storage.append_entries(_entries(1))
+        storage.mark_session_processed("source-1")
+        assert storage.flush_outbox() is True
+
+    status = storage.get_outbox_status()
+    assert status is not None and (status.pending, status.failed) == (0, 1)
+
+
+def test_reader_role_and_disabled_outbox_write_directly(tmp_path) -> None:
+    storage, shared = _file_backed(tmp_path, write_behind_enabled=False)
+
+    storage.append_entries(_entries(1))
+
+    assert storage.get_outbox_status() is None
+    assert shared.count_log_entries() == 1
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class FakeTurboPufferServer:
+    """In-process TurboPuffer stand-in serving ``/vectors/upsert`` and ``/vectors/query``.
+
+    ``latency_seconds`` delays every response, ``fail_next`` answers that many
+    requests with 503 first, and ``max_in_flight`` records peak request overlap.
+    """
+
+    def __init__(self, *, token: str = "token", latency_seconds: float = 0.0) -> None:
+        self.token = token
+        self.latency_seconds = latency_seconds
+        self.fail_next = 0
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+        self.records: dict[str, dict[str, Any]] = {}
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeTurboPufferServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+
+    def _handle(self, path: str, headers: Any, payload: dict[str, Any]) -> tuple[int, Any]:
+        with self._lock:
+            self.requests.append((path, payload))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.fail_next > 0
+            if fail:
+                self.fail_next -= 1
+        try:
+            if self.latency_seconds:
+                time.sleep(self.latency_seconds)
+            if headers.get("Authorization") != f"Bearer {self.token}":
+                return 401, {"error": "unauthorized"}
+            if fail:
+                return 503, {"error": "unavailable"}
+            if path == "/vectors/upsert":
+                with self._lock:
+                    for record in payload.get("records", []):
+                        self.records[str(record["id"])] = record
+                return 200, {"upserted": len(payload.get("records", []))}
+            if path == "/vectors/query":
+                top_k = int(payload.get("top_k", 10))
+                with self._lock:
+                    ids = sorted(self.records)[:top_k]
+                return 200, {"matches": [{"id": item, "score": 1.0} for item in ids]}
+            return 404, {"error": "not found"}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length", "0"))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, body = server._handle(self.path, self.headers, payload)
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                _ = (format, args)
+
+        return _Handler
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+from agent_recall.memory import agent_memory
+from agent_recall.memory.agent_memory import AgentMemoryIndex
+from agent_recall.memory.vector_store import VectorRecord
+from agent_recall.ralph.loop import RalphLoop
+
+
+class _FakeVectorStore:
+    instances: list[_FakeVectorStore] = []
+
+    def __init__(self, db_path, *, tenant_id: str, project_id: str) -> None:  # noqa: ANN001
+        self.db_path = db_path
+        self.tenant_id = tenant_id
+        self.queries = 0
+        self.closed = False
+        _FakeVectorStore.instances.append(self)
+
+    def query(self, *, embedding: list[float], top_k: int = 10):
+        self.queries += 1
+        record = VectorRecord(
+            id=f"hit-{self.queries}",
+            tenant_id=self.tenant_id,
+            project_id="p",
+            text="use the shared fixture",
+            label="pattern",
+            embedding=embedding,
+            updated_at=datetime.now(UTC).isoformat(),
+        )
+        return [(record, 0.9)][:top_k]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _write_config(files, tenant_id: str) -> None:  # noqa: ANN001
+    config_path = files.agent_dir / "config.yaml"
+    config_path.write_text(
+        "memory:\n"
+        "  vector_enabled: true\n"
+        "retrieval:\n"
+        "  embedding_dimensions: 16\n"
+        "storage:\n"
+        "  shared:\n"
+        f"    tenant_id: {tenant_id}\n"
+    )
+
+
+def test_agent_memory_index_reuses_provider_and_store(storage, files, monkeypatch) -> None:
+    _FakeVectorStore.instances.clear()
+    monkeypatch.setattr(agent_memory, "LocalVectorStore", _FakeVectorStore)
+    builds = {"count": 0}
+    original_build = agent_memory.build_embedding_provider_from_memory_config
+
+    def _counting_build(*args, **kwargs):  # noqa: ANN002, ANN003, ANN202
+        builds["count"] += 1
+        return original_build(*args, **kwargs)
+
+    monkeypatch.setattr(
+        agent_memory, "build_embedding_provider_from_memory_config", _counting_build
+    )
+    _write_config(files, "team-a")
+    index = AgentMemoryIndex(storage=storage, files=files)
+
+    index.search("fixtures", top_k=3)
+    batches = index.search_many(["fixtures", "build", "release"], top_k=1)
+    assert [len(cards) for cards in batches] == [1, 1, 1]
+    assert builds["count"] == 1
+    assert len(_FakeVectorStore.instances) == 1
+    assert _FakeVectorStore.instances[0].queries == 4
+
+    # A different length changes the file size, so the stamp differs even within one mtime tick.
+    _write_config(files, "team-bb")
+    assert index.search("fixtures")[0].id == "hit-1"
+    assert builds["count"] == 2
+    assert _FakeVectorStore.instances[0].closed is True
+    assert _FakeVectorStore.instances[1].tenant_id == "team-bb"
+
+
+def test_agent_memory_index_search_many_when_disabled(storage, files) -> None:
+    index = AgentMemoryIndex(storage=storage, files=files)
+
+    assert index.search_many(["a", "b"]) == [[], []]
+    assert index.search_many([]) == []
+
+
+async def test_ralph_loop_closes_memory_index_when_run_finishes(
+    storage, files, monkeypatch, tmp_path
+) -> None:
+    _FakeVectorStore.instances.clear()
+    monkeypatch.setattr(agent_memory, "LocalVectorStore", _FakeVectorStore)
+    _write_config(files, "team-a")
+    prd_path = tmp_path / "prd.json"
+    prd_path.write_text(json.dumps({"items": [{"id": "T-1", "title": "Test", "passes": False}]}))
+    monkeypatch.setattr(RalphLoop, "_resolve_prd_path", staticmethod(lambda _agent_dir: prd_path))
+    loop = RalphLoop(files.agent_dir, storage, files)
+    loop.memory_index.search("fixtures")
+
+    summary = await loop.run_loop(coding_cli=None)
+
+    assert summary["total_iterations"] == 1
+    assert _FakeVectorStore.instances[0].closed is True
@@ -2011,6 +2011,30 @@ def test_cli_metrics_report_json_renders_recent_runs() -> None:
         assert payload["data"]["recent_runs"][0]["run_id"] == run_id
 
 
+def test_cli_metrics_events_json_filters_by_run_and_stage() -> None:
+    with runner.isolated_filesystem():
+        cli_main.get_storage.cache_clear()
+        initialize_agent_repo(runner, cli_main.app)
+
+        files = FileStorage(Path(".agent"))
+        telemetry = PipelineTelemetry.from_config(
+            agent_dir=files.agent_dir,
+            config=files.read_config(),
+        )
+        run_id = telemetry.create_run_id("sync")
+        for stage in ("ingest", "extract"):
+            telemetry.record_event(run_id=run_id, stage=stage, action="complete", success=True)
+        telemetry.record_event(run_id="other-run", stage="extract", action="complete")
+
+        result = runner.invoke(
+            cli_main.app,
+            ["metrics", "events", "--run-id", run_id, "--stage", "extract", "--format", "json"],
+        )
+        assert result.exit_code == 0
+        events = json.loads(result.output)["data"]["events"]
+        assert [(event["run_id"], event["stage"]) for event in events] == [(run_id, "extract")]
+
+
 def test_cli_sync_no_compact(monkeypatch) -> None:
     called = {"sync": 0, "sync_and_compact": 0}
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +13,15 @@ from agent_recall.core.session import SessionManager
 from agent_recall.core.tier_format import parse_tier_content
 from agent_recall.llm.base import LLMProvider, LLMResponse, Message
 from agent_recall.storage.files import KnowledgeTier
-from agent_recall.storage.models import CurationStatus, SemanticLabel
+from agent_recall.storage.models import (
+    ChangeBatch,
+    Chunk,
+    ChunkSource,
+    CurationStatus,
+    LogEntry,
+    LogSource,
+    SemanticLabel,
+)
 
 
 class FakeLLMProvider(LLMProvider):
@@ -200,8 +210,8 @@ async def test_compaction_uses_semantic_embedder_for_384_dimensions(
 
     expected_embedding = [0.75] * 384
     monkeypatch.setattr(
-        "agent_recall.core.compact.embed_single",
-        lambda text: np.array(expected_embedding, dtype=np.float32),
+        "agent_recall.core.compact.embed_batch",
+        lambda texts: [np.array(expected_embedding, dtype=np.float32) for _ in texts],
     )
 
     def _should_not_use_legacy(text: str, dimensions: int = 64) -> list[float]:
@@ -224,6 +234,62 @@ async def test_compaction_uses_semantic_embedder_for_384_dimensions(
     assert chunks[0].embedding == expected_embedding
 
 
+@pytest.mark.asyncio
+async def test_compaction_indexes_chunks_in_one_batch(storage, files, monkeypatch) -> None:
+    files.write_config(
+        {
+            "llm": {"provider": "openai", "model": "gpt-4o-mini"},
+            "retrieval": {"semantic_index_enabled": True, "embedding_dimensions": 384},
+        }
+    )
+    log_writer = LogWriter(storage)
+    for index in range(30):
+        log_writer.log(content=f"Gotcha number {index}", label=SemanticLabel.GOTCHA)
+    log_writer.log(content="Gotcha number 0", label=SemanticLabel.GOTCHA)
+    storage.store_chunk(
+        Chunk(
+            source=ChunkSource.MANUAL,
+            source_ids=[],
+            content="Gotcha number 1",
+            label=SemanticLabel.GOTCHA,
+        )
+    )
+
+    calls: dict[str, int] = {"lookup": 0, "store": 0, "embed": 0, "index": 0}
+    embedded_texts: list[str] = []
+
+    def _embed_batch(texts: list[str]) -> list[np.ndarray]:
+        calls["embed"] += 1
+        embedded_texts.extend(texts)
+        return [np.full(384, 0.5, dtype=np.float32) for _ in texts]
+
+    def _count(name: str, method):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr("agent_recall.core.compact.embed_batch", _embed_batch)
+    monkeypatch.setattr(
+        storage, "find_existing_chunks", _count("lookup", storage.find_existing_chunks)
+    )
+    monkeypatch.setattr(storage, "store_chunks", _count("store", storage.store_chunks))
+    monkeypatch.setattr(
+        storage, "index_chunk_embeddings", _count("index", storage.index_chunk_embeddings)
+    )
+
+    engine = CompactionEngine(storage=storage, files=files, llm=FakeLLMProvider())
+    results = await engine.compact(force=True)
+
+    assert results["chunks_indexed"] == 29
+    assert calls == {"lookup": 1, "store": 1, "embed": 1, "index": 1}
+    assert len(embedded_texts) == 29
+    assert "Gotcha number 1" not in embedded_texts
+    chunks = storage.search_chunks_fts("Gotcha", top_k=50)
+    assert len(chunks) == 30
+
+
 @pytest.mark.asyncio
 async def test_compaction_ignores_pending_entries(storage, files) -> None:
     log_writer = LogWriter(storage)
@@ -458,6 +524,219 @@ async def test_compaction_promotes_only_approved_entries(storage, files) -> None
     assert storage.has_chunk("Curation gating", SemanticLabel.GOTCHA)
 
 
+class ConcurrencyTrackingLLM(FakeLLMProvider):
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(
+        self,
+        messages: list[Message],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await super().generate(messages, temperature, max_tokens)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("llm_concurrency", "expected_in_flight"), [(3, 3), (1, 1)])
+async def test_compaction_runs_tier_syntheses_concurrently(
+    storage,
+    files,
+    llm_concurrency: int,
+    expected_in_flight: int,
+) -> None:
+    files.write_config({"compaction": {"llm_concurrency": llm_concurrency}})
+    session_mgr = SessionManager(storage)
+    log_writer = LogWriter(storage)
+    session = session_mgr.start("Implement auth")
+    log_writer.log(content="Avoid weak password hashing rounds", label=SemanticLabel.GOTCHA)
+    log_writer.log(content="Use DTO mapping at API boundaries", label=SemanticLabel.PATTERN)
+    session_mgr.end(session.id, "Completed auth flow")
+
+    llm = ConcurrencyTrackingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    results = await engine.compact(force=True)
+
+    assert llm.max_in_flight == expected_in_flight
+    assert results["llm_requests"] == 3
+    assert results["llm_responses"] == 3
+    assert results["guardrails_updated"] is True
+    assert results["style_updated"] is True
+    assert results["recent_updated"] is True
+
+
+class PromptRecordingLLM(FakeLLMProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    async def generate(
+        self,
+        messages: list[Message],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        self.prompts.append(messages[-1].content)
+        return await super().generate(messages, temperature, max_tokens)
+
+
+@pytest.mark.asyncio
+async def test_compaction_is_incremental_from_change_cursor(storage, files) -> None:
+    files.write_config({"compaction": {"promote_pattern_after_occurrences": 1}})
+    log_writer = LogWriter(storage)
+    session_mgr = SessionManager(storage)
+    session = session_mgr.start("Implement auth")
+    log_writer.log(content="Avoid weak password hashing rounds", label=SemanticLabel.GOTCHA)
+    log_writer.log(content="Use DTO mapping at API boundaries", label=SemanticLabel.PATTERN)
+    session_mgr.end(session.id, "Completed auth flow")
+
+    llm = PromptRecordingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    first = await engine.compact()
+    assert first["llm_requests"] == 3
+    assert (files.agent_dir / "compaction_state.json").exists()
+
+    llm.prompts.clear()
+    unchanged = await engine.compact()
+    assert unchanged["llm_requests"] == 0
+    assert unchanged["chunks_indexed"] == 0
+    assert llm.prompts == []
+
+    log_writer.log(content="Rotate signing keys before expiry", label=SemanticLabel.GOTCHA)
+    incremental = await engine.compact()
+
+    assert incremental["llm_requests"] == 1
+    assert incremental["chunks_indexed"] == 1
+    (prompt,) = llm.prompts
+    assert "Current GUARDRAILS.md" in prompt
+    assert "Verify lock ordering" in prompt
+    assert "Rotate signing keys before expiry" in prompt
+    assert "Avoid weak password hashing rounds" not in prompt
+
+    llm.prompts.clear()
+    forced = await engine.compact(force=True)
+    assert forced["llm_requests"] == 3
+    assert any("Avoid weak password hashing rounds" in prompt for prompt in llm.prompts)
+
+
+@pytest.mark.asyncio
+async def test_compaction_cursor_still_promotes_patterns_across_runs(storage, files) -> None:
+    files.write_config({"compaction": {"promote_pattern_after_occurrences": 2}})
+    log_writer = LogWriter(storage)
+    log_writer.log(content="Prefer small focused commits", label=SemanticLabel.PATTERN)
+
+    llm = PromptRecordingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    await engine.compact()
+    assert not any("Current STYLE.md" in prompt for prompt in llm.prompts)
+
+    log_writer.log(content="Prefer small focused commits", label=SemanticLabel.PATTERN)
+    llm.prompts.clear()
+    results = await engine.compact()
+
+    style_prompts = [prompt for prompt in llm.prompts if "Current STYLE.md" in prompt]
+    assert len(style_prompts) == 1
+    assert style_prompts[0].count("Prefer small focused commits") == 2
+    assert results["style_updated"] is True
+
+
+@pytest.mark.asyncio
+async def test_compaction_cursor_picks_up_late_approvals(storage, files) -> None:
+    log_writer = LogWriter(storage)
+    pending = log_writer.log(content="Pin the sqlite-vec version", label=SemanticLabel.GOTCHA)
+    storage.update_entry_curation_status(pending.id, CurationStatus.PENDING)
+    log_writer.log(content="Avoid weak password hashing rounds", label=SemanticLabel.GOTCHA)
+
+    llm = PromptRecordingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    await engine.compact()
+    assert not any("Pin the sqlite-vec version" in prompt for prompt in llm.prompts)
+
+    approved = storage.update_entry_curation_status(pending.id, CurationStatus.APPROVED)
+    assert approved is not None
+    llm.prompts.clear()
+    results = await engine.compact()
+
+    assert results["chunks_indexed"] == 1
+    assert any("Pin the sqlite-vec version" in prompt for prompt in llm.prompts)
+
+
+@pytest.mark.asyncio
+async def test_compaction_cursor_picks_up_pulled_entries_with_older_timestamps(
+    storage, files
+) -> None:
+    log_writer = LogWriter(storage)
+    log_writer.log(content="Avoid weak password hashing rounds", label=SemanticLabel.GOTCHA)
+
+    llm = PromptRecordingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    await engine.compact()
+
+    pulled = LogEntry(
+        source=LogSource.MANUAL,
+        content="Drain the outbox before switching backends",
+        label=SemanticLabel.GOTCHA,
+        timestamp=datetime.now(UTC) - timedelta(minutes=1),
+    )
+    storage.apply_changes(ChangeBatch(entries=[pulled]))
+    llm.prompts.clear()
+    results = await engine.compact()
+
+    assert results["llm_requests"] == 1
+    assert results["chunks_indexed"] == 1
+    (prompt,) = llm.prompts
+    assert "Drain the outbox before switching backends" in prompt
+
+
+@pytest.mark.asyncio
+async def test_compaction_cursor_reads_every_entry_of_a_large_run(storage, files) -> None:
+    log_writer = LogWriter(storage)
+    contents = [f"Guard against flaky fixture number {index}" for index in range(150)]
+    for content in contents:
+        log_writer.log(content=content, label=SemanticLabel.GOTCHA)
+
+    llm = PromptRecordingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    results = await engine.compact()
+
+    guardrail_prompts = [prompt for prompt in llm.prompts if "Current GUARDRAILS.md" in prompt]
+    assert len(guardrail_prompts) == 2
+    sent = "\n".join(guardrail_prompts)
+    assert all(f"{content}\n" in f"{sent}\n" for content in contents)
+    assert results["chunks_indexed"] == 150
+
+    llm.prompts.clear()
+    assert (await engine.compact())["llm_requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_compaction_without_change_feed_reads_latest_entries(
+    storage, files, monkeypatch
+) -> None:
+    from agent_recall.storage.base import UnsupportedStorageCapabilityError
+
+    def no_change_feed(since: int = 0, limit: int = 500) -> ChangeBatch:
+        raise UnsupportedStorageCapabilityError("change_feed")
+
+    monkeypatch.setattr(storage, "list_changes", no_change_feed)
+    LogWriter(storage).log(content="Avoid weak password hashing rounds", label=SemanticLabel.GOTCHA)
+
+    llm = PromptRecordingLLM()
+    engine = CompactionEngine(storage=storage, files=files, llm=llm)
+    await engine.compact()
+    llm.prompts.clear()
+    await engine.compact()
+
+    assert any("Avoid weak password hashing rounds" in prompt for prompt in llm.prompts)
+    assert "change_cursors" not in engine._load_state()
+
+
 class TestCodingCLIProvider:
     """Tests for the coding_cli backend provider."""
 
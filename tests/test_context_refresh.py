@@ -5,8 +5,11 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from agent_recall.core.context import ContextAssembler
+from agent_recall.core.retrieve import Retriever
 from agent_recall.ralph.context_refresh import ContextRefreshHook
 from agent_recall.storage.files import FileStorage
+from agent_recall.storage.models import Chunk, ChunkSource, SemanticLabel
 from agent_recall.storage.sqlite import SQLiteStorage
 
 
@@ -256,3 +259,103 @@ def test_context_refresh_includes_rules_file(tmp_path: Path) -> None:
     context = mock_write.call_args[1]["context"]
     assert "## Rules" in context
     assert "Always run local checks." in context
+
+
+class _CountingRetriever(Retriever):
+    def __init__(self, storage: SQLiteStorage) -> None:
+        super().__init__(storage)
+        self.queries: list[str] = []
+
+    def search_hybrid(
+        self,
+        query: str,
+        top_k: int = 5,
+        fts_weight: float | None = None,
+        semantic_weight: float | None = None,
+        fts_top_k: int = 20,
+    ) -> list[Chunk]:
+        self.queries.append(query)
+        return self.storage.list_chunks()[:top_k]
+
+
+def test_context_refresh_reuses_retrieval_across_iterations(tmp_path: Path) -> None:
+    agent_dir = _make_agent_dir(tmp_path)
+    storage = SQLiteStorage(agent_dir / "state.db")
+    files = FileStorage(agent_dir)
+    storage.store_chunk(
+        Chunk(
+            source=ChunkSource.MANUAL,
+            content="Use the shared HTTP client.",
+            label=SemanticLabel.PATTERN,
+        )
+    )
+    retriever = _CountingRetriever(storage)
+
+    with patch(
+        "agent_recall.ralph.context_refresh.write_adapter_payloads",
+        return_value={},
+    ) as mock_write:
+        hook = ContextRefreshHook(agent_dir, storage, files)
+        hook.assembler = ContextAssembler(storage, files, retriever=retriever)
+
+        hook.refresh(task="Build feature", item_id="AR-003", iteration=1)
+        assert hook.assembler.last_cache_status == "miss"
+        hook.refresh(task="Build feature", item_id="AR-003", iteration=2)
+        assert hook.assembler.last_cache_status == "hit"
+        context = mock_write.call_args[1]["context"]
+
+        storage.store_chunk(
+            Chunk(
+                source=ChunkSource.MANUAL,
+                content="Prefer small commits.",
+                label=SemanticLabel.PATTERN,
+            )
+        )
+        hook.refresh(task="Build feature", item_id="AR-003", iteration=3)
+        assert hook.assembler.last_cache_status == "miss"
+
+        (agent_dir / "STYLE.md").write_text("# Style\n- Type every public function.\n")
+        hook.refresh(task="Build feature", item_id="AR-003", iteration=4)
+        assert hook.assembler.last_cache_status == "miss"
+
+    assert len(retriever.queries) == 3
+    assert '## Relevant to "[Ralph Iteration 2] AR-003: Build feature"' in context
+    assert "Use the shared HTTP client." in context
+
+
+def test_context_assembler_cache_is_shared_across_instances(tmp_path: Path) -> None:
+    agent_dir = _make_agent_dir(tmp_path)
+    storage = SQLiteStorage(agent_dir / "state.db")
+    files = FileStorage(agent_dir)
+    retriever = _CountingRetriever(storage)
+
+    first = ContextAssembler(storage, files, retriever=retriever)
+    assert first.is_fresh("Implement JWT auth") is False
+    output = first.assemble(task="Implement JWT auth")
+    assert first.is_fresh("Implement JWT auth") is True
+
+    second = ContextAssembler(storage, files, retriever=retriever)
+    assert second.assemble(task="Implement JWT auth") == output
+    assert second.last_cache_status == "hit"
+    wider = ContextAssembler(storage, files, retriever=retriever, retrieval_top_k=9)
+    assert wider.is_fresh("Implement JWT auth") is False
+    assert len(retriever.queries) == 1
+
+
+def test_context_assembler_cache_misses_after_retrieval_feedback(tmp_path: Path) -> None:
+    agent_dir = _make_agent_dir(tmp_path)
+    storage = SQLiteStorage(agent_dir / "state.db")
+    files = FileStorage(agent_dir)
+    chunk = Chunk(
+        source=ChunkSource.MANUAL,
+        content="Use the shared HTTP client.",
+        label=SemanticLabel.PATTERN,
+    )
+    storage.store_chunk(chunk)
+    assembler = ContextAssembler(storage, files, retriever=_CountingRetriever(storage))
+
+    assembler.assemble(task="Implement JWT auth")
+    assert assembler.is_fresh("Implement JWT auth") is True
+
+    storage.record_retrieval_feedback(query="Implement JWT auth", chunk_id=chunk.id, score=1)
+    assert assembler.is_fresh("Implement JWT auth") is False
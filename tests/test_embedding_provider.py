@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
+import httpx
 import pytest
+import respx
 
-from agent_recall.memory.embedding_provider import ExternalEmbeddingProvider, LocalEmbeddingProvider
+from agent_recall.llm.rate_limit import RateLimitSettings, reset_rate_limiters
+from agent_recall.memory.embedding_provider import (
+    ExternalEmbeddingProvider,
+    LocalEmbeddingProvider,
+    PartialEmbeddingError,
+    _estimate_tokens,
+)
 
 
 def test_local_embedding_provider_caches_results(monkeypatch) -> None:
@@ -25,38 +36,174 @@ def test_local_embedding_provider_caches_results(monkeypatch) -> None:
 def test_external_embedding_provider_cost_guardrail(monkeypatch) -> None:
     monkeypatch.setenv("EMB_KEY", "secret")
 
-    class _Response:
-        def raise_for_status(self) -> None:
-            return None
+    provider = ExternalEmbeddingProvider(
+        base_url="https://emb.example",
+        api_key_env="EMB_KEY",
+        model="emb-small",
+        max_cost_usd=0.001,
+        cost_per_1k_tokens_usd=0.001,
+    )
+    with respx.mock:
+        respx.post("https://emb.example/embeddings").mock(
+            return_value=httpx.Response(200, json={"data": [{"embedding": [0.1, 0.2]}]})
+        )
+        response = provider.embed_texts(["short text"])
+    assert response.vectors
+
+    with pytest.raises(RuntimeError, match="cost guardrail"):
+        provider.embed_texts(["x" * 20_000])
+    provider.close()
+
+
+def _embedding_route(calls: list[list[str]], *, fail_first_with: int | None = None):
+    def _respond(request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["input"]
+        calls.append(texts)
+        if fail_first_with is not None and len(calls) == 1:
+            return httpx.Response(fail_first_with, json={"error": "try later"})
+        return httpx.Response(
+            200,
+            json={
+                "data": [{"embedding": [float(len(text)), 1.0]} for text in texts],
+                "usage": {"prompt_tokens": 3 * len(texts), "total_tokens": 3 * len(texts)},
+            },
+        )
 
-        def json(self) -> dict[str, object]:
-            return {"data": [{"embedding": [0.1, 0.2]}]}
+    return respx.post("https://emb.example/embeddings").mock(side_effect=_respond)
 
-    class _Client:
-        def __init__(self, timeout: float):
-            self.timeout = timeout
 
-        def __enter__(self):
-            return self
+def test_external_embedding_provider_packs_batches_and_retries_one(monkeypatch) -> None:
+    monkeypatch.setenv("EMB_KEY", "secret")
+    provider = ExternalEmbeddingProvider(
+        base_url="https://emb.example",
+        api_key_env="EMB_KEY",
+        model="emb-small",
+        max_batch_inputs=3,
+        max_batch_tokens=8,
+        max_concurrency=2,
+        retry_attempts=2,
+    )
+    texts = ["a", "bb", "ccc", "dd", "a long sentence about the build fixtures", "e"]
+    calls: list[list[str]] = []
 
-        def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
-            _ = (exc_type, exc, tb)
+    with respx.mock:
+        _embedding_route(calls, fail_first_with=503)
+        response = provider.embed_texts(texts)
+        client = provider._client
+        provider.embed_texts(["again"])
+        assert provider._client is client
 
-        def post(self, url: str, json: dict[str, object], headers: dict[str, str]):
-            _ = (url, json, headers)
-            return _Response()
+    assert [vector[0] for vector in response.vectors] == [float(len(text)) for text in texts]
+    # Six requests, not eight: only the batch that got a 503 was sent twice.
+    assert sorted(len(batch) for batch in calls[:-1]) == [1, 1, 1, 3, 3]
+    assert response.estimated_tokens == 3 * len(texts)
+    provider.close()
+    assert provider._client is None
 
-    monkeypatch.setattr("agent_recall.memory.embedding_provider.httpx.Client", _Client)
 
+def test_external_embedding_provider_does_not_retry_client_errors(monkeypatch) -> None:
+    monkeypatch.setenv("EMB_KEY", "secret")
     provider = ExternalEmbeddingProvider(
         base_url="https://emb.example",
         api_key_env="EMB_KEY",
         model="emb-small",
-        max_cost_usd=0.001,
-        cost_per_1k_tokens_usd=0.001,
+        retry_attempts=3,
     )
-    response = provider.embed_texts(["short text"])
-    assert response.vectors
+    calls: list[list[str]] = []
 
-    with pytest.raises(RuntimeError, match="cost guardrail"):
-        provider.embed_texts(["x" * 20_000])
+    with respx.mock:
+        _embedding_route(calls, fail_first_with=400)
+        with pytest.raises(RuntimeError, match="400"):
+            provider.embed_texts(["bad input"])
+    assert len(calls) == 1
+    assert provider.spent_usd == 0.0
+    provider.close()
+
+
+def test_external_embedding_provider_charges_and_returns_completed_batches(monkeypatch) -> None:
+    monkeypatch.setenv("EMB_KEY", "secret")
+    provider = ExternalEmbeddingProvider(
+        base_url="https://emb.example",
+        api_key_env="EMB_KEY",
+        model="emb-small",
+        cost_per_1k_tokens_usd=1.0,
+        max_batch_inputs=1,
+        max_concurrency=1,
+        retry_attempts=1,
+    )
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["input"]
+        if texts == ["bad"]:
+            return httpx.Response(400, json={"error": "rejected"})
+        return httpx.Response(
+            200,
+            json={"data": [{"embedding": [1.0]}], "usage": {"total_tokens": 10}},
+        )
+
+    with respx.mock:
+        respx.post("https://emb.example/embeddings").mock(side_effect=_respond)
+        with pytest.raises(PartialEmbeddingError, match="400") as raised:
+            provider.embed_texts(["one", "two", "bad", "four"])
+
+    # Batches run one at a time, so the two before the rejected one finished; the
+    # last may also have finished before the failure cancelled it.
+    completed = raised.value.vectors
+    assert {0, 1} <= set(completed) <= {0, 1, 3}
+    assert all(vector == [1.0] for vector in completed.values())
+    assert raised.value.estimated_tokens == 10 * len(completed)
+    assert provider.spent_usd == pytest.approx(0.01 * len(completed))
+    provider.close()
+
+
+def test_external_embedding_provider_closes_client_of_previous_loop(monkeypatch) -> None:
+    monkeypatch.setenv("EMB_KEY", "secret")
+    provider = ExternalEmbeddingProvider(
+        base_url="https://emb.example", api_key_env="EMB_KEY", model="emb-small"
+    )
+    calls: list[list[str]] = []
+
+    with respx.mock:
+        _embedding_route(calls)
+        asyncio.run(provider.aembed_texts(["one"]))
+        first = provider._client
+        asyncio.run(provider.aembed_texts(["two"]))
+
+    assert first is not None and first.is_closed
+    second = provider._client
+    assert second is not None and second is not first and not second.is_closed
+    asyncio.run(provider.aclose())
+
+
+async def test_external_embedding_provider_shares_rate_limiter(monkeypatch) -> None:
+    monkeypatch.setenv("EMB_KEY", "secret")
+    reset_rate_limiters()
+    provider = ExternalEmbeddingProvider(
+        base_url="https://emb.example",
+        api_key_env="EMB_KEY",
+        model="emb-small",
+        max_batch_inputs=2,
+        rate_limit=RateLimitSettings(requests_per_minute=600),
+    )
+    calls: list[list[str]] = []
+
+    with respx.mock:
+        _embedding_route(calls)
+        awaited = await provider.aembed_texts(["one", "two", "three"])
+        # The synchronous entry point still works with this loop running.
+        blocking = provider.embed_texts(["four"])
+
+    assert len(awaited.vectors) == 3
+    assert len(blocking.vectors) == 1
+    assert provider.rate_limiter is not None
+    assert provider.rate_limiter.stats()["acquired_total"] == 3
+    await provider.aclose()
+    provider.close()
+    reset_rate_limiters()
+
+
+def test_estimate_tokens_counts_words_symbols_and_non_ascii() -> None:
+    assert _estimate_tokens("The quick brown fox jumps over the lazy dog.") == 10
+    assert _estimate_tokens("x" * 20_000) == 4_000
+    assert _estimate_tokens("日本語のテキスト") == 8
+    assert _estimate_tokens("") == 1
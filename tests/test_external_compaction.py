@@ -281,6 +281,50 @@ def test_external_compaction_semantic_dedupe_skips_equivalent_lines(storage, fil
     assert guardrails.count("Sort migration inputs before execution.") == 1
 
 
+def test_external_compaction_near_duplicate_index_skips_and_persists(storage, files) -> None:
+    files.write_tier(
+        KnowledgeTier.GUARDRAILS,
+        "# Guardrails\n\n"
+        "- [GOTCHA] Retry sqlite writes when the database reports busy timeout errors.\n"
+        "- [GOTCHA] Sort migration inputs before execution.\n",
+    )
+    service = ExternalCompactionService(
+        storage,
+        files,
+        agent_dir=files.agent_dir,
+        repo_root=Path.cwd(),
+    )
+
+    result = service.apply_notes_payload(
+        {
+            "notes": [
+                {
+                    "tier": "GUARDRAILS",
+                    "line": (
+                        "- [GOTCHA] Retry sqlite writes when the database reports busy "
+                        "timeout errors quickly."
+                    ),
+                    "source_session_ids": ["session-1"],
+                },
+                {
+                    "tier": "GUARDRAILS",
+                    "line": "- [GOTCHA] Pin the embedding model version in CI.",
+                    "source_session_ids": ["session-1"],
+                },
+            ]
+        },
+        dry_run=False,
+        mark_processed=False,
+    )
+
+    assert result["notes_applied"] == 1
+    guardrails = files.read_tier(KnowledgeTier.GUARDRAILS)
+    assert "timeout errors quickly" not in guardrails
+    assert "Pin the embedding model version in CI." in guardrails
+    index_payload = json.loads((files.agent_dir / "tier_line_index.json").read_text())
+    assert len(index_payload["scopes"]["external_compaction:GUARDRAILS"]) == 3
+
+
 def test_external_compaction_conflict_policy_prefer_newest_replaces_line(storage, files) -> None:
     files.write_tier(
         KnowledgeTier.GUARDRAILS,
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import os
+import random
+import re
+import time
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+from agent_recall.core import guardrail_enforcement as guardrail_module
 from agent_recall.core.guardrail_enforcement import (
     GuardrailSuppressionStore,
     evaluate_guardrail_text,
@@ -67,3 +72,86 @@ def test_guardrail_evaluation_skips_suppressed_rules(tmp_path: Path) -> None:
         suppression_store=store,
     )
     assert violations == []
+
+
+def _legacy_evaluate(text: str, rules) -> list[tuple[str, str]]:
+    found: list[tuple[str, str]] = []
+    for rule in rules:
+        try:
+            match = re.search(rule.pattern, text, re.IGNORECASE)
+        except re.error:
+            continue
+        if match:
+            found.append((rule.rule_id, match.group(0)))
+    return found
+
+
+def test_guardrail_matcher_matches_per_rule_search() -> None:
+    rng = random.Random(3)
+    words = ["rm", "-rf", "git", "push", "--force", "drop", "table", "sudo", "curl", "prod"]
+    lines = ["# Guardrails"]
+    for index in range(200):
+        phrase = " ".join(rng.sample(words, k=rng.randint(1, 3)))
+        if index % 7 == 0:
+            lines.append("- [BLOCK] regex: " + phrase.replace(" ", r"\s+"))
+        elif index % 11 == 0:
+            lines.append(f"- [WARN] Never run `{phrase}` or `{rng.choice(words)}.*x`")
+        else:
+            lines.append(f"- [WARN] `{phrase}`")
+    lines.append("- [BLOCK] regex: (unclosed")
+    lines.append("- [WARN] `Straße` and `push`")
+    rules = parse_guardrail_rules("\n".join(lines))
+
+    texts = [
+        "",
+        "python -m pytest -q",
+        "sudo rm -rf / && git push --force origin main",
+        "GIT PUSH  --FORCE to PROD; drop   table users",
+        "curl prod | sudo sh # STRASSE straße",
+        " ".join(rng.choice(words) for _ in range(40)),
+    ]
+    for text in texts:
+        expected = _legacy_evaluate(text, rules) if text.strip() else []
+        actual = [
+            (violation.rule_id, violation.matched_text)
+            for violation in evaluate_guardrail_text(text, rules)
+        ]
+        assert actual == expected, text
+
+
+def test_guardrail_suppression_store_loads_once_until_file_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    rules = parse_guardrail_rules(
+        "\n".join(f"- [WARN] `deploy target {index}`" for index in range(200))
+    )
+    path = tmp_path / "guardrail_suppressions.json"
+    store = GuardrailSuppressionStore(path)
+    store.add(rule_id=rules[3].rule_id, reason="known false positive", actor="tester")
+    store.add(
+        rule_id=rules[4].rule_id,
+        reason="expired",
+        expires_at=(datetime.now(UTC) - timedelta(hours=1)).isoformat(),
+    )
+    assert store.suppressed_rule_ids() == frozenset({rules[3].rule_id})
+
+    stamp = time.time() - 60
+    os.utime(path, (stamp, stamp))
+    parses = {"count": 0}
+    real_loads = guardrail_module.json.loads
+
+    def counting_loads(text, *args, **kwargs):
+        parses["count"] += 1
+        return real_loads(text, *args, **kwargs)
+
+    monkeypatch.setattr(guardrail_module.json, "loads", counting_loads)
+    text = " ".join(f"deploy target {index}" for index in range(200))
+    for _ in range(5):
+        violations = evaluate_guardrail_text(text, rules, suppression_store=store)
+        assert len(violations) == 199
+        assert rules[3].rule_id not in {violation.rule_id for violation in violations}
+    assert parses["count"] <= 1
+
+    other_writer = GuardrailSuppressionStore(path)
+    other_writer.add(rule_id=rules[5].rule_id, reason="second override", actor="tester")
+    assert store.suppressed_rule_ids() == frozenset({rules[3].rule_id, rules[5].rule_id})
@@ -0,0 +1,508 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+import httpcore
+import httpx
+import pytest
+
+import agent_recall.storage.http_server as http_server
+from agent_recall.storage.http_server import (
+    AUDIT_LOG_FILENAME,
+    create_shared_backend_wsgi_app,
+    make_shared_backend_server,
+)
+from agent_recall.storage.models import (
+    Chunk,
+    ChunkSource,
+    CurationStatus,
+    LogEntry,
+    LogSource,
+    SemanticLabel,
+    Session,
+    SessionCheckpoint,
+    SessionStatus,
+    SharedStorageConfig,
+)
+from agent_recall.storage.remote import _HTTPClient
+
+
+def _client_for(
+    app,
+    *,
+    tenant_id: str = "tenant-a",
+    project_id: str = "project-a",
+    cache_path: Path | None = None,
+) -> _HTTPClient:
+    client = _HTTPClient(
+        SharedStorageConfig(
+            base_url="http://test-server",
+            tenant_id=tenant_id,
+            project_id=project_id,
+        ),
+        cache_path=cache_path,
+    )
+    headers = dict(client._client.headers)
+    client._client.close()
+    client._client = httpx.Client(
+        transport=httpx.WSGITransport(app=app),
+        base_url="http://test-server",
+        headers=headers,
+        timeout=5.0,
+    )
+    client._audit._client = client._client
+    return client
+
+
+def test_http_client_round_trips_full_storage_surface(tmp_path: Path) -> None:
+    app = create_shared_backend_wsgi_app(tmp_path / "shared" / "state.db")
+    client = _client_for(app)
+
+    session = Session(task="Ship the shared backend")
+    client.create_session(session)
+    fetched = client.get_session(session.id)
+    assert fetched is not None
+    assert (fetched.id, fetched.task, fetched.tenant_id) == (session.id, session.task, "tenant-a")
+    active = client.get_active_session()
+    assert active is not None
+    assert active.id == session.id
+    assert client.get_session(uuid4()) is None
+
+    entry = LogEntry(
+        session_id=session.id,
+        source=LogSource.EXTRACTED,
+        source_session_id="source-1",
+        content="Batch writes per request",
+        label=SemanticLabel.PATTERN,
+        curation_status=CurationStatus.PENDING,
+    )
+    client.append_entry(entry)
+    assert [item.id for item in client.get_entries(session.id)] == [entry.id]
+    assert client.count_log_entries() == 1
+    assert client.list_entries_by_curation_status(CurationStatus.PENDING)[0].id == entry.id
+    updated = client.update_entry_curation_status(entry.id, CurationStatus.APPROVED)
+    assert updated is not None and updated.curation_status == CurationStatus.APPROVED
+    assert [item.id for item in client.get_entries_by_label([SemanticLabel.PATTERN])] == [entry.id]
+    assert client.update_entry_curation_status(uuid4(), CurationStatus.APPROVED) is None
+
+    session.status = SessionStatus.COMPLETED
+    session.summary = "done"
+    client.update_session(session)
+    assert client.list_sessions(status=SessionStatus.COMPLETED)[0].summary == "done"
+    assert client.get_active_session() is None
+
+    chunk = Chunk(
+        source=ChunkSource.MANUAL,
+        content="Cache storage instances per tenant",
+        label=SemanticLabel.PATTERN,
+    )
+    client.store_chunk(chunk)
+    client.index_chunk_embedding(chunk.id, [0.25, 0.5])
+    assert client.count_chunks() == 1
+    assert client.has_chunk(chunk.content, chunk.label) is True
+    assert [item.id for item in client.search_chunks_fts("tenant")] == [chunk.id]
+    assert client.list_chunks_with_embeddings()[0].embedding == [0.25, 0.5]
+    assert [item.id for item in client.list_chunks()] == [chunk.id]
+
+    client.mark_session_processed("source-1")
+    assert client.is_session_processed("source-1") is True
+    client.save_session_checkpoint(
+        SessionCheckpoint(source_session_id="source-1", last_message_index=4)
+    )
+    checkpoint = client.get_session_checkpoint("source-1")
+    assert checkpoint is not None
+    assert checkpoint.last_message_index == 4
+    assert client.get_stats()["chunks"] == 1
+    assert client.get_last_processed_at() is not None
+    recent = client.list_recent_source_sessions()
+    assert recent[0]["source_session_id"] == "source-1"
+    assert isinstance(recent[0]["last_timestamp"], datetime)
+    assert client.clear_session_checkpoints(source_session_id="source-1") == 1
+    assert client.get_session_checkpoint("source-1") is None
+    assert client.clear_processed_sessions(source_session_id="source-1") == 1
+
+    started = client.start_background_sync(4242)
+    assert started.is_running is True and started.pid == 4242
+    completed = client.complete_background_sync(3, 7)
+    assert completed.is_running is False and completed.learnings_extracted == 7
+    assert client.get_background_sync_status().sessions_processed == 3
+
+    client.flush_audit_events()
+    audit_lines = (tmp_path / "shared" / AUDIT_LOG_FILENAME).read_text().splitlines()
+    assert audit_lines
+    assert {json.loads(line)["tenant_id"] for line in audit_lines} == {"tenant-a"}
+
+
+def test_http_server_batch_endpoints_round_trip(tmp_path: Path) -> None:
+    app = create_shared_backend_wsgi_app(tmp_path / "state.db")
+    client = _client_for(app)
+    client._batch_size = 3
+    session = Session(task="bulk writes")
+    client.create_session(session)
+
+    entries = [
+        LogEntry(
+            session_id=session.id,
+            source=LogSource.EXTRACTED,
+            source_session_id="source-bulk",
+            content=f"bulk learning {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(7)
+    ]
+    client.append_entries(entries)
+    assert [item.id for item in client.get_entries(session.id)] == [e.id for e in entries]
+    stored = client.get_session(session.id)
+    assert stored is not None
+    assert stored.entry_count == 7
+
+    chunks = [
+        Chunk(source=ChunkSource.MANUAL, content=f"chunk {index}", label=SemanticLabel.PATTERN)
+        for index in range(4)
+    ]
+    client.store_chunks(chunks)
+    client.index_chunk_embeddings({chunk.id: [float(index)] for index, chunk in enumerate(chunks)})
+    assert client.count_chunks() == 4
+    assert len(client.list_chunks_with_embeddings()) == 4
+    existing = client.find_existing_chunks(
+        [("chunk 1", SemanticLabel.PATTERN), ("missing", SemanticLabel.PATTERN)]
+    )
+    assert existing == {("chunk 1", SemanticLabel.PATTERN)}
+
+    client.mark_sessions_processed(["s1", "s2", "s1"])
+    assert client.is_session_processed("s1") and client.is_session_processed("s2")
+
+    client.flush_audit_events()
+    audit_lines = (tmp_path / AUDIT_LOG_FILENAME).read_text().splitlines()
+    resource_types = [json.loads(line)["resource_type"] for line in audit_lines]
+    assert resource_types.count("log_entry") == 7
+    assert resource_types.count("processed_session") == 2
+
+
+def test_http_server_batch_retry_after_partial_failure_is_idempotent(tmp_path: Path) -> None:
+    app = create_shared_backend_wsgi_app(tmp_path / "state.db")
+    client = _client_for(app)
+    client._batch_size = 2
+    session = Session(task="retried upload")
+    client.create_session(session)
+    entries = [
+        LogEntry(
+            session_id=session.id,
+            source=LogSource.EXTRACTED,
+            content=f"retried learning {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(5)
+    ]
+    chunks = [
+        Chunk(source=ChunkSource.MANUAL, content=f"retried {index}", label=SemanticLabel.PATTERN)
+        for index in range(5)
+    ]
+
+    # The first attempt lands page one, then the connection drops on page two.
+    transport = client._client._transport
+    pages = 0
+
+    def _flaky(request: httpx.Request) -> httpx.Response:
+        nonlocal pages
+        pages += 1
+        if pages == 2:
+            raise httpx.ConnectError("connection reset", request=request)
+        return transport.handle_request(request)
+
+    client._client._transport = httpx.MockTransport(_flaky)
+    with pytest.raises(httpx.ConnectError):
+        client.append_entries(entries)
+    pages = 0
+    with pytest.raises(httpx.ConnectError):
+        client.store_chunks(chunks)
+    client._client._transport = transport
+
+    client.append_entries(entries)
+    client.store_chunks(chunks)
+    assert [item.id for item in client.get_entries(session.id)] == [e.id for e in entries]
+    stored = client.get_session(session.id)
+    assert stored is not None
+    assert stored.entry_count == 5
+    assert client.count_chunks() == 5
+
+
+def test_http_server_serves_the_change_feed(tmp_path: Path) -> None:
+    app = create_shared_backend_wsgi_app(tmp_path / "state.db")
+    client = _client_for(app)
+    other = _client_for(app, project_id="project-b")
+    entries = [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            source_session_id="source-feed",
+            content=f"feed learning {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(3)
+    ]
+    client.append_entries(entries)
+    other.append_entries([entries[0].model_copy(update={"id": uuid4()})])
+    chunk = Chunk(source=ChunkSource.MANUAL, content="feed chunk", label=SemanticLabel.GOTCHA)
+    client.store_chunk(chunk)
+
+    first = client.list_changes(since=0, limit=2)
+    assert [e.id for e in first.entries] == [entries[0].id, entries[1].id]
+    assert first.has_more is True
+    rest = client.list_changes(since=first.next_since, limit=2)
+    assert [e.id for e in rest.entries] == [entries[2].id]
+    assert [c.id for c in rest.chunks] == [chunk.id]
+    assert rest.has_more is False
+    assert client.list_changes(since=rest.next_since).entries == []
+
+
+def test_http_client_read_cache_revalidates_with_etags(tmp_path: Path) -> None:
+    statuses: list[tuple[str, str]] = []
+    inner = create_shared_backend_wsgi_app(tmp_path / "server" / "state.db")
+
+    def recording_app(environ, start_response):
+        def record(status, headers, exc_info=None):
+            statuses.append((environ["PATH_INFO"], status.split()[0]))
+            return start_response(status, headers, exc_info)
+
+        return inner(environ, record)
+
+    writer = _client_for(recording_app)
+    reader = _client_for(recording_app, cache_path=tmp_path / "client" / "shared_cache.db")
+    assert reader._read_cache is not None
+    reader._read_cache.max_age_seconds = 0.0
+    writer.store_chunks(
+        [
+            Chunk(
+                source=ChunkSource.MANUAL,
+                content="mirror shared chunks",
+                label=SemanticLabel.PATTERN,
+            ),
+            Chunk(
+                source=ChunkSource.MANUAL, content="validate with etags", label=SemanticLabel.GOTCHA
+            ),
+        ]
+    )
+
+    statuses.clear()
+    assert [c.content for c in reader.search_chunks_fts("mirror")] == ["mirror shared chunks"]
+    generation = reader.get_chunk_generation()
+    assert reader.count_chunks() == 2
+    assert statuses == [("/chunks", "200"), ("/chunks", "304"), ("/chunks", "304")]
+
+    writer.store_chunk(
+        Chunk(source=ChunkSource.MANUAL, content="mirror refresh", label=SemanticLabel.PATTERN)
+    )
+    statuses.clear()
+    assert len(reader.search_chunks_fts("mirror")) == 2
+    assert reader.get_chunk_generation() != generation
+    assert statuses == [("/chunks", "200"), ("/chunks", "304")]
+
+    statuses.clear()
+    first = reader.get_stats()
+    assert reader.get_stats() == first
+    assert statuses == [("/stats", "200"), ("/stats", "304")]
+    assert first["chunks"] == 3
+
+
+def test_http_client_chunk_mirror_skips_revalidation_within_max_age(tmp_path: Path) -> None:
+    paths: list[str] = []
+    inner = create_shared_backend_wsgi_app(tmp_path / "server" / "state.db")
+
+    def recording_app(environ, start_response):
+        paths.append(environ["PATH_INFO"])
+        return inner(environ, start_response)
+
+    other = _client_for(recording_app)
+    reader = _client_for(recording_app, cache_path=tmp_path / "client" / "shared_cache.db")
+    assert reader._read_cache is not None
+    reader._read_cache.max_age_seconds = 60.0
+    reader.store_chunk(
+        Chunk(source=ChunkSource.MANUAL, content="first chunk", label=SemanticLabel.PATTERN)
+    )
+
+    paths.clear()
+    for _ in range(5):
+        assert reader.count_chunks() == 1
+    assert paths == ["/chunks"]
+
+    other.store_chunk(
+        Chunk(source=ChunkSource.MANUAL, content="from elsewhere", label=SemanticLabel.PATTERN)
+    )
+    assert reader.count_chunks() == 1
+    reader.store_chunk(
+        Chunk(source=ChunkSource.MANUAL, content="own write", label=SemanticLabel.PATTERN)
+    )
+    assert reader.count_chunks() == 3
+
+
+def test_http_server_isolates_scopes_and_reuses_storage(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    created: list[tuple[str, str]] = []
+    original = http_server.SQLiteStorage
+
+    def counting_storage(*args, **kwargs):  # noqa: ANN002, ANN003
+        created.append((kwargs["tenant_id"], kwargs["project_id"]))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(http_server, "SQLiteStorage", counting_storage)
+    app = create_shared_backend_wsgi_app(tmp_path / "state.db")
+    tenant_a = _client_for(app, tenant_id="tenant-a")
+    tenant_b = _client_for(app, tenant_id="tenant-b")
+
+    for index in range(5):
+        tenant_a.create_session(Session(task=f"task {index}"))
+    tenant_b.create_session(Session(task="other tenant"))
+
+    assert len(tenant_a.list_sessions()) == 5
+    assert [session.task for session in tenant_b.list_sessions()] == ["other tenant"]
+    assert sorted(created) == [("tenant-a", "project-a"), ("tenant-b", "project-a")]
+
+
+def test_http_server_compacts_and_gzips_large_responses(tmp_path: Path) -> None:
+    app = create_shared_backend_wsgi_app(tmp_path / "state.db")
+    client = _client_for(app, tenant_id="default", project_id="default")
+    for index in range(40):
+        client.create_session(Session(task=f"long running task number {index}"))
+
+    transport = httpx.WSGITransport(app=app)
+    with httpx.Client(transport=transport, base_url="http://test-server") as raw:
+        plain = raw.get("/sessions", headers={"Accept-Encoding": "identity"})
+        zipped = raw.get("/sessions", headers={"Accept-Encoding": "gzip"})
+        small = raw.get("/chunks/count", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert b"\n" not in plain.content and b", " not in plain.content
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert int(zipped.headers["content-length"]) < len(plain.content)
+    assert zipped.json() == plain.json()
+    assert "content-encoding" not in small.headers
+
+
+def test_http_server_reports_request_errors(tmp_path: Path) -> None:
+    app = create_shared_backend_wsgi_app(tmp_path / "state.db", bearer_token="secret")
+    transport = httpx.WSGITransport(app=app)
+    auth = {"Authorization": "Bearer secret"}
+    with httpx.Client(transport=transport, base_url="http://test-server") as raw:
+        assert raw.get("/sessions").status_code == 401
+        assert raw.get("/missing", headers=auth).status_code == 404
+        assert raw.delete("/sessions", headers=auth).status_code == 405
+        assert raw.get("/sessions/not-a-uuid", headers=auth).status_code == 400
+        assert raw.post("/sessions", content=b"{}", headers=auth).status_code == 400
+        session = Session(task="dup")
+        assert (
+            raw.post("/sessions", content=session.model_dump_json(), headers=auth).status_code
+            == 201
+        )
+        conflict = raw.post("/sessions", content=session.model_dump_json(), headers=auth)
+    assert conflict.status_code == 409
+    assert conflict.json()["error"] == "conflict"
+
+
+def test_http_server_checks_auth_and_body_size_before_routing(
+    tmp_path: Path, monkeypatch, caplog
+) -> None:
+    db_path = tmp_path / "state.db"
+    app = create_shared_backend_wsgi_app(db_path, bearer_token="secret", max_body_bytes=64)
+    transport = httpx.WSGITransport(app=app)
+    auth = {"Authorization": "Bearer secret"}
+    with httpx.Client(transport=transport, base_url="http://test-server") as raw:
+        assert raw.get("/missing").status_code == 401
+        assert raw.delete("/sessions").status_code == 401
+        assert raw.post("/sessions", content=b"x" * 1024).status_code == 401
+        too_large = raw.post("/sessions", content=b"x" * 65, headers=auth)
+        assert too_large.status_code == 413
+        assert too_large.json()["error"] == "body_too_large"
+
+        def _broken(*args, **kwargs):  # noqa: ANN002, ANN003, ANN202
+            raise RuntimeError("disk on fire")
+
+        monkeypatch.setattr(http_server.SQLiteStorage, "list_sessions", _broken)
+        with caplog.at_level("ERROR", logger=http_server.__name__):
+            assert raw.get("/sessions", headers=auth).status_code == 500
+    assert "disk on fire" in caplog.text
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_threaded_server_closes_connection_after_rejecting_large_body(tmp_path: Path) -> None:
+    server = make_shared_backend_server(tmp_path / "state.db", port=0, max_body_bytes=1024)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    try:
+        with httpx.Client(base_url=f"http://{host}:{port}", timeout=5.0) as client:
+            small = client.post("/sessions", content=b"x" * 2048)
+            assert small.status_code == 413
+            assert small.headers.get("connection", "").lower() != "close"
+            large = client.post("/sessions", content=b"x" * 200_000)
+            assert large.status_code == 413
+            assert client.get("/chunks/count").status_code == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_threaded_server_serves_concurrent_clients(tmp_path: Path) -> None:
+    server = make_shared_backend_server(tmp_path / "state.db", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    errors: list[BaseException] = []
+
+    def worker(index: int) -> None:
+        try:
+            with httpx.Client(base_url=f"http://{host}:{port}", timeout=5.0) as client:
+                response = client.post(
+                    "/sessions",
+                    content=Session(
+                        task=f"worker {index}", started_at=datetime.now(UTC)
+                    ).model_dump_json(),
+                )
+                response.raise_for_status()
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    try:
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+        for item in workers:
+            item.start()
+        for item in workers:
+            item.join()
+        with httpx.Client(base_url=f"http://{host}:{port}", timeout=5.0) as client:
+            sessions = client.get("/sessions", params={"limit": 20}).json()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert errors == []
+    assert len(sessions) == 8
+
+
+def test_threaded_server_keeps_connections_alive(tmp_path: Path) -> None:
+    server = make_shared_backend_server(tmp_path / "state.db", port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    connections: list[int] = []
+    try:
+        with httpx.Client(base_url=f"http://{host}:{port}", timeout=5.0) as client:
+            for _ in range(3):
+                response = client.get("/chunks/count", extensions={"trace": None})
+                response.raise_for_status()
+                assert response.http_version == "HTTP/1.1"
+                assert response.headers.get("connection", "").lower() != "close"
+            transport = client._transport
+            assert isinstance(transport, httpx.HTTPTransport)
+            pool = transport._pool
+            assert isinstance(pool, httpcore.ConnectionPool)
+            connections.append(len(pool.connections))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert connections == [1]
@@ -4,6 +4,7 @@ import json
 import sqlite3
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -1020,6 +1021,34 @@ class MockLLM(LLMProvider):
         return True, "ok"
 
 
+class TranscriptRecordingLLM(LLMProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    @property
+    def provider_name(self) -> str:
+        return "recording"
+
+    @property
+    def model_name(self) -> str:
+        return "mock"
+
+    async def generate(
+        self,
+        messages: list[Message],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        _ = (temperature, max_tokens)
+        prompt = "\n".join(message.content for message in messages)
+        if "=== TRANSCRIPT START ===" in prompt:
+            self.prompts.append(prompt)
+        return LLMResponse(content='{"learnings": []}', model="mock")
+
+    def validate(self) -> tuple[bool, str]:
+        return True, "ok"
+
+
 class TestTranscriptExtractor:
     @pytest.mark.asyncio
     async def test_extract_prompt_literal_empty_object_does_not_break_formatting(self) -> None:
@@ -1394,6 +1423,166 @@ class TestTranscriptExtractor:
         assert progress_events[2]["messages_total"] == 205
         assert progress_events[2]["batch_count"] == 3
 
+    @pytest.mark.asyncio
+    async def test_extract_token_budget_strategy_packs_batches_under_budget(self) -> None:
+        from agent_recall.core.extract import TranscriptExtractor, estimate_tokens
+
+        tiny_messages = [
+            RawMessage(
+                role="user" if index % 2 == 0 else "assistant",
+                content=f"Step {index}: keep the migration retry guard in place.",
+            )
+            for index in range(150)
+        ]
+        session = RawSession(
+            source="test",
+            session_id="test-token-budget",
+            started_at=datetime.now(UTC),
+            messages=tiny_messages,
+        )
+
+        by_count = TranscriptRecordingLLM()
+        await TranscriptExtractor(by_count, messages_per_batch=50).extract(session)
+        by_budget = TranscriptRecordingLLM()
+        extractor = TranscriptExtractor(
+            by_budget,
+            batch_strategy="token_budget",
+            prompt_token_budget=6_000,
+        )
+        progress_events: list[dict[str, object]] = []
+        await extractor.extract(session, progress_callback=progress_events.append)
+
+        assert len(by_count.prompts) == 3
+        assert len(by_budget.prompts) == 1
+        batch_events = [
+            event for event in progress_events if event["event"] == "extraction_batch_complete"
+        ]
+        assert batch_events[-1]["messages_processed"] == 150
+
+        huge_messages = [
+            RawMessage(
+                role="assistant",
+                content=f"Tool output {index}: " + ("failed retry timeout in sqlite " * 40),
+            )
+            for index in range(40)
+        ]
+        huge_session = session.model_copy(update={"messages": huge_messages})
+        bounded = TranscriptRecordingLLM()
+        bounded_extractor = TranscriptExtractor(
+            bounded,
+            batch_strategy="token_budget",
+            prompt_token_budget=3_000,
+        )
+        await bounded_extractor.extract(huge_session)
+
+        assert len(bounded.prompts) > 1
+        assert all(estimate_tokens(prompt) <= 3_000 for prompt in bounded.prompts)
+
+    @pytest.mark.asyncio
+    async def test_extract_signal_filter_skips_noise_without_losing_golden_learnings(
+        self,
+    ) -> None:
+        from agent_recall.core.extract import TranscriptExtractor
+
+        corpus_path = Path(__file__).parent / "fixtures" / "signal_filter" / "corpus.json"
+        corpus = json.loads(corpus_path.read_text())
+        unfiltered_calls = 0
+        filtered_calls = 0
+
+        for case in corpus["sessions"]:
+            session = RawSession(
+                source="test",
+                session_id=case["name"],
+                started_at=datetime.now(UTC),
+                messages=[RawMessage.model_validate(message) for message in case["messages"]],
+            )
+            baseline = TranscriptRecordingLLM()
+            await TranscriptExtractor(
+                baseline,
+                messages_per_batch=corpus["messages_per_batch"],
+            ).extract(session)
+            filtered = TranscriptRecordingLLM()
+            events: list[dict[str, Any]] = []
+            await TranscriptExtractor(
+                filtered,
+                messages_per_batch=corpus["messages_per_batch"],
+                signal_filter_enabled=True,
+            ).extract(session, progress_callback=events.append)
+
+            sent = "\n".join(filtered.prompts)
+            for snippet in case["golden"]:
+                assert snippet in sent, f"{case['name']}: lost golden learning {snippet!r}"
+            assert len(filtered.prompts) <= case["max_llm_calls"], case["name"]
+            filter_events = [
+                event for event in events if event["event"] == "extraction_signal_filter"
+            ]
+            assert len(filter_events) == 1
+            assert filter_events[0]["llm_calls_skipped"] == (
+                filter_events[0]["batches_total"] - len(filtered.prompts)
+            )
+            unfiltered_calls += len(baseline.prompts)
+            filtered_calls += len(filtered.prompts)
+
+        assert filtered_calls < unfiltered_calls
+
+    def test_signal_filter_merge_pool_respects_budget_and_keeps_trailing_pool(self) -> None:
+        from unittest.mock import MagicMock
+
+        from agent_recall.core.extract import TranscriptExtractor
+
+        extractor = TranscriptExtractor(
+            MagicMock(spec=LLMProvider),
+            signal_filter_enabled=True,
+            signal_filter_min_score=100,
+        )
+        batches = [
+            [RawMessage(role="assistant", content=f"step {index} " + "x" * 200)]
+            for index in range(5)
+        ]
+        one_batch = extractor._batch_chars(batches[0])
+
+        kept, stats = extractor._filter_low_signal_batches(batches, max_chars=one_batch * 2 + 20)
+
+        assert [len(batch) for batch in kept] == [2, 2, 1]
+        assert all(extractor._batch_chars(batch) <= one_batch * 2 + 20 for batch in kept)
+        assert stats["batches_merged"] == 5
+        assert stats["batches_sent"] == 3
+
+    def test_signal_filter_merge_pool_never_spans_a_kept_batch(self) -> None:
+        from unittest.mock import MagicMock
+
+        from agent_recall.core.extract import TranscriptExtractor
+
+        extractor = TranscriptExtractor(
+            MagicMock(spec=LLMProvider),
+            signal_filter_enabled=True,
+            signal_filter_min_score=5,
+        )
+        batches = [
+            [RawMessage(role="assistant", content="step one notes")],
+            [RawMessage(role="assistant", content="decision: retry with a timeout fallback")],
+            [RawMessage(role="assistant", content="step three notes")],
+        ]
+
+        kept, stats = extractor._filter_low_signal_batches(batches, max_chars=10_000)
+
+        assert kept == batches
+        assert stats["batches_merged"] == 2
+        assert stats["batches_sent"] == 3
+
+    def test_noise_is_only_zeroed_inside_the_signal_filter(self) -> None:
+        from unittest.mock import MagicMock
+
+        from agent_recall.core.extract import TranscriptExtractor
+
+        extractor = TranscriptExtractor(MagicMock(spec=LLMProvider))
+        progress = RawMessage(
+            role="assistant", content="\n".join(f"[{n}/10] 42%" for n in range(10))
+        )
+
+        assert extractor._message_signal_score(progress) > 0
+        assert extractor._message_signal_score(progress, drop_noise=True) == 0
+
     @pytest.mark.asyncio
     async def test_extract_filters_codex_boilerplate_and_preserves_middle_messages(self) -> None:
         from agent_recall.core.extract import TranscriptExtractor
@@ -10,9 +10,22 @@ from agent_recall.llm import (
     ensure_provider_dependency,
     get_available_providers,
 )
-from agent_recall.llm.base import LLMConfigError, LLMRateLimitError, Message
+from agent_recall.llm.base import (
+    LLMConfigError,
+    LLMProvider,
+    LLMRateLimitError,
+    LLMResponse,
+    Message,
+)
 from agent_recall.llm.openai_compat import OpenAICompatibleProvider
-from agent_recall.storage.models import LLMConfig
+from agent_recall.llm.rate_limit import (
+    ProviderRateLimiter,
+    RateLimitedProvider,
+    RateLimitSettings,
+    TokenBucket,
+    reset_rate_limiters,
+)
+from agent_recall.storage.models import LLMConfig, LLMRateLimitConfig
 
 
 class TestOpenAICompatibleProvider:
@@ -309,3 +322,141 @@ class TestLLMGeneration:
         assert exc_info.value.retry_after_seconds == pytest.approx(3.0)
         assert "rate limit exceeded" in str(exc_info.value).lower()
         assert "OpenInference" in str(exc_info.value)
+
+
+class _ManualClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _ScriptedLLM(LLMProvider):
+    def __init__(self, *, fail_with: Exception | None = None) -> None:
+        self.fail_with = fail_with
+        self.calls = 0
+
+    @property
+    def provider_name(self) -> str:
+        return "scripted"
+
+    @property
+    def model_name(self) -> str:
+        return "scripted-model"
+
+    async def generate(
+        self,
+        messages: list[Message],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        _ = (messages, temperature, max_tokens)
+        self.calls += 1
+        if self.fail_with is not None:
+            raise self.fail_with
+        return LLMResponse(
+            content="ok",
+            model="scripted-model",
+            usage={"prompt_tokens": 10, "completion_tokens": 5},
+        )
+
+    def validate(self) -> tuple[bool, str]:
+        return True, "ok"
+
+
+class TestRateLimiter:
+    def test_token_bucket_queues_reservations_behind_refill(self) -> None:
+        clock = _ManualClock()
+        bucket = TokenBucket.per_minute(60, clock=clock)
+
+        assert bucket.reserve(60) == 0.0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        assert bucket.reserve(1) == pytest.approx(2.0)
+
+        clock.now = 2.0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+
+    def test_limiter_combines_request_and_token_budgets(self) -> None:
+        clock = _ManualClock()
+        limiter = ProviderRateLimiter(
+            "openai",
+            RateLimitSettings(requests_per_minute=600, tokens_per_minute=1200),
+            clock=clock,
+        )
+
+        assert limiter.reserve(1200) == 0.0
+        assert limiter.reserve(100) == pytest.approx(5.0)
+
+        stats = limiter.stats()
+        assert stats["acquired_total"] == 2
+        assert stats["waits_total"] == 1
+        assert stats["wait_ms_total"] == pytest.approx(5000.0)
+
+    def test_limiter_honors_retry_after_for_all_callers(self) -> None:
+        clock = _ManualClock()
+        limiter = ProviderRateLimiter(
+            "openai",
+            RateLimitSettings(requests_per_minute=6000),
+            clock=clock,
+        )
+
+        limiter.record_retry_after(3.0)
+        assert limiter.reserve(1) == pytest.approx(3.0)
+        clock.now = 3.0
+        assert limiter.reserve(1) == 0.0
+        assert limiter.stats()["retry_after_total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_provider_records_retry_after(self) -> None:
+        limiter = ProviderRateLimiter("scripted", RateLimitSettings(requests_per_minute=6000))
+        inner = _ScriptedLLM(
+            fail_with=LLMRateLimitError("slow down", retry_after_seconds=0.01),
+        )
+        provider = RateLimitedProvider(inner, limiter)
+
+        with pytest.raises(LLMRateLimitError):
+            await provider.generate([Message(role="user", content="Hello")])
+
+        assert inner.calls == 1
+        assert limiter.stats()["retry_after_total"] == 1
+        assert limiter.reserve(1) > 0.0
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_provider_delegates_generate(self) -> None:
+        limiter = ProviderRateLimiter("scripted", RateLimitSettings(tokens_per_minute=100_000))
+        provider = RateLimitedProvider(_ScriptedLLM(), limiter)
+
+        response = await provider.generate([Message(role="user", content="Hello")])
+
+        assert response.content == "ok"
+        assert provider.provider_name == "scripted"
+        assert provider.model_name == "scripted-model"
+        assert limiter.stats()["acquired_total"] == 1
+
+    def test_create_llm_provider_shares_limiter_per_provider(self) -> None:
+        reset_rate_limiters()
+        config = LLMConfig(
+            provider="ollama",
+            model="llama3.1",
+            rate_limits={"ollama": LLMRateLimitConfig(requests_per_minute=30)},
+        )
+
+        first = create_llm_provider(config)
+        second = create_llm_provider(config)
+
+        assert isinstance(first, RateLimitedProvider)
+        assert isinstance(second, RateLimitedProvider)
+        assert first.rate_limiter is second.rate_limiter
+        assert isinstance(first.inner, OpenAICompatibleProvider)
+
+    def test_create_llm_provider_skips_limiter_for_other_providers(self) -> None:
+        config = LLMConfig(
+            provider="ollama",
+            model="llama3.1",
+            rate_limits={"openai": LLMRateLimitConfig(requests_per_minute=30)},
+        )
+
+        provider = create_llm_provider(config)
+
+        assert isinstance(provider, OpenAICompatibleProvider)
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import pytest
 
+from agent_recall.memory.embedding_provider import (
+    EmbeddingResponse,
+    LocalEmbeddingProvider,
+    PartialEmbeddingError,
+)
 from agent_recall.memory.migration import VectorMigrationRequest, VectorMigrationService
 from agent_recall.memory.policy import MemoryPolicy
 from agent_recall.memory.vector_store import LocalVectorStore
-from agent_recall.storage.models import LogEntry, LogSource, SemanticLabel
+from agent_recall.storage.models import CurationStatus, LogEntry, LogSource, SemanticLabel
 
 
 def _memory_cfg() -> dict[str, object]:
@@ -111,3 +116,124 @@ def test_vector_migration_service_requires_external_base_url(storage, files) ->
 
     with pytest.raises(ValueError, match="external_embedding_base_url"):
         service.migrate(VectorMigrationRequest(dry_run=True))
+
+
+def test_vector_migration_service_only_embeds_changed_rows(storage, files, monkeypatch) -> None:
+    entries = [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            source_session_id="session-incremental",
+            content=f"Incremental learning {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(3)
+    ]
+    for entry in entries:
+        storage.append_entry(entry)
+    embedded: list[str] = []
+    provider = LocalEmbeddingProvider(dimensions=16)
+
+    def _embed(texts: list[str]) -> EmbeddingResponse:
+        embedded.extend(texts)
+        return LocalEmbeddingProvider.embed_texts(provider, texts)
+
+    monkeypatch.setattr(provider, "embed_texts", _embed)
+    memory_cfg = _memory_cfg()
+    service = VectorMigrationService(
+        storage=storage,
+        files=files,
+        memory_cfg=memory_cfg,
+        policy=MemoryPolicy.from_memory_config(memory_cfg),
+        tenant_id="tenant-test",
+        project_id="project-test",
+        embedding_dimensions=16,
+        vector_db_path=files.agent_dir / "vector.db",
+    )
+    monkeypatch.setattr(service, "build_embedding_provider", lambda: ("local", provider))
+
+    first = service.migrate(VectorMigrationRequest())
+    assert (first["rows_migrated"], first["rows_unchanged"]) == (3, 0)
+
+    embedded.clear()
+    unchanged = service.migrate(VectorMigrationRequest())
+    assert embedded == []
+    assert (unchanged["rows_written"], unchanged["rows_unchanged"]) == (0, 3)
+
+    storage.update_entry_curation_status(entries[0].id, CurationStatus.REJECTED)
+    storage.append_entry(
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            source_session_id="session-incremental",
+            content="A brand new learning",
+            label=SemanticLabel.GOTCHA,
+        )
+    )
+    with service.local_vector_store()._connect() as conn:
+        conn.execute(
+            "UPDATE memory_vector_records SET content_hash = 'stale' WHERE id = ?",
+            (str(entries[1].id),),
+        )
+
+    changed = service.migrate(VectorMigrationRequest())
+    assert sorted(embedded) == ["A brand new learning", "Incremental learning 1"]
+    assert (changed["rows_written"], changed["rows_deleted"]) == (2, 1)
+    assert service.local_vector_store().count_records() == 3
+
+
+def test_vector_migration_service_keeps_vectors_embedded_before_a_failure(
+    storage, files, monkeypatch
+) -> None:
+    for index in range(4):
+        storage.append_entry(
+            LogEntry(
+                source=LogSource.EXTRACTED,
+                source_session_id="session-partial",
+                content=f"Partial learning {index}",
+                label=SemanticLabel.PATTERN,
+            )
+        )
+    calls: list[list[str]] = []
+
+    class _FlakyProvider:
+        def embed_texts(self, texts: list[str]) -> EmbeddingResponse:
+            calls.append(texts)
+            if len(calls) == 1:
+                return EmbeddingResponse(
+                    vectors=[[1.0, 0.0] for _ in texts],
+                    provider="external",
+                    model="emb-small",
+                    estimated_tokens=2,
+                    estimated_cost_usd=0.0,
+                )
+            raise PartialEmbeddingError(
+                "Embedding request failed: 400",
+                vectors={1: [0.0, 1.0]},
+                estimated_tokens=1,
+                estimated_cost_usd=0.0,
+            )
+
+    memory_cfg = _memory_cfg()
+    service = VectorMigrationService(
+        storage=storage,
+        files=files,
+        memory_cfg=memory_cfg,
+        policy=MemoryPolicy.from_memory_config(memory_cfg),
+        tenant_id="tenant-test",
+        project_id="project-test",
+        embedding_dimensions=2,
+        vector_db_path=files.agent_dir / "vector.db",
+    )
+    monkeypatch.setattr(service, "build_embedding_provider", lambda: ("local", _FlakyProvider()))
+    persisted: list[str] = []
+    monkeypatch.setattr(
+        service,
+        "persist_vectors",
+        lambda vectors, *, backend, dry_run: persisted.extend(record.text for record in vectors),
+    )
+
+    with pytest.raises(PartialEmbeddingError) as raised:
+        service.migrate(VectorMigrationRequest(batch_size=2))
+
+    assert sorted(raised.value.vectors) == [0, 1, 3]
+    assert raised.value.estimated_tokens == 3
+    assert sorted(persisted) == sorted([*calls[0], calls[1][1]])
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import random
+
+from agent_recall.core.near_duplicates import (
+    NUM_PERMUTATIONS,
+    NearDuplicateLineIndex,
+    line_key,
+    load_tier_line_index,
+    minhash_signature,
+    save_tier_line_index,
+)
+from agent_recall.core.tier_notes import jaccard_similarity, semantic_token_set
+from agent_recall.core.tier_writer import _compute_content_hash
+
+_VOCABULARY = [
+    "sqlite",
+    "migration",
+    "retry",
+    "timeout",
+    "cache",
+    "pytest",
+    "fixture",
+    "tenant",
+    "schema",
+    "embedding",
+    "vector",
+    "guardrail",
+    "compaction",
+    "session",
+    "transcript",
+    "remote",
+    "storage",
+    "watermark",
+    "index",
+    "chunk",
+]
+
+
+def _corpus(count: int, *, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    lines: list[str] = []
+    for index in range(count):
+        words = rng.sample(_VOCABULARY, k=8)
+        if lines and index % 5 == 0:
+            # Near-duplicate of an earlier line with one extra token.
+            words = sorted(semantic_token_set(rng.choice(lines))) + [f"extra{index}"]
+        lines.append(f"- [GOTCHA] {' '.join(words)}")
+    return lines
+
+
+def test_minhash_signature_is_stable_and_sized() -> None:
+    tokens = {"sqlite", "retry", "timeout"}
+    assert minhash_signature(tokens) == minhash_signature(set(tokens))
+    assert len(minhash_signature(tokens)) == NUM_PERMUTATIONS
+    assert minhash_signature(set()) == ()
+
+
+def test_line_key_matches_tier_writer_hash() -> None:
+    line = "  - [PATTERN]   Keep Validation   Green "
+    assert line_key(line) == _compute_content_hash(line)
+
+
+def test_near_duplicate_index_matches_exhaustive_jaccard_scan() -> None:
+    existing = _corpus(300)
+    queries = _corpus(120, seed=11) + [f"{line} extra" for line in existing[:40]]
+    index = NearDuplicateLineIndex.from_lines(existing)
+    token_sets = [semantic_token_set(line) for line in existing]
+
+    for query in queries:
+        query_tokens = semantic_token_set(query)
+        expected = any(jaccard_similarity(query_tokens, tokens) >= 0.85 for tokens in token_sets)
+        assert (index.find_near_duplicate(query) is not None) == expected, query
+
+
+def test_near_duplicate_index_remove_respects_repeated_lines() -> None:
+    line = "- [GOTCHA] Sort migration inputs before execution."
+    index = NearDuplicateLineIndex.from_lines([line, line])
+
+    index.remove(line)
+    assert index.contains(line)
+    assert index.find_near_duplicate("- [GOTCHA] sort migration inputs before execution") == line
+
+    index.remove(line)
+    assert not index.contains(line)
+    assert index.find_near_duplicate(line) is None
+
+
+def test_tier_line_index_persists_signatures_and_drops_stale_lines(tmp_path) -> None:
+    path = tmp_path / "tier_line_index.json"
+    lines = _corpus(50)
+    first = load_tier_line_index(path, "GUARDRAILS", lines)
+    assert first.signatures_computed == len({line_key(line) for line in lines})
+    save_tier_line_index(path, "GUARDRAILS", first)
+
+    kept = lines[:10]
+    added = "- [GOTCHA] brand new line about websocket reconnect backoff"
+    second = load_tier_line_index(path, "GUARDRAILS", [*kept, added])
+    assert second.signatures_computed == 1
+    save_tier_line_index(path, "GUARDRAILS", second)
+
+    payload = json.loads(path.read_text())
+    assert set(payload["scopes"]["GUARDRAILS"]) == {line_key(line) for line in [*kept, added]}
+
+
+def test_tier_line_index_ignores_corrupt_file(tmp_path) -> None:
+    path = tmp_path / "tier_line_index.json"
+    path.write_text("{not json")
+    index = load_tier_line_index(path, "STYLE", ["- [PATTERN] Prefer pathlib over os.path"])
+    assert index.signatures_computed == 1
+    assert index.find_near_duplicate("- [PATTERN] prefer pathlib over os.path") is not None
@@ -1,3 +1,6 @@
+import asyncio
+import json
+import threading
 import uuid
 from datetime import UTC, datetime
 
@@ -5,7 +8,7 @@ import httpx
 import pytest
 import respx
 
-from agent_recall.storage.base import PermissionDeniedError
+from agent_recall.storage.base import PermissionDeniedError, UnsupportedStorageCapabilityError
 from agent_recall.storage.models import (
     AuditAction,
     AuditEvent,
@@ -15,10 +18,15 @@ from agent_recall.storage.models import (
     LogSource,
     SemanticLabel,
     Session,
+    SessionCheckpoint,
     SessionStatus,
     SharedStorageConfig,
 )
-from agent_recall.storage.remote import RemoteStorage, SharedBackendUnavailableError
+from agent_recall.storage.remote import (
+    RemoteStorage,
+    SharedBackendUnavailableError,
+    _AsyncHTTPClient,
+)
 
 
 @pytest.fixture
@@ -55,9 +63,10 @@ def test_create_session(storage):
     )
 
     route = respx.post("http://test-server/sessions").mock(return_value=httpx.Response(201))
-    respx.post("http://test-server/audit/events").mock(return_value=httpx.Response(201))
+    respx.post("http://test-server/audit/events/batch").mock(return_value=httpx.Response(201))
 
     storage.create_session(session)
+    storage.flush_audit_events()
 
     assert route.called
     assert route.calls.last.request.content == session.model_dump_json().encode()
@@ -243,8 +252,9 @@ def test_writer_role_allows_write_operations(http_config):
 
     with respx.mock:
         respx.post("http://test-server/sessions").mock(return_value=httpx.Response(201))
-        respx.post("http://test-server/audit/events").mock(return_value=httpx.Response(201))
+        respx.post("http://test-server/audit/events/batch").mock(return_value=httpx.Response(201))
         storage.create_session(session)
+        storage.flush_audit_events()
 
 
 def test_promote_gate_blocks_chunk_store(http_config):
@@ -270,8 +280,9 @@ def test_promote_gate_allows_chunk_store(http_config):
 
     with respx.mock:
         respx.post("http://test-server/chunks").mock(return_value=httpx.Response(201))
-        respx.post("http://test-server/audit/events").mock(return_value=httpx.Response(201))
+        respx.post("http://test-server/audit/events/batch").mock(return_value=httpx.Response(201))
         storage.store_chunk(chunk)
+        storage.flush_audit_events()
 
 
 @respx.mock
@@ -280,15 +291,18 @@ def test_write_operations_emit_audit_events(http_config):
     http_config.audit_actor = "cli"
     storage = RemoteStorage(http_config)
     session = Session(task="audit task", status=SessionStatus.ACTIVE)
-    event_route = respx.post("http://test-server/audit/events").mock(
+    event_route = respx.post("http://test-server/audit/events/batch").mock(
         return_value=httpx.Response(201)
     )
     respx.post("http://test-server/sessions").mock(return_value=httpx.Response(201))
 
     storage.create_session(session)
+    assert not event_route.called
+    storage.flush_audit_events()
 
-    assert event_route.called
-    event_payload = AuditEvent.model_validate_json(event_route.calls.last.request.content)
+    assert event_route.call_count == 1
+    events = json.loads(event_route.calls.last.request.content)["events"]
+    event_payload = AuditEvent.model_validate(events[0])
     assert event_payload.actor == "cli"
     assert event_payload.action == AuditAction.CREATE
     assert event_payload.resource_type == "session"
@@ -306,3 +320,216 @@ def test_audit_disabled_skips_audit_event_call(http_config):
 
     assert len(respx.calls) == 1
     assert respx.calls.last.request.url.path == "/sessions"
+
+
+@respx.mock
+def test_append_entries_pages_batches_and_coalesces_audit(http_config):
+    http_config.batch_size = 2
+    http_config.audit_batch_size = 3
+    storage = RemoteStorage(http_config)
+    entries = [
+        LogEntry(
+            source=LogSource.EXTRACTED,
+            content=f"learning {index}",
+            label=SemanticLabel.PATTERN,
+        )
+        for index in range(5)
+    ]
+    batch_route = respx.post("http://test-server/entries/batch").mock(
+        return_value=httpx.Response(201)
+    )
+    audit_route = respx.post("http://test-server/audit/events/batch").mock(
+        return_value=httpx.Response(201)
+    )
+
+    storage.append_entries(entries)
+
+    pages = [json.loads(call.request.content)["entries"] for call in batch_route.calls]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [item["id"] for page in pages for item in page] == [str(e.id) for e in entries]
+    assert audit_route.call_count == 1
+    assert len(json.loads(audit_route.calls.last.request.content)["events"]) == 5
+
+
+@respx.mock
+def test_batch_writes_fall_back_when_server_lacks_batch_endpoints(http_config):
+    http_config.audit_enabled = False
+    storage = RemoteStorage(http_config)
+    respx.post("http://test-server/entries/batch").mock(return_value=httpx.Response(404))
+    respx.put("http://test-server/processed_sessions/batch").mock(return_value=httpx.Response(405))
+    entry_route = respx.post("http://test-server/entries").mock(return_value=httpx.Response(201))
+    processed_route = respx.put("http://test-server/processed_sessions").mock(
+        return_value=httpx.Response(200)
+    )
+    entries = [
+        LogEntry(source=LogSource.EXTRACTED, content=f"item {index}", label=SemanticLabel.GOTCHA)
+        for index in range(3)
+    ]
+
+    storage.append_entries(entries)
+    storage.mark_sessions_processed(["a", "b", "a"])
+
+    assert entry_route.call_count == 3
+    assert [json.loads(call.request.content) for call in processed_route.calls] == [
+        {"source_session_id": "a"},
+        {"source_session_id": "b"},
+    ]
+
+
+def test_read_through_cache_lives_beside_local_db(http_config, tmp_path):
+    http_config.read_cache_max_age_seconds = 0.0
+    storage = RemoteStorage(http_config, local_db_path=tmp_path / "state.db")
+    chunk = Chunk(content="cached chunk", label=SemanticLabel.PATTERN, source=ChunkSource.MANUAL)
+
+    with respx.mock:
+        route = respx.get("http://test-server/chunks").mock(
+            side_effect=[
+                httpx.Response(200, json=[chunk.model_dump(mode="json")], headers={"ETag": '"g1"'}),
+                httpx.Response(304, headers={"ETag": '"g1"'}),
+            ]
+        )
+        assert [item.id for item in storage.list_chunks()] == [chunk.id]
+        assert [item.id for item in storage.search_chunks_fts("cached")] == [chunk.id]
+
+    assert route.calls[1].request.headers["If-None-Match"] == '"g1"'
+    assert (tmp_path / "shared_cache.db").exists()
+
+
+def test_read_cache_disabled_reads_from_server(http_config, tmp_path):
+    http_config.read_cache_enabled = False
+    storage = RemoteStorage(http_config, local_db_path=tmp_path / "state.db")
+
+    with respx.mock:
+        respx.get("http://test-server/chunks/count").mock(
+            return_value=httpx.Response(200, json={"count": 4})
+        )
+        assert storage.count_chunks() == 4
+
+    assert not (tmp_path / "shared_cache.db").exists()
+
+
+@respx.mock
+async def test_async_storage_awaits_sync_path_calls(http_config):
+    http_config.batch_size = 2
+    http_config.write_behind_enabled = False
+    storage = RemoteStorage(http_config).as_async()
+    entries = [
+        LogEntry(source=LogSource.EXTRACTED, content=f"async {index}", label=SemanticLabel.PATTERN)
+        for index in range(5)
+    ]
+    batch_route = respx.post("http://test-server/entries/batch").mock(
+        return_value=httpx.Response(201)
+    )
+    audit_route = respx.post("http://test-server/audit/events/batch").mock(
+        return_value=httpx.Response(201)
+    )
+    respx.get("http://test-server/checkpoints").mock(return_value=httpx.Response(404))
+    respx.get("http://test-server/processed_sessions/check").mock(
+        return_value=httpx.Response(200, json={"processed": False})
+    )
+    checkpoint_route = respx.put("http://test-server/checkpoints").mock(
+        return_value=httpx.Response(200)
+    )
+    processed_route = respx.put("http://test-server/processed_sessions/batch").mock(
+        return_value=httpx.Response(200)
+    )
+
+    await storage.append_entries(entries)
+    assert await storage.get_session_checkpoint("source-1") is None
+    assert await storage.is_session_processed("source-1") is False
+    await storage.save_session_checkpoint(
+        SessionCheckpoint(source_session_id="source-1", last_message_index=4)
+    )
+    await storage.mark_session_processed("source-1")
+    await storage.aclose()
+
+    pages = [json.loads(call.request.content)["entries"] for call in batch_route.calls]
+    assert sorted(len(page) for page in pages) == [1, 2, 2]
+    assert sorted(item["id"] for page in pages for item in page) == sorted(
+        str(e.id) for e in entries
+    )
+    assert checkpoint_route.call_count == 1
+    assert json.loads(processed_route.calls.last.request.content) == {
+        "source_session_ids": ["source-1"]
+    }
+    storage.storage.flush_audit_events()
+    assert audit_route.call_count == 1
+
+
+@respx.mock
+async def test_async_storage_falls_back_to_local_db(http_config, tmp_path):
+    http_config.write_behind_enabled = False
+    remote = RemoteStorage(http_config, local_db_path=tmp_path / "state.db")
+    assert remote._local is not None
+    remote._local.mark_session_processed("offline-session")
+    route = respx.get("http://test-server/processed_sessions/check").mock(
+        side_effect=httpx.ConnectError("Connection refused")
+    )
+
+    assert await remote.as_async().is_session_processed("offline-session") is True
+    assert route.call_count == 1
+
+    with pytest.raises(SharedBackendUnavailableError):
+        await RemoteStorage(http_config).as_async().is_session_processed("offline-session")
+
+
+async def test_async_storage_reraises_unsupported_capability(http_config, monkeypatch):
+    async def _unsupported(self, source_session_id):
+        raise UnsupportedStorageCapabilityError("processed_sessions")
+
+    monkeypatch.setattr(_AsyncHTTPClient, "is_session_processed", _unsupported)
+    with pytest.raises(UnsupportedStorageCapabilityError, match="processed_sessions"):
+        await RemoteStorage(http_config).as_async().is_session_processed("source-1")
+
+
+def test_async_http_client_closes_the_previous_loops_client(http_config):
+    client = RemoteStorage(http_config).as_async()._http
+    assert client is not None
+
+    # The first client belongs to a loop that is still running on another thread.
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    first = asyncio.run_coroutine_threadsafe(client._http(), loop).result()
+    second = asyncio.run(client._http())
+    # The close is handed to the owning loop; let it run.
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result()
+    assert first.is_closed and second is not first
+
+    # The second belonged to an ``asyncio.run`` loop that has since closed.
+    third = asyncio.run(client._http())
+    assert second.is_closed and not third.is_closed
+    asyncio.run(client.aclose())
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+async def test_async_storage_queues_writes_behind_for_file_backends(tmp_path):
+    config = SharedStorageConfig(
+        base_url=f"sqlite://{tmp_path / 'shared'}",
+        tenant_id="test-tenant",
+        project_id="test-project",
+        outbox_flush_interval_seconds=60.0,
+    )
+    remote = RemoteStorage(config, local_db_path=tmp_path / "local" / "state.db")
+    storage = remote.as_async()
+
+    await storage.mark_sessions_processed(["queued"])
+    await storage.save_session_checkpoint(
+        SessionCheckpoint(source_session_id="queued", last_message_index=2)
+    )
+
+    assert await storage.is_session_processed("queued") is True
+    checkpoint = await storage.get_session_checkpoint("queued")
+    assert checkpoint is not None and checkpoint.last_message_index == 2
+    status = remote.get_outbox_status()
+    assert status is not None and status.pending == 2
+
+
+def test_async_storage_http2_requires_h2(http_config, monkeypatch):
+    http_config.http2 = True
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+
+    with pytest.raises(ValueError, match="h2"):
+        RemoteStorage(http_config).as_async()
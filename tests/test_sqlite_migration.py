@@ -3,6 +3,7 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
+from agent_recall.storage.models import SemanticLabel
 from agent_recall.storage.sqlite import SQLiteStorage
 
 LEGACY_SCHEMA = """
@@ -143,3 +144,21 @@ def test_sqlite_storage_migrates_when_only_project_column_is_missing(tmp_path: P
             "SELECT tenant_id, project_id FROM sessions WHERE id='session-1'"
         ).fetchone()
     assert row == ("tenant-a", "default")
+
+
+def test_sqlite_storage_backfills_chunk_content_hashes(tmp_path: Path) -> None:
+    db_path = tmp_path / "state.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute(
+            "INSERT INTO chunks (id, source, source_ids, content, label, tags, created_at) "
+            "VALUES ('chunk-1', 'manual', '[]', 'Pin sqlite-vec', 'gotcha', '[]', "
+            "'2026-01-01T00:00:00+00:00')"
+        )
+
+    storage = SQLiteStorage(db_path)
+
+    assert "content_hash" in _column_names(db_path, "chunks")
+    assert _index_exists(db_path, "idx_chunks_content_hash")
+    assert storage.has_chunk("Pin sqlite-vec", SemanticLabel.GOTCHA)
+    assert not storage.has_chunk("Pin sqlite-vec", SemanticLabel.PATTERN)
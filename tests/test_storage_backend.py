@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import os
+import time
+
 import respx
 from httpx import Response
 
 from agent_recall.storage import create_storage_backend
+from agent_recall.storage import files as files_module
 from agent_recall.storage.files import FileStorage, KnowledgeTier
 from agent_recall.storage.models import (
     AgentRecallConfig,
@@ -134,10 +138,12 @@ def test_remote_http_client_create_session(tmp_path) -> None:
     )
     session = Session(task="test task")
     route = respx.post(f"{base_url}/sessions").mock(return_value=Response(201))
-    respx.post(f"{base_url}/audit/events").mock(return_value=Response(201))
+    respx.post(f"{base_url}/audit/events/batch").mock(return_value=Response(201))
 
     storage = create_storage_backend(config, tmp_path / "state.db")
+    assert isinstance(storage, RemoteStorage)
     storage.create_session(session)
+    storage.flush_audit_events()
 
     assert route.called
     assert route.calls.last.request.content == session.model_dump_json().encode("utf-8")
@@ -206,3 +212,69 @@ def test_file_storage_reads_shared_tier_before_local(tmp_path) -> None:
     files = FileStorage(repo_agent_dir, shared_tiers_dir=shared_dir)
 
     assert files.read_tier(KnowledgeTier.STYLE) == "# Shared style\n- Team rule\n"
+
+
+def _age_file(path, seconds: float = 60.0) -> None:
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_file_storage_caches_config_until_file_changes(tmp_path, monkeypatch) -> None:
+    agent_dir = tmp_path / ".agent"
+    agent_dir.mkdir()
+    config_path = agent_dir / "config.yaml"
+    config_path.write_text("llm:\n  provider: openai\n")
+    _age_file(config_path)
+    files = FileStorage(agent_dir)
+
+    parses = {"count": 0}
+    real_safe_load = files_module.yaml.safe_load
+
+    def counting_safe_load(text):
+        parses["count"] += 1
+        return real_safe_load(text)
+
+    monkeypatch.setattr(files_module.yaml, "safe_load", counting_safe_load)
+
+    first = files.read_config()
+    first["llm"]["provider"] = "mutated"
+    second = files.read_config()
+    assert second == {"llm": {"provider": "openai"}}
+    assert parses["count"] == 1
+
+    config_path.write_text("llm:\n  provider: anthropic\n  model: x\n")
+    assert files.read_config() == {"llm": {"provider": "anthropic", "model": "x"}}
+    assert parses["count"] == 2
+
+
+def test_file_storage_detects_same_size_rewrite_within_mtime_tick(tmp_path) -> None:
+    agent_dir = tmp_path / ".agent"
+    agent_dir.mkdir()
+    files = FileStorage(agent_dir)
+    files.write_tier(KnowledgeTier.RECENT, "# Recent\n- aaaa\n")
+    stat = (agent_dir / "RECENT.md").stat()
+
+    tier_path = agent_dir / "RECENT.md"
+    with tier_path.open("r+") as fp:
+        fp.write("# Recent\n- bbbb\n")
+    os.utime(tier_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert files.read_tier(KnowledgeTier.RECENT) == "# Recent\n- bbbb\n"
+
+
+def test_file_storage_writes_are_atomic_and_refresh_cache(tmp_path) -> None:
+    agent_dir = tmp_path / ".agent"
+    agent_dir.mkdir()
+    files = FileStorage(agent_dir)
+    files.write_tier(KnowledgeTier.STYLE, "# Style\n- one\n")
+    assert files.read_tier(KnowledgeTier.STYLE) == "# Style\n- one\n"
+
+    original_inode = (agent_dir / "STYLE.md").stat().st_ino
+    files.write_tier(KnowledgeTier.STYLE, "# Style\n- one\n- two\n")
+    files.write_config({"telemetry": {"enabled": False}})
+
+    assert (agent_dir / "STYLE.md").stat().st_ino != original_inode
+    assert files.read_tier(KnowledgeTier.STYLE) == "# Style\n- one\n- two\n"
+    assert files.read_config() == {"telemetry": {"enabled": False}}
+    assert not list(agent_dir.glob("*.tmp"))
+    assert not list(agent_dir.glob(".*.tmp"))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -11,7 +12,17 @@ from agent_recall.core.sync import AutoSync, SyncDiscoverStage, SyncFilterStage
 from agent_recall.core.telemetry import PipelineTelemetry
 from agent_recall.ingest.base import RawMessage, RawSession, SessionIngester
 from agent_recall.llm.base import LLMProvider, LLMRateLimitError, LLMResponse, Message
-from agent_recall.storage.models import Chunk, ChunkSource, CurationStatus, SemanticLabel
+from agent_recall.llm.rate_limit import ProviderRateLimiter, RateLimitedProvider, RateLimitSettings
+from agent_recall.storage.http_server import make_shared_backend_server
+from agent_recall.storage.models import (
+    Chunk,
+    ChunkSource,
+    CurationStatus,
+    SemanticLabel,
+    SharedStorageConfig,
+)
+from agent_recall.storage.remote import RemoteStorage
+from agent_recall.storage.sqlite import SQLiteStorage
 
 
 class AdaptiveLLM(LLMProvider):
@@ -235,6 +246,44 @@ async def test_auto_sync_processes_then_skips_duplicates(storage, files, tmp_pat
     assert second["session_diagnostics"][0]["status"] == "skipped_already_processed"
 
 
+@pytest.mark.asyncio
+async def test_auto_sync_awaits_shared_http_storage(files, tmp_path: Path) -> None:
+    server = make_shared_backend_server(tmp_path / "server" / "state.db", port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    session_path = tmp_path / "cursor-session"
+    session_path.write_text("session")
+    storage = RemoteStorage(
+        SharedStorageConfig(
+            base_url=f"http://{host}:{port}",
+            tenant_id="team",
+            project_id="app",
+            write_behind_enabled=False,
+            audit_enabled=False,
+        )
+    )
+    sync = AutoSync(
+        storage=storage,
+        files=files,
+        llm=AdaptiveLLM(),
+        ingesters=[FakeIngester("cursor", [session_path])],
+    )
+    try:
+        first = await sync.sync()
+        second = await sync.sync()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert sync._async_storage is not None
+    assert first["sessions_processed"] == 1
+    assert second["sessions_already_processed"] == 1
+    shared = SQLiteStorage(tmp_path / "server" / "state.db", tenant_id="team", project_id="app")
+    assert shared.count_log_entries() == 1
+    assert shared.get_session_checkpoint("cursor-cursor-session") is not None
+    assert shared.is_session_processed("cursor-cursor-session") is True
+
+
 @pytest.mark.asyncio
 async def test_auto_sync_auto_approves_extracted_entries_when_curation_mode_disabled(
     storage,
@@ -285,6 +334,66 @@ async def test_auto_sync_keeps_extracted_entries_pending_when_curation_mode_enab
     assert storage.list_entries_by_curation_status(CurationStatus.APPROVED) == []
 
 
+def test_auto_sync_configures_token_budget_batching_from_config(storage, files) -> None:
+    files.write_config(
+        {
+            "extraction": {
+                "batch_strategy": "token_budget",
+                "prompt_token_budget": 8000,
+                "per_model_prompt_token_budget": {"mock": 4000},
+            }
+        }
+    )
+
+    sync = AutoSync(storage=storage, files=files, llm=AdaptiveLLM(), ingesters=[])
+
+    assert sync.extractor is not None
+    assert sync.extractor.batch_strategy == "token_budget"
+    assert sync.extractor.prompt_token_budget == 4000
+    assert sync._maybe_reduce_extract_batch_size(sync.extractor) == (4000, 2000)
+    assert sync.extractor.prompt_token_budget == 2000
+
+
+@pytest.mark.asyncio
+async def test_auto_sync_signal_filter_reports_skipped_llm_calls(
+    storage,
+    files,
+    tmp_path: Path,
+) -> None:
+    session_path = tmp_path / "cursor-noise"
+    session_path.write_text("noise")
+    listing = "\n".join(f"src/agent_recall/module_{index}.py" for index in range(6))
+
+    class NoiseIngester(FakeIngester):
+        def parse_session(self, path: Path) -> RawSession:
+            return RawSession(
+                source=self.source_name,
+                session_id=self.get_session_id(path),
+                started_at=datetime.now(UTC),
+                messages=[RawMessage(role="assistant", content=listing) for _ in range(6)],
+            )
+
+    files.write_config({"extraction": {"signal_filter_enabled": True}})
+    sync = AutoSync(
+        storage=storage,
+        files=files,
+        llm=AdaptiveLLM(),
+        ingesters=[NoiseIngester("cursor", [session_path])],
+    )
+    assert sync.extractor is not None
+    sync.extractor.messages_per_batch = 2
+
+    results = await sync.sync(telemetry_run_id="sync-signal-filter-test")
+
+    assert results["llm_requests"] == 0
+    assert results["llm_calls_skipped"] == 3
+    telemetry = PipelineTelemetry(files.agent_dir)
+    snapshot = telemetry.read_snapshot()
+    assert snapshot["counters"]["llm_calls_skipped"] == 3
+    run = telemetry.list_recent_runs(limit=1)[0]
+    assert run["llm_calls_skipped"] == 3
+
+
 @pytest.mark.asyncio
 async def test_auto_sync_filters_by_source(storage, files, tmp_path: Path) -> None:
     cursor_session = tmp_path / "cursor-session"
@@ -798,6 +907,33 @@ async def test_auto_sync_retries_rate_limit_then_processes(
     assert storage.is_session_processed("cursor-cursor-session") is True
 
 
+@pytest.mark.asyncio
+async def test_auto_sync_reports_rate_limiter_metrics_in_telemetry(
+    storage,
+    files,
+    tmp_path: Path,
+) -> None:
+    session_path = tmp_path / "cursor-session"
+    session_path.write_text("session")
+    limiter = ProviderRateLimiter("flaky", RateLimitSettings(requests_per_minute=60_000))
+    sync = AutoSync(
+        storage=storage,
+        files=files,
+        llm=RateLimitedProvider(FlakyRateLimitedLLM(fail_attempts=1), limiter),
+        ingesters=[FakeIngester("cursor", [session_path])],
+    )
+    sync.extract_retry_backoff_seconds = 0
+
+    results = await sync.sync(telemetry_run_id="sync-rate-limit-test")
+
+    assert results["sessions_processed"] == 1
+    events_path = files.agent_dir / "metrics" / "pipeline-events.jsonl"
+    events = [json.loads(line) for line in events_path.read_text().splitlines()]
+    extract_events = [event for event in events if event["stage"] == "extract"]
+    assert extract_events[-1]["metadata"]["rate_limit_retry_after"] == 1
+    assert extract_events[-1]["metadata"]["rate_limit_wait_ms"] >= 0.0
+
+
 @pytest.mark.asyncio
 async def test_auto_sync_rate_limit_honors_retry_after_and_reduces_batch_size(
     storage,
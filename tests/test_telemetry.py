@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import json
+import multiprocessing
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 from agent_recall.core.telemetry import PipelineTelemetry
-from agent_recall.storage.models import PipelineEventAction, PipelineStage
+from agent_recall.core.telemetry_store import TelemetryEventStore
+from agent_recall.storage.models import PipelineEvent, PipelineEventAction, PipelineStage
 
 
 def test_pipeline_telemetry_records_snapshot_and_recent_runs(tmp_path: Path) -> None:
@@ -58,3 +62,188 @@ def test_pipeline_telemetry_disabled_does_not_write_files(tmp_path: Path) -> Non
 
     assert not telemetry.events_path.exists()
     assert telemetry.read_snapshot()["counters"]["events_total"] == 0
+
+
+def test_pipeline_telemetry_buffers_until_threshold(tmp_path: Path) -> None:
+    agent_dir = tmp_path / ".agent"
+    telemetry = PipelineTelemetry(
+        agent_dir=agent_dir,
+        enabled=True,
+        flush_max_events=3,
+        flush_interval_seconds=3600.0,
+    )
+    run_id = telemetry.create_run_id("sync")
+
+    for _ in range(2):
+        telemetry.record_event(
+            run_id=run_id,
+            stage=PipelineStage.INGEST,
+            action=PipelineEventAction.START,
+        )
+    assert not telemetry.events_path.exists()
+    assert not telemetry.snapshot_path.exists()
+
+    telemetry.record_event(
+        run_id=run_id,
+        stage=PipelineStage.INGEST,
+        action=PipelineEventAction.COMPLETE,
+        success=True,
+    )
+    assert len(telemetry.events_path.read_text(encoding="utf-8").splitlines()) == 3
+    assert telemetry.read_snapshot()["counters"]["by_stage"]["ingest"]["start"] == 2
+    assert not list(telemetry.metrics_dir.glob("*.tmp"))
+
+
+def _record_events_in_subprocess(agent_dir: str, count: int) -> None:
+    telemetry = PipelineTelemetry(
+        agent_dir=Path(agent_dir),
+        enabled=True,
+        flush_max_events=7,
+        flush_interval_seconds=3600.0,
+    )
+    run_id = telemetry.create_run_id("worker")
+    for _ in range(count):
+        telemetry.record_event(
+            run_id=run_id,
+            stage=PipelineStage.EXTRACT,
+            action=PipelineEventAction.COMPLETE,
+            success=True,
+            duration_ms=10.0,
+        )
+    telemetry.flush()
+
+
+def test_pipeline_telemetry_concurrent_processes_keep_snapshot_consistent(
+    tmp_path: Path,
+) -> None:
+    agent_dir = tmp_path / ".agent"
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_record_events_in_subprocess, args=(str(agent_dir), 50))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    telemetry = PipelineTelemetry(agent_dir=agent_dir, enabled=True)
+    snapshot = json.loads(telemetry.snapshot_path.read_text(encoding="utf-8"))
+    assert snapshot["counters"]["events_total"] == 200
+    assert snapshot["counters"]["by_stage"]["extract"]["success"] == 200
+    assert len(telemetry.events_path.read_text(encoding="utf-8").splitlines()) == 200
+
+
+def test_pipeline_telemetry_migrates_legacy_jsonl_into_store(tmp_path: Path) -> None:
+    agent_dir = tmp_path / ".agent"
+    metrics_dir = agent_dir / "metrics"
+    metrics_dir.mkdir(parents=True)
+    legacy = [
+        PipelineEvent(
+            run_id=f"legacy-{index % 3}",
+            stage=PipelineStage.EXTRACT,
+            action=PipelineEventAction.COMPLETE,
+            success=True,
+            duration_ms=5.0,
+            created_at=datetime.now(UTC) - timedelta(minutes=30 - index),
+        )
+        for index in range(9)
+    ]
+    (metrics_dir / "pipeline-events.jsonl").write_text(
+        "".join(event.model_dump_json() + "\n" for event in legacy) + "not json\n",
+        encoding="utf-8",
+    )
+
+    telemetry = PipelineTelemetry(agent_dir=agent_dir, enabled=True)
+    runs = telemetry.list_recent_runs(limit=2)
+
+    assert [run["run_id"] for run in runs] == ["legacy-2", "legacy-1"]
+    assert all(run["events_total"] == 3 for run in runs)
+    assert len(telemetry.query_events()) == 9
+
+    # A second telemetry instance (or a later process) must not import the file again.
+    assert TelemetryEventStore(telemetry.db_path).migrate_jsonl([telemetry.events_path]) == 0
+    assert TelemetryEventStore(telemetry.db_path).count() == 9
+
+
+def test_pipeline_telemetry_query_filters_by_run_stage_and_time(tmp_path: Path) -> None:
+    agent_dir = tmp_path / ".agent"
+    telemetry = PipelineTelemetry(agent_dir=agent_dir, enabled=True)
+    started = datetime.now(UTC)
+    for run_id in ("sync-a", "sync-b"):
+        for stage in (PipelineStage.INGEST, PipelineStage.EXTRACT):
+            telemetry.record_event(
+                run_id=run_id,
+                stage=stage,
+                action=PipelineEventAction.COMPLETE,
+                success=True,
+            )
+    telemetry.record_event(
+        run_id="sync-b",
+        stage=PipelineStage.EXTRACT,
+        action=PipelineEventAction.ERROR,
+        success=False,
+    )
+
+    assert len(telemetry.query_events(run_id="sync-a")) == 2
+    errors = telemetry.query_events(stage="extract", action="error")
+    assert [(event.run_id, event.success) for event in errors] == [("sync-b", False)]
+    assert len(telemetry.query_events(since=started - timedelta(seconds=1))) == 5
+    assert telemetry.query_events(until=started - timedelta(seconds=1)) == []
+    assert len(telemetry.query_events(limit=2)) == 2
+
+
+def test_telemetry_event_store_applies_retention(tmp_path: Path) -> None:
+    store = TelemetryEventStore(tmp_path / "events.db", retention_days=7, max_events=5)
+    now = datetime.now(UTC)
+    store.append(
+        [
+            PipelineEvent(
+                run_id="old",
+                stage=PipelineStage.COMPACT,
+                action=PipelineEventAction.COMPLETE,
+                created_at=now - timedelta(days=10),
+            )
+        ]
+    )
+    assert store.count() == 0
+
+    store.append(
+        [
+            PipelineEvent(
+                run_id=f"run-{index}",
+                stage=PipelineStage.COMPACT,
+                action=PipelineEventAction.COMPLETE,
+                created_at=now - timedelta(seconds=60 - index),
+            )
+            for index in range(8)
+        ]
+    )
+    assert store.count() == 5
+    assert store.recent_run_ids(limit=1) == ["run-7"]
+
+
+def test_pipeline_telemetry_rotates_jsonl_segments(tmp_path: Path) -> None:
+    agent_dir = tmp_path / ".agent"
+    telemetry = PipelineTelemetry(
+        agent_dir=agent_dir,
+        enabled=True,
+        flush_max_events=1,
+        jsonl_max_bytes=400,
+        jsonl_backups=2,
+    )
+    for index in range(20):
+        telemetry.record_event(
+            run_id=f"run-{index}",
+            stage=PipelineStage.INGEST,
+            action=PipelineEventAction.COMPLETE,
+        )
+
+    segments = sorted(path.name for path in telemetry.metrics_dir.glob("pipeline-events.jsonl*"))
+    assert segments == [
+        "pipeline-events.jsonl",
+        "pipeline-events.jsonl.1",
+        "pipeline-events.jsonl.2",
+    ]
+    assert len(telemetry.query_events()) == 20
@@ -1,5 +1,6 @@
 """Tests for tier_writer module with structured tier file writing policies."""
 
+import json
 from pathlib import Path
 
 from agent_recall.core.tier_writer import (
@@ -156,6 +157,46 @@ class TestTierWriterGuardrails:
 
         assert written is True
 
+    def test_line_index_is_updated_incrementally_in_its_own_scope(
+        self, tmp_path: Path, monkeypatch
+    ):
+        from agent_recall.core import near_duplicates, tier_writer
+
+        agent_dir = tmp_path / ".agent"
+        agent_dir.mkdir()
+        files = FileStorage(agent_dir)
+        writer = TierWriter(files)
+        loads = {"count": 0}
+        real_load = tier_writer.load_tier_line_index
+
+        def counting_load(*args, **kwargs):
+            loads["count"] += 1
+            return real_load(*args, **kwargs)
+
+        monkeypatch.setattr(tier_writer, "load_tier_line_index", counting_load)
+        for iteration in (1, 2):
+            writer.write_guardrails_entry(
+                iteration=iteration,
+                item_id="TEST-001",
+                item_title="Test Item",
+                reason="validation_failed",
+            )
+        assert loads["count"] == 1
+
+        index_path = agent_dir / near_duplicates.TIER_LINE_INDEX_FILENAME
+        payload = json.loads(index_path.read_text())
+        assert list(payload["scopes"]) == ["tier_writer:GUARDRAILS"]
+        saved_at = index_path.stat().st_mtime_ns
+
+        skipped = writer.write_guardrails_entry(
+            iteration=2,
+            item_id="TEST-001",
+            item_title="Test Item",
+            reason="validation_failed",
+        )
+        assert skipped is False
+        assert index_path.stat().st_mtime_ns == saved_at
+
     def test_write_guardrails_hard_failure(self, tmp_path: Path):
         agent_dir = tmp_path / ".agent"
         agent_dir.mkdir()
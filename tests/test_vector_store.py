@@ -4,6 +4,7 @@ import json
 from datetime import UTC, datetime, timedelta
 
 import httpx
+import pytest
 
 from agent_recall.memory.vector_store import (
     LocalVectorStore,
@@ -134,3 +135,182 @@ def test_resolve_local_vector_db_path_prefers_semantic_memory_name(tmp_path) ->
 
     assert resolved == agent_dir / "semantic-memory.db"
     assert resolved.exists()
+
+
+def test_local_vector_store_reuses_one_connection(tmp_path, monkeypatch) -> None:
+    loads = {"count": 0}
+    original = LocalVectorStore._load_sqlite_vec
+
+    def _counting_load(conn) -> None:  # noqa: ANN001
+        loads["count"] += 1
+        original(conn)
+
+    monkeypatch.setattr(LocalVectorStore, "_load_sqlite_vec", staticmethod(_counting_load))
+    store = LocalVectorStore(tmp_path / "vectors.db", tenant_id="t1", project_id="p1")
+    record = VectorRecord(
+        id="v1",
+        tenant_id="t1",
+        project_id="p1",
+        text="alpha vector",
+        label="pattern",
+        embedding=[0.25, -0.5, 1.0],
+        updated_at=datetime.now(UTC).isoformat(),
+    )
+    store.upsert_records([record])
+    for _ in range(3):
+        results = store.query(embedding=[0.25, -0.5, 1.0], top_k=1)
+    assert store.list_records()[0].embedding == [0.25, -0.5, 1.0]
+    assert loads["count"] == 1
+
+    assert results[0][0].embedding == [0.25, -0.5, 1.0]
+    assert results[0][1] > 0.99
+
+    store.close()
+    assert store.count_records() == 1
+    assert loads["count"] == 2
+
+
+def _record(record_id: str, embedding: list[float], **updates: object) -> VectorRecord:
+    record = VectorRecord(
+        id=record_id,
+        tenant_id="t1",
+        project_id="p1",
+        text=f"{record_id} text",
+        label="pattern",
+        embedding=embedding,
+        updated_at=datetime.now(UTC).isoformat(),
+    )
+    return record.model_copy(update=updates)
+
+
+def _index_count(store: LocalVectorStore) -> int:
+    with store._connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM memory_vector_index").fetchone()[0]
+
+
+def test_local_vector_store_knn_index_filters_scope_and_label(tmp_path) -> None:
+    db_path = tmp_path / "vectors.db"
+    store = LocalVectorStore(db_path, tenant_id="t1", project_id="p1")
+    other = LocalVectorStore(db_path, tenant_id="t2", project_id="p1")
+    store.upsert_records(
+        [
+            _record("near", [1.0, 0.0, 0.0]),
+            _record("gotcha", [0.9, 0.1, 0.0], label="gotcha"),
+            _record("far", [0.0, 0.0, 1.0]),
+        ]
+    )
+    other.upsert_records([_record("foreign", [1.0, 0.0, 0.0], tenant_id="t2")])
+
+    assert [r.id for r, _ in store.query(embedding=[1.0, 0.0, 0.0], top_k=2)] == [
+        "near",
+        "gotcha",
+    ]
+    gotchas = store.query(embedding=[1.0, 0.0, 0.0], top_k=5, label="gotcha")
+    assert [r.id for r, _ in gotchas] == ["gotcha"]
+
+    # Re-upserting replaces the indexed vector instead of adding a second one.
+    store.upsert_records([_record("far", [1.0, 0.0, 0.0], updated_at="2000-01-01T00:00:00")])
+    assert store.query(embedding=[1.0, 0.0, 0.0], top_k=1)[0][0].id == "far"
+    assert _index_count(store) == 4
+
+    assert store.prune_older_than(retention_days=90) == 1
+    assert _index_count(store) == 3
+    assert [r.id for r, _ in other.query(embedding=[1.0, 0.0, 0.0])] == ["foreign"]
+
+
+def test_local_vector_store_indexes_existing_files_and_new_dimensions(tmp_path) -> None:
+    db_path = tmp_path / "vectors.db"
+    store = LocalVectorStore(db_path, tenant_id="t1", project_id="p1")
+    store.upsert_records([_record("a", [1.0, 0.0]), _record("b", [0.0, 1.0])])
+    with store._connect() as conn:
+        conn.execute("DROP TABLE memory_vector_index")
+    store.close()
+
+    migrated = LocalVectorStore(db_path, tenant_id="t1", project_id="p1")
+    assert _index_count(migrated) == 2
+    assert migrated.query(embedding=[0.0, 1.0], top_k=1)[0][0].id == "b"
+
+    migrated.upsert_records([_record("c", [0.0, 0.0, 1.0])])
+    assert _index_count(migrated) == 1
+    assert migrated.query(embedding=[0.0, 0.0, 1.0], top_k=1)[0][0].id == "c"
+    # Vectors of the previous dimension are still reachable through the scan.
+    assert migrated.query(embedding=[1.0, 0.0], top_k=1)[0][0].id == "a"
+
+
+def _turbopuffer_records(count: int) -> list[VectorRecord]:
+    now = datetime.now(UTC).isoformat()
+    return [
+        VectorRecord(
+            id=f"v{index:03d}",
+            tenant_id="tenant-a",
+            project_id="project-b",
+            text=f"learning {index}",
+            label="pattern",
+            embedding=[float(index), 1.0],
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def test_turbopuffer_upserts_batches_concurrently_on_one_client(turbopuffer_server) -> None:
+    turbopuffer_server.latency_seconds = 0.05
+    store = TurboPufferVectorStore(
+        base_url=turbopuffer_server.base_url,
+        api_key_env="TP_KEY",
+        tenant_id="tenant-a",
+        project_id="project-b",
+        upsert_batch_size=10,
+        upsert_concurrency=4,
+    )
+
+    assert store.upsert_records(_turbopuffer_records(35)) == 35
+    assert len(turbopuffer_server.records) == 35
+    sizes = sorted(len(payload["records"]) for _, payload in turbopuffer_server.requests)
+    assert sizes == [5, 10, 10, 10]
+    assert turbopuffer_server.max_in_flight > 1
+
+    client = store._http()
+    assert [match["id"] for match in store.query(embedding=[1.0, 0.0], top_k=2)] == [
+        "v000",
+        "v001",
+    ]
+    assert store._http() is client
+    # Four concurrent upserts plus the query reuse at most four pooled connections.
+    assert turbopuffer_server.connections <= 4
+    store.close()
+    assert store._client is None
+
+
+def test_turbopuffer_retries_failed_batches_only(turbopuffer_server) -> None:
+    turbopuffer_server.fail_next = 1
+    store = TurboPufferVectorStore(
+        base_url=turbopuffer_server.base_url,
+        api_key_env="TP_KEY",
+        tenant_id="tenant-a",
+        project_id="project-b",
+        retry_attempts=3,
+        upsert_batch_size=5,
+        upsert_concurrency=2,
+    )
+
+    assert store.upsert_records(_turbopuffer_records(10)) == 10
+    assert len(turbopuffer_server.records) == 10
+    assert len(turbopuffer_server.requests) == 3
+    store.close()
+
+
+def test_turbopuffer_does_not_retry_client_errors(turbopuffer_server, monkeypatch) -> None:
+    monkeypatch.setenv("TP_KEY", "wrong")
+    store = TurboPufferVectorStore(
+        base_url=turbopuffer_server.base_url,
+        api_key_env="TP_KEY",
+        tenant_id="tenant-a",
+        project_id="project-b",
+        retry_attempts=3,
+    )
+
+    with pytest.raises(RuntimeError, match="401"):
+        store.query(embedding=[1.0, 0.0])
+    assert len(turbopuffer_server.requests) == 1
+    store.close()